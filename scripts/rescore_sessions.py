@@ -0,0 +1,384 @@
+#!/usr/bin/env python3
+"""
+Bulk Re-score Historical Sessions
+IRT 參數、常模或語句庫更新後，批次重新計算歷史評測的分數與結果報告
+
+- 依游標分批串流讀取已計分的 session：
+  sqlalchemy 後端讀 v4_scores (由 v4_responses / v4_response_items 重算)，
+  legacy 後端讀舊版 SQLite 的 v4_assessment_results (由 responses 重算 θ 與常模)
+- 每批以向量化方式計分，分派到 process pool 平行計算
+- 依讀取順序以批次 upsert 寫回，每批寫入後更新檢查點游標，中斷後可續跑
+- sqlalchemy 後端同時重算背景分析產出，並刪除物化結果文件 (下次讀取時重建)
+  與跨程序共用快取層中的 v4_results:<session_id> 項目
+- 回報每秒處理 session 數；--max-seconds 在時間預算用完時停在批次邊界
+
+Usage:
+    python scripts/rescore_sessions.py --backend sqlalchemy --workers 4
+    python scripts/rescore_sessions.py --backend sqlalchemy --shared-cache data/shared_cache.db
+    python scripts/rescore_sessions.py --backend legacy --legacy-db path/to/gallup_assessment.db
+    python scripts/rescore_sessions.py --reset --max-seconds 3600
+"""
+
+import argparse
+import json
+import os
+import sqlite3
+import sys
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+
+# Add project root to path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root / 'src' / 'main' / 'python'))
+
+from core.v4.count_scoring import (DIMENSION_INDEX, LEAST_LIKE_WEIGHT, MOST_LIKE_WEIGHT, TALENT_DIMENSIONS,
+                                   count_score_matrix, normalize_counts, score_record, talent_scores)
+
+CHOICE_WEIGHTS = {"most_like": MOST_LIKE_WEIGHT, "least_like": LEAST_LIKE_WEIGHT}
+
+
+# ---------------------------------------------------------------------------
+# 檢查點
+# ---------------------------------------------------------------------------
+
+def load_checkpoint(path: Path, backend: str) -> Dict[str, Any]:
+    """讀取檢查點；不存在或屬於其他後端時從頭開始"""
+    if path.exists():
+        with open(path, 'r', encoding='utf-8') as f:
+            checkpoint = json.load(f)
+        if checkpoint.get('backend') == backend:
+            return checkpoint
+    return {'backend': backend, 'cursor': 0, 'processed': 0, 'elapsed_seconds': 0.0,
+            'started_at': datetime.now().strftime("%Y-%m-%d %H:%M:%S")}
+
+
+def save_checkpoint(path: Path, checkpoint: Dict[str, Any]):
+    """原子寫入檢查點"""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_suffix(path.suffix + '.tmp')
+    with open(tmp, 'w', encoding='utf-8') as f:
+        json.dump(checkpoint, f, ensure_ascii=False, indent=2)
+    os.replace(tmp, path)
+
+
+# ---------------------------------------------------------------------------
+# 計分 (在 worker process 中執行，輸入輸出皆可 pickle)
+# ---------------------------------------------------------------------------
+
+def score_sqlalchemy_chunk(chunk: Dict[str, Any]) -> List[Tuple[str, Dict[str, Any], Dict[str, Any]]]:
+    """
+    以計數計分重算一批 session (與提交路由相同的計算)
+
+    Returns:
+        [(session_id, V4Score 欄位, 背景分析產出)]
+    """
+    from api.routes.v4_assessment_sqlalchemy import V4_CONFIG
+    from services.enrichment_service import compute_enrichment
+
+    session_ids = chunk['session_ids']
+    n = len(session_ids)
+    raw = count_score_matrix(chunk['session_index'], chunk['dimension_index'], chunk['weights'], n)
+    exposures = count_score_matrix(chunk['session_index'], chunk['dimension_index'],
+                                   np.ones(len(chunk['weights'])), n)
+    normalized = normalize_counts(raw, chunk['n_responses'])
+
+    results = []
+    for i, session_id in enumerate(session_ids):
+        t_scores = talent_scores(normalized[i])
+        dimension_counts = {dimension: float(raw[i, j])
+                            for j, dimension in enumerate(TALENT_DIMENSIONS) if exposures[i, j] > 0}
+        record = score_record(t_scores, dimension_counts, chunk['n_responses'][i], V4_CONFIG)
+        enrichment = compute_enrichment({f"T{j}": t_scores[f"t{j}_talent"] for j in range(1, 13)})
+        results.append((session_id, record, enrichment))
+    return results
+
+
+def score_legacy_chunk(chunk: Dict[str, Any]) -> List[Tuple[int, str, str, str]]:
+    """
+    重算舊版結果：計數 θ → 常模分數 → 優勢概況
+
+    Returns:
+        [(row id, theta_scores JSON, norm_scores JSON, profile JSON)]
+    """
+    from core.component_registry import get_component_registry
+    from data.v4_statements import DIMENSION_MAPPING
+
+    rows = chunk['rows']
+    session_index, dimension_index, weights = [], [], []
+    for i, (_, _, responses_json) in enumerate(rows):
+        for resp in json.loads(responses_json):
+            statement_ids = resp.get('statement_ids', [])
+            for key, weight in (('most_like_index', 1.0), ('least_like_index', -1.0)):
+                index = resp.get(key)
+                if index is None or index >= len(statement_ids):
+                    continue
+                dimension = DIMENSION_MAPPING.get(statement_ids[index])
+                if dimension in DIMENSION_INDEX:
+                    session_index.append(i)
+                    dimension_index.append(DIMENSION_INDEX[dimension])
+                    weights.append(weight)
+
+    scores = count_score_matrix(session_index, dimension_index, weights, len(rows))
+    counts = count_score_matrix(session_index, dimension_index, np.ones(len(weights)), len(rows))
+    theta = scores / np.maximum(counts, 1) * 1.5
+    present = counts > 0
+
+    norm_scorer = get_component_registry().get("normative_scorer")
+    norm_rows = norm_scorer.compute_norm_scores_batch(list(TALENT_DIMENSIONS), theta, present)
+
+    results = []
+    for i, (row_id, _, _) in enumerate(rows):
+        theta_scores = {dimension: float(theta[i, j])
+                        for j, dimension in enumerate(TALENT_DIMENSIONS) if present[i, j]}
+        norm_scores = norm_rows[i]
+        profile = norm_scorer.get_strength_profile(norm_scores)
+        results.append((
+            row_id,
+            json.dumps(theta_scores),
+            json.dumps({k: v.__dict__ for k, v in norm_scores.items()}),
+            json.dumps(profile)
+        ))
+    return results
+
+
+# ---------------------------------------------------------------------------
+# 資料來源 (主程序：讀取與寫回)
+# ---------------------------------------------------------------------------
+
+class SQLAlchemySource:
+    """v4_scores / v4_responses (SQLite 或 PostgreSQL)"""
+
+    score = staticmethod(score_sqlalchemy_chunk)
+
+    def __init__(self, database_url: Optional[str] = None, shared_cache_path: Optional[str] = None):
+        from database.engine import DatabaseEngine
+        self.engine = DatabaseEngine(database_url).engine
+        # API worker 共用的快取層 (未設定時伺服器也未啟用)
+        self.shared_store = None
+        if shared_cache_path:
+            from utils.shared_cache import SQLiteSharedStore
+            self.shared_store = SQLiteSharedStore(shared_cache_path)
+
+    def fetch(self, cursor: int, size: int) -> Tuple[Optional[Dict[str, Any]], int]:
+        """讀取游標之後的一批 session；回傳 (批次資料, 新游標)，無資料時批次為 None"""
+        from sqlalchemy import func, select
+        from models.v4_models import V4Response, V4ResponseItem, V4Score, V4Statement
+
+        with self.engine.connect() as conn:
+            scored = conn.execute(
+                select(V4Score.id, V4Score.session_id)
+                .where(V4Score.id > cursor).order_by(V4Score.id).limit(size)
+            ).all()
+            if not scored:
+                return None, cursor
+
+            session_ids = [session_id for _, session_id in scored]
+            position = {session_id: i for i, session_id in enumerate(session_ids)}
+
+            response_counts = dict(conn.execute(
+                select(V4Response.session_id, func.count())
+                .where(V4Response.session_id.in_(session_ids))
+                .group_by(V4Response.session_id)
+            ).all())
+
+            choices = conn.execute(
+                select(V4Response.session_id, V4ResponseItem.choice_type, V4Statement.dimension)
+                .join(V4ResponseItem, V4ResponseItem.response_id == V4Response.id)
+                .join(V4Statement, V4Statement.statement_id == V4ResponseItem.statement_id)
+                .where(V4Response.session_id.in_(session_ids),
+                       V4ResponseItem.choice_type.in_(tuple(CHOICE_WEIGHTS)))
+            ).all()
+
+        choices = [row for row in choices if row[2] in DIMENSION_INDEX]
+        chunk = {
+            'session_ids': session_ids,
+            'n_responses': [response_counts.get(session_id, 0) for session_id in session_ids],
+            'session_index': np.array([position[row[0]] for row in choices], dtype=np.intp),
+            'dimension_index': np.array([DIMENSION_INDEX[row[2]] for row in choices], dtype=np.intp),
+            'weights': np.array([CHOICE_WEIGHTS[row[1]] for row in choices])
+        }
+        return chunk, scored[-1][0]
+
+    def write(self, results: List[Tuple[str, Dict[str, Any], Dict[str, Any]]]):
+        """批次 upsert 分數與背景分析產出，刪除過期的物化結果文件與共用快取項目"""
+        from sqlalchemy import delete
+        from core.data_access.results_document_store import results_cache_key
+        from models.v4_models import V4ResultsDocument, V4Score, V4SessionEnrichment
+
+        now = datetime.utcnow()
+        score_rows = [{'session_id': session_id, **record, 'updated_at': now}
+                      for session_id, record, _ in results]
+        enrichment_rows = [
+            {
+                'session_id': session_id,
+                'status': 'completed',
+                'stages': {name: {'status': 'completed', 'attempts': 1, 'error': None, 'duration_ms': None}
+                           for name in (*outputs, 'report')},
+                'outputs': outputs,
+                'updated_at': now
+            }
+            for session_id, _, outputs in results
+        ]
+        session_ids = [session_id for session_id, _, _ in results]
+
+        with self.engine.begin() as conn:
+            self._upsert(conn, V4Score.__table__, score_rows)
+            self._upsert(conn, V4SessionEnrichment.__table__, enrichment_rows)
+            conn.execute(delete(V4ResultsDocument).where(V4ResultsDocument.session_id.in_(session_ids)))
+
+        # 提交後才刪除，避免 worker 在提交前重新讀到舊文件並寫回快取
+        if self.shared_store is not None:
+            self.shared_store.delete_many([results_cache_key(session_id) for session_id in session_ids])
+
+    @staticmethod
+    def _upsert(conn, table, rows: List[Dict[str, Any]]):
+        if conn.dialect.name == 'postgresql':
+            from sqlalchemy.dialects.postgresql import insert
+        else:
+            from sqlalchemy.dialects.sqlite import insert
+
+        statement = insert(table)
+        statement = statement.on_conflict_do_update(
+            index_elements=['session_id'],
+            set_={column: statement.excluded[column] for column in rows[0] if column != 'session_id'}
+        )
+        conn.execute(statement, rows)
+
+
+class LegacySource:
+    """舊版 SQLite v4_assessment_results"""
+
+    score = staticmethod(score_legacy_chunk)
+
+    def __init__(self, db_path: Path):
+        self.conn = sqlite3.connect(str(db_path))
+
+    def fetch(self, cursor: int, size: int) -> Tuple[Optional[Dict[str, Any]], int]:
+        """讀取游標 (row id) 之後的一批結果"""
+        rows = self.conn.execute(
+            "SELECT id, session_id, responses FROM v4_assessment_results WHERE id > ? ORDER BY id LIMIT ?",
+            (cursor, size)
+        ).fetchall()
+        if not rows:
+            return None, cursor
+        return {'rows': rows}, rows[-1][0]
+
+    def write(self, results: List[Tuple[int, str, str, str]]):
+        """批次更新 θ、常模分數與概況"""
+        with self.conn:
+            self.conn.executemany(
+                "UPDATE v4_assessment_results SET theta_scores = ?, norm_scores = ?, profile = ? WHERE id = ?",
+                [(theta, norms, profile, row_id) for row_id, theta, norms, profile in results]
+            )
+
+
+# ---------------------------------------------------------------------------
+# 主流程
+# ---------------------------------------------------------------------------
+
+def rescore(source, checkpoint_path: Path, backend: str, chunk_size: int, workers: int,
+            max_seconds: Optional[float] = None, dry_run: bool = False) -> Dict[str, Any]:
+    """
+    串流重新計分
+
+    讀取、計算、寫回重疊進行：最多 workers * 2 批在計算中，
+    寫回依讀取順序，因此檢查點游標永遠只前進到已寫入的批次。
+    """
+    checkpoint = load_checkpoint(checkpoint_path, backend)
+    cursor = checkpoint['cursor']
+    started = time.monotonic()
+    processed = 0
+    in_flight = deque()
+    exhausted = False
+
+    def drain_one():
+        nonlocal processed
+        future, chunk_cursor = in_flight.popleft()
+        results = future.result()
+        if not dry_run:
+            source.write(results)
+        processed += len(results)
+        elapsed = time.monotonic() - started
+        checkpoint.update(cursor=chunk_cursor, processed=checkpoint['processed'] + len(results))
+        if not dry_run:
+            save_checkpoint(checkpoint_path, {**checkpoint,
+                                              'elapsed_seconds': checkpoint['elapsed_seconds'] + elapsed})
+        print(f"  cursor={chunk_cursor} sessions={processed} "
+              f"({processed / max(elapsed, 1e-9):.0f} sessions/s)")
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        while not exhausted:
+            if max_seconds is not None and time.monotonic() - started >= max_seconds:
+                print(f"⏱️ 時間預算 {max_seconds}s 已用完，停在批次邊界")
+                break
+
+            chunk, cursor = source.fetch(cursor, chunk_size)
+            if chunk is None:
+                exhausted = True
+                break
+            in_flight.append((pool.submit(source.score, chunk), cursor))
+
+            if len(in_flight) >= workers * 2:
+                drain_one()
+
+        while in_flight:
+            drain_one()
+
+    elapsed = time.monotonic() - started
+    return {
+        'processed': processed,
+        'complete': exhausted,
+        'cursor': checkpoint['cursor'],
+        'elapsed_seconds': round(elapsed, 2),
+        'sessions_per_second': round(processed / elapsed, 1) if elapsed > 0 else 0.0
+    }
+
+
+def main():
+    """主函數"""
+    parser = argparse.ArgumentParser(description="Bulk re-score historical assessment sessions")
+    parser.add_argument('--backend', choices=['sqlalchemy', 'legacy'], default='sqlalchemy')
+    parser.add_argument('--database-url', help="SQLAlchemy URL (defaults to GALLUP_DATABASE_URL / settings)")
+    parser.add_argument('--shared-cache',
+                        help="Shared cache SQLite file used by the API workers (defaults to settings)")
+    parser.add_argument('--legacy-db', type=Path,
+                        default=project_root / 'src' / 'main' / 'python' / 'data' / 'gallup_assessment.db')
+    parser.add_argument('--chunk-size', type=int, default=2000)
+    parser.add_argument('--workers', type=int, default=os.cpu_count() or 2)
+    parser.add_argument('--checkpoint', type=Path)
+    parser.add_argument('--max-seconds', type=float, help="Stop at a chunk boundary after this long")
+    parser.add_argument('--reset', action='store_true', help="Ignore the checkpoint and start over")
+    parser.add_argument('--dry-run', action='store_true', help="Score without writing")
+    args = parser.parse_args()
+
+    checkpoint_path = args.checkpoint or project_root / 'data' / f'rescore_{args.backend}.checkpoint.json'
+    if args.reset and checkpoint_path.exists():
+        checkpoint_path.unlink()
+
+    if args.backend == 'sqlalchemy':
+        from core.config import get_settings
+        source = SQLAlchemySource(args.database_url, args.shared_cache or get_settings().shared_cache_path)
+    else:
+        source = LegacySource(args.legacy_db)
+
+    print(f"🔄 重新計分 ({args.backend})，每批 {args.chunk_size} 筆，{args.workers} 個 worker...")
+    summary = rescore(source, checkpoint_path, args.backend, args.chunk_size, args.workers,
+                      args.max_seconds, args.dry_run)
+
+    print(f"\n🎯 {'完成' if summary['complete'] else '已暫停 (可用相同指令續跑)'}:")
+    print(f"  - 處理 session: {summary['processed']}")
+    print(f"  - 耗時: {summary['elapsed_seconds']}s")
+    print(f"  - 吞吐量: {summary['sessions_per_second']} sessions/s")
+    print(f"  - 游標: {summary['cursor']}")
+    return summary['complete']
+
+
+if __name__ == "__main__":
+    success = main()
+    exit(0 if success else 1)
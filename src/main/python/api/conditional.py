@@ -0,0 +1,44 @@
+"""
+Conditional Responses for Materialized Documents
+
+以 ETag 提供物化結果文件：
+- If-None-Match 相符時回傳 304 (無內容)
+- 用戶端接受 gzip 時直接傳送已壓縮內容，不重新編碼
+- gzip 與未壓縮回應為不同表示，各自帶不同的強 ETag (gzip 加 -gzip 後綴)
+- Cache-Control: no-cache 讓瀏覽器每次以 ETag 重新驗證
+"""
+
+from fastapi import Request, Response
+
+from core.data_access.results_document_store import ResultsDocument
+
+
+def _etag_matches(if_none_match: str, etag: str) -> bool:
+    # 弱比較：忽略 W/ 前綴
+    for tag in if_none_match.split(","):
+        tag = tag.strip()
+        if tag == "*" or tag.removeprefix("W/") == etag:
+            return True
+    return False
+
+
+def representation_etag(etag: str, gzipped: bool) -> str:
+    """依內容編碼區分的 ETag (同一文件的 gzip 與未壓縮位元組不同)"""
+    return etag[:-1] + '-gzip"' if gzipped else etag
+
+
+def document_response(request: Request, document: ResultsDocument) -> Response:
+    """回傳 304 或 JSON 文件"""
+    gzipped = "gzip" in request.headers.get("accept-encoding", "").lower()
+    etag = representation_etag(document.etag, gzipped)
+    headers = {"ETag": etag, "Cache-Control": "private, no-cache", "Vary": "Accept-Encoding"}
+
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match and _etag_matches(if_none_match, etag):
+        return Response(status_code=304, headers=headers)
+
+    if gzipped:
+        headers["Content-Encoding"] = "gzip"
+        return Response(content=document.body, media_type="application/json", headers=headers)
+
+    return Response(content=document.json_bytes(), media_type="application/json", headers=headers)
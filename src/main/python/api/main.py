@@ -11,6 +11,7 @@ Key Principles:
 - Explainability and provenance tracking built-in
 """
 
+import asyncio
 from datetime import datetime
 from typing import Dict, Any
 import uuid
@@ -95,26 +96,24 @@ async def get_questions(include_situational: bool = True):
     Supports both traditional Mini-IPIP and situational questions.
     """
     try:
-        from database.engine import get_session
-        from models.v4_models import V4Statement
-        import json
+        from database.engine import get_async_session
+        from core.data_access.statement_repository import get_statement_repository
+
+        async with get_async_session() as session:
+            snapshot = await get_statement_repository().get_snapshot(session)
 
         questions = []
-        with get_session() as session:
-            raw_items = session.query(V4Statement).all()
-
-            for item in raw_items:
-                # V4 statements are all for Thurstonian IRT
-                # Access all attributes while session is active
-                question_data = {
-                    "id": item.statement_id,
-                    "text": item.text,
-                    "dimension": item.dimension,
-                    "context": item.context,
-                    "social_desirability": item.social_desirability,
-                    "question_type": "thurstonian_irt"
-                }
-                questions.append(question_data)
+        for item in snapshot.statements:
+            # V4 statements are all for Thurstonian IRT
+            question_data = {
+                "id": item.statement_id,
+                "text": item.text,
+                "dimension": item.dimension,
+                "context": item.context,
+                "social_desirability": item.social_desirability,
+                "question_type": "thurstonian_irt"
+            }
+            questions.append(question_data)
 
         # Sort by dimension and statement ID
         questions.sort(key=lambda x: (x["dimension"], x["id"]))
@@ -177,6 +176,13 @@ async def health_check() -> HealthResponse:
         )
 
 
+@app.get("/api/system/components", tags=["System"])
+async def component_status() -> Dict[str, Any]:
+    """Initialization status and init time of the shared scoring components."""
+    from core.component_registry import get_component_registry
+    return {"components": get_component_registry().stats()}
+
+
 # Include route modules - Functional grouping
 # app.include_router(consent.router, prefix="/api", tags=["Privacy"])
 app.include_router(reports_v4_only.router, prefix="/api", tags=["Reports"])
@@ -204,6 +210,45 @@ async def startup_event():
         from core.file_storage import get_file_storage
         storage = get_file_storage()
 
+        # Share computed results across workers on this host
+        if settings.shared_cache_path:
+            from utils.shared_cache import register_shared_cache
+            register_shared_cache(settings.shared_cache_path)
+            print(f"Shared cache enabled: {settings.shared_cache_path}")
+
+        # Build the shared scoring components before accepting traffic
+        from core.component_registry import get_component_registry
+        components = await asyncio.to_thread(get_component_registry().preload)
+        for name, status in components.items():
+            if status["initialized"]:
+                print(f"Component {name} ready in {status['init_ms']}ms")
+            else:
+                print(f"Component {name} unavailable: {status['error']}")
+
+        # Re-enqueue sessions whose enrichment was queued or running at shutdown
+        from services.enrichment_service import get_enrichment_service
+        resumed = await get_enrichment_service().resume_pending()
+        if resumed:
+            print(f"Resumed enrichment for {resumed} sessions")
+
+        # Cached recommendations depend on the loaded knowledge base version,
+        # cached norm conversions on the loaded norms
+        from core.knowledge.career_knowledge_base import get_career_knowledge_base
+        from utils.cache import ARTIFACT_KNOWLEDGE_BASE, ARTIFACT_NORMS, get_cache_manager
+        await get_cache_manager().publish_version(ARTIFACT_KNOWLEDGE_BASE,
+                                                  get_career_knowledge_base().version)
+        if components["normative_scorer"]["initialized"]:
+            await get_cache_manager().publish_version(
+                ARTIFACT_NORMS, get_component_registry().get("normative_scorer").version)
+
+        # Load reference snapshots, then refill the hottest cache entries
+        # from the saved traffic summary (if any)
+        from utils.cache_warming import get_cache_warmer
+        warmer = get_cache_warmer()
+        warmer.tracker.load(settings.cache_hotness_path)
+        asyncio.create_task(warmer.warm(settings.cache_warm_top_k,
+                                        settings.cache_warm_time_budget_seconds))
+
         print("FastAPI application started successfully")
         print("V4 File storage version ready")
         print(f"API documentation: http://localhost:8005/api/docs")
@@ -214,6 +259,22 @@ async def startup_event():
         raise
 
 
+@app.on_event("shutdown")
+async def shutdown_event():
+    """Finish queued enrichment, persist cache hotness and release the database pools."""
+    from database.engine import dispose_database_engine
+    from database.sqlite_pool import close_sqlite_pools
+    from services.enrichment_service import get_enrichment_service
+    from utils.cache_warming import get_cache_warmer
+    await get_enrichment_service().stop()
+    try:
+        get_cache_warmer().tracker.save(settings.cache_hotness_path)
+    except OSError as e:
+        print(f"Could not save cache hotness summary: {e}")
+    await dispose_database_engine()
+    close_sqlite_pools()
+
+
 # Assessment frontend endpoint
 @app.get("/assessment", include_in_schema=False)
 async def assessment_page():
@@ -175,6 +175,12 @@ async def startup_event():
         raise
 
 
+@app.on_event("shutdown")
+async def shutdown_event():
+    """Flush journaled batches into the table files"""
+    storage.checkpoint()
+
+
 # Assessment frontend endpoint
 @app.get("/assessment", include_in_schema=False)
 async def assessment_page():
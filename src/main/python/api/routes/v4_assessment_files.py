@@ -12,7 +12,7 @@ import uuid
 import os
 from pathlib import Path
 
-from core.file_storage import get_file_storage
+from core.file_storage import get_file_storage, StorageBatch
 from core.scoring.quality_checker import ResponseQualityChecker
 from core.scoring.v4_scoring_engine import V4ScoringEngine
 
@@ -122,7 +122,9 @@ async def submit_assessment(request: Request):
             "completion_time_formatted": f"{completion_time_seconds // 60}:{completion_time_seconds % 60:02d}"
         }
 
-        storage.insert("v4_responses", response_data)
+        # All mutations of this submit are committed as one journaled batch
+        batch = StorageBatch()
+        batch.insert("v4_responses", response_data)
 
         # Store individual response items
         response_items = []
@@ -148,7 +150,7 @@ async def submit_assessment(request: Request):
                 })
 
         if response_items:
-            storage.insert_many("v4_response_items", response_items)
+            batch.insert_many("v4_response_items", response_items)
 
         # Quality check
         try:
@@ -183,15 +185,17 @@ async def submit_assessment(request: Request):
                 "calibration_version": "v4_pilot_2025"
             }
 
-            storage.insert("v4_scores", score_data)
+            batch.insert("v4_scores", score_data)
 
             # Update session status
-            storage.update("v4_sessions", "session_id", session_id, {
+            batch.update("v4_sessions", "session_id", session_id, {
                 "status": "COMPLETED",
                 "completed_at": datetime.now().isoformat(),
                 "completed_blocks": len(responses)
             })
 
+            await storage.commit_async(batch)
+
             return {
                 "session_id": session_id,
                 "status": "completed",
@@ -206,11 +210,14 @@ async def submit_assessment(request: Request):
 
         except Exception as e:
             print(f"Scoring failed: {e}")
-            # Update session with error status
-            storage.update("v4_sessions", "session_id", session_id, {
-                "status": "ERROR",
-                "error_message": str(e)
-            })
+            if batch.seq is None:
+                # Scoring failed before the commit: keep the raw responses
+                # and record the error status
+                batch.update("v4_sessions", "session_id", session_id, {
+                    "status": "ERROR",
+                    "error_message": str(e)
+                })
+                await storage.commit_async(batch)
 
             raise HTTPException(
                 status_code=500,
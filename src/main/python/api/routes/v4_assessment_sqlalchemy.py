@@ -3,6 +3,8 @@ V4.0 Assessment API - Pure SQLAlchemy Implementation
 
 完全基於 SQLAlchemy 的 V4 評測系統
 支援 Thurstonian IRT 四選二強制選擇評測
+
+所有路由使用 AsyncSession (aiosqlite / asyncpg)，資料庫 I/O 不阻塞 event loop
 """
 
 from typing import List, Dict, Any, Optional
@@ -10,12 +12,25 @@ from datetime import datetime, timedelta
 import json
 import uuid
 
+import numpy as np
+
 from fastapi import APIRouter, HTTPException, Request
 from pydantic import BaseModel, Field
-
-from database.engine import get_session
+from sqlalchemy import select
+
+from api.conditional import document_response
+from database.engine import get_async_session
+from utils.cache import get_cache_manager
+from utils.cache_warming import get_cache_warmer
+from core.data_access.statement_repository import get_statement_repository
+from core.data_access.results_document_store import (ResultsDocument, get_results_document_store,
+                                                      results_cache_key)
+from services.enrichment_service import analysis_status, get_enrichment_service, load_enrichment
+from utils.pipeline import PipelineFull
+from models.database import Consent
 from models.v4_models import V4Statement, V4Session, V4Response, V4ResponseItem, V4Score
 from core.v4.block_designer import QuartetBlockDesigner
+from core.v4.count_scoring import TALENT_DIMENSIONS, normalize_counts, score_record, talent_scores
 from data.v4_statements import get_all_statements
 
 router = APIRouter()
@@ -33,6 +48,9 @@ V4_CONFIG = {
     "dominant_threshold": 75.0,             # 主導才幹閾值
     "lesser_threshold": 25.0,               # 較弱才幹閾值
     "algorithm_version": "4.0.0-alpha",     # 演算法版本
+    "results_cache_ttl": 300,               # 結果快取新鮮期 (秒)
+    "results_stale_ttl": 3600,              # 過期後仍可先回傳的時間 (背景重新載入)
+    "results_missing_ttl": 30,              # 查無結果的 session 負快取時間
     "calibration_version": "v4_pilot_2025", # 校準版本
     "computation_ms_per_response": 2.5      # 每回應計算時間(毫秒)
 }
@@ -88,6 +106,7 @@ class ScoreResponse(BaseModel):
     scores: Dict[str, float]
     message: str
     analysis_complete: bool = True
+    analysis_status_url: Optional[str] = None
 
 
 @router.get("/assessment/blocks", response_model=BlocksResponse)
@@ -95,7 +114,7 @@ async def get_assessment_blocks(request: BlockRequest = BlockRequest()):
     """
     生成 V4 Thurstonian IRT 評測題組
 
-    使用 SQLAlchemy 從資料庫載入語句並生成平衡題組。
+    使用 SQLAlchemy (async session) 從資料庫載入語句並生成平衡題組。
     支援匿名評測和正式同意記錄兩種模式。
 
     Args:
@@ -113,51 +132,34 @@ async def get_assessment_blocks(request: BlockRequest = BlockRequest()):
         # 生成 session ID
         session_id = f"v4_{uuid.uuid4().hex[:12]}"
 
-        # 從資料庫載入 V4 語句
-        with get_session() as db_session:
-            v4_statements = db_session.query(V4Statement).all()
-
-            if not v4_statements:
-                raise HTTPException(
-                    status_code=500,
-                    detail="No V4 statements found in database"
-                )
+        # 從語句快照載入 V4 語句 (快照有效時不查詢資料庫，失效時單次查詢)
+        async with get_async_session() as db_session:
+            snapshot = await get_statement_repository().get_snapshot(db_session)
 
-            # 轉換為 core 系統需要的格式
-            statements_dict = {}
-            for stmt in v4_statements:
-                if stmt.dimension not in statements_dict:
-                    statements_dict[stmt.dimension] = []
-                statements_dict[stmt.dimension].append({
-                    "statement_id": stmt.statement_id,
-                    "text": stmt.text,
-                    "social_desirability": stmt.social_desirability,
-                    "context": stmt.context
-                })
+        if not snapshot.statements:
+            raise HTTPException(
+                status_code=500,
+                detail="No V4 statements found in database"
+            )
 
         # 使用現有的平衡題組設計器
         from core.v4.balanced_block_designer import create_objective_assessment_blocks
-        # 將 statements_dict 轉換為 Statement 物件列表
+        # 將快照轉換為 Statement 物件列表
         from models.v4.forced_choice import Statement as FCStatement
 
         all_statements = []
-        for dimension, statements in statements_dict.items():
-            for stmt_data in statements:
-                # 從資料庫取得實際的 factor_loading，若未校準則使用預設值
-                with get_session() as db_session:
-                    db_stmt = db_session.query(V4Statement).filter(
-                        V4Statement.statement_id == stmt_data["statement_id"]
-                    ).first()
-
-                    factor_loading = (db_stmt.factor_loading if db_stmt and db_stmt.is_calibrated
-                                    else V4_CONFIG["default_factor_loading"])
+        for dimension, statements in snapshot.by_dimension.items():
+            for stmt in statements:
+                # 使用實際的 factor_loading，若未校準則使用預設值
+                factor_loading = (stmt.factor_loading if stmt.is_calibrated
+                                  else V4_CONFIG["default_factor_loading"])
 
                 fc_statement = FCStatement(
-                    statement_id=stmt_data["statement_id"],
-                    text=stmt_data["text"],
+                    statement_id=stmt.statement_id,
+                    text=stmt.text,
                     dimension=dimension,
                     factor_loading=factor_loading,
-                    social_desirability=stmt_data["social_desirability"]
+                    social_desirability=stmt.social_desirability
                 )
                 all_statements.append(fc_statement)
 
@@ -197,14 +199,14 @@ async def get_assessment_blocks(request: BlockRequest = BlockRequest()):
             ))
 
         # 將 session 和題組資料儲存到資料庫
-        with get_session() as db_session:
+        async with get_async_session() as db_session:
             # 處理 consent 記錄
             if request.consent_id:
                 # 驗證提供的 consent 記錄是否存在且有效
-                from models.database import Consent
-                consent = db_session.query(Consent).filter(
-                    Consent.consent_id == request.consent_id
-                ).first()
+                result = await db_session.execute(
+                    select(Consent).where(Consent.consent_id == request.consent_id)
+                )
+                consent = result.scalars().first()
 
                 if not consent:
                     raise HTTPException(
@@ -221,8 +223,6 @@ async def get_assessment_blocks(request: BlockRequest = BlockRequest()):
                 consent_id = request.consent_id
             else:
                 # 創建匿名評測的 consent 記錄
-                from models.database import Consent
-
                 consent_id = f"anonymous_{uuid.uuid4().hex[:12]}"
                 anonymous_consent = Consent(
                     consent_id=consent_id,
@@ -249,7 +249,6 @@ async def get_assessment_blocks(request: BlockRequest = BlockRequest()):
                 created_at=datetime.utcnow()
             )
             db_session.add(v4_session)
-            db_session.commit()
 
         return BlocksResponse(
             session_id=session_id,
@@ -267,14 +266,18 @@ async def submit_assessment(request: SubmitRequest):
     """
     提交評測結果並計算 T1-T12 分數
 
-    使用 SQLAlchemy 儲存回應並計算初步分數
+    使用 SQLAlchemy 儲存回應並計算初步分數。
+    回應、回應項目、session 狀態與分數在同一個 unit of work 中一次 commit。
+    職業原型、職缺匹配、發展建議與結果文件排入背景 pipeline，
+    進度由 /assessment/status/{session_id} 查詢。
     """
     try:
-        # 驗證 session 存在
-        with get_session() as db_session:
-            v4_session = db_session.query(V4Session).filter(
-                V4Session.session_id == request.session_id
-            ).first()
+        async with get_async_session() as db_session:
+            # 驗證 session 存在
+            result = await db_session.execute(
+                select(V4Session).where(V4Session.session_id == request.session_id)
+            )
+            v4_session = result.scalars().first()
 
             if not v4_session:
                 raise HTTPException(
@@ -292,6 +295,7 @@ async def submit_assessment(request: SubmitRequest):
                 v4_session.completed_at = datetime.utcnow()
 
             # 儲存個別回應
+            chosen_statements = []
             for resp in request.responses:
                 # 驗證回應
                 if resp.most_like_index == resp.least_like_index:
@@ -325,127 +329,66 @@ async def submit_assessment(request: SubmitRequest):
                     response_time_ms=resp.response_time_ms or 0,
                     answered_at=datetime.utcnow()
                 )
-                db_session.add(v4_response)
-
-                # 需要先 commit 來獲得 v4_response.id
-                db_session.flush()
 
                 # 儲存 V4ResponseItem (詳細的 statement 選擇記錄)
-                response_item_most = V4ResponseItem(
-                    response_id=v4_response.id,
-                    statement_id=statement_ids[resp.most_like_index],
-                    statement_index=resp.most_like_index,
-                    choice_type="most_like"
-                )
-                db_session.add(response_item_most)
+                # 透過 relationship 掛載，commit 時一次 flush，不需逐筆取得 id
+                for i, stmt_id in enumerate(statement_ids):
+                    if i == resp.most_like_index:
+                        choice_type = "most_like"
+                    elif i == resp.least_like_index:
+                        choice_type = "least_like"
+                    else:
+                        choice_type = "neutral"
+                    v4_response.response_items.append(V4ResponseItem(
+                        statement_id=stmt_id,
+                        statement_index=i,
+                        choice_type=choice_type
+                    ))
 
-                response_item_least = V4ResponseItem(
-                    response_id=v4_response.id,
-                    statement_id=statement_ids[resp.least_like_index],
-                    statement_index=resp.least_like_index,
-                    choice_type="least_like"
-                )
-                db_session.add(response_item_least)
+                db_session.add(v4_response)
+                chosen_statements.append((statement_ids[resp.most_like_index],
+                                          statement_ids[resp.least_like_index]))
 
-                # 為未選擇的語句建立 neutral 記錄
-                for i, stmt_id in enumerate(statement_ids):
-                    if i not in [resp.most_like_index, resp.least_like_index]:
-                        response_item_neutral = V4ResponseItem(
-                            response_id=v4_response.id,
-                            statement_id=stmt_id,
-                            statement_index=i,
-                            choice_type="neutral"
-                        )
-                        db_session.add(response_item_neutral)
-
-            db_session.commit()
-
-        # 計算初步分數 (簡化版本)
-        dimension_counts = {}
-
-        # 計算維度分數
-        for resp in request.responses:
-            block = blocks_data[resp.block_id]
-            statement_ids = block['statement_ids']
-
-            # 查找語句維度
-            with get_session() as db_session:
-                most_like_stmt = db_session.query(V4Statement).filter(
-                    V4Statement.statement_id == statement_ids[resp.most_like_index]
-                ).first()
-
-                least_like_stmt = db_session.query(V4Statement).filter(
-                    V4Statement.statement_id == statement_ids[resp.least_like_index]
-                ).first()
+            # 計算初步分數 (簡化版本) - 語句維度取自快照
+            snapshot = await get_statement_repository().get_snapshot(db_session)
 
+            dimension_counts = {}
+            for most_like_id, least_like_id in chosen_statements:
+                most_like_stmt = snapshot.by_id.get(most_like_id)
                 if most_like_stmt:
                     dimension = most_like_stmt.dimension
                     dimension_counts[dimension] = dimension_counts.get(dimension, 0) + 1
 
+                least_like_stmt = snapshot.by_id.get(least_like_id)
                 if least_like_stmt:
                     dimension = least_like_stmt.dimension
                     dimension_counts[dimension] = dimension_counts.get(dimension, 0) - 0.5
 
-        # 標準化分數 (0-100)
-        max_score = len(request.responses) * 1.0
-        min_score = len(request.responses) * -0.5
-
-        t_scores = {}
-        for i in range(1, 13):
-            dimension = f"T{i}"
-            raw_score = dimension_counts.get(dimension, 0)
-
-            if max_score > min_score:
-                normalized = ((raw_score - min_score) / (max_score - min_score)) * 100
-                normalized = max(0, min(100, normalized))
-            else:
-                normalized = 50.0
-
-            t_scores[f"t{i}_talent"] = round(normalized, 1)
+            # 標準化分數 (0-100) - 與批次重新計分共用同一套計算
+            raw_counts = np.array([[dimension_counts.get(dimension, 0) for dimension in TALENT_DIMENSIONS]])
+            t_scores = talent_scores(normalize_counts(raw_counts, [len(request.responses)])[0])
 
-        # 儲存分數 - 使用正確的 V4Score 欄位名稱
-        with get_session() as db_session:
+            # 儲存分數 - 使用正確的 V4Score 欄位名稱
             v4_score = V4Score(
                 session_id=request.session_id,
-                t1_structured_execution=t_scores.get("t1_talent", 50.0),
-                t2_quality_perfectionism=t_scores.get("t2_talent", 50.0),
-                t3_exploration_innovation=t_scores.get("t3_talent", 50.0),
-                t4_analytical_insight=t_scores.get("t4_talent", 50.0),
-                t5_influence_advocacy=t_scores.get("t5_talent", 50.0),
-                t6_collaboration_harmony=t_scores.get("t6_talent", 50.0),
-                t7_customer_orientation=t_scores.get("t7_talent", 50.0),
-                t8_learning_growth=t_scores.get("t8_talent", 50.0),
-                t9_discipline_trust=t_scores.get("t9_talent", 50.0),
-                t10_pressure_regulation=t_scores.get("t10_talent", 50.0),
-                t11_conflict_integration=t_scores.get("t11_talent", 50.0),
-                t12_responsibility_accountability=t_scores.get("t12_talent", 50.0),
-                # Thurstonian IRT 技術參數
-                theta_estimates=dimension_counts,
-                standard_errors={f"t{i}": 0.3 + (0.2 * abs(t_scores.get(f"t{i}_talent", 50.0) - 50.0) / 50.0) for i in range(1, 13)},
-                percentiles={f"t{i}": t_scores.get(f"t{i}_talent", 50.0) for i in range(1, 13)},
-                dimension_reliability={f"t{i}": max(V4_CONFIG["min_reliability"],
-                                                   V4_CONFIG["base_reliability"] - (len(request.responses) / 100.0))
-                                     for i in range(1, 13)},
-                # 品質指標 - 基於實際回應數量計算
-                overall_confidence=max(V4_CONFIG["min_confidence"],
-                                     min(V4_CONFIG["max_confidence"],
-                                         0.5 + (len(request.responses) / 20.0))),
-                response_consistency=max(0.7,
-                                       min(0.98, V4_CONFIG["base_response_consistency"] + (len(request.responses) / 50.0))),
-                # 才幹分層 - 基於分數計算
-                dominant_talents=[f"t{i}" for i in range(1, 13)
-                                if t_scores.get(f"t{i}_talent", 50.0) >= V4_CONFIG["dominant_threshold"]],
-                supporting_talents=[f"t{i}" for i in range(1, 13)
-                                  if V4_CONFIG["lesser_threshold"] <= t_scores.get(f"t{i}_talent", 50.0) < V4_CONFIG["dominant_threshold"]],
-                lesser_talents=[f"t{i}" for i in range(1, 13)
-                              if t_scores.get(f"t{i}_talent", 50.0) < V4_CONFIG["lesser_threshold"]],
-                # 計分元資料
-                algorithm_version=V4_CONFIG["algorithm_version"],
-                computation_time_ms=len(request.responses) * V4_CONFIG["computation_ms_per_response"],
-                calibration_version=V4_CONFIG["calibration_version"]
+                **score_record(t_scores, dimension_counts, len(request.responses), V4_CONFIG)
             )
             db_session.add(v4_score)
-            db_session.commit()
+            # 背景分析的 queued 記錄：重啟或佇列已滿時仍可補排
+            await db_session.merge(get_enrichment_service().queued_record(request.session_id))
+            # get_async_session() 離開時單次 commit
+
+        # 清除結果快取與「查無結果」標記；其餘分析與結果文件在背景完成
+        await get_cache_manager().delete(results_cache_key(request.session_id))
+        try:
+            queued = get_enrichment_service().enqueue(
+                request.session_id,
+                {f"T{i}": t_scores.get(f"t{i}_talent", 50.0) for i in range(1, 13)}
+            )
+            message = ("Assessment scored; career analysis is running in the background"
+                       if queued else "Assessment scored; career analysis is already in progress")
+        except PipelineFull:
+            message = "Assessment scored; career analysis is deferred until the queue has capacity"
 
         return ScoreResponse(
             session_id=request.session_id,
@@ -463,8 +406,9 @@ async def submit_assessment(request: SubmitRequest):
                 "t11_conflict_integration": t_scores.get("t11_talent", 50.0),
                 "t12_responsibility_accountability": t_scores.get("t12_talent", 50.0)
             },
-            message="Assessment completed successfully using SQLAlchemy V4 system",
-            analysis_complete=True
+            message=message,
+            analysis_complete=False,
+            analysis_status_url=f"/api/assessment/status/{request.session_id}"
         )
 
     except HTTPException:
@@ -473,62 +417,150 @@ async def submit_assessment(request: SubmitRequest):
         raise HTTPException(status_code=500, detail=f"Submission failed: {str(e)}")
 
 
+async def _load_results(session_id: str) -> Optional[Dict[str, Any]]:
+    """從資料庫組出評測結果，查無分數時回傳 None"""
+    async with get_async_session() as db_session:
+        # 查找分數
+        result = await db_session.execute(
+            select(V4Score).where(V4Score.session_id == session_id)
+        )
+        v4_score = result.scalars().first()
+
+        if not v4_score:
+            return None
+
+        # 查找 session 資訊
+        result = await db_session.execute(
+            select(V4Session).where(V4Session.session_id == session_id)
+        )
+        v4_session = result.scalars().first()
+
+        # 背景分析產出 (尚未完成的階段不列出)
+        enrichment = await load_enrichment(session_id, db_session)
+        outputs = enrichment.outputs if enrichment else {}
+
+        return {
+            "session_id": session_id,
+            "scores": {
+                "t1_structured_execution": v4_score.t1_structured_execution,
+                "t2_quality_perfectionism": v4_score.t2_quality_perfectionism,
+                "t3_exploration_innovation": v4_score.t3_exploration_innovation,
+                "t4_analytical_insight": v4_score.t4_analytical_insight,
+                "t5_influence_advocacy": v4_score.t5_influence_advocacy,
+                "t6_collaboration_harmony": v4_score.t6_collaboration_harmony,
+                "t7_customer_orientation": v4_score.t7_customer_orientation,
+                "t8_learning_growth": v4_score.t8_learning_growth,
+                "t9_discipline_trust": v4_score.t9_discipline_trust,
+                "t10_pressure_regulation": v4_score.t10_pressure_regulation,
+                "t11_conflict_integration": v4_score.t11_conflict_integration,
+                "t12_responsibility_accountability": v4_score.t12_responsibility_accountability
+            },
+            "session_info": {
+                "created_at": v4_session.created_at.isoformat() if v4_session else None,
+                "assessment_type": v4_session.assessment_type if v4_session else "thurstonian_irt",
+                "total_blocks": v4_session.total_blocks if v4_session else 0
+            },
+            "scoring_info": {
+                "method": v4_score.scoring_algorithm,
+                "algorithm_version": v4_score.algorithm_version,
+                "created_at": v4_score.created_at.isoformat(),
+                "theta_estimates": v4_score.theta_estimates,
+                "overall_confidence": v4_score.overall_confidence
+            },
+            "analysis_status": analysis_status(enrichment),
+            "archetype_analysis": outputs.get("archetype"),
+            "job_recommendations": outputs.get("job_matching"),
+            "development_plan": outputs.get("development_plan")
+        }
+
+
+async def _load_results_document(session_id: str) -> Optional[Dict[str, Any]]:
+    """讀取物化結果文件 (不存在時計算一次)，回傳可快取形式"""
+    document = await get_results_document_store().get_or_build(session_id, _load_results)
+    return document.to_cache() if document else None
+
+
+async def _render_results_document(session_id: str):
+    """背景分析完成後物化結果文件，並清除提交後可能已快取的舊版"""
+    await get_results_document_store().materialize(session_id, _load_results)
+    await get_cache_manager().delete(results_cache_key(session_id))
+
+
+get_enrichment_service().report_renderer = _render_results_document
+
+
+async def _warm_results(key: str) -> Optional[Dict[str, Any]]:
+    """快取預熱載入器：key 為 v4_results:<session_id>"""
+    return await _load_results_document(key.split(":", 1)[1])
+
+
+async def _preload_statement_snapshot():
+    """預先載入題庫快照 (表單/題目 ID)，首個請求不必查詢資料庫"""
+    async with get_async_session() as db_session:
+        await get_statement_repository().get_snapshot(db_session)
+
+
+def _preload_archetype_reference():
+    """預先載入原型/職位參考資料快照 (同步查詢，於工作執行緒執行)"""
+    from services.archetype_service import get_archetype_service
+    get_archetype_service().preload_reference_data()
+
+
+# 啟動與失效後依流量熱度預先重建熱門結果；參考資料快照於啟動時預載
+get_cache_warmer().register(
+    "v4_results",
+    _warm_results,
+    ttl=V4_CONFIG["results_cache_ttl"],
+    stale_ttl=V4_CONFIG["results_stale_ttl"]
+)
+get_cache_warmer().register_preload("statement_snapshot", _preload_statement_snapshot)
+get_cache_warmer().register_preload("archetype_reference", _preload_archetype_reference)
+
+
 @router.get("/assessment/results/{session_id}")
-async def get_assessment_results(session_id: str):
+async def get_assessment_results(session_id: str, http_request: Request):
     """
     獲取評測結果
 
-    從 SQLAlchemy 資料庫取得完整的評測結果
+    回傳背景分析完成時物化的結果文件 (gzip 壓縮 JSON)，支援 ETag / If-None-Match；
+    文件經快取 (stale-while-revalidate)，查無結果的 session 短暫負快取，
+    避免重複 404 查詢打到資料庫
     """
     try:
-        with get_session() as db_session:
-            # 查找分數
-            v4_score = db_session.query(V4Score).filter(
-                V4Score.session_id == session_id
-            ).first()
+        results = await get_cache_manager().get_or_load(
+            results_cache_key(session_id),
+            lambda: _load_results_document(session_id),
+            ttl=V4_CONFIG["results_cache_ttl"],
+            stale_ttl=V4_CONFIG["results_stale_ttl"],
+            negative_ttl=V4_CONFIG["results_missing_ttl"]
+        )
 
-            if not v4_score:
-                raise HTTPException(
-                    status_code=404,
-                    detail=f"Results not found for session {session_id}"
-                )
+        if results is None:
+            raise HTTPException(
+                status_code=404,
+                detail=f"Results not found for session {session_id}"
+            )
 
-            # 查找 session 資訊
-            v4_session = db_session.query(V4Session).filter(
-                V4Session.session_id == session_id
-            ).first()
-
-            return {
-                "session_id": session_id,
-                "scores": {
-                    "t1_structured_execution": v4_score.t1_structured_execution,
-                    "t2_quality_perfectionism": v4_score.t2_quality_perfectionism,
-                    "t3_exploration_innovation": v4_score.t3_exploration_innovation,
-                    "t4_analytical_insight": v4_score.t4_analytical_insight,
-                    "t5_influence_advocacy": v4_score.t5_influence_advocacy,
-                    "t6_collaboration_harmony": v4_score.t6_collaboration_harmony,
-                    "t7_customer_orientation": v4_score.t7_customer_orientation,
-                    "t8_learning_growth": v4_score.t8_learning_growth,
-                    "t9_discipline_trust": v4_score.t9_discipline_trust,
-                    "t10_pressure_regulation": v4_score.t10_pressure_regulation,
-                    "t11_conflict_integration": v4_score.t11_conflict_integration,
-                    "t12_responsibility_accountability": v4_score.t12_responsibility_accountability
-                },
-                "session_info": {
-                    "created_at": v4_session.created_at.isoformat() if v4_session else None,
-                    "assessment_type": v4_session.assessment_type if v4_session else "thurstonian_irt",
-                    "total_blocks": v4_session.total_blocks if v4_session else 0
-                },
-                "scoring_info": {
-                    "method": v4_score.scoring_algorithm,
-                    "algorithm_version": v4_score.algorithm_version,
-                    "created_at": v4_score.created_at.isoformat(),
-                    "theta_estimates": v4_score.theta_estimates,
-                    "overall_confidence": v4_score.overall_confidence
-                }
-            }
+        return document_response(http_request, ResultsDocument.from_cache(results))
 
     except HTTPException:
         raise
     except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Failed to retrieve results: {str(e)}")
\ No newline at end of file
+        raise HTTPException(status_code=500, detail=f"Failed to retrieve results: {str(e)}")
+
+
+@router.get("/assessment/status/{session_id}")
+async def get_assessment_status(session_id: str):
+    """
+    查詢提交後背景分析進度
+
+    回傳整體狀態 (queued / running / completed / failed) 與各階段
+    (archetype, job_matching, development_plan, report) 的狀態、嘗試次數與耗時
+    """
+    status = await get_enrichment_service().get_status(session_id)
+    if status is None:
+        raise HTTPException(
+            status_code=404,
+            detail=f"No analysis found for session {session_id}"
+        )
+    return {"session_id": session_id, **status}
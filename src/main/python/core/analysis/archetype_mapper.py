@@ -1,12 +1,17 @@
 """
 職業原型映射系統
 基於凱爾西氣質理論，將12個才幹維度映射到四大職業原型
+
+原型定義在初始化時編譯成 (原型 x 12才幹) 的核心/輔助權重矩陣，
+一批天賦檔案的原型分數以一次矩陣乘法計算
 """
 
-from typing import Dict, List, Tuple, Optional
+from typing import Dict, List, Tuple, Optional, Sequence
 from dataclasses import dataclass
 import json
 
+import numpy as np
+
 # 12個核心才幹維度定義（符合系統設計文檔）
 TALENT_DIMENSIONS = {
     'T1': '結構化執行',
@@ -23,6 +28,17 @@ TALENT_DIMENSIONS = {
     'T12': '責任與當責'
 }
 
+# 權重矩陣的欄位順序
+TALENT_IDS = tuple(TALENT_DIMENSIONS)
+TALENT_INDEX = {talent_id: i for i, talent_id in enumerate(TALENT_IDS)}
+
+# 核心才幹與輔助才幹的匹配分數
+PRIMARY_TALENT_WEIGHT = 3
+SECONDARY_TALENT_WEIGHT = 1
+
+# 原型映射只看前幾個主導才幹
+MAPPING_TOP_TALENTS = 4
+
 @dataclass
 class CareerArchetype:
     """職業原型資料結構"""
@@ -47,6 +63,60 @@ class ArchetypeMapper:
 
     def __init__(self):
         self.archetypes = self._load_archetypes()
+        self._compile_weights()
+
+    def _compile_weights(self):
+        """編譯核心/輔助才幹權重矩陣 (原型 x 才幹)"""
+        shape = (len(self.archetypes), len(TALENT_IDS))
+        self.primary_matrix = np.zeros(shape, dtype=np.int64)
+        self.secondary_matrix = np.zeros(shape, dtype=np.int64)
+        for row, archetype in enumerate(self.archetypes):
+            for talent in archetype.primary_talents:
+                if talent in TALENT_INDEX:
+                    self.primary_matrix[row, TALENT_INDEX[talent]] += 1
+            for talent in archetype.secondary_talents:
+                if talent in TALENT_INDEX:
+                    self.secondary_matrix[row, TALENT_INDEX[talent]] += 1
+        self.weight_matrix = (PRIMARY_TALENT_WEIGHT * self.primary_matrix
+                              + SECONDARY_TALENT_WEIGHT * self.secondary_matrix)
+
+    def talent_indicators(self, talent_id_sets: Sequence[Sequence[str]]) -> np.ndarray:
+        """
+        才幹ID列表 -> (檔案數 x 12) 0/1 指示矩陣
+
+        Args:
+            talent_id_sets: 每個檔案要計分的才幹ID (如主導才幹)
+        """
+        indicators = np.zeros((len(talent_id_sets), len(TALENT_IDS)), dtype=np.int64)
+        for row, talent_ids in enumerate(talent_id_sets):
+            for talent in talent_ids:
+                index = TALENT_INDEX.get(talent)
+                if index is not None:
+                    indicators[row, index] = 1
+        return indicators
+
+    def score_archetypes(self, talent_id_sets: Sequence[Sequence[str]]) -> np.ndarray:
+        """
+        批次計算原型匹配分數
+
+        Args:
+            talent_id_sets: 每個檔案要計分的才幹ID
+
+        Returns:
+            (檔案數 x 原型數) 分數矩陣，核心才幹每個 3 分、輔助才幹每個 1 分
+        """
+        return self.talent_indicators(talent_id_sets) @ self.weight_matrix.T
+
+    @staticmethod
+    def top_two(scores: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        每列分數最高的兩個原型 (同分時依原型定義順序)
+
+        Returns:
+            (order, values)：(檔案數 x 2) 的原型索引與對應分數
+        """
+        order = np.argsort(-scores, axis=1, kind="stable")[:, :2]
+        return order, np.take_along_axis(scores, order, axis=1)
 
     def _load_archetypes(self) -> List[CareerArchetype]:
         """載入職業原型資料庫"""
@@ -147,36 +217,29 @@ class ArchetypeMapper:
         Returns:
             CareerArchetype: 最匹配的職業原型
         """
-        # 獲取主導才幹的ID列表（取前4個）
-        top_talents = [t[0] for t in talent_profile.dominant_talents[:4]]
-
-        # 計算每個原型的匹配度
-        best_match = None
-        best_score = 0
+        return self.map_to_archetypes([talent_profile])[0]
 
-        for archetype in self.archetypes:
-            score = 0
-
-            # 核心才幹匹配（權重更高）
-            for talent in archetype.primary_talents:
-                if talent in top_talents:
-                    score += 3
-
-            # 輔助才幹匹配
-            for talent in archetype.secondary_talents:
-                if talent in top_talents:
-                    score += 1
+    def map_to_archetypes(self, talent_profiles: Sequence[TalentProfile]) -> List[CareerArchetype]:
+        """
+        批次將天賦檔案映射到最匹配的職業原型
 
-            # 更新最佳匹配
-            if score > best_score:
-                best_score = score
-                best_match = archetype
+        每個檔案取前4個主導才幹計分；同分取定義順序在前的原型，
+        全部 0 分時返回預設原型（系統建構者）
 
-        # 如果沒有明顯匹配，返回預設原型（系統建構者）
-        if best_match is None:
-            best_match = self.archetypes[0]
+        Args:
+            talent_profiles: 分類後的天賦檔案
 
-        return best_match
+        Returns:
+            每個檔案最匹配的職業原型
+        """
+        if not talent_profiles:
+            return []
+        scores = self.score_archetypes([
+            [talent for talent, _ in profile.dominant_talents[:MAPPING_TOP_TALENTS]]
+            for profile in talent_profiles
+        ])
+        # argmax 取第一個最高分；全部 0 分時為 0，即預設原型
+        return [self.archetypes[index] for index in np.argmax(scores, axis=1)]
 
     def get_synergy_analysis(self, dominant_talents: List[str]) -> Dict:
         """
@@ -15,6 +15,15 @@ from typing import Dict, List, Tuple, Optional, Any
 from dataclasses import dataclass, asdict
 from datetime import datetime
 
+# 領域分數的固定順序 (與 _calculate_domain_scores 一致)
+DOMAIN_IDS = ("EXECUTING", "INFLUENCING", "RELATIONSHIP_BUILDING", "STRATEGIC_THINKING")
+
+# 前4名才幹的位置權重
+TOP_TALENT_WEIGHTS = (0.4, 0.3, 0.2, 0.1)
+PRIMARY_MATCH_WEIGHT = 1.0
+SECONDARY_MATCH_WEIGHT = 0.7
+DOMAIN_PREFERENCE_WEIGHT = 0.3
+
 
 @dataclass
 class TalentScore:
@@ -86,6 +95,7 @@ class FileBasedAssessmentEngine:
         # 才幹定義
         self.talent_definitions = self.statement_bank["talent_definitions"]
         self.domain_mapping = self._build_domain_mapping()
+        self._compile_archetype_matrices()
 
     def _load_methodology(self) -> Dict:
         """載入評測基準方法論"""
@@ -114,6 +124,29 @@ class FileBasedAssessmentEngine:
             mapping[talent_id] = talent_info["domain"]
         return mapping
 
+    def _compile_archetype_matrices(self):
+        """編譯原型定義：才幹匹配權重 (原型 x 才幹) 與領域偏好 (原型 x 領域)"""
+        definitions = self.mapping_rules["archetype_definitions"]
+        self._archetype_ids = list(definitions)
+        self._talent_index = {talent_id: i for i, talent_id in enumerate(self.talent_definitions)}
+
+        # 多一欄全 0，給不足4名或未定義的才幹使用
+        self._archetype_talent_weights = np.zeros((len(self._talent_index) + 1, len(self._archetype_ids)))
+        self._archetype_domain_mask = np.zeros((len(DOMAIN_IDS), len(self._archetype_ids)))
+        for column, info in enumerate(definitions.values()):
+            primary_talents = info.get("primary_talents", [])
+            secondary_talents = info.get("secondary_talents", [])
+            for talent_id, row in self._talent_index.items():
+                # 核心才幹優先於輔助才幹
+                if talent_id in primary_talents:
+                    self._archetype_talent_weights[row, column] = PRIMARY_MATCH_WEIGHT
+                elif talent_id in secondary_talents:
+                    self._archetype_talent_weights[row, column] = SECONDARY_MATCH_WEIGHT
+
+            domain_preference = info.get("domain_preference", "")
+            for row, domain_id in enumerate(DOMAIN_IDS):
+                self._archetype_domain_mask[row, column] = float(domain_id in domain_preference)
+
     def generate_questionnaire(self, method: str = "systematic_rotation",
                              random_seed: Optional[int] = None) -> Dict[str, Any]:
         """
@@ -482,84 +515,117 @@ class FileBasedAssessmentEngine:
                           domain_scores: List[DomainScore],
                           balance_metrics: BalanceMetrics) -> ArchetypeClassification:
         """分類職業原型"""
+        return self.classify_archetypes_batch([(talent_scores, domain_scores, balance_metrics)])[0]
+
+    def classify_archetypes_batch(
+        self,
+        profiles: List[Tuple[List[TalentScore], List[DomainScore], BalanceMetrics]]
+    ) -> List[ArchetypeClassification]:
+        """
+        批次分類職業原型 (批次報告、群體分析)
+
+        Args:
+            profiles: 每位用戶的 (才幹分數, 領域分數, 均衡指標)
+
+        Returns:
+            每位用戶的原型分類結果
+        """
+        if not profiles:
+            return []
+
         # 獲取前4名才幹
-        top_talents = sorted(talent_scores, key=lambda x: x.percentile, reverse=True)[:4]
+        top_talents = [
+            sorted(talent_scores, key=lambda x: x.percentile, reverse=True)[:len(TOP_TALENT_WEIGHTS)]
+            for talent_scores, _, _ in profiles
+        ]
+        archetype_scores = self._score_archetypes(
+            top_talents,
+            [domain_scores for _, domain_scores, _ in profiles],
+            [balance_metrics for _, _, balance_metrics in profiles]
+        )
 
-        archetype_scores = {}
+        # 主要和次要原型：每列前兩高分 (同分依定義順序)
+        order = np.argsort(-archetype_scores, axis=1, kind="stable")[:, :2]
         archetype_definitions = self.mapping_rules["archetype_definitions"]
 
-        # 計算每個原型分數
-        for archetype_id, archetype_info in archetype_definitions.items():
-            score = self._calculate_archetype_score(
-                top_talents, domain_scores, archetype_info, balance_metrics
-            )
-            archetype_scores[archetype_id] = score
-
-        # 找出主要和次要原型
-        sorted_archetypes = sorted(archetype_scores.items(), key=lambda x: x[1], reverse=True)
-        primary_id, primary_score = sorted_archetypes[0]
-        secondary_id, secondary_score = sorted_archetypes[1]
-
-        primary_archetype = {
-            "archetype_id": primary_id,
-            "archetype_name": archetype_definitions[primary_id]["name"],
-            "probability": primary_score,
-            "confidence": "high" if primary_score > 0.80 else "medium" if primary_score > 0.60 else "low",
-            "key_supporting_talents": [t.talent_id for t in top_talents[:3]]
-        }
-
-        secondary_archetype = {
-            "archetype_id": secondary_id,
-            "archetype_name": archetype_definitions[secondary_id]["name"],
-            "probability": secondary_score
-        }
+        classifications = []
+        for talents, scores, (primary_index, secondary_index), (_, _, balance_metrics) in zip(
+                top_talents, archetype_scores, order, profiles):
+            primary_id, primary_score = self._archetype_ids[primary_index], float(scores[primary_index])
+            secondary_id, secondary_score = self._archetype_ids[secondary_index], float(scores[secondary_index])
+
+            primary_archetype = {
+                "archetype_id": primary_id,
+                "archetype_name": archetype_definitions[primary_id]["name"],
+                "probability": primary_score,
+                "confidence": "high" if primary_score > 0.80 else "medium" if primary_score > 0.60 else "low",
+                "key_supporting_talents": [t.talent_id for t in talents[:3]]
+            }
 
-        return ArchetypeClassification(
-            primary_archetype=primary_archetype,
-            secondary_archetype=secondary_archetype,
-            archetype_scores=archetype_scores,
-            classification_details={
-                "top_talents": [{"talent": t.talent_id, "percentile": t.percentile} for t in top_talents],
-                "balance_profile": balance_metrics.profile_type
-            },
-            career_recommendations={
-                "primary_suggestions": archetype_definitions[primary_id]["career_suggestions"][:4],
-                "alternative_paths": archetype_definitions[secondary_id]["career_suggestions"][:3]
+            secondary_archetype = {
+                "archetype_id": secondary_id,
+                "archetype_name": archetype_definitions[secondary_id]["name"],
+                "probability": secondary_score
             }
-        )
 
-    def _calculate_archetype_score(self, top_talents: List[TalentScore],
-                                 domain_scores: List[DomainScore],
-                                 archetype_info: Dict,
-                                 balance_metrics: BalanceMetrics) -> float:
-        """計算原型匹配分數"""
-        score = 0.0
+            classifications.append(ArchetypeClassification(
+                primary_archetype=primary_archetype,
+                secondary_archetype=secondary_archetype,
+                archetype_scores={archetype_id: float(score)
+                                  for archetype_id, score in zip(self._archetype_ids, scores)},
+                classification_details={
+                    "top_talents": [{"talent": t.talent_id, "percentile": t.percentile} for t in talents],
+                    "balance_profile": balance_metrics.profile_type
+                },
+                career_recommendations={
+                    "primary_suggestions": archetype_definitions[primary_id]["career_suggestions"][:4],
+                    "alternative_paths": archetype_definitions[secondary_id]["career_suggestions"][:3]
+                }
+            ))
 
-        # 才幹匹配分數
-        primary_talents = archetype_info.get("primary_talents", [])
-        secondary_talents = archetype_info.get("secondary_talents", [])
+        return classifications
+
+    def _score_archetypes(self, top_talents: List[List[TalentScore]],
+                          domain_scores: List[List[DomainScore]],
+                          balance_metrics: List[BalanceMetrics]) -> np.ndarray:
+        """
+        計算原型匹配分數矩陣 (用戶數 x 原型數)
 
-        for i, talent in enumerate(top_talents):
-            weight = 0.4 if i == 0 else 0.3 if i == 1 else 0.2 if i == 2 else 0.1
+        依才幹位置、領域順序逐項累加 (未匹配項加 0)，
+        與逐一原型計算的結果位元相同
+        """
+        n_profiles = len(top_talents)
+        missing = len(self._talent_index)
+        scores = np.zeros((n_profiles, len(self._archetype_ids)))
 
-            if talent.talent_id in primary_talents:
-                score += weight * 1.0
-            elif talent.talent_id in secondary_talents:
-                score += weight * 0.7
+        # 才幹匹配分數
+        talent_rows = np.full((n_profiles, len(TOP_TALENT_WEIGHTS)), missing)
+        for i, talents in enumerate(top_talents):
+            for position, talent in enumerate(talents):
+                talent_rows[i, position] = self._talent_index.get(talent.talent_id, missing)
+        for position, weight in enumerate(TOP_TALENT_WEIGHTS):
+            scores += weight * self._archetype_talent_weights[talent_rows[:, position]]
 
         # 領域偏好分數
-        domain_preference = archetype_info.get("domain_preference", "")
-        for domain_score in domain_scores:
-            if domain_score.domain_id in domain_preference:
-                score += domain_score.percentile / 100.0 * 0.3
+        domain_rows = {domain_id: row for row, domain_id in enumerate(DOMAIN_IDS)}
+        domain_bonus = np.zeros((n_profiles, len(DOMAIN_IDS)))
+        for i, profile_domains in enumerate(domain_scores):
+            for domain_score in profile_domains:
+                row = domain_rows.get(domain_score.domain_id)
+                if row is not None:
+                    domain_bonus[i, row] = domain_score.percentile / 100.0 * DOMAIN_PREFERENCE_WEIGHT
+        for row in range(len(DOMAIN_IDS)):
+            scores += domain_bonus[:, row:row + 1] * self._archetype_domain_mask[row]
 
         # 均衡度調整
         balance_modifier = self.mapping_rules["mapping_rules"]["balance_profile_modifiers"]
-        if balance_metrics.profile_type in balance_modifier:
-            modifier = balance_modifier[balance_metrics.profile_type]["modifier"]
-            score *= modifier
+        modifiers = np.array([
+            balance_modifier[metrics.profile_type]["modifier"] if metrics.profile_type in balance_modifier else 1.0
+            for metrics in balance_metrics
+        ])
+        scores *= modifiers[:, None]
 
-        return min(1.0, max(0.0, score))
+        return np.clip(scores, 0.0, 1.0)
 
     def _calculate_confidence(self, talent_scores: List[TalentScore],
                             archetype_classification: ArchetypeClassification) -> float:
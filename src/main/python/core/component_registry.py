@@ -0,0 +1,169 @@
+"""
+Component Registry - Application-Scoped Shared Components
+
+Scoring, matching and visualization components build large in-code
+tables in __init__. The registry constructs each of them once per
+process and hands the same instance to every request:
+
+- preload() builds all registered components at startup, before the
+  worker accepts traffic, and records per-component init time
+- get() returns the shared instance (constructing it on first use if it
+  was not preloaded); construction is serialized per component
+- A component that fails to build is reported in stats() and retried
+  on the next get(), it does not block the others
+
+Registered components must be safe to share: they hold only reference
+data built in __init__ and keep no per-request state.
+"""
+
+import threading
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, Optional
+import logging
+
+logger = logging.getLogger(__name__)
+
+NORMATIVE_DATA_PATH = Path(__file__).parent.parent / "data" / "v4_normative_data.json"
+
+
+@dataclass
+class _Component:
+    factory: Callable[[], Any]
+    instance: Any = None
+    built: bool = False
+    init_ms: Optional[float] = None
+    error: Optional[str] = None
+    lock: threading.Lock = field(default_factory=threading.Lock)
+
+
+class ComponentRegistry:
+    """Named, lazily or eagerly constructed process-wide singletons."""
+
+    def __init__(self):
+        self._components: Dict[str, _Component] = {}
+
+    def register(self, name: str, factory: Callable[[], Any]):
+        """Register a zero-argument factory (replaces an unbuilt entry)."""
+        self._components[name] = _Component(factory)
+
+    def names(self):
+        return list(self._components)
+
+    def get(self, name: str) -> Any:
+        """
+        Shared instance of a component.
+
+        Raises:
+            KeyError: if the component is not registered
+        """
+        component = self._components[name]
+        if component.built:
+            return component.instance
+
+        with component.lock:
+            if not component.built:
+                started = time.perf_counter()
+                try:
+                    component.instance = component.factory()
+                except Exception as e:
+                    component.error = str(e)
+                    raise
+                component.init_ms = (time.perf_counter() - started) * 1000
+                component.error = None
+                component.built = True
+                logger.info(f"Component {name} initialized in {component.init_ms:.1f}ms")
+        return component.instance
+
+    def preload(self, names: Optional[Iterable[str]] = None) -> Dict[str, Dict[str, Any]]:
+        """Build components (all by default); failures are logged, not raised."""
+        for name in (names if names is not None else self.names()):
+            try:
+                self.get(name)
+            except Exception as e:
+                logger.warning(f"Component {name} failed to initialize: {e}")
+        return self.stats()
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        """Per-component status and init time."""
+        return {
+            name: {
+                "initialized": component.built,
+                "init_ms": round(component.init_ms, 2) if component.init_ms is not None else None,
+                "error": component.error
+            }
+            for name, component in self._components.items()
+        }
+
+
+def _normative_scorer():
+    from core.v4.normative_scoring import NormativeScorer
+    return NormativeScorer(NORMATIVE_DATA_PATH)
+
+
+def _strength_dna_visualizer():
+    from core.v4.strength_dna_visualizer import StrengthDNAVisualizer
+    return StrengthDNAVisualizer()
+
+
+def _knowledge_base():
+    from core.knowledge.career_knowledge_base import get_career_knowledge_base
+    return get_career_knowledge_base()
+
+
+def _career_matcher():
+    from core.recommendation.career_matcher import CareerMatcher
+    matcher = CareerMatcher()
+    matcher.matrix  # compile the role matrix up front
+    return matcher
+
+
+def _rule_engine():
+    from core.recommendation.rule_engine import RuleEngine
+    return RuleEngine()
+
+
+def _development_planner():
+    from core.recommendation.development_planner import DevelopmentPlanner
+    return DevelopmentPlanner()
+
+
+def _archetype_mapper():
+    from core.analysis.archetype_mapper import ArchetypeMapper
+    return ArchetypeMapper()
+
+
+def _archetype_service():
+    from services.archetype_service import ArchetypeService
+    return ArchetypeService()
+
+
+DEFAULT_COMPONENTS: Dict[str, Callable[[], Any]] = {
+    "normative_scorer": _normative_scorer,
+    "strength_dna_visualizer": _strength_dna_visualizer,
+    "knowledge_base": _knowledge_base,
+    "career_matcher": _career_matcher,
+    "rule_engine": _rule_engine,
+    "development_planner": _development_planner,
+    "archetype_mapper": _archetype_mapper,
+    "archetype_service": _archetype_service,
+}
+
+
+# Global registry instance
+_component_registry: Optional[ComponentRegistry] = None
+_registry_lock = threading.Lock()
+
+
+def get_component_registry() -> ComponentRegistry:
+    """Get the process-wide registry with the default components registered."""
+    global _component_registry
+    if _component_registry is None:
+        with _registry_lock:
+            if _component_registry is None:
+                registry = ComponentRegistry()
+                for name, factory in DEFAULT_COMPONENTS.items():
+                    registry.register(name, factory)
+                _component_registry = registry
+    return _component_registry
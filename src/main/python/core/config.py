@@ -64,6 +64,56 @@ class Settings(BaseSettings):
         description="Enable SQLAlchemy SQL logging"
     )
 
+    database_pool_size: int = Field(
+        default=10,
+        description="Connection pool size for server databases (PostgreSQL)"
+    )
+
+    database_max_overflow: int = Field(
+        default=20,
+        description="Connections allowed beyond the pool size"
+    )
+
+    sqlite_tuning_profile: str = Field(
+        default="development",
+        description="SQLite PRAGMA/pool profile: development or production"
+    )
+
+    shared_cache_path: Optional[str] = Field(
+        default=None,
+        description="SQLite file for the cache shared by all workers (disabled when unset)"
+    )
+
+    cache_hotness_path: str = Field(
+        default="data/cache_hotness.json",
+        description="Persisted cache access-frequency summary used for warming"
+    )
+
+    cache_warm_top_k: int = Field(
+        default=200,
+        description="Number of hottest cache entries to precompute on startup"
+    )
+
+    cache_warm_time_budget_seconds: float = Field(
+        default=10.0,
+        description="Wall-clock budget for startup cache warming"
+    )
+
+    enrichment_concurrency: int = Field(
+        default=4,
+        description="Sessions enriched concurrently after submit (archetype, jobs, report)"
+    )
+
+    enrichment_max_attempts: int = Field(
+        default=3,
+        description="Attempts per enrichment stage before it is marked failed"
+    )
+
+    enrichment_requeue_after_seconds: float = Field(
+        default=60.0,
+        description="Age after which a still-queued enrichment record not tracked by this worker is re-enqueued"
+    )
+
     # Psychometric Configuration
     mini_ipip_version: str = Field(
         default="v1.0",
@@ -202,6 +252,7 @@ class ProductionSettings(Settings):
     """
     debug_mode: bool = False
     database_echo: bool = False
+    sqlite_tuning_profile: str = "production"
     # allowed_origins will be set via environment variables
 
 
@@ -0,0 +1,190 @@
+"""
+Archetype Reference Data Repository
+
+職業原型與職位角色參考資料的快取存取層：
+- career_archetypes、job_roles 一次載入並解析 JSON 欄位，
+  轉成型別化的 CareerArchetype / JobRole 模型跨請求共用
+- 以各表的筆數、最後更新時間與修訂計數作為版本，超過
+  revalidate_seconds 時只執行一次版本查詢，版本變更才重新載入
+- 修訂計數由 schema 初始化時建立的 INSERT/UPDATE/DELETE 觸發器維護
+  (models.database.create_reference_revision_triggers)，未更動
+  updated_at 的原地 UPDATE 也會改變版本；計數表不存在時退回筆數與
+  更新時間，寫入方須呼叫 invalidate()。儲存庫本身只讀取，不變更 schema
+- invalidate() 強制下次存取時重新載入 (參考資料被寫入後呼叫)
+
+遵循 Repository Pattern 和 Linus 簡潔原則
+"""
+
+from dataclasses import dataclass, field
+from typing import Any, Callable, ContextManager, Dict, List, Optional
+import json
+import logging
+import sqlite3
+import threading
+import time
+
+from models.schemas import CareerArchetype, JobRole
+
+logger = logging.getLogger(__name__)
+
+# 回傳 sqlite 連線 context manager 的函式 (如 db_manager.get_connection)
+ConnectionFactory = Callable[[], ContextManager[Any]]
+
+_ARCHETYPE_JSON_FIELDS = ('mbti_correlates', 'core_characteristics', 'work_environment_preferences',
+                          'stress_indicators', 'development_areas')
+_JOB_ROLE_JSON_FIELDS = ('key_responsibilities', 'required_skills', 'preferred_skills')
+
+_VERSION_QUERY = """
+    SELECT
+        (SELECT COUNT(*) || ':' || COALESCE(MAX(updated_at), '') FROM career_archetypes),
+        (SELECT COUNT(*) || ':' || COALESCE(MAX(updated_at), '') FROM job_roles)
+"""
+
+_REVISION_QUERY = """
+    SELECT
+        (SELECT COUNT(*) || ':' || COALESCE(MAX(updated_at), '') FROM career_archetypes),
+        (SELECT COUNT(*) || ':' || COALESCE(MAX(updated_at), '') FROM job_roles),
+        (SELECT group_concat(revision, '.') FROM
+            (SELECT revision FROM reference_data_revisions ORDER BY table_name))
+"""
+
+
+_ARCHETYPES_QUERY = """
+    SELECT archetype_id, archetype_name, archetype_name_en,
+           keirsey_temperament, mbti_correlates, description,
+           core_characteristics, work_environment_preferences,
+           leadership_style, decision_making_style, communication_style,
+           stress_indicators, development_areas
+    FROM career_archetypes
+"""
+
+_JOB_ROLES_QUERY = """
+    SELECT role_id, role_name, role_name_en, industry_sector, job_family,
+           seniority_level, description, key_responsibilities, required_skills,
+           preferred_skills, salary_range_min, salary_range_max, work_arrangement
+    FROM job_roles
+"""
+
+
+@dataclass(frozen=True)
+class ArchetypeReferenceSnapshot:
+    """參考資料的不可變快照"""
+    version: str
+    archetypes: Dict[str, CareerArchetype] = field(repr=False)
+    job_roles: Dict[str, JobRole] = field(repr=False)
+
+
+def _fetch_rows(conn, query: str) -> List[Dict[str, Any]]:
+    """查詢結果轉為 dict (不依賴連線的 row_factory)"""
+    cursor = conn.execute(query)
+    columns = [column[0] for column in cursor.description]
+    return [dict(zip(columns, row)) for row in cursor.fetchall()]
+
+
+def _parse_json_fields(data: Dict[str, Any], fields) -> Dict[str, Any]:
+    for name in fields:
+        if data.get(name):
+            data[name] = json.loads(data[name])
+    return data
+
+
+class ArchetypeReferenceRepository:
+    """
+    職業原型參考資料儲存庫
+
+    快照有效時不查詢資料庫；超過 revalidate_seconds 時以一次版本查詢
+    確認，版本未變則沿用原快照，變更或 invalidate() 後重新載入。
+    """
+
+    def __init__(self, revalidate_seconds: float = 300.0):
+        self.revalidate_seconds = revalidate_seconds
+        self._snapshot: Optional[ArchetypeReferenceSnapshot] = None
+        self._checked_at = 0.0
+        self._stale = True
+        self._lock = threading.Lock()
+        # 最近一次版本查詢是否取得觸發器修訂計數 (否則僅能依賴 invalidate())
+        self._revision_tracking: Optional[bool] = None
+        self.hits = 0
+        self.version_checks = 0
+        self.loads = 0
+
+    def invalidate(self):
+        """標記快照失效，下次存取時重新載入"""
+        self._stale = True
+
+    def _is_fresh(self) -> bool:
+        return (self._snapshot is not None and not self._stale
+                and time.monotonic() - self._checked_at <= self.revalidate_seconds)
+
+    def get_snapshot(self, connect: ConnectionFactory) -> ArchetypeReferenceSnapshot:
+        """
+        取得參考資料快照
+
+        Args:
+            connect: 連線工廠；快照有效時不會被呼叫
+        """
+        if self._is_fresh():
+            self.hits += 1
+            return self._snapshot
+
+        with self._lock:
+            if self._is_fresh():
+                self.hits += 1
+                return self._snapshot
+
+            with connect() as conn:
+                version = ":".join(str(part) for part in self._query_version(conn))
+                self.version_checks += 1
+                if self._stale or self._snapshot is None or self._snapshot.version != version:
+                    self._snapshot = self._load(conn, version)
+
+            self._checked_at = time.monotonic()
+            self._stale = False
+            return self._snapshot
+
+    def _query_version(self, conn):
+        """版本查詢；修訂計數表不存在時退回筆數與最後更新時間"""
+        try:
+            row = conn.execute(_REVISION_QUERY).fetchone()
+            self._revision_tracking = True
+            return row
+        except sqlite3.OperationalError as e:
+            if self._revision_tracking is not False:
+                logger.warning(f"Archetype reference revision counters unavailable, "
+                               f"writers must call invalidate(): {e}")
+            self._revision_tracking = False
+            return conn.execute(_VERSION_QUERY).fetchone()
+
+    def _load(self, conn, version: str) -> ArchetypeReferenceSnapshot:
+        archetypes = {}
+        for row in _fetch_rows(conn, _ARCHETYPES_QUERY):
+            data = _parse_json_fields(row, _ARCHETYPE_JSON_FIELDS)
+            try:
+                archetypes[data['archetype_id']] = CareerArchetype(**data)
+            except ValueError as e:
+                logger.warning(f"Skipping invalid archetype {data.get('archetype_id')}: {e}")
+
+        job_roles = {}
+        for row in _fetch_rows(conn, _JOB_ROLES_QUERY):
+            data = _parse_json_fields(row, _JOB_ROLE_JSON_FIELDS)
+            try:
+                job_roles[data['role_id']] = JobRole(**data)
+            except ValueError as e:
+                logger.warning(f"Skipping invalid job role {data.get('role_id')}: {e}")
+
+        self.loads += 1
+        if self._snapshot is not None and self._snapshot.version != version:
+            logger.info(f"Archetype reference data changed: {self._snapshot.version} -> {version}")
+        return ArchetypeReferenceSnapshot(version=version, archetypes=archetypes, job_roles=job_roles)
+
+    def stats(self) -> Dict[str, object]:
+        return {
+            "version": self._snapshot.version if self._snapshot else None,
+            "archetype_count": len(self._snapshot.archetypes) if self._snapshot else 0,
+            "job_role_count": len(self._snapshot.job_roles) if self._snapshot else 0,
+            "hits": self.hits,
+            "version_checks": self.version_checks,
+            "loads": self.loads,
+            "revision_tracking": bool(self._revision_tracking),
+            "stale": not self._is_fresh()
+        }
@@ -0,0 +1,151 @@
+"""
+V4 Results Document Store
+
+物化評測結果文件，取代每次讀取都重跑完整分析流程：
+- 完整結果文件只在提交或首次讀取時計算一次
+- 以 gzip 壓縮 JSON 儲存，依 session 與依賴版本指紋 (versions_key) 索引
+- ETag 為內容雜湊，支援 If-None-Match / 304
+- 依賴產物發佈新版本後文件視為過期，下次讀取時重新計算
+
+遵循 Repository Pattern 和 Linus 簡潔原則
+"""
+
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Dict, Iterable, Optional
+import gzip
+import hashlib
+import json
+import logging
+
+from sqlalchemy import select
+
+from core.v4.fingerprint import fingerprint
+from database.engine import get_async_session
+from models.v4_models import V4ResultsDocument
+from utils.cache import get_cache_manager
+
+logger = logging.getLogger(__name__)
+
+# 文件結構變更時遞增，讓舊格式文件全部重新計算
+DOCUMENT_SCHEMA_VERSION = 1
+
+DocumentBuilder = Callable[[str], Awaitable[Optional[Dict[str, Any]]]]
+
+
+@dataclass(frozen=True)
+class ResultsDocument:
+    """已序列化的結果文件"""
+    session_id: str
+    versions_key: str
+    etag: str
+    body: bytes  # gzip 壓縮 JSON
+
+    @classmethod
+    def build(cls, session_id: str, versions_key: str, document: Dict[str, Any]) -> "ResultsDocument":
+        raw = json.dumps(document, ensure_ascii=False, separators=(",", ":"), default=str).encode("utf-8")
+        etag = '"' + hashlib.blake2b(raw, digest_size=16).hexdigest() + '"'
+        # mtime=0 讓相同內容產生相同位元組
+        return cls(session_id, versions_key, etag, gzip.compress(raw, compresslevel=6, mtime=0))
+
+    def json_bytes(self) -> bytes:
+        """解壓縮後的 JSON"""
+        return gzip.decompress(self.body)
+
+    def to_cache(self) -> Dict[str, Any]:
+        """快取用的可 JSON 序列化形式 (可放入跨程序快取)"""
+        return {"session_id": self.session_id, "versions_key": self.versions_key,
+                "etag": self.etag, "body": self.body}
+
+    @classmethod
+    def from_cache(cls, data: Dict[str, Any]) -> "ResultsDocument":
+        return cls(data["session_id"], data["versions_key"], data["etag"], bytes(data["body"]))
+
+
+def results_cache_key(session_id: str) -> str:
+    """結果文件在 CacheManager (含跨程序共用層) 中的鍵"""
+    return f"v4_results:{session_id}"
+
+
+def current_versions_key(depends_on: Iterable[str] = ()) -> str:
+    """文件格式與依賴產物目前版本的指紋"""
+    versions = get_cache_manager().dependencies.versions_of(sorted(depends_on))
+    return fingerprint(DOCUMENT_SCHEMA_VERSION, versions)
+
+
+class ResultsDocumentStore:
+    """
+    V4 結果文件儲存庫
+
+    get_or_build() 讀取版本相符的物化文件；不存在或過期時以 builder
+    計算一次並寫回。
+    """
+
+    def __init__(self):
+        self.hits = 0
+        self.builds = 0
+
+    async def get(self, session_id: str) -> Optional[ResultsDocument]:
+        """讀取物化文件 (不檢查版本)"""
+        async with get_async_session() as db_session:
+            row = (await db_session.execute(
+                select(V4ResultsDocument).where(V4ResultsDocument.session_id == session_id)
+            )).scalars().first()
+            if row is None:
+                return None
+            return ResultsDocument(row.session_id, row.versions_key, row.etag, row.body)
+
+    async def put(self, document: ResultsDocument):
+        """寫入 (或取代) 物化文件"""
+        async with get_async_session() as db_session:
+            await db_session.merge(V4ResultsDocument(
+                session_id=document.session_id,
+                versions_key=document.versions_key,
+                etag=document.etag,
+                body=document.body
+            ))
+
+    async def materialize(self, session_id: str, builder: DocumentBuilder,
+                          depends_on: Iterable[str] = ()) -> Optional[ResultsDocument]:
+        """計算並儲存文件；builder 回傳 None (查無結果) 時不寫入"""
+        versions_key = current_versions_key(depends_on)
+        content = await builder(session_id)
+        if content is None:
+            return None
+
+        document = ResultsDocument.build(session_id, versions_key, content)
+        await self.put(document)
+        self.builds += 1
+        logger.debug(f"Materialized results document {session_id} ({len(document.body)} bytes)")
+        return document
+
+    async def get_or_build(self, session_id: str, builder: DocumentBuilder,
+                           depends_on: Iterable[str] = ()) -> Optional[ResultsDocument]:
+        """
+        取得版本相符的物化文件，必要時計算一次
+
+        Args:
+            session_id: 評測會話識別碼
+            builder: 組出完整結果文件的協程函式 (查無結果回傳 None)
+            depends_on: 文件依賴的產物 (ARTIFACT_*)
+        """
+        depends_on = tuple(depends_on)
+        document = await self.get(session_id)
+        if document is not None and document.versions_key == current_versions_key(depends_on):
+            self.hits += 1
+            return document
+        return await self.materialize(session_id, builder, depends_on)
+
+    def stats(self) -> Dict[str, int]:
+        return {"hits": self.hits, "builds": self.builds}
+
+
+# 全域實例
+_results_document_store: Optional[ResultsDocumentStore] = None
+
+
+def get_results_document_store() -> ResultsDocumentStore:
+    """獲取結果文件儲存庫"""
+    global _results_document_store
+    if _results_document_store is None:
+        _results_document_store = ResultsDocumentStore()
+    return _results_document_store
@@ -0,0 +1,183 @@
+"""
+V4 Statement Repository
+
+語句庫快照存取層，解決題組生成的 N+1 查詢問題：
+- 單次查詢載入題組生成所需的所有欄位
+- 以內容雜湊為版本的不可變快照，跨請求共用
+- 語句寫入 (ORM 事件) 或 TTL 到期時重新驗證
+- 版本變更時發佈至快取依賴索引，只失效依賴語句庫的快取項目
+
+遵循 Repository Pattern 和 Linus 簡潔原則
+"""
+
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Tuple
+import hashlib
+import logging
+import threading
+import time
+
+from sqlalchemy import event, select
+
+from models.v4_models import V4Statement
+from utils.cache import ARTIFACT_STATEMENT_BANK, get_cache_manager
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class StatementRecord:
+    """題組生成所需的語句欄位 (與 ORM session 脫鉤)"""
+    statement_id: str
+    dimension: str
+    text: str
+    social_desirability: float
+    context: str
+    factor_loading: float
+    is_calibrated: bool
+    calibration_version: Optional[str]
+
+
+@dataclass(frozen=True)
+class StatementSnapshot:
+    """語句庫的不可變快照"""
+    version: str
+    statements: Tuple[StatementRecord, ...]
+    by_id: Dict[str, StatementRecord] = field(repr=False)
+    by_dimension: Dict[str, Tuple[StatementRecord, ...]] = field(repr=False)
+
+    @classmethod
+    def from_records(cls, records: List[StatementRecord]) -> "StatementSnapshot":
+        digest = hashlib.blake2b(digest_size=8)
+        grouped: Dict[str, List[StatementRecord]] = {}
+        for record in records:
+            digest.update(repr(record).encode("utf-8"))
+            grouped.setdefault(record.dimension, []).append(record)
+
+        return cls(
+            version=digest.hexdigest(),
+            statements=tuple(records),
+            by_id={record.statement_id: record for record in records},
+            by_dimension={dim: tuple(items) for dim, items in grouped.items()}
+        )
+
+
+# 單次查詢載入的欄位
+_SNAPSHOT_COLUMNS = (
+    V4Statement.statement_id,
+    V4Statement.dimension,
+    V4Statement.text,
+    V4Statement.social_desirability,
+    V4Statement.context,
+    V4Statement.factor_loading,
+    V4Statement.is_calibrated,
+    V4Statement.calibration_version,
+)
+
+
+class StatementRepository:
+    """
+    V4 語句儲存庫
+
+    快照有效時不查詢資料庫；失效 (語句被寫入或超過 revalidate_seconds)
+    時以一次查詢重新載入。內容未變時沿用原快照與版本。
+    """
+
+    def __init__(self, revalidate_seconds: float = 300.0):
+        self.revalidate_seconds = revalidate_seconds
+        self._snapshot: Optional[StatementSnapshot] = None
+        self._loaded_at = 0.0
+        self._stale = True
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.loads = 0
+
+    def invalidate(self):
+        """標記快照失效，下次存取時重新載入"""
+        self._stale = True
+
+    def _needs_reload(self) -> bool:
+        if self._snapshot is None or self._stale:
+            return True
+        return time.monotonic() - self._loaded_at > self.revalidate_seconds
+
+    @staticmethod
+    def _snapshot_query():
+        return select(*_SNAPSHOT_COLUMNS).order_by(V4Statement.id)
+
+    def _install(self, rows) -> StatementSnapshot:
+        """以查詢結果建立快照；內容未變時保留舊快照"""
+        snapshot = StatementSnapshot.from_records([
+            StatementRecord(
+                statement_id=row.statement_id,
+                dimension=row.dimension,
+                text=row.text,
+                social_desirability=row.social_desirability,
+                context=row.context,
+                factor_loading=row.factor_loading,
+                is_calibrated=bool(row.is_calibrated),
+                calibration_version=row.calibration_version
+            )
+            for row in rows
+        ])
+
+        with self._lock:
+            self.loads += 1
+            self._loaded_at = time.monotonic()
+            self._stale = False
+            if self._snapshot is None or self._snapshot.version != snapshot.version:
+                if self._snapshot is not None:
+                    logger.info(f"Statement snapshot changed: {self._snapshot.version} -> {snapshot.version}")
+                self._snapshot = snapshot
+            return self._snapshot
+
+    async def get_snapshot(self, db_session) -> StatementSnapshot:
+        """取得快照 (AsyncSession)，最多一次查詢"""
+        if not self._needs_reload():
+            self.hits += 1
+            return self._snapshot
+
+        result = await db_session.execute(self._snapshot_query())
+        snapshot = self._install(result.all())
+        # 版本未變時不失效任何項目
+        await get_cache_manager().publish_version(ARTIFACT_STATEMENT_BANK, snapshot.version)
+        return snapshot
+
+    def get_snapshot_sync(self, db_session) -> StatementSnapshot:
+        """取得快照 (同步 Session)，最多一次查詢"""
+        if not self._needs_reload():
+            self.hits += 1
+            return self._snapshot
+
+        return self._install(db_session.execute(self._snapshot_query()).all())
+
+    def stats(self) -> Dict[str, object]:
+        return {
+            "version": self._snapshot.version if self._snapshot else None,
+            "statement_count": len(self._snapshot.statements) if self._snapshot else 0,
+            "hits": self.hits,
+            "loads": self.loads,
+            "stale": self._needs_reload()
+        }
+
+
+# 全域實例
+_statement_repository: Optional[StatementRepository] = None
+
+
+def get_statement_repository() -> StatementRepository:
+    """獲取語句儲存庫"""
+    global _statement_repository
+    if _statement_repository is None:
+        _statement_repository = StatementRepository()
+    return _statement_repository
+
+
+def _invalidate_on_write(mapper, connection, target):
+    if _statement_repository is not None:
+        _statement_repository.invalidate()
+
+
+# 透過 ORM 寫入語句時讓快照失效；繞過 ORM 的更新由 TTL 重新驗證
+for _event_name in ("after_insert", "after_update", "after_delete"):
+    event.listen(V4Statement, _event_name, _invalidate_on_write)
@@ -13,6 +13,7 @@ Unified Repository Pattern
 from typing import Dict, List, Any, Optional, Protocol, TypeVar, Generic
 from abc import ABC, abstractmethod
 from contextlib import contextmanager
+from contextvars import ContextVar
 import json
 import logging
 from datetime import datetime
@@ -21,6 +22,9 @@ logger = logging.getLogger(__name__)
 
 T = TypeVar('T')
 
+# 目前進行中的 unit of work: (adapter, connection)
+_active_unit_of_work: ContextVar[Optional[tuple]] = ContextVar("active_unit_of_work", default=None)
+
 
 class Repository(Protocol, Generic[T]):
     """資料儲存庫協議"""
@@ -65,24 +69,70 @@ class DatabaseAdapter(ABC):
         """執行命令（INSERT/UPDATE/DELETE）"""
         ...
 
+    @contextmanager
+    def unit_of_work(self):
+        """
+        將多個儲存庫操作合併為單一事務
+
+        區塊內所有 execute_query/execute_command 共用同一連接，
+        結束時只 commit 一次；巢狀呼叫加入外層事務。
+        """
+        active = _active_unit_of_work.get()
+        if active is not None and active[0] is self:
+            yield active[1]
+            return
+
+        with self.get_connection() as conn:
+            token = _active_unit_of_work.set((self, conn))
+            try:
+                yield conn
+                if hasattr(conn, 'commit'):
+                    conn.commit()
+            except Exception:
+                if hasattr(conn, 'rollback'):
+                    conn.rollback()
+                raise
+            finally:
+                _active_unit_of_work.reset(token)
+
+    @contextmanager
+    def _connection(self):
+        """取得目前 unit of work 的連接，沒有則開新連接"""
+        active = _active_unit_of_work.get()
+        if active is not None and active[0] is self:
+            yield active[1]
+        else:
+            with self.get_connection() as conn:
+                yield conn
+
 
 class SQLiteAdapter(DatabaseAdapter):
     """SQLite 資料庫適配器"""
 
     def __init__(self, db_path: str):
+        from database.sqlite_pool import get_sqlite_pool
         self.db_path = db_path
+        self.pool = get_sqlite_pool(db_path)
 
     @contextmanager
     def get_connection(self):
-        """獲取 SQLite 連接"""
-        from utils.database import get_database_manager
-        db_manager = get_database_manager()
-        with db_manager.get_connection() as conn:
+        """獲取 SQLite 寫入連接 (序列化，區塊結束時 commit)"""
+        with self.pool.writer() as conn:
             yield conn
 
+    @contextmanager
+    def _read_connection(self):
+        """事務中沿用事務連接，否則從讀取連接池借用"""
+        active = _active_unit_of_work.get()
+        if active is not None and active[0] is self:
+            yield active[1]
+        else:
+            with self.pool.reader() as conn:
+                yield conn
+
     def execute_query(self, query: str, params: tuple = ()) -> List[Dict[str, Any]]:
         """執行 SQLite 查詢"""
-        with self.get_connection() as conn:
+        with self._read_connection() as conn:
             cursor = conn.execute(query, params)
             columns = [description[0] for description in cursor.description] if cursor.description else []
             rows = cursor.fetchall()
@@ -90,7 +140,7 @@ class SQLiteAdapter(DatabaseAdapter):
 
     def execute_command(self, command: str, params: tuple = ()) -> int:
         """執行 SQLite 命令"""
-        with self.get_connection() as conn:
+        with self._connection() as conn:
             cursor = conn.execute(command, params)
             return cursor.rowcount
 
@@ -117,13 +167,13 @@ class SQLAlchemyAdapter(DatabaseAdapter):
 
     def execute_query(self, query: str, params: tuple = ()) -> List[Dict[str, Any]]:
         """執行 SQLAlchemy 查詢"""
-        with self.get_connection() as session:
+        with self._connection() as session:
             result = session.execute(query, params)
             return [dict(row) for row in result]
 
     def execute_command(self, command: str, params: tuple = ()) -> int:
         """執行 SQLAlchemy 命令"""
-        with self.get_connection() as session:
+        with self._connection() as session:
             result = session.execute(command, params)
             return result.rowcount
 
@@ -368,28 +418,32 @@ class UnifiedDataAccess:
 
     @contextmanager
     def transaction(self):
-        """事務管理"""
-        with self.adapter.get_connection() as conn:
-            try:
-                yield conn
-                # SQLite 使用 autocommit，SQLAlchemy 在適配器中處理
-                if hasattr(conn, 'commit'):
-                    conn.commit()
-            except Exception:
-                if hasattr(conn, 'rollback'):
-                    conn.rollback()
-                raise
+        """
+        事務管理
+
+        區塊內各儲存庫的寫入共用同一連接並一次 commit：
+
+            with data_access.transaction():
+                data_access.scores.save_v4_scores(session_id, scores)
+                data_access.archetypes.save_user_archetype_result(session_id, result)
+        """
+        with self.adapter.unit_of_work() as conn:
+            yield conn
 
     def health_check(self) -> Dict[str, Any]:
         """資料庫健康檢查"""
         try:
             # 簡單查詢測試連接
             result = self.adapter.execute_query("SELECT 1 as test")
-            return {
+            health = {
                 "status": "healthy",
                 "adapter_type": type(self.adapter).__name__,
                 "connection_test": "passed"
             }
+            pool = getattr(self.adapter, "pool", None)
+            if pool is not None:
+                health["pool"] = pool.stats()
+            return health
         except Exception as e:
             return {
                 "status": "unhealthy",
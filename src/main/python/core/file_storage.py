@@ -3,14 +3,18 @@ File-based storage system for rapid development and testing
 Replaces SQLAlchemy/SQLite with CSV/JSON files for flexibility
 """
 
+import asyncio
 import json
 import csv
+import threading
 import pandas as pd
 from pathlib import Path
 from typing import Dict, List, Any, Optional, Union
 from datetime import datetime
 import uuid
 import os
+from collections import OrderedDict
+from contextlib import contextmanager
 from dataclasses import dataclass, asdict
 
 
@@ -21,12 +25,194 @@ class StorageConfig:
     backup_enabled: bool = True
     auto_save: bool = True
     format_preference: str = "json"  # "json" or "csv"
+    bounded_memory: bool = False  # Page tables from JSONL on demand instead of caching whole tables
+    page_size: int = 500  # Rows per page in bounded-memory mode
+    max_cached_pages: int = 64  # LRU capacity for hot pages across all tables
+    fsync_journal: bool = True  # fsync the batch journal on every (group) commit
+    checkpoint_interval: int = 32  # Batches applied before dirty tables are rewritten
+    group_commit_window_ms: float = 2.0  # How long commit_async waits for other batches
+
+
+def _stamp_records(records: List[Dict[str, Any]]):
+    """Fill in created_at/updated_at for records that do not carry them"""
+    now = datetime.now().isoformat()
+    for record in records:
+        if 'created_at' not in record:
+            record['created_at'] = now
+        if 'updated_at' not in record:
+            record['updated_at'] = now
+
+
+class StorageBatch:
+    """
+    Mutations of one logical operation, committed together
+
+    Records are timestamped when queued. IDs are assigned at commit time in
+    commit order, before the batch is journaled, so replaying the journal after
+    a crash gives the same rows and can skip rows that already reached disk.
+    """
+
+    def __init__(self):
+        self.operations: List[Dict[str, Any]] = []
+        self.seq: Optional[int] = None
+
+    def insert(self, table_name: str, record: Dict[str, Any]) -> Dict[str, Any]:
+        """Queue a record insert"""
+        return self.insert_many(table_name, [record])[0]
+
+    def insert_many(self, table_name: str, records: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Queue a multi-record insert"""
+        _stamp_records(records)
+        self.operations.append({"op": "insert", "table": table_name, "records": records})
+        return records
+
+    def update(self, table_name: str, id_field: str, id_value: Any, updates: Dict[str, Any]):
+        """Queue an update of the first record matching id_field == id_value"""
+        self.operations.append({
+            "op": "update",
+            "table": table_name,
+            "id_field": id_field,
+            "id_value": id_value,
+            "updates": {**updates, "updated_at": datetime.now().isoformat()}
+        })
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {"seq": self.seq, "ops": self.operations}
+
+    def __len__(self) -> int:
+        return len(self.operations)
+
+
+class GroupCommitter:
+    """
+    Coalesces batches committed by concurrent requests
+
+    The first waiting request schedules a flush; every batch queued before the
+    flush runs (including those arriving while the previous fsync is in flight)
+    shares one journal write and one fsync, executed off the event loop.
+    """
+
+    def __init__(self, storage: "FileStorageManager", window_ms: float = 2.0):
+        self.storage = storage
+        self.window = max(0.0, window_ms) / 1000.0
+        self._pending: List[tuple] = []
+        self._flushing = False
+        self.groups_committed = 0
+        self.batches_committed = 0
+
+    async def commit(self, batch: StorageBatch):
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._pending.append((batch, future))
+
+        if not self._flushing:
+            self._flushing = True
+            loop.create_task(self._flush_loop())
+
+        await future
+
+    async def _flush_loop(self):
+        loop = asyncio.get_running_loop()
+        try:
+            while self._pending:
+                if self.window:
+                    await asyncio.sleep(self.window)
+
+                group, self._pending = self._pending, []
+                try:
+                    await loop.run_in_executor(
+                        None, self.storage.commit_batches, [batch for batch, _ in group]
+                    )
+                except Exception as e:
+                    for _, future in group:
+                        if not future.done():
+                            future.set_exception(e)
+                else:
+                    self.groups_committed += 1
+                    self.batches_committed += len(group)
+                    for _, future in group:
+                        if not future.done():
+                            future.set_result(None)
+        finally:
+            self._flushing = False
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "groups_committed": self.groups_committed,
+            "batches_committed": self.batches_committed,
+            "avg_group_size": (self.batches_committed / self.groups_committed
+                               if self.groups_committed else 0.0),
+            "pending": len(self._pending)
+        }
+
+
+class PageCache:
+    """
+    LRU cache of table pages keyed by (table_name, page_number)
+    Keeps worker memory bounded regardless of how much history is on disk
+    """
+
+    def __init__(self, max_pages: int = 64):
+        self.max_pages = max(1, max_pages)
+        self._pages: "OrderedDict[tuple, List[Dict[str, Any]]]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, table_name: str, page_no: int) -> Optional[List[Dict[str, Any]]]:
+        key = (table_name, page_no)
+        page = self._pages.get(key)
+        if page is None:
+            self.misses += 1
+            return None
+        self._pages.move_to_end(key)
+        self.hits += 1
+        return page
+
+    def put(self, table_name: str, page_no: int, rows: List[Dict[str, Any]]):
+        key = (table_name, page_no)
+        self._pages[key] = rows
+        self._pages.move_to_end(key)
+        while len(self._pages) > self.max_pages:
+            self._pages.popitem(last=False)
+
+    def invalidate(self, table_name: str, page_no: Optional[int] = None):
+        """Drop one page, or every page of a table when page_no is None"""
+        if page_no is not None:
+            self._pages.pop((table_name, page_no), None)
+            return
+        for key in [k for k in self._pages if k[0] == table_name]:
+            del self._pages[key]
+
+    def stats(self) -> Dict[str, Any]:
+        total = self.hits + self.misses
+        return {
+            "cached_pages": len(self._pages),
+            "max_pages": self.max_pages,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / total if total else 0.0
+        }
 
 
 class FileStorageManager:
     """
     File-based storage manager for rapid development
     Provides database-like operations using CSV/JSON files
+
+    With ``bounded_memory`` enabled, tables are stored as JSONL and read page
+    by page through an LRU ``PageCache``. Row counts and page offsets live in a
+    per-table ``<table>.meta.json`` so counts and health checks never read rows.
+
+    ``batch()`` / ``commit_async()`` group the mutations of one logical
+    operation into a single fsynced append to ``_journal.jsonl``; tables are
+    rewritten at checkpoints, and the journal is replayed on startup. In
+    bounded mode journaled updates are kept as an overlay on reads and only
+    rewritten into the JSONL file at checkpoints.
+
+    A table's ``journal_seq`` in its metadata only advances at checkpoints,
+    after the data file is fsynced, so it never claims more than is on disk.
+    Direct ``insert``/``update``/``delete`` calls on a table with journaled
+    changes checkpoint first, so a replay never lands on top of a later write.
     """
 
     def __init__(self, config: StorageConfig = None):
@@ -38,16 +224,52 @@ class FileStorageManager:
         self._cache = {}
         self._cache_loaded = set()
 
+        # Bounded-memory mode state
+        self._meta: Dict[str, Dict[str, Any]] = {}
+        self._pages = PageCache(self.config.max_cached_pages)
+
+        # Batch journal state
+        self._lock = threading.RLock()
+        self._dirty = set()
+        self._deferred_updates: Dict[str, List[Dict[str, Any]]] = {}
+        self._journaled_tables = set()
+        self._journal_seq = 0
+        self._applied_seq = 0
+        self._batches_since_checkpoint = 0
+        self._group_committer = GroupCommitter(self, self.config.group_commit_window_ms)
+        self._recover_journal()
+
     def _get_file_path(self, table_name: str, format_type: str = None) -> Path:
         """Get file path for a table"""
         format_type = format_type or self.config.format_preference
         return self.base_path / f"{table_name}.{format_type}"
 
+    def _get_meta_path(self, table_name: str) -> Path:
+        """Get metadata file path for a table"""
+        return self.base_path / f"{table_name}.meta.json"
+
+    def _get_journal_path(self) -> Path:
+        """Get path of the batch journal"""
+        return self.base_path / "_journal.jsonl"
+
     def _load_table(self, table_name: str) -> List[Dict[str, Any]]:
         """Load table data from file"""
+        if self.config.bounded_memory:
+            return list(self._iter_rows(table_name))
+
         if table_name in self._cache_loaded:
             return self._cache.get(table_name, [])
 
+        data = self._read_table_file(table_name)
+
+        # Cache the data
+        self._cache[table_name] = data
+        self._cache_loaded.add(table_name)
+
+        return data
+
+    def _read_table_file(self, table_name: str) -> List[Dict[str, Any]]:
+        """Read a whole JSON/CSV table file without caching it"""
         json_path = self._get_file_path(table_name, "json")
         csv_path = self._get_file_path(table_name, "csv")
 
@@ -69,14 +291,16 @@ class FileStorageManager:
             except Exception as e:
                 print(f"Warning: Failed to load CSV {csv_path}: {e}")
 
-        # Cache the data
-        self._cache[table_name] = data
-        self._cache_loaded.add(table_name)
-
         return data
 
-    def _save_table(self, table_name: str, data: List[Dict[str, Any]]):
-        """Save table data to file"""
+    def _save_table(self, table_name: str, data: List[Dict[str, Any]], fsync: bool = False):
+        """
+        Save table data to file
+
+        With ``fsync`` (checkpoints) the JSON file is replaced atomically and
+        durably, its metadata records the applied journal sequence, and a
+        failed write raises instead of being reported and ignored.
+        """
         if not data:
             data = []
 
@@ -84,15 +308,23 @@ class FileStorageManager:
         self._cache[table_name] = data
 
         if not self.config.auto_save:
+            self._dirty.discard(table_name)
             return
 
         # Save to JSON
         json_path = self._get_file_path(table_name, "json")
-        try:
-            with open(json_path, 'w', encoding='utf-8') as f:
-                json.dump(data, f, indent=2, ensure_ascii=False, default=str)
-        except Exception as e:
-            print(f"Error saving JSON {json_path}: {e}")
+        if fsync:
+            self._write_durably(json_path, json.dumps(
+                data, indent=2, ensure_ascii=False, default=str
+            ).encode('utf-8'))
+        else:
+            try:
+                with open(json_path, 'w', encoding='utf-8') as f:
+                    json.dump(data, f, indent=2, ensure_ascii=False, default=str)
+            except Exception as e:
+                print(f"Error saving JSON {json_path}: {e}")
+                return
+        self._dirty.discard(table_name)
 
         # Save to CSV
         csv_path = self._get_file_path(table_name, "csv")
@@ -103,24 +335,578 @@ class FileStorageManager:
         except Exception as e:
             print(f"Error saving CSV {csv_path}: {e}")
 
+        self._write_meta(table_name, {
+            "row_count": len(data),
+            "source": json_path.name,
+            **self._file_signature(json_path)
+        }, checkpoint=fsync)
+
+    def _write_durably(self, path: Path, payload: bytes):
+        """Replace a file atomically: write a temp file, fsync it, rename it"""
+        tmp_path = path.with_name(path.name + ".tmp")
+        with open(tmp_path, 'wb') as f:
+            f.write(payload)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+        self._fsync_dir()
+
+    def _fsync_dir(self):
+        """Make renames in the storage directory durable (no-op where unsupported)"""
+        try:
+            fd = os.open(self.base_path, os.O_RDONLY)
+        except OSError:
+            return
+        try:
+            os.fsync(fd)
+        except OSError:
+            pass
+        finally:
+            os.close(fd)
+
+    # ------------------------------------------------------------------
+    # Table metadata
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def _file_signature(path: Path) -> Dict[str, Any]:
+        """Size and mtime used to detect data files changed behind our back"""
+        try:
+            stat = path.stat()
+            return {"source_size": stat.st_size, "source_mtime_ns": stat.st_mtime_ns}
+        except OSError:
+            return {"source_size": None, "source_mtime_ns": None}
+
+    def _write_meta(self, table_name: str, meta: Dict[str, Any], checkpoint: bool = False):
+        """
+        Persist table metadata next to the data file
+
+        ``journal_seq`` is carried over unchanged except at a checkpoint, where
+        the data file has just been fsynced: the metadata is then written
+        durably and raises on failure.
+        """
+        journal_seq = (self._applied_seq if checkpoint
+                       else self._meta.get(table_name, {}).get("journal_seq", 0))
+        meta = {"table": table_name, "updated_at": datetime.now().isoformat(),
+                **meta, "journal_seq": journal_seq}
+        self._meta[table_name] = meta
+        meta_path = self._get_meta_path(table_name)
+
+        if checkpoint:
+            self._write_durably(meta_path, json.dumps(meta).encode('utf-8'))
+            return
+        try:
+            tmp_path = meta_path.with_name(meta_path.name + ".tmp")
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(meta, f)
+            os.replace(tmp_path, meta_path)
+        except Exception as e:
+            print(f"Error saving metadata for {table_name}: {e}")
+
+    def _read_meta(self, table_name: str) -> Optional[Dict[str, Any]]:
+        """Return metadata if it still matches the data file on disk"""
+        meta = self._meta.get(table_name)
+        if meta is None:
+            meta_path = self._get_meta_path(table_name)
+            if not meta_path.exists():
+                return None
+            try:
+                with open(meta_path, 'r', encoding='utf-8') as f:
+                    meta = json.load(f)
+            except Exception:
+                return None
+
+        source = self.base_path / meta.get("source", "")
+        signature = self._file_signature(source)
+        if signature["source_size"] is None or any(meta.get(k) != v for k, v in signature.items()):
+            self._meta.pop(table_name, None)
+            return None
+
+        self._meta[table_name] = meta
+        return meta
+
+    def _row_count(self, table_name: str) -> int:
+        """Row count from metadata, falling back to reading the table"""
+        if self.config.bounded_memory:
+            return self._paged_meta(table_name)["row_count"]
+
+        if table_name in self._cache_loaded:
+            return len(self._cache.get(table_name, []))
+
+        meta = self._read_meta(table_name)
+        if meta is not None:
+            return meta["row_count"]
+
+        return len(self._load_table(table_name))
+
+    # ------------------------------------------------------------------
+    # Bounded-memory (paged JSONL) storage
+    # ------------------------------------------------------------------
+
+    def _get_jsonl_path(self, table_name: str) -> Path:
+        """Get JSONL file path used by bounded-memory mode"""
+        return self.base_path / f"{table_name}.jsonl"
+
+    @staticmethod
+    def _encode_row(record: Dict[str, Any]) -> bytes:
+        return json.dumps(record, ensure_ascii=False, default=str).encode('utf-8') + b"\n"
+
+    def _paged_meta(self, table_name: str) -> Dict[str, Any]:
+        """Metadata for a paged table, migrating JSON/CSV data on first use"""
+        meta = self._read_meta(table_name)
+        if meta is not None and meta.get("page_size") == self.config.page_size:
+            return meta
+
+        jsonl_path = self._get_jsonl_path(table_name)
+        if not jsonl_path.exists():
+            if not (self._get_file_path(table_name, "json").exists()
+                    or self._get_file_path(table_name, "csv").exists()):
+                # Unknown table: nothing on disk until the first insert
+                return {
+                    "row_count": 0,
+                    "page_size": self.config.page_size,
+                    "page_offsets": [],
+                    "max_id": 0,
+                    "source": jsonl_path.name
+                }
+
+            # One-off migration from the JSON/CSV representation
+            rows = self._read_table_file(table_name)
+            if not isinstance(rows, list):
+                rows = []
+            with open(jsonl_path, 'wb') as f:
+                for row in rows:
+                    f.write(self._encode_row(row))
+
+        return self._rebuild_paged_meta(table_name)
+
+    def _rebuild_paged_meta(self, table_name: str, checkpoint: bool = False) -> Dict[str, Any]:
+        """Scan a JSONL file once to record row count and page offsets"""
+        jsonl_path = self._get_jsonl_path(table_name)
+        offsets = []
+        row_count = 0
+        max_id = 0
+
+        with open(jsonl_path, 'rb') as f:
+            while True:
+                offset = f.tell()
+                line = f.readline()
+                if not line:
+                    break
+                if not line.strip():
+                    continue
+                if row_count % self.config.page_size == 0:
+                    offsets.append(offset)
+                row_count += 1
+                try:
+                    row_id = json.loads(line).get("id")
+                    if isinstance(row_id, int):
+                        max_id = max(max_id, row_id)
+                except (ValueError, AttributeError):
+                    pass
+
+        self._pages.invalidate(table_name)
+        self._write_meta(table_name, {
+            "row_count": row_count,
+            "page_size": self.config.page_size,
+            "page_offsets": offsets,
+            "max_id": max(max_id, row_count),
+            "source": jsonl_path.name,
+            **self._file_signature(jsonl_path)
+        }, checkpoint=checkpoint)
+        return self._meta[table_name]
+
+    def _read_page(self, table_name: str, page_no: int) -> List[Dict[str, Any]]:
+        """Read one page of rows, served from the LRU when hot"""
+        page = self._pages.get(table_name, page_no)
+        if page is not None:
+            return page
+
+        with self._lock:
+            meta = self._paged_meta(table_name)
+            rows = []
+            with open(self._get_jsonl_path(table_name), 'rb') as f:
+                f.seek(meta["page_offsets"][page_no])
+                while len(rows) < meta["page_size"]:
+                    line = f.readline()
+                    if not line:
+                        break
+                    if line.strip():
+                        rows.append(json.loads(line))
+
+            self._pages.put(table_name, page_no, rows)
+            return rows
+
+    def _iter_rows(self, table_name: str):
+        """
+        Yield rows of a table without materialising it
+
+        In bounded mode the rows live in the shared page LRU, so each one is
+        yielded as a copy; callers may mutate what they get back.
+        """
+        if not self.config.bounded_memory:
+            yield from self._load_table(table_name)
+            return
+
+        meta = self._paged_meta(table_name)
+        deferred = list(self._deferred_updates.get(table_name, ()))
+        for page_no in range(len(meta["page_offsets"])):
+            for row in self._read_page(table_name, page_no):
+                yield self._overlay_updates(row, deferred) if deferred else dict(row)
+
+    @staticmethod
+    def _overlay_updates(row: Dict[str, Any], deferred: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """
+        Apply deferred updates that target this row
+
+        Each update applies to the first matching row only, so it is removed
+        from ``deferred`` once used.
+        """
+        row = dict(row)
+        for op in list(deferred):
+            if str(row.get(op["id_field"])) == str(op["id_value"]):
+                row.update(op["updates"])
+                deferred.remove(op)
+        return row
+
+    def _append_rows(self, table_name: str, records: List[Dict[str, Any]]):
+        """Append rows to a paged table without rewriting it"""
+        meta = self._paged_meta(table_name)
+        offsets = list(meta["page_offsets"])
+        row_count = meta["row_count"]
+        jsonl_path = self._get_jsonl_path(table_name)
+
+        with open(jsonl_path, 'ab') as f:
+            for record in records:
+                if row_count % self.config.page_size == 0:
+                    offsets.append(f.tell())
+                f.write(self._encode_row(record))
+                row_count += 1
+
+        # Only the tail page can have changed
+        if offsets:
+            self._pages.invalidate(table_name, len(offsets) - 1)
+            if len(offsets) > 1:
+                self._pages.invalidate(table_name, len(offsets) - 2)
+
+        ids = [r.get("id") for r in records if isinstance(r.get("id"), int)]
+        self._write_meta(table_name, {
+            **{k: v for k, v in meta.items() if k not in ("table", "updated_at")},
+            "row_count": row_count,
+            "page_offsets": offsets,
+            "max_id": max([meta.get("max_id", 0), row_count] + ids),
+            **self._file_signature(jsonl_path)
+        })
+
+    def _rewrite_rows(self, table_name: str, transform, checkpoint: bool = False) -> int:
+        """
+        Stream a paged table through ``transform`` into a new file.
+
+        ``transform`` returns the row to keep (possibly modified) or None to
+        drop it. Deferred updates are written into the new file as well.
+        Returns the number of rows changed or dropped.
+        """
+        jsonl_path = self._get_jsonl_path(table_name)
+        tmp_path = jsonl_path.with_suffix(".jsonl.tmp")
+        materialize = bool(self._deferred_updates.get(table_name))
+        changed = 0
+
+        with open(tmp_path, 'wb') as out:
+            for row in self._iter_rows(table_name):
+                new_row = transform(dict(row))
+                if new_row is None or new_row != row:
+                    changed += 1
+                if new_row is not None:
+                    out.write(self._encode_row(new_row))
+            if checkpoint:
+                out.flush()
+                os.fsync(out.fileno())
+
+        if changed or materialize:
+            os.replace(tmp_path, jsonl_path)
+            self._deferred_updates.pop(table_name, None)
+            if checkpoint:
+                self._fsync_dir()
+            self._rebuild_paged_meta(table_name, checkpoint=checkpoint)
+        else:
+            tmp_path.unlink()
+
+        return changed
+
+    # ------------------------------------------------------------------
+    # Mutation primitives (no persistence of eager tables)
+    # ------------------------------------------------------------------
+
+    def _next_id(self, table_name: str) -> int:
+        """Highest ID handed out so far for a table"""
+        if self.config.bounded_memory:
+            return self._paged_meta(table_name).get("max_id", 0)
+        return len(self._load_table(table_name))
+
+    def _apply_insert(self, table_name: str, records: List[Dict[str, Any]]):
+        """Assign IDs and add records; eager tables are only marked dirty"""
+        next_id = self._next_id(table_name)
+
+        for i, record in enumerate(records):
+            if 'id' not in record:
+                record['id'] = next_id + i + 1
+
+        if self.config.bounded_memory:
+            self._append_rows(table_name, records)
+        else:
+            self._load_table(table_name).extend(records)
+        self._dirty.add(table_name)
+
+    def _apply_update(self, table_name: str, id_field: str, id_value: Any,
+                      updates: Dict[str, Any], deferred: bool = False) -> Optional[Dict[str, Any]]:
+        """
+        Update the first matching record; eager tables are only marked dirty
+
+        With ``deferred`` (journaled batches) a paged table is not rewritten:
+        the update is overlaid on reads until the next checkpoint.
+        """
+        if self.config.bounded_memory and deferred:
+            self._deferred_updates.setdefault(table_name, []).append(
+                {"id_field": id_field, "id_value": id_value, "updates": updates}
+            )
+            self._dirty.add(table_name)
+            return None
+
+        if self.config.bounded_memory:
+            updated = []
+
+            def apply(record):
+                if not updated and str(record.get(id_field)) == str(id_value):
+                    record.update(updates)
+                    updated.append(record)
+                return record
+
+            self._rewrite_rows(table_name, apply)
+            if updated:
+                self._dirty.add(table_name)
+            return updated[0] if updated else None
+
+        for record in self._load_table(table_name):
+            if str(record.get(id_field)) == str(id_value):
+                record.update(updates)
+                self._dirty.add(table_name)
+                return record
+
+        return None
+
+    def _persist(self, table_name: str):
+        """Write an eager table back after a single-operation mutation"""
+        if not self.config.bounded_memory:
+            self._save_table(table_name, self._cache.get(table_name, []))
+
+    # ------------------------------------------------------------------
+    # Batches, journal and group commit
+    # ------------------------------------------------------------------
+
+    @contextmanager
+    def batch(self):
+        """
+        Collect mutations and commit them as one unit of work
+
+            with storage.batch() as batch:
+                batch.insert("v4_responses", response)
+                batch.update("v4_sessions", "session_id", sid, {"status": "COMPLETED"})
+
+        Nothing is written if the block raises.
+        """
+        batch = StorageBatch()
+        yield batch
+        self.commit_batch(batch)
+
+    def commit_batch(self, batch: StorageBatch):
+        """Commit one batch synchronously"""
+        self.commit_batches([batch])
+
+    async def commit_async(self, batch: StorageBatch):
+        """Commit a batch, sharing the journal fsync with concurrent requests"""
+        await self._group_committer.commit(batch)
+
+    def commit_batches(self, batches: List[StorageBatch]):
+        """Commit several batches with a single journal write and fsync"""
+        batches = [batch for batch in batches if batch.operations]
+        if not batches:
+            return
+
+        with self._lock:
+            for batch in batches:
+                self._journal_seq += 1
+                batch.seq = self._journal_seq
+            self._assign_ids(batches)
+
+            if self.config.auto_save:
+                self._append_journal(batches)
+
+            for batch in batches:
+                self._apply_batch(batch)
+
+            self._batches_since_checkpoint += len(batches)
+            if self._batches_since_checkpoint >= self.config.checkpoint_interval:
+                try:
+                    self.checkpoint()
+                except Exception as e:
+                    # The batches are durable in the journal, which is kept
+                    # until a later checkpoint succeeds
+                    print(f"Error during checkpoint: {e}")
+
+    def _assign_ids(self, batches: List[StorageBatch]):
+        """Give inserted records their IDs before they are journaled"""
+        next_ids: Dict[str, int] = {}
+        for batch in batches:
+            for op in batch.operations:
+                if op["op"] != "insert":
+                    continue
+                table_name = op["table"]
+                if table_name not in next_ids:
+                    next_ids[table_name] = self._next_id(table_name)
+                for record in op["records"]:
+                    if 'id' not in record:
+                        next_ids[table_name] += 1
+                        record['id'] = next_ids[table_name]
+
+    def _append_journal(self, batches: List[StorageBatch]):
+        """Durably append committed batches to the journal"""
+        payload = b"".join(
+            json.dumps(batch.to_dict(), ensure_ascii=False, default=str).encode('utf-8') + b"\n"
+            for batch in batches
+        )
+        with open(self._get_journal_path(), 'ab') as f:
+            f.write(payload)
+            if self.config.fsync_journal:
+                f.flush()
+                os.fsync(f.fileno())
+
+    def _apply_batch(self, batch: StorageBatch, applied_seqs: Optional[Dict[str, int]] = None,
+                     existing_ids: Optional[Dict[str, set]] = None):
+        """
+        Apply a committed batch, skipping tables that already contain it
+
+        During recovery ``existing_ids`` holds the IDs already on disk per
+        table, so inserted rows written before the crash are not added twice.
+        """
+        self._applied_seq = batch.seq
+        for op in batch.operations:
+            table_name = op["table"]
+            if applied_seqs is not None and applied_seqs.get(table_name, 0) >= batch.seq:
+                continue
+            self._journaled_tables.add(table_name)
+            if op["op"] == "insert":
+                records = op["records"]
+                if existing_ids is not None:
+                    if table_name not in existing_ids:
+                        existing_ids[table_name] = {str(row.get("id")) for row in self._iter_rows(table_name)}
+                    known = existing_ids[table_name]
+                    records = [r for r in records if 'id' not in r or str(r['id']) not in known]
+                    known.update(str(r['id']) for r in records if 'id' in r)
+                if records:
+                    self._apply_insert(table_name, records)
+            elif op["op"] == "update":
+                self._apply_update(table_name, op["id_field"], op["id_value"], op["updates"],
+                                   deferred=True)
+
+    def checkpoint(self):
+        """
+        Write dirty tables back durably, then truncate the journal
+
+        Raises if any table cannot be written; the journal is then left intact
+        and replayed on the next start.
+        """
+        with self._lock:
+            for table_name in sorted(self._dirty):
+                if self.config.bounded_memory:
+                    if self._deferred_updates.get(table_name):
+                        self._rewrite_rows(table_name, lambda row: row, checkpoint=True)
+                    else:
+                        jsonl_path = self._get_jsonl_path(table_name)
+                        if jsonl_path.exists():
+                            with open(jsonl_path, 'rb+') as f:
+                                os.fsync(f.fileno())
+                        meta = self._paged_meta(table_name)
+                        self._write_meta(table_name, {
+                            k: v for k, v in meta.items()
+                            if k not in ("table", "updated_at", "journal_seq")
+                        }, checkpoint=True)
+                    self._dirty.discard(table_name)
+                elif self.config.auto_save:
+                    self._save_table(table_name, self._cache.get(table_name, []), fsync=True)
+
+            journal_path = self._get_journal_path()
+            if journal_path.exists():
+                with open(journal_path, 'wb') as f:
+                    if self.config.fsync_journal:
+                        os.fsync(f.fileno())
+
+            self._journaled_tables.clear()
+            self._batches_since_checkpoint = 0
+
+    def _settle_journal(self, table_name: str):
+        """
+        Checkpoint before a direct write to a table with journaled changes
+
+        Otherwise the direct write persists the table without advancing its
+        ``journal_seq`` and a restart would replay the older batch over it.
+        """
+        if table_name in self._journaled_tables:
+            self.checkpoint()
+
+    def _recover_journal(self):
+        """Replay batches that were journaled but not yet checkpointed"""
+        applied_seqs = {}
+        for meta_path in self.base_path.glob("*.meta.json"):
+            try:
+                with open(meta_path, 'r', encoding='utf-8') as f:
+                    meta = json.load(f)
+                applied_seqs[meta.get("table", meta_path.name[:-len(".meta.json")])] = meta.get("journal_seq", 0)
+            except Exception:
+                continue
+
+        entries = []
+        journal_path = self._get_journal_path()
+        if journal_path.exists():
+            with open(journal_path, 'rb') as f:
+                for line in f:
+                    try:
+                        entries.append(json.loads(line))
+                    except ValueError:
+                        # Torn final write: the batch was never acknowledged
+                        break
+
+        self._journal_seq = max([0] + list(applied_seqs.values()) + [e["seq"] for e in entries])
+        self._applied_seq = self._journal_seq
+        if not entries:
+            return
+
+        with self._lock:
+            existing_ids: Dict[str, set] = {}
+            for entry in entries:
+                batch = StorageBatch()
+                batch.operations = entry["ops"]
+                batch.seq = entry["seq"]
+                self._apply_batch(batch, applied_seqs, existing_ids)
+            self._applied_seq = self._journal_seq
+            print(f"Recovered {len(entries)} journaled batches")
+            self.checkpoint()
+
     def select_all(self, table_name: str) -> List[Dict[str, Any]]:
         """Select all records from a table"""
         return self._load_table(table_name)
 
     def select_by_id(self, table_name: str, id_field: str, id_value: Any) -> Optional[Dict[str, Any]]:
         """Select a record by ID"""
-        data = self._load_table(table_name)
-        for record in data:
+        for record in self._iter_rows(table_name):
             if str(record.get(id_field)) == str(id_value):
                 return record
         return None
 
     def select_where(self, table_name: str, **conditions) -> List[Dict[str, Any]]:
         """Select records matching conditions"""
-        data = self._load_table(table_name)
         results = []
 
-        for record in data:
+        for record in self._iter_rows(table_name):
             match = True
             for key, value in conditions.items():
                 if str(record.get(key)) != str(value):
@@ -133,72 +919,59 @@ class FileStorageManager:
 
     def insert(self, table_name: str, record: Dict[str, Any]) -> Dict[str, Any]:
         """Insert a new record"""
-        data = self._load_table(table_name)
-
-        # Add timestamp and ID if not present
-        if 'id' not in record:
-            record['id'] = len(data) + 1
-        if 'created_at' not in record:
-            record['created_at'] = datetime.now().isoformat()
-        if 'updated_at' not in record:
-            record['updated_at'] = datetime.now().isoformat()
-
-        data.append(record)
-        self._save_table(table_name, data)
-
-        return record
+        return self.insert_many(table_name, [record])[0]
 
     def insert_many(self, table_name: str, records: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
         """Insert multiple records"""
-        data = self._load_table(table_name)
+        _stamp_records(records)
 
-        for i, record in enumerate(records):
-            if 'id' not in record:
-                record['id'] = len(data) + i + 1
-            if 'created_at' not in record:
-                record['created_at'] = datetime.now().isoformat()
-            if 'updated_at' not in record:
-                record['updated_at'] = datetime.now().isoformat()
-
-        data.extend(records)
-        self._save_table(table_name, data)
+        with self._lock:
+            self._settle_journal(table_name)
+            self._apply_insert(table_name, records)
+            self._persist(table_name)
 
         return records
 
     def update(self, table_name: str, id_field: str, id_value: Any, updates: Dict[str, Any]) -> Optional[Dict[str, Any]]:
         """Update a record"""
-        data = self._load_table(table_name)
-
-        for i, record in enumerate(data):
-            if str(record.get(id_field)) == str(id_value):
-                # Update the record
-                data[i].update(updates)
-                data[i]['updated_at'] = datetime.now().isoformat()
-
-                self._save_table(table_name, data)
-                return data[i]
+        with self._lock:
+            self._settle_journal(table_name)
+            record = self._apply_update(table_name, id_field, id_value, {
+                **updates,
+                'updated_at': datetime.now().isoformat()
+            })
+            if record is not None:
+                self._persist(table_name)
 
-        return None
+        return record
 
     def delete(self, table_name: str, id_field: str, id_value: Any) -> bool:
         """Delete a record"""
-        data = self._load_table(table_name)
-        original_length = len(data)
+        with self._lock:
+            self._settle_journal(table_name)
+            if self.config.bounded_memory:
+                return self._rewrite_rows(
+                    table_name,
+                    lambda record: None if str(record.get(id_field)) == str(id_value) else record
+                ) > 0
 
-        data[:] = [record for record in data if str(record.get(id_field)) != str(id_value)]
+            data = self._load_table(table_name)
+            original_length = len(data)
 
-        if len(data) < original_length:
-            self._save_table(table_name, data)
-            return True
+            data[:] = [record for record in data if str(record.get(id_field)) != str(id_value)]
 
-        return False
+            if len(data) < original_length:
+                self._save_table(table_name, data)
+                return True
+
+            return False
 
     def count(self, table_name: str, **conditions) -> int:
         """Count records matching conditions"""
         if conditions:
             return len(self.select_where(table_name, **conditions))
         else:
-            return len(self._load_table(table_name))
+            return self._row_count(table_name)
 
     def create_session_id(self, prefix: str = "v4") -> str:
         """Generate a unique session ID"""
@@ -214,7 +987,7 @@ class FileStorageManager:
         backup_dir.mkdir(parents=True, exist_ok=True)
 
         # Copy current files
-        for format_type in ["json", "csv"]:
+        for format_type in ["json", "csv", "jsonl"]:
             source_path = self._get_file_path(table_name, format_type)
             if source_path.exists():
                 backup_path = backup_dir / f"{table_name}.{format_type}"
@@ -226,17 +999,19 @@ class FileStorageManager:
     def health_check(self) -> Dict[str, Any]:
         """Check system health"""
         try:
+            data_suffix = ".jsonl" if self.config.bounded_memory else ".json"
             tables = []
-            for file_path in self.base_path.glob("*.json"):
+            for file_path in sorted(self.base_path.glob(f"*{data_suffix}")):
                 table_name = file_path.stem
-                record_count = len(self._load_table(table_name))
+                if table_name.endswith(".meta") or table_name.startswith("_"):
+                    continue
                 tables.append({
                     "name": table_name,
-                    "records": record_count,
+                    "records": self._row_count(table_name),
                     "file_size": file_path.stat().st_size
                 })
 
-            return {
+            health = {
                 "status": "healthy",
                 "storage_type": "file_based",
                 "base_path": str(self.base_path),
@@ -244,6 +1019,11 @@ class FileStorageManager:
                 "tables": tables,
                 "cache_loaded": list(self._cache_loaded)
             }
+            if self.config.bounded_memory:
+                health["page_cache"] = self._pages.stats()
+            health["group_commit"] = self._group_committer.stats()
+            health["dirty_tables"] = sorted(self._dirty)
+            return health
         except Exception as e:
             return {
                 "status": "error",
@@ -252,7 +1032,10 @@ class FileStorageManager:
 
 
 # Global instance for easy access
-storage = FileStorageManager()
+# GALLUP_FILE_STORAGE_BOUNDED=1 keeps worker memory flat as history grows
+storage = FileStorageManager(StorageConfig(
+    bounded_memory=os.getenv("GALLUP_FILE_STORAGE_BOUNDED", "").lower() in ("1", "true", "yes")
+))
 
 
 def get_file_storage() -> FileStorageManager:
@@ -9,13 +9,17 @@
 - 優勢主題與職位的雙向映射
 - 可擴展的技能發展建議
 - 支援多語言和本地化
+- 載入時建立反向索引 (優勢→職位、職位→優勢、領域→職位)，查詢不再掃描所有職位
 """
 
 from typing import Dict, List, Optional, Any, Tuple
 from dataclasses import dataclass, field
 from enum import Enum
+import hashlib
 import json
 
+import numpy as np
+
 
 class StrengthCategory(Enum):
     """優勢類別"""
@@ -146,6 +150,17 @@ class CareerKnowledgeBase:
         # 載入預設數據
         self._load_default_data()
 
+        # 內容版本：依賴知識庫的快取項目在版本變更時失效
+        self.version = self._content_version()
+
+        # 載入後建立一次查詢索引
+        self._build_indexes()
+
+    def _content_version(self) -> str:
+        """以知識庫內容計算版本雜湊"""
+        content = (self._strength_themes, self._career_roles, self._development_library)
+        return hashlib.blake2b(repr(content).encode("utf-8"), digest_size=8).hexdigest()
+
     def _load_default_data(self):
         """載入預設的職涯知識庫數據"""
         self._load_strength_themes()
@@ -911,6 +926,48 @@ class CareerKnowledgeBase:
             resources=["商業分析證照", "案例研究方法", "企業實習機會"]
         )
 
+    def _build_indexes(self):
+        """建立反向索引與權重矩陣"""
+        roles = list(self._career_roles.values())
+        self._role_position = {role.role_id: i for i, role in enumerate(roles)}
+
+        # 優勢 → 最適合/相容職位 (依主題定義順序)
+        self._theme_roles: Dict[str, Tuple[CareerRole, ...]] = {
+            theme_id: tuple(self._career_roles[role_id]
+                            for role_id in theme.best_fit_roles + theme.compatible_roles
+                            if role_id in self._career_roles)
+            for theme_id, theme in self._strength_themes.items()
+        }
+
+        # 職位 → 需要的優勢主題
+        self._role_strengths: Dict[str, Tuple[StrengthTheme, ...]] = {
+            role.role_id: tuple(self._strength_themes[strength_id]
+                                for strength_id in role.get_all_required_strengths()
+                                if strength_id in self._strength_themes)
+            for role in roles
+        }
+
+        # 優勢 → (職位位置, 權重)，只收非零權重
+        self._strength_role_weights: Dict[str, List[Tuple[int, float]]] = {}
+        for position, role in enumerate(roles):
+            for strength_id, weight in role.strength_weights.items():
+                if weight != 0:
+                    self._strength_role_weights.setdefault(strength_id, []).append((position, weight))
+
+        # 領域 → 需要該領域優勢的職位
+        self._domain_roles: Dict[StrengthCategory, Tuple[CareerRole, ...]] = {
+            category: tuple(role for role in roles
+                            if any(theme.category == category for theme in self._role_strengths[role.role_id]))
+            for category in StrengthCategory
+        }
+
+        # 批次匹配用 (職位 × 優勢) 權重矩陣
+        self._weight_columns = {strength_id: i for i, strength_id in enumerate(self._strength_role_weights)}
+        self._weight_matrix = np.zeros((len(roles), len(self._weight_columns)))
+        for strength_id, entries in self._strength_role_weights.items():
+            for position, weight in entries:
+                self._weight_matrix[position, self._weight_columns[strength_id]] = weight
+
     # 公開方法
     def get_strength_theme(self, theme_id: str) -> Optional[StrengthTheme]:
         """獲取優勢主題"""
@@ -933,35 +990,22 @@ class CareerKnowledgeBase:
         return self._career_roles.copy()
 
     def get_roles_for_strength(self, strength_id: str) -> List[CareerRole]:
-        """根據優勢獲取適合的職涯角色"""
-        strength_theme = self.get_strength_theme(strength_id)
-        if not strength_theme:
-            return []
-
-        # 獲取最適合和相容的角色
-        role_ids = strength_theme.best_fit_roles + strength_theme.compatible_roles
-        roles = []
-        for role_id in role_ids:
-            role = self.get_career_role(role_id)
-            if role:
-                roles.append(role)
+        """根據優勢獲取適合的職涯角色 (最適合在前，其次相容)"""
+        return list(self._theme_roles.get(strength_id, ()))
 
-        return roles
+    def get_weighted_roles_for_strength(self, strength_id: str) -> List[Tuple[CareerRole, float]]:
+        """獲取對該優勢有權重的職涯角色及權重"""
+        roles = list(self._career_roles.values())
+        return [(roles[position], weight)
+                for position, weight in self._strength_role_weights.get(strength_id, ())]
 
     def get_strengths_for_role(self, role_id: str) -> List[StrengthTheme]:
         """根據職涯角色獲取需要的優勢"""
-        role = self.get_career_role(role_id)
-        if not role:
-            return []
+        return list(self._role_strengths.get(role_id, ()))
 
-        strength_ids = role.get_all_required_strengths()
-        strengths = []
-        for strength_id in strength_ids:
-            strength = self.get_strength_theme(strength_id)
-            if strength:
-                strengths.append(strength)
-
-        return strengths
+    def get_roles_for_domain(self, category: StrengthCategory) -> List[CareerRole]:
+        """獲取需要該領域優勢的職涯角色"""
+        return list(self._domain_roles.get(category, ()))
 
     def get_development_suggestions_for_strength(self, strength_id: str) -> List[DevelopmentSuggestion]:
         """根據優勢獲取發展建議"""
@@ -981,27 +1025,65 @@ class CareerKnowledgeBase:
 
     def find_career_matches_by_strengths(self, user_strengths: List[str], top_n: int = 5) -> List[Tuple[CareerRole, float]]:
         """根據用戶優勢找到匹配的職涯角色"""
-        matches = []
-
-        for role in self._career_roles.values():
-            # 計算匹配分數
-            match_score = 0.0
-            total_weight = 0.0
-
-            for strength_id in user_strengths:
-                weight = role.get_strength_weight(strength_id)
+        # 只累加用戶優勢索引到的職位
+        match_scores: Dict[int, float] = {}
+        total_weights: Dict[int, float] = {}
+        for strength_id in user_strengths:
+            for position, weight in self._strength_role_weights.get(strength_id, ()):
                 if weight > 0:
-                    match_score += weight
-                total_weight += weight
-
-            # 正規化分數
-            if total_weight > 0:
-                normalized_score = match_score / total_weight
-                matches.append((role, normalized_score))
-
-        # 按分數排序並返回前N個
-        matches.sort(key=lambda x: x[1], reverse=True)
-        return matches[:top_n]
+                    match_scores[position] = match_scores.get(position, 0.0) + weight
+                total_weights[position] = total_weights.get(position, 0.0) + weight
+
+        # 正規化分數，按分數排序 (同分依知識庫順序) 並返回前N個
+        roles = list(self._career_roles.values())
+        matches = sorted(
+            ((position, match_scores.get(position, 0.0) / total)
+             for position, total in total_weights.items() if total > 0),
+            key=lambda x: (-x[1], x[0])
+        )
+        return [(roles[position], score) for position, score in matches[:top_n]]
+
+    def find_career_matches_by_strengths_bulk(self, users_strengths: List[List[str]],
+                                              top_n: int = 5) -> List[List[Tuple[CareerRole, float]]]:
+        """
+        批次版 find_career_matches_by_strengths：多位用戶以一次矩陣乘積計算
+
+        Args:
+            users_strengths: 每位用戶的優勢 ID 列表
+            top_n: 每位用戶回傳的職位數
+
+        Returns:
+            與輸入順序對應的匹配列表
+        """
+        roles = list(self._career_roles.values())
+        if not users_strengths or not roles or top_n <= 0:
+            return [[] for _ in users_strengths]
+
+        # 用戶 × 優勢 出現次數
+        counts = np.zeros((len(users_strengths), len(self._weight_columns)))
+        for row, strengths in enumerate(users_strengths):
+            for strength_id in strengths:
+                column = self._weight_columns.get(strength_id)
+                if column is not None:
+                    counts[row, column] += 1
+
+        weights = self._weight_matrix
+        match_scores = counts @ np.where(weights > 0, weights, 0).T
+        total_weights = counts @ weights.T
+        valid = total_weights > 0
+        scores = np.divide(match_scores, total_weights, out=np.zeros_like(match_scores), where=valid)
+
+        results = []
+        positions = np.arange(len(roles))
+        for row in range(len(users_strengths)):
+            candidates = positions[valid[row]]
+            if len(candidates) > top_n:
+                # 第 N 名的分數為門檻；同分者全部保留再依知識庫順序截斷
+                kth = np.partition(-scores[row, candidates], top_n - 1)[top_n - 1]
+                candidates = candidates[-scores[row, candidates] <= kth]
+            order = candidates[np.lexsort((candidates, -scores[row, candidates]))][:top_n]
+            results.append([(roles[position], float(scores[row, position])) for position in order])
+        return results
 
 
 # 全域實例
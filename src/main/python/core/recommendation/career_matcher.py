@@ -15,6 +15,11 @@ Career Matcher - Job Role Matching Based on Strengths
 - 優勢導向的匹配算法
 - 產業分類和經驗等級考量
 - 文化和市場背景支援
+
+效能：
+- 職位需求預先編譯為 (職位 × 優勢) 權重矩陣與情境向量
+- 匹配分數以單次矩陣向量乘積計算，argpartition 取前 K 名
+- 對齊明細、差距分析與匹配原因只為回傳的 K 個職位產生
 """
 
 from typing import Dict, List, Optional, Any, Tuple
@@ -23,6 +28,8 @@ from enum import Enum
 import json
 from pathlib import Path
 
+import numpy as np
+
 from .strength_mapper import StrengthProfile, StrengthScore
 from ..knowledge.career_knowledge_base import (
     get_career_knowledge_base,
@@ -60,6 +67,94 @@ class CareerMatch:
         return f"{self.chinese_name} - 匹配度: {self.match_score:.1f}% (信心: {self.confidence:.2f})"
 
 
+def _parse_salary_range(salary_range: str) -> Tuple[float, float]:
+    """解析 "60-150萬" 形式的薪資範圍，無法解析時回傳 NaN"""
+    numbers = [int(s) for s in salary_range.replace("萬", "").split("-") if s.isdigit()]
+    if len(numbers) == 2:
+        return float(numbers[0]), float(numbers[1])
+    return np.nan, np.nan
+
+
+class CareerMatchMatrix:
+    """
+    知識庫職位需求的編譯形式
+
+    對齊分數總和 (各優勢對齊 + 主要/次要平均) 對用戶分數是線性的，
+    因此每個職位可表示為一列權重：
+        主要優勢: weight * (1 + 1 / 主要優勢數)
+        次要優勢: weight * 0.5 * (1 + 1 / 次要優勢數)
+    """
+
+    def __init__(self, knowledge_base):
+        self.version = knowledge_base.version
+        roles = knowledge_base.get_all_career_roles()
+        self.roles: List[CareerRole] = list(roles.values())
+
+        strength_ids = list(knowledge_base.get_all_strength_themes())
+        for role in self.roles:
+            for strength_id in role.get_all_required_strengths():
+                if strength_id not in strength_ids:
+                    strength_ids.append(strength_id)
+        self.strength_index: Dict[str, int] = {sid: i for i, sid in enumerate(strength_ids)}
+
+        # (職位 × 優勢) 對齊權重
+        self.weights = np.zeros((len(self.roles), len(strength_ids)))
+        for r, role in enumerate(self.roles):
+            if role.primary_strengths:
+                factor = 1 + 1 / len(role.primary_strengths)
+                for strength_id in role.primary_strengths:
+                    self.weights[r, self.strength_index[strength_id]] += role.get_strength_weight(strength_id) * factor
+            if role.secondary_strengths:
+                factor = 0.5 * (1 + 1 / len(role.secondary_strengths))
+                for strength_id in role.secondary_strengths:
+                    self.weights[r, self.strength_index[strength_id]] += role.get_strength_weight(strength_id) * factor
+
+        # 情境向量：產業、經驗等級、薪資範圍
+        self.sector_values = [sector.value.lower() for sector in IndustrySector]
+        sector_position = {sector: i for i, sector in enumerate(IndustrySector)}
+        self.role_sector = np.array([sector_position[role.industry_sector] for role in self.roles], dtype=np.intp)
+
+        self.experience_levels = list(ExperienceLevel)
+        self.experience = np.array([[level in role.experience_levels for level in self.experience_levels]
+                                    for role in self.roles], dtype=bool).reshape(len(self.roles), -1)
+
+        salary = np.array([_parse_salary_range(role.salary_range) for role in self.roles]).reshape(-1, 2)
+        self.salary_min, self.salary_max = salary[:, 0], salary[:, 1]
+
+    def user_vector(self, strength_profile) -> np.ndarray:
+        """用戶優勢分數向量 (0-1)，未知優勢忽略"""
+        vector = np.zeros(len(self.strength_index))
+        for strength in strength_profile.all_strengths:
+            index = self.strength_index.get(strength.name)
+            if index is not None:
+                vector[index] = strength.score / 100
+        return vector
+
+    def context_bonus(self, user_context: Dict[str, Any]) -> np.ndarray:
+        """各職位的情境獎勵 (與 _calculate_context_bonus_from_kb 相同規則)"""
+        bonus = np.zeros(len(self.roles))
+
+        preferred_industry = user_context.get("industry_preference", "").lower()
+        if preferred_industry:
+            sector_match = np.array([preferred_industry in value for value in self.sector_values])
+            bonus += 10 * sector_match[self.role_sector]
+
+        user_experience = user_context.get("experience_level", "").lower()
+        if user_experience:
+            try:
+                level = self.experience_levels.index(ExperienceLevel(user_experience))
+                bonus += 15 * self.experience[:, level]
+            except ValueError:
+                pass
+
+        salary_expectation = user_context.get("salary_expectation", 0)
+        if salary_expectation > 0:
+            in_range = (self.salary_min <= salary_expectation) & (salary_expectation <= self.salary_max)
+            bonus += np.where(in_range, 10, np.where(salary_expectation < self.salary_min, -5, 0))
+
+        return bonus
+
+
 class CareerMatcher:
     """
     基於優勢檔案的智能職涯匹配系統
@@ -71,6 +166,7 @@ class CareerMatcher:
     def __init__(self):
         """Initialize the career matcher with unified knowledge base."""
         self.knowledge_base = get_career_knowledge_base()
+        self._matrix: Optional[CareerMatchMatrix] = None
 
         # 保留舊的載入邏輯作為備用
         # self.job_roles = self._load_job_roles()  # 已廢棄，改用統一知識庫
@@ -103,10 +199,18 @@ class CareerMatcher:
         """
         pass
 
+    @property
+    def matrix(self) -> CareerMatchMatrix:
+        """編譯後的職位矩陣 (知識庫版本變更時重建)"""
+        if self._matrix is None or self._matrix.version != self.knowledge_base.version:
+            self._matrix = CareerMatchMatrix(self.knowledge_base)
+        return self._matrix
+
     def find_career_matches(
         self,
         strength_profile: StrengthProfile,
-        user_context: Optional[Dict[str, Any]] = None
+        user_context: Optional[Dict[str, Any]] = None,
+        top_k: Optional[int] = None
     ) -> List[CareerMatch]:
         """
         根據優勢檔案和用戶背景尋找職涯匹配
@@ -114,6 +218,7 @@ class CareerMatcher:
         Args:
             strength_profile: StrengthMapper 產生的完整優勢檔案
             user_context: 用戶偏好和背景（經驗、產業等）
+            top_k: 只回傳前 K 個匹配 (None 為全部)
 
         Returns:
             依匹配分數排序的 CareerMatch 列表（最高分在前）
@@ -121,19 +226,35 @@ class CareerMatcher:
         if user_context is None:
             user_context = {}
 
-        matches = []
+        matrix = self.matrix
+        if not matrix.roles:
+            return []
 
-        # 從統一知識庫獲取所有職涯角色
-        career_roles = self.knowledge_base.get_all_career_roles()
+        # 領域適配度與職位無關：每位用戶只計算一次
+        domain_fit = self._calculate_user_domain_fit(strength_profile)
 
-        for role_id, career_role in career_roles.items():
-            match = self._calculate_job_match_from_knowledge_base(
-                career_role, strength_profile, user_context
-            )
-            matches.append(match)
-
-        # 依匹配分數排序（最高在前）
-        return sorted(matches, key=lambda x: x.match_score, reverse=True)
+        # 單次矩陣向量乘積計算所有職位分數
+        scores = (
+            (matrix.weights @ matrix.user_vector(strength_profile)) * 0.6 +  # 優勢對齊最重要
+            sum(domain_fit.values()) * 0.3 +                                 # 領域適配次要
+            matrix.context_bonus(user_context) * 0.1                         # 情境獎勵最少
+        )
+        # 正規化至 0-100 範圍
+        scores = np.clip(scores, 0, 100)
+
+        # 取前 K 名，同分依知識庫順序
+        k = len(scores) if top_k is None else max(0, min(top_k, len(scores)))
+        if k < len(scores):
+            candidates = np.argpartition(-scores, k - 1)[:k] if k else np.array([], dtype=np.intp)
+        else:
+            candidates = np.arange(len(scores))
+        order = candidates[np.lexsort((candidates, -scores[candidates]))]
+
+        # 明細只為回傳的職位產生
+        return [
+            self._build_match(matrix.roles[i], strength_profile, float(scores[i]), domain_fit)
+            for i in order
+        ]
 
     def _calculate_job_match_from_knowledge_base(
         self,
@@ -141,7 +262,7 @@ class CareerMatcher:
         strength_profile: StrengthProfile,
         user_context: Dict[str, Any]
     ) -> CareerMatch:
-        """根據統一知識庫計算職位匹配分數"""
+        """根據統一知識庫計算單一職位匹配分數"""
 
         # 1. 計算優勢對齊度
         strength_alignment = self._calculate_strength_alignment_from_kb(career_role, strength_profile)
@@ -162,6 +283,21 @@ class CareerMatcher:
         # 正規化至 0-100 範圍
         match_score = min(100, max(0, base_score))
 
+        return self._build_match(career_role, strength_profile, match_score, domain_fit,
+                                 strength_alignment)
+
+    def _build_match(
+        self,
+        career_role: CareerRole,
+        strength_profile: StrengthProfile,
+        match_score: float,
+        domain_fit: Dict[StrengthCategory, float],
+        strength_alignment: Optional[Dict[str, float]] = None
+    ) -> CareerMatch:
+        """產生匹配明細：對齊、信心、差距與原因"""
+        if strength_alignment is None:
+            strength_alignment = self._calculate_strength_alignment_from_kb(career_role, strength_profile)
+
         # 5. 基於優勢檔案信心計算匹配信心
         confidence = self._calculate_match_confidence_from_kb(
             strength_profile, strength_alignment, domain_fit
@@ -463,6 +599,10 @@ class CareerMatcher:
 
     def _calculate_domain_fit_from_kb(self, career_role: CareerRole, strength_profile: StrengthProfile) -> Dict[StrengthCategory, float]:
         """計算領域適配度 - 基於統一知識庫"""
+        return self._calculate_user_domain_fit(strength_profile)
+
+    def _calculate_user_domain_fit(self, strength_profile: StrengthProfile) -> Dict[StrengthCategory, float]:
+        """計算用戶各優勢類別的強度 (與職位無關)"""
         domain_fit = {}
 
         # 計算每個優勢類別的用戶分布
@@ -614,5 +754,6 @@ class CareerMatcher:
 
 
 def get_career_matcher() -> CareerMatcher:
-    """Get a configured CareerMatcher instance."""
-    return CareerMatcher()
\ No newline at end of file
+    """Get the shared CareerMatcher instance (built once per process)."""
+    from core.component_registry import get_component_registry
+    return get_component_registry().get("career_matcher")
\ No newline at end of file
@@ -15,15 +15,19 @@ Key Features:
 - Prioritized development areas
 - Actionable learning recommendations
 - Progress tracking frameworks
+- Plan fragments memoized on normalized profile inputs (bounded LRU)
 """
 
-from typing import Dict, List, Optional, Any, Tuple
-from dataclasses import dataclass
+from typing import Dict, List, Optional, Any, Tuple, Sequence
+from collections import OrderedDict
+from dataclasses import dataclass, replace
 from enum import Enum
 from datetime import datetime, timedelta
+import copy
 import json
+import threading
 
-from .strength_mapper import StrengthProfile, StrengthScore
+from .strength_mapper import StrengthProfile, StrengthScore, StrengthDomain
 from .career_matcher import CareerMatch
 from ..knowledge.career_knowledge_base import CareerRole, StrengthCategory
 
@@ -120,6 +124,69 @@ class DevelopmentPlan:
         return f"發展計劃 ({len(self.development_goals)}個目標, {len(self.immediate_actions)}個立即行動)"
 
 
+# Goals in cached fragments are dated from this reference and shifted to the plan date
+_FRAGMENT_EPOCH = datetime(2000, 1, 1)
+
+
+@dataclass
+class _PlanFragments:
+    """Date-independent parts of a plan, shared by all profiles with the same key."""
+    priority_areas: List[str]
+    development_goals: List[DevelopmentGoal]
+    immediate_actions: List[DevelopmentAction]
+    quarterly_milestones: List[str]
+    annual_objectives: List[str]
+    resource_requirements: Dict[str, Any]
+    success_tracking: Dict[str, str]
+    profile_summary: str
+    career_focus: str
+
+
+class PlanFragmentCache:
+    """
+    Bounded LRU cache of plan fragments keyed by normalized planning inputs
+    Thread-safe: the planner is shared through the component registry
+    """
+
+    def __init__(self, max_entries: int = 1024):
+        self.max_entries = max(1, max_entries)
+        self._entries: "OrderedDict[tuple, _PlanFragments]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: tuple) -> Optional[_PlanFragments]:
+        with self._lock:
+            fragments = self._entries.get(key)
+            if fragments is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return fragments
+
+    def put(self, key: tuple, fragments: _PlanFragments):
+        with self._lock:
+            self._entries[key] = fragments
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        total = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "max_entries": self.max_entries,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / total if total else 0.0
+        }
+
+
 class DevelopmentPlanner:
     """
     Creates personalized development plans based on strengths and career goals.
@@ -129,9 +196,10 @@ class DevelopmentPlanner:
     timelines.
     """
 
-    def __init__(self):
+    def __init__(self, fragment_cache_size: int = 1024):
         """Initialize the development planner with action templates."""
         self.development_templates = self._load_development_templates()
+        self.fragment_cache = PlanFragmentCache(fragment_cache_size)
 
     def create_development_plan(
         self,
@@ -150,15 +218,89 @@ class DevelopmentPlanner:
         Returns:
             Complete DevelopmentPlan with goals, actions, and timelines
         """
-        plan_id = f"DEV_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
         created_date = datetime.now()
+        plan_id = f"DEV_{created_date.strftime('%Y%m%d_%H%M%S')}"
+        fragments = self._get_plan_fragments(strength_profile, career_matches, user_context)
+        return self._assemble_plan(plan_id, created_date, fragments)
+
+    def create_development_plans(
+        self,
+        requests: Sequence[Tuple[StrengthProfile, List[CareerMatch], Dict[str, Any]]]
+    ) -> List[DevelopmentPlan]:
+        """
+        Create development plans for many users at once.
 
+        Args:
+            requests: (strength_profile, career_matches, user_context) per user
+
+        Returns:
+            One DevelopmentPlan per request, in order; users with the same
+            normalized profile share one fragment computation
+        """
+        created_date = datetime.now()
+        batch_id = created_date.strftime('%Y%m%d_%H%M%S')
+        review_schedule = self._create_review_schedule(created_date)
+
+        plans = []
+        for i, (strength_profile, career_matches, user_context) in enumerate(requests, 1):
+            fragments = self._get_plan_fragments(strength_profile, career_matches, user_context)
+            plans.append(self._assemble_plan(f"DEV_{batch_id}_{i:04d}", created_date, fragments, review_schedule))
+        return plans
+
+    def _fragment_key(
+        self,
+        strength_profile: StrengthProfile,
+        career_matches: List[CareerMatch]
+    ) -> tuple:
+        """
+        Normalized inputs that fully determine the plan fragments.
+
+        Only what the fragment builders read: the top themes with their
+        confidence, which domains fall below the gap threshold, the
+        dominant domain and the top career match. user_context is not
+        read by any fragment.
+        """
+        top_strengths = tuple(
+            (s.theme.name, s.theme.chinese_name, s.confidence_level)
+            for s in strength_profile.top_5_strengths
+        )
+        distribution = strength_profile.domain_distribution
+        domain_gaps = tuple(domain for domain, percentage in distribution.items() if percentage < 15)
+        dominant_domain = max(distribution.items(), key=lambda x: x[1])[0] if distribution else None
+
+        top_career = None
+        if career_matches:
+            match = career_matches[0]
+            top_career = (match.role_name, match.chinese_name,
+                          tuple(match.development_needs[:3]), tuple(match.matching_strengths))
+        return top_strengths, domain_gaps, dominant_domain, top_career
+
+    def _get_plan_fragments(
+        self,
+        strength_profile: StrengthProfile,
+        career_matches: List[CareerMatch],
+        user_context: Dict[str, Any]
+    ) -> _PlanFragments:
+        key = self._fragment_key(strength_profile, career_matches)
+        fragments = self.fragment_cache.get(key)
+        if fragments is None:
+            fragments = self._build_plan_fragments(strength_profile, career_matches, user_context)
+            self.fragment_cache.put(key, fragments)
+        return fragments
+
+    def _build_plan_fragments(
+        self,
+        strength_profile: StrengthProfile,
+        career_matches: List[CareerMatch],
+        user_context: Dict[str, Any]
+    ) -> _PlanFragments:
+        """Build everything except dates (goals are dated from _FRAGMENT_EPOCH)."""
         # 1. Analyze development priorities
         priority_areas = self._identify_priority_areas(strength_profile, career_matches)
 
         # 2. Generate development goals
         development_goals = self._generate_development_goals(
-            strength_profile, career_matches, priority_areas, user_context
+            strength_profile, career_matches, priority_areas, user_context, _FRAGMENT_EPOCH
         )
 
         # 3. Create immediate actions (next 3 months)
@@ -166,42 +308,70 @@ class DevelopmentPlanner:
             strength_profile, development_goals, user_context
         )
 
-        # 4. Set quarterly milestones
-        quarterly_milestones = self._generate_quarterly_milestones(development_goals)
-
-        # 5. Define annual objectives
-        annual_objectives = self._generate_annual_objectives(development_goals, career_matches)
-
-        # 6. Calculate resource requirements
-        resource_requirements = self._calculate_resource_requirements(development_goals)
-
-        # 7. Setup success tracking
-        success_tracking = self._setup_success_tracking(development_goals)
-
-        # 8. Create review schedule
-        review_schedule = self._create_review_schedule(created_date)
+        return _PlanFragments(
+            priority_areas=priority_areas,
+            development_goals=development_goals,
+            immediate_actions=immediate_actions,
+            # 4. Set quarterly milestones
+            quarterly_milestones=self._generate_quarterly_milestones(development_goals),
+            # 5. Define annual objectives
+            annual_objectives=self._generate_annual_objectives(development_goals, career_matches),
+            # 6. Calculate resource requirements
+            resource_requirements=self._calculate_resource_requirements(development_goals),
+            # 7. Setup success tracking
+            success_tracking=self._setup_success_tracking(development_goals),
+            # 8. Generate profile summary
+            profile_summary=self._generate_profile_summary(strength_profile, career_matches),
+            # 9. Determine career focus
+            career_focus=career_matches[0].chinese_name if career_matches else "多元職涯發展"
+        )
 
-        # 9. Generate profile summary
-        profile_summary = self._generate_profile_summary(strength_profile, career_matches)
+    def _assemble_plan(
+        self,
+        plan_id: str,
+        created_date: datetime,
+        fragments: _PlanFragments,
+        review_schedule: Optional[List[datetime]] = None
+    ) -> DevelopmentPlan:
+        """
+        Date the cached fragments for one plan.
 
-        # 10. Determine career focus
-        career_focus = career_matches[0].chinese_name if career_matches else "多元職涯發展"
+        Containers are copied per plan; DevelopmentAction objects are
+        shared between plans and must be treated as read-only.
+        """
+        development_goals = [
+            replace(
+                goal,
+                target_completion=created_date + (goal.target_completion - _FRAGMENT_EPOCH),
+                actions=list(goal.actions),
+                success_criteria=list(goal.success_criteria),
+                milestones=list(goal.milestones),
+                related_strengths=list(goal.related_strengths)
+            )
+            for goal in fragments.development_goals
+        ]
+        if review_schedule is None:
+            review_schedule = self._create_review_schedule(created_date)
 
         return DevelopmentPlan(
             plan_id=plan_id,
             created_date=created_date,
-            user_profile_summary=profile_summary,
-            career_focus=career_focus,
-            priority_areas=priority_areas,
+            user_profile_summary=fragments.profile_summary,
+            career_focus=fragments.career_focus,
+            priority_areas=list(fragments.priority_areas),
             development_goals=development_goals,
-            immediate_actions=immediate_actions,
-            quarterly_milestones=quarterly_milestones,
-            annual_objectives=annual_objectives,
-            resource_requirements=resource_requirements,
-            success_tracking=success_tracking,
-            review_schedule=review_schedule
+            immediate_actions=list(fragments.immediate_actions),
+            quarterly_milestones=list(fragments.quarterly_milestones),
+            annual_objectives=list(fragments.annual_objectives),
+            resource_requirements=copy.deepcopy(fragments.resource_requirements),
+            success_tracking=dict(fragments.success_tracking),
+            review_schedule=list(review_schedule)
         )
 
+    def get_cache_stats(self) -> Dict[str, Any]:
+        """Plan fragment cache statistics."""
+        return self.fragment_cache.stats()
+
     def _identify_priority_areas(
         self,
         strength_profile: StrengthProfile,
@@ -233,10 +403,10 @@ class DevelopmentPlanner:
         domain_gaps = []
 
         domain_names = {
-            StrengthCategory.EXECUTING: "執行力",
-            StrengthCategory.INFLUENCING: "影響力",
-            StrengthCategory.RELATIONSHIP_BUILDING: "關係建立",
-            StrengthCategory.STRATEGIC_THINKING: "戰略思維"
+            StrengthDomain.EXECUTING: "執行力",
+            StrengthDomain.INFLUENCING: "影響力",
+            StrengthDomain.RELATIONSHIP_BUILDING: "關係建立",
+            StrengthDomain.STRATEGIC_THINKING: "戰略思維"
         }
 
         # Find domains with low representation
@@ -252,7 +422,8 @@ class DevelopmentPlanner:
         strength_profile: StrengthProfile,
         career_matches: List[CareerMatch],
         priority_areas: List[str],
-        user_context: Dict[str, Any]
+        user_context: Dict[str, Any],
+        start_date: datetime
     ) -> List[DevelopmentGoal]:
         """Generate development goals based on priorities."""
         goals = []
@@ -260,7 +431,7 @@ class DevelopmentPlanner:
 
         # Goal 1: Strengthen top strengths
         top_strength_goal = self._create_strength_enhancement_goal(
-            goal_counter, strength_profile.top_5_strengths[:2]
+            goal_counter, strength_profile.top_5_strengths[:2], start_date
         )
         goals.append(top_strength_goal)
         goal_counter += 1
@@ -268,7 +439,7 @@ class DevelopmentPlanner:
         # Goal 2: Career-specific skill development
         if career_matches:
             career_goal = self._create_career_alignment_goal(
-                goal_counter, career_matches[0], strength_profile
+                goal_counter, career_matches[0], strength_profile, start_date
             )
             goals.append(career_goal)
             goal_counter += 1
@@ -276,7 +447,7 @@ class DevelopmentPlanner:
         # Goal 3: Address development areas
         if priority_areas:
             development_goal = self._create_skill_development_goal(
-                goal_counter, priority_areas[:2]
+                goal_counter, priority_areas[:2], start_date
             )
             goals.append(development_goal)
 
@@ -285,11 +456,12 @@ class DevelopmentPlanner:
     def _create_strength_enhancement_goal(
         self,
         goal_id: int,
-        top_strengths: List[StrengthScore]
+        top_strengths: List[StrengthScore],
+        start_date: datetime
     ) -> DevelopmentGoal:
         """Create goal focused on enhancing existing strengths."""
         strength_names = [s.theme.chinese_name for s in top_strengths]
-        target_date = datetime.now() + timedelta(days=180)  # Approximately 6 months
+        target_date = start_date + timedelta(days=180)  # Approximately 6 months
 
         actions = []
         for i, strength in enumerate(top_strengths):
@@ -334,10 +506,11 @@ class DevelopmentPlanner:
         self,
         goal_id: int,
         career_match: CareerMatch,
-        strength_profile: StrengthProfile
+        strength_profile: StrengthProfile,
+        start_date: datetime
     ) -> DevelopmentGoal:
         """Create goal aligned with target career requirements."""
-        target_date = datetime.now() + timedelta(days=365)  # Approximately 12 months
+        target_date = start_date + timedelta(days=365)  # Approximately 12 months
 
         actions = []
         for i, skill in enumerate(career_match.development_needs[:3]):
@@ -381,10 +554,11 @@ class DevelopmentPlanner:
     def _create_skill_development_goal(
         self,
         goal_id: int,
-        priority_areas: List[str]
+        priority_areas: List[str],
+        start_date: datetime
     ) -> DevelopmentGoal:
         """Create goal for general skill development."""
-        target_date = datetime.now() + timedelta(days=270)  # Approximately 9 months
+        target_date = start_date + timedelta(days=270)  # Approximately 9 months
 
         actions = []
         for i, area in enumerate(priority_areas):
@@ -655,5 +829,6 @@ class DevelopmentPlanner:
 
 
 def get_development_planner() -> DevelopmentPlanner:
-    """Get a configured DevelopmentPlanner instance."""
-    return DevelopmentPlanner()
\ No newline at end of file
+    """Get the shared DevelopmentPlanner instance (built once per process)."""
+    from core.component_registry import get_component_registry
+    return get_component_registry().get("development_planner")
\ No newline at end of file
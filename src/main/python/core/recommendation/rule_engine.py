@@ -15,11 +15,14 @@ Key Features:
 - Confidence scoring for rule matches
 - Rule chaining and composition
 - Audit trail for rule application
+- Rules compiled at add time: pre-split field accessors, shared conditions
+  evaluated once per profile, rules indexed by required "equals" values
 """
 
-from typing import Dict, List, Optional, Any, Callable, Tuple
+from typing import Dict, List, Optional, Any, Callable, Tuple, Set
 from dataclasses import dataclass
 from enum import Enum
+import bisect
 import json
 from pathlib import Path
 
@@ -82,6 +85,195 @@ class RuleEvaluationResult:
     confidence: float
 
 
+# Minimum weighted share of matched conditions for a rule to apply
+MATCH_THRESHOLD = 0.6
+
+# Numeric comparisons that can be answered for many thresholds with one bisect
+RANGE_OPERATORS = ("greater_than", "greater_equal", "less_than", "less_equal")
+
+_MISSING = object()
+
+
+def _compile_path(field_path: str) -> Tuple[Tuple[str, Optional[int]], ...]:
+    """Split a dotted field path once; digit keys also carry their list index."""
+    return tuple((key, int(key) if key.isdigit() else None) for key in field_path.split('.'))
+
+
+def _resolve_path(value: Any, steps: Tuple[Tuple[str, Optional[int]], ...]) -> Any:
+    """Follow pre-split steps through dicts, list indexes and attributes."""
+    try:
+        for key, index in steps:
+            if isinstance(value, dict):
+                value = value.get(key)
+            elif isinstance(value, list) and index is not None:
+                value = value[index] if 0 <= index < len(value) else None
+            elif hasattr(value, key):
+                value = getattr(value, key)
+            else:
+                return None
+        return value
+    except (KeyError, IndexError, AttributeError, TypeError):
+        return None
+
+
+# Top-level evaluation context fields, resolved only when a candidate rule reads them
+_CONTEXT_FIELDS: Dict[str, Callable[[StrengthProfile, Dict[str, Any]], Any]] = {
+    "top_5_strengths": lambda profile, user_context: profile.top_5_strengths,
+    "all_strengths": lambda profile, user_context: profile.all_strengths,
+    "domain_distribution": lambda profile, user_context: {
+        domain.value: percentage for domain, percentage in profile.domain_distribution.items()
+    },
+    "profile_confidence": lambda profile, user_context: profile.profile_confidence,
+    "analysis_summary": lambda profile, user_context: profile.analysis_summary,
+    "user_context": lambda profile, user_context: user_context,
+    # Computed fields for easier rule writing
+    "domain_max_percentage": lambda profile, user_context: max(
+        profile.domain_distribution.values()
+    ) if profile.domain_distribution else 0,
+    # Strength name lookup for "contains" operations
+    "strength_contains": lambda profile, user_context: " ".join(
+        s.theme.name.lower() for s in profile.all_strengths
+    ),
+}
+
+
+class _EvaluationContext:
+    """Per-profile lazy field values and condition results."""
+
+    __slots__ = ("profile", "user_context", "fields", "values", "conditions")
+
+    def __init__(self, profile: StrengthProfile, user_context: Dict[str, Any]):
+        self.profile = profile
+        self.user_context = user_context
+        self.fields: Dict[str, Any] = {}
+        self.values: Dict[str, Any] = {}
+        self.conditions: Dict[Tuple, bool] = {}
+
+    def field(self, name: str) -> Any:
+        value = self.fields.get(name, _MISSING)
+        if value is _MISSING:
+            resolver = _CONTEXT_FIELDS.get(name)
+            value = resolver(self.profile, self.user_context) if resolver else None
+            self.fields[name] = value
+        return value
+
+
+class _CompiledCondition:
+    """A RuleCondition with its accessor and operator bound at compile time."""
+
+    __slots__ = ("key", "field_path", "steps", "operator_name", "operator", "value")
+
+    def __init__(self, condition: RuleCondition, operator: Optional[Callable]):
+        self.field_path = condition.field_path
+        self.steps = _compile_path(condition.field_path)
+        self.operator_name = condition.operator
+        self.operator = operator
+        self.value = condition.value
+        # Conditions with the same key are evaluated once per profile
+        self.key = (condition.field_path, condition.operator, repr(condition.value))
+
+    def resolve(self, context: _EvaluationContext) -> Any:
+        value = context.values.get(self.field_path, _MISSING)
+        if value is _MISSING:
+            (root, _), rest = self.steps[0], self.steps[1:]
+            value = context.field(root)
+            if rest:
+                value = _resolve_path(value, rest)
+            context.values[self.field_path] = value
+        return value
+
+    def evaluate(self, context: _EvaluationContext) -> bool:
+        result = context.conditions.get(self.key)
+        if result is None:
+            result = False
+            if self.operator is not None:
+                try:
+                    actual_value = self.resolve(context)
+                    if actual_value is not None:
+                        result = bool(self.operator(actual_value, self.value))
+                except Exception:
+                    # If evaluation fails, condition is false
+                    result = False
+            context.conditions[self.key] = result
+        return result
+
+
+class _CompiledRule:
+    """Rule with compiled conditions, split into required and optional ones."""
+
+    __slots__ = ("rule", "position", "conditions", "required", "index_condition", "threshold",
+                 "requirements")
+
+    def __init__(self, rule: RecommendationRule, position: int, conditions: List[_CompiledCondition]):
+        self.rule = rule
+        self.position = position
+        self.conditions = conditions
+        self.requirements = [_compile_path(requirement) for requirement in rule.context_requirements]
+
+        # A condition is required when the others alone cannot reach the threshold
+        # (with negative weights a subset may score higher, so nothing is required)
+        self.required = []
+        if all(condition.weight >= 0 for condition in rule.conditions):
+            total_weight = 0
+            for condition in rule.conditions:
+                total_weight += condition.weight
+            for i, compiled in enumerate(conditions):
+                # Accumulated in evaluation order, as in evaluate()
+                other_weight = 0
+                for j, condition in enumerate(rule.conditions):
+                    if j != i:
+                        other_weight += condition.weight
+                if total_weight <= 0 or other_weight / total_weight < MATCH_THRESHOLD:
+                    self.required.append(compiled)
+
+        # One required condition is used to index the rule: an "equals" on a
+        # hashable value if there is one, otherwise a numeric threshold
+        self.index_condition = None
+        self.threshold = None
+        for compiled in self.required:
+            if compiled.operator_name == "equals" and compiled.value is not None:
+                try:
+                    hash(compiled.value)
+                except TypeError:
+                    continue
+                self.index_condition = compiled
+                break
+        if self.index_condition is None:
+            for compiled in self.required:
+                if compiled.operator_name in RANGE_OPERATORS:
+                    try:
+                        threshold = float(compiled.value)
+                    except (TypeError, ValueError):
+                        continue
+                    if threshold == threshold:  # not NaN
+                        self.index_condition, self.threshold = compiled, threshold
+                        break
+
+    def evaluate(self, context: _EvaluationContext) -> RuleEvaluationResult:
+        matched_conditions = []
+        total_weight = 0
+        matched_weight = 0
+
+        for compiled, condition in zip(self.conditions, self.rule.conditions):
+            total_weight += condition.weight
+            if compiled.evaluate(context):
+                matched_conditions.append(condition)
+                matched_weight += condition.weight
+
+        # Calculate match score based on weighted conditions
+        match_score = matched_weight / total_weight if total_weight > 0 else 0
+        matched = match_score >= MATCH_THRESHOLD
+
+        return RuleEvaluationResult(
+            rule=self.rule,
+            matched=matched,
+            match_score=match_score,
+            matched_conditions=matched_conditions,
+            output_message=self.rule.output_template if matched else "",
+            confidence=self.rule.confidence_score * match_score if matched else 0
+        )
+
+
 class RuleEngine:
     """
     Flexible rule engine for generating context-aware recommendations.
@@ -92,8 +284,9 @@ class RuleEngine:
 
     def __init__(self):
         """Initialize the rule engine with default rules."""
-        self.rules = self._load_default_rules()
         self._operators = self._setup_operators()
+        self.rules = self._load_default_rules()
+        self._compile_rules()
 
     def _setup_operators(self) -> Dict[str, Callable]:
         """Setup comparison operators for rule conditions."""
@@ -233,6 +426,81 @@ class RuleEngine:
 
         return rules
 
+    def _compile_rules(self):
+        """Compile all rules and rebuild the rule indexes."""
+        self._compiled_rules: List[_CompiledRule] = []
+        self._unindexed_rules: List[_CompiledRule] = []
+        # field_path -> (condition, {expected value: rules})
+        self._equals_index: Dict[str, Tuple[_CompiledCondition, Dict[Any, List[_CompiledRule]]]] = {}
+        # (field_path, operator) -> (condition, sorted thresholds, rules in threshold order)
+        self._range_index: Dict[Tuple[str, str], Tuple[_CompiledCondition, List[float], List[_CompiledRule]]] = {}
+        self._shared_conditions: Dict[Tuple, _CompiledCondition] = {}
+        self._compiled_source = self.rules
+        self._compiled_count = len(self.rules)
+        for rule in self.rules:
+            self._compile_rule(rule)
+
+    def _compile_rule(self, rule: RecommendationRule):
+        """Compile one rule and add it to the indexes."""
+        conditions = []
+        for condition in rule.conditions:
+            compiled = _CompiledCondition(condition, self._operators.get(condition.operator))
+            conditions.append(self._shared_conditions.setdefault(compiled.key, compiled))
+
+        compiled_rule = _CompiledRule(rule, len(self._compiled_rules), conditions)
+        self._compiled_rules.append(compiled_rule)
+
+        index_condition = compiled_rule.index_condition
+        if index_condition is None:
+            self._unindexed_rules.append(compiled_rule)
+            return
+        if compiled_rule.threshold is None:
+            _, buckets = self._equals_index.setdefault(index_condition.field_path, (index_condition, {}))
+            buckets.setdefault(index_condition.value, []).append(compiled_rule)
+            return
+        _, thresholds, rules = self._range_index.setdefault(
+            (index_condition.field_path, index_condition.operator_name), (index_condition, [], [])
+        )
+        position = bisect.bisect_right(thresholds, compiled_rule.threshold)
+        thresholds.insert(position, compiled_rule.threshold)
+        rules.insert(position, compiled_rule)
+
+    def _candidate_rules(self, context: _EvaluationContext) -> List[_CompiledRule]:
+        """Rules that can still match: unindexed ones plus indexed ones whose key condition holds."""
+        candidates = list(self._unindexed_rules)
+        for field_path, (condition, buckets) in self._equals_index.items():
+            actual_value = condition.resolve(context)
+            if actual_value is None:
+                continue
+            try:
+                bucket = buckets.get(actual_value)
+            except TypeError:
+                # Unhashable value: fall back to evaluating every rule on this field
+                bucket = [rule for rules in buckets.values() for rule in rules]
+            if bucket:
+                candidates.extend(bucket)
+        for (field_path, operator), (condition, thresholds, rules) in self._range_index.items():
+            actual_value = condition.resolve(context)
+            if actual_value is None:
+                continue
+            try:
+                actual_value = float(actual_value)
+            except (TypeError, ValueError):
+                continue
+            if actual_value != actual_value:  # NaN fails every comparison
+                continue
+            # Rules whose threshold satisfies "actual <operator> threshold"
+            if operator == "greater_than":
+                candidates.extend(rules[:bisect.bisect_left(thresholds, actual_value)])
+            elif operator == "greater_equal":
+                candidates.extend(rules[:bisect.bisect_right(thresholds, actual_value)])
+            elif operator == "less_than":
+                candidates.extend(rules[bisect.bisect_right(thresholds, actual_value):])
+            else:
+                candidates.extend(rules[bisect.bisect_left(thresholds, actual_value):])
+        candidates.sort(key=lambda compiled: compiled.position)
+        return candidates
+
     def evaluate_strength_profile(
         self,
         strength_profile: StrengthProfile,
@@ -248,142 +516,47 @@ class RuleEngine:
         Returns:
             List of matching RecommendationRule objects sorted by priority
         """
-        matching_rules = []
-        evaluation_context = self._prepare_evaluation_context(strength_profile, user_context)
-
-        for rule in self.rules:
-            if not rule.enabled:
-                continue
-
-            # Check if required context is available
-            if not self._has_required_context(rule, user_context):
-                continue
+        return [result.rule for result in self.evaluate_rules(strength_profile, user_context)]
 
-            # Evaluate rule conditions
-            result = self._evaluate_rule(rule, evaluation_context)
-            if result.matched:
-                matching_rules.append(rule)
-
-        # Sort by priority (higher priority first)
-        return sorted(matching_rules, key=lambda r: r.priority, reverse=True)
-
-    def _prepare_evaluation_context(
+    def evaluate_rules(
         self,
         strength_profile: StrengthProfile,
         user_context: Dict[str, Any]
-    ) -> Dict[str, Any]:
-        """Prepare combined context for rule evaluation."""
-        context = {
-            "top_5_strengths": strength_profile.top_5_strengths,
-            "all_strengths": strength_profile.all_strengths,
-            "domain_distribution": {
-                domain.value: percentage
-                for domain, percentage in strength_profile.domain_distribution.items()
-            },
-            "profile_confidence": strength_profile.profile_confidence,
-            "analysis_summary": strength_profile.analysis_summary,
-            "user_context": user_context
-        }
-
-        # Add computed fields for easier rule writing
-        context["domain_max_percentage"] = max(
-            strength_profile.domain_distribution.values()
-        ) if strength_profile.domain_distribution else 0
-
-        # Create strength name lookup for "contains" operations
-        strength_names = [s.theme.name.lower() for s in strength_profile.all_strengths]
-        context["strength_contains"] = " ".join(strength_names)
-
-        # Add individual strength scores for direct access
-        for strength in strength_profile.top_5_strengths[:5]:
-            context[f"top_5_strengths.{strength.theme.name.lower()}"] = strength
-
-        return context
-
-    def _has_required_context(self, rule: RecommendationRule, user_context: Dict[str, Any]) -> bool:
-        """Check if all required context fields are available."""
-        for requirement in rule.context_requirements:
-            if not self._get_nested_value(user_context, requirement):
-                return False
-        return True
-
-    def _evaluate_rule(
-        self,
-        rule: RecommendationRule,
-        context: Dict[str, Any]
-    ) -> RuleEvaluationResult:
-        """Evaluate a single rule against the context."""
-        matched_conditions = []
-        total_weight = 0
-        matched_weight = 0
+    ) -> List[RuleEvaluationResult]:
+        """
+        Evaluate rules and return the results of the matching ones.
 
-        for condition in rule.conditions:
-            total_weight += condition.weight
+        Only candidate rules from the index are evaluated; each distinct
+        condition is evaluated at most once per profile.
 
-            if self._evaluate_condition(condition, context):
-                matched_conditions.append(condition)
-                matched_weight += condition.weight
+        Returns:
+            Matching RuleEvaluationResult objects sorted by rule priority
+        """
+        if self.rules is not self._compiled_source or len(self.rules) != self._compiled_count:
+            # Rule list was replaced or edited directly
+            self._compile_rules()
 
-        # Calculate match score based on weighted conditions
-        match_score = matched_weight / total_weight if total_weight > 0 else 0
-        matched = match_score >= 0.6  # Require at least 60% condition match
+        context = _EvaluationContext(strength_profile, user_context)
+        results = []
 
-        # Generate output message if matched
-        output_message = rule.output_template if matched else ""
+        for compiled in self._candidate_rules(context):
+            if not compiled.rule.enabled:
+                continue
 
-        # Calculate final confidence
-        confidence = rule.confidence_score * match_score if matched else 0
+            # Check if required context is available
+            if not all(_resolve_path(user_context, steps) for steps in compiled.requirements):
+                continue
 
-        return RuleEvaluationResult(
-            rule=rule,
-            matched=matched,
-            match_score=match_score,
-            matched_conditions=matched_conditions,
-            output_message=output_message,
-            confidence=confidence
-        )
+            # Required conditions first: a failed one rules out the match
+            if not all(condition.evaluate(context) for condition in compiled.required):
+                continue
 
-    def _evaluate_condition(self, condition: RuleCondition, context: Dict[str, Any]) -> bool:
-        """Evaluate a single condition against the context."""
-        try:
-            # Get value from context using field path
-            actual_value = self._get_nested_value(context, condition.field_path)
+            result = compiled.evaluate(context)
+            if result.matched:
+                results.append(result)
 
-            if actual_value is None:
-                return False
-
-            # Get operator function
-            operator_func = self._operators.get(condition.operator)
-            if not operator_func:
-                return False
-
-            # Evaluate condition
-            return operator_func(actual_value, condition.value)
-
-        except Exception:
-            # If evaluation fails, condition is false
-            return False
-
-    def _get_nested_value(self, data: Dict[str, Any], field_path: str) -> Any:
-        """Get nested value from dictionary using dot notation."""
-        try:
-            keys = field_path.split('.')
-            value = data
-
-            for key in keys:
-                if isinstance(value, dict):
-                    value = value.get(key)
-                elif isinstance(value, list) and key.isdigit():
-                    idx = int(key)
-                    value = value[idx] if 0 <= idx < len(value) else None
-                elif hasattr(value, key):
-                    value = getattr(value, key)
-                else:
-                    return None
-
-            return value
-        except (KeyError, IndexError, AttributeError, TypeError):
-            return None
+        # Sort by priority (higher priority first)
+        return sorted(results, key=lambda r: r.rule.priority, reverse=True)
 
     def add_rule(self, rule: RecommendationRule):
         """Add a new rule to the engine."""
@@ -392,10 +565,13 @@ class RuleEngine:
             raise ValueError(f"Rule with ID {rule.rule_id} already exists")
 
         self.rules.append(rule)
+        self._compile_rule(rule)
+        self._compiled_count = len(self.rules)
 
     def remove_rule(self, rule_id: str):
         """Remove a rule from the engine."""
         self.rules = [r for r in self.rules if r.rule_id != rule_id]
+        self._compile_rules()
 
     def enable_rule(self, rule_id: str):
         """Enable a rule by ID."""
@@ -428,5 +604,6 @@ class RuleEngine:
 
 
 def get_rule_engine() -> RuleEngine:
-    """Get a configured RuleEngine instance."""
-    return RuleEngine()
\ No newline at end of file
+    """Get the shared RuleEngine instance (built once per process)."""
+    from core.component_registry import get_component_registry
+    return get_component_registry().get("rule_engine")
\ No newline at end of file
@@ -16,14 +16,22 @@ Based on Gallup's CliftonStrengths research and correlations with
 Big Five personality model as documented in psychological literature.
 """
 
-from typing import Dict, List, Tuple, Optional
+from typing import Dict, List, Tuple, Optional, Sequence
 from dataclasses import dataclass
 from enum import Enum
 import json
 from pathlib import Path
 
+import numpy as np
+
 from core.config import get_psychometric_settings
 
+# Column order of the compiled (themes x factors) weight matrix
+BIG_FIVE_FACTORS = ("openness", "conscientiousness", "extraversion", "agreeableness", "neuroticism")
+
+# Top themes whose contribution breakdown is filled in by generate_strength_profile
+DISPLAYED_THEMES = 5
+
 
 class StrengthDomain(Enum):
     """Gallup's four leadership strength domains."""
@@ -53,7 +61,7 @@ class StrengthScore:
     raw_score: float
     percentile_score: float
     confidence_level: str
-    contributing_factors: Dict[str, float]
+    contributing_factors: Optional[Dict[str, float]] = None  # None unless breakdown was requested
 
     def __str__(self) -> str:
         return f"{self.theme.chinese_name}: {self.percentile_score:.1f}% (信心: {self.confidence_level})"
@@ -84,6 +92,20 @@ class StrengthMapper:
         self._psychometric_config = get_psychometric_settings()
         self._strength_themes = self._load_strength_themes()
         self._mapping_weights = self._load_mapping_weights()
+        self._compile_weights()
+
+    def _compile_weights(self):
+        """Compile _mapping_weights into a (themes x factors) matrix."""
+        self._theme_names = list(self._strength_themes)
+        self._weight_matrix = np.array([
+            [self._mapping_weights.get(name, {}).get(factor, 0.0) for factor in BIG_FIVE_FACTORS]
+            for name in self._theme_names
+        ])
+        # Factors that carry a weight for the theme (only these appear in breakdowns)
+        self._weighted = np.array([
+            [factor in self._mapping_weights.get(name, {}) for factor in BIG_FIVE_FACTORS]
+            for name in self._theme_names
+        ])
 
     def _load_strength_themes(self) -> Dict[str, StrengthTheme]:
         """Load all 34 Gallup CliftonStrengths themes with Chinese translations."""
@@ -489,57 +511,99 @@ class StrengthMapper:
             }
         }
 
-    def calculate_strength_scores(self, big_five_scores: Dict[str, float]) -> List[StrengthScore]:
+    def score_themes(self, big_five_batch: Sequence[Dict[str, float]]) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Score every theme for many respondents at once.
+
+        Args:
+            big_five_batch: Big Five score dicts (0-100 scale); missing
+                factors do not contribute
+
+        Returns:
+            (raw, normalized, max_contribution) arrays of shape (respondents, themes)
+        """
+        scores = np.array([[b.get(factor, 0.0) for factor in BIG_FIVE_FACTORS] for b in big_five_batch],
+                          dtype=float).reshape(len(big_five_batch), len(BIG_FIVE_FACTORS))
+        present = np.array([[factor in b for factor in BIG_FIVE_FACTORS] for b in big_five_batch],
+                           dtype=bool).reshape(scores.shape)
+
+        # (respondents, themes, factors); zero where the factor is missing or unweighted
+        contributions = scores[:, None, :] * self._weight_matrix[None, :, :]
+        contributions = np.where(present[:, None, :] & self._weighted[None, :, :], contributions, 0.0)
+
+        # Accumulate factor by factor (the per-theme loop's summation order)
+        # so results are bit-identical to scoring one theme at a time
+        raw = np.zeros(contributions.shape[:2])
+        for f in range(len(BIG_FIVE_FACTORS)):
+            raw += contributions[:, :, f]
+
+        # Raw scores typically range from -20 to +80, normalize to 0-100
+        normalized = np.clip((raw + 20) * 1.25, 0, 100)
+        max_contribution = np.abs(contributions).max(axis=2)
+        return raw, normalized, max_contribution
+
+    def _contribution_breakdown(self, theme_index: int, big_five_scores: Dict[str, float]) -> Dict[str, float]:
+        name = self._theme_names[theme_index]
+        return {
+            factor: big_five_scores[factor] * weight
+            for factor, weight in self._mapping_weights.get(name, {}).items()
+            if factor in big_five_scores
+        }
+
+    def calculate_strength_scores_batch(self,
+                                        big_five_batch: Sequence[Dict[str, float]],
+                                        breakdown_top_n: Optional[int] = None) -> List[List[StrengthScore]]:
+        """
+        Calculate ranked strength scores for many respondents.
+
+        Args:
+            big_five_batch: Big Five score dicts (0-100 scale)
+            breakdown_top_n: Fill contributing_factors only for each
+                respondent's top N themes (all themes when None)
+
+        Returns:
+            Per respondent, StrengthScore objects sorted by score (highest first)
+        """
+        if not big_five_batch:
+            return []
+
+        raw, normalized, max_contribution = self.score_themes(big_five_batch)
+        # Stable: equal scores keep theme definition order
+        ranking = np.argsort(-normalized, axis=1, kind="stable")
+        confidence = np.where(max_contribution > 30, "high",
+                              np.where(max_contribution > 15, "medium", "low"))
+
+        results = []
+        for i, big_five_scores in enumerate(big_five_batch):
+            ranked = []
+            for position, t in enumerate(ranking[i]):
+                breakdown = breakdown_top_n is None or position < breakdown_top_n
+                ranked.append(StrengthScore(
+                    theme=self._strength_themes[self._theme_names[t]],
+                    raw_score=float(raw[i, t]),
+                    percentile_score=float(normalized[i, t]),
+                    confidence_level=str(confidence[i, t]),
+                    contributing_factors=self._contribution_breakdown(t, big_five_scores) if breakdown else None
+                ))
+            results.append(ranked)
+        return results
+
+    def calculate_strength_scores(self,
+                                  big_five_scores: Dict[str, float],
+                                  breakdown_top_n: Optional[int] = None) -> List[StrengthScore]:
         """
         Calculate strength theme scores based on Big Five personality scores.
 
         Args:
             big_five_scores: Dictionary with keys: extraversion, agreeableness,
                            conscientiousness, neuroticism, openness (0-100 scale)
+            breakdown_top_n: Fill contributing_factors only for the top N
+                           themes (all themes when None)
 
         Returns:
             List of StrengthScore objects sorted by score (highest first)
         """
-        strength_scores = []
-
-        for theme_name, theme in self._strength_themes.items():
-            weights = self._mapping_weights.get(theme_name, {})
-
-            # Calculate raw score using weighted sum
-            raw_score = 0.0
-            contributing_factors = {}
-
-            for factor, weight in weights.items():
-                if factor in big_five_scores:
-                    contribution = big_five_scores[factor] * weight
-                    raw_score += contribution
-                    contributing_factors[factor] = contribution
-
-            # Normalize to 0-100 scale and apply confidence calculation
-            # Raw scores typically range from -20 to +80, normalize to 0-100
-            normalized_score = max(0, min(100, (raw_score + 20) * 1.25))
-
-            # Calculate confidence based on strength of contributing factors
-            max_contribution = max(abs(v) for v in contributing_factors.values()) if contributing_factors else 0
-            if max_contribution > 30:
-                confidence = "high"
-            elif max_contribution > 15:
-                confidence = "medium"
-            else:
-                confidence = "low"
-
-            strength_score = StrengthScore(
-                theme=theme,
-                raw_score=raw_score,
-                percentile_score=normalized_score,
-                confidence_level=confidence,
-                contributing_factors=contributing_factors
-            )
-
-            strength_scores.append(strength_score)
-
-        # Sort by percentile score (highest first)
-        return sorted(strength_scores, key=lambda x: x.percentile_score, reverse=True)
+        return self.calculate_strength_scores_batch([big_five_scores], breakdown_top_n)[0]
 
     def generate_strength_profile(self, big_five_scores: Dict[str, float]) -> StrengthProfile:
         """
@@ -551,8 +615,21 @@ class StrengthMapper:
         Returns:
             Complete StrengthProfile with recommendations
         """
-        all_strengths = self.calculate_strength_scores(big_five_scores)
-        top_5_strengths = all_strengths[:5]
+        return self.generate_strength_profiles([big_five_scores])[0]
+
+    def generate_strength_profiles(self, big_five_batch: Sequence[Dict[str, float]]) -> List[StrengthProfile]:
+        """
+        Generate strength profiles for many respondents (one scoring pass).
+
+        Contribution breakdowns are computed only for the displayed top themes.
+        """
+        return [
+            self._build_profile(all_strengths)
+            for all_strengths in self.calculate_strength_scores_batch(big_five_batch, DISPLAYED_THEMES)
+        ]
+
+    def _build_profile(self, all_strengths: List[StrengthScore]) -> StrengthProfile:
+        top_5_strengths = all_strengths[:DISPLAYED_THEMES]
 
         # Calculate domain distribution
         domain_scores = {domain: 0.0 for domain in StrengthDomain}
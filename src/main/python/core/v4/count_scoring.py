@@ -0,0 +1,122 @@
+"""
+Dimension-Count Scoring for v4.0 Sessions
+
+The forced-choice count scoring used by the submit route, in a form
+that scores one session or a chunk of thousands with the same math:
+- count_score_matrix(): chosen statements -> (sessions x T1-T12) counts
+- normalize_counts(): raw counts -> 0-100 talent scores
+- score_record(): one session's talent scores -> V4Score column values
+
+"Most like" adds 1 to the statement's dimension, "least like"
+subtracts 0.5; scores are rescaled from [-0.5n, n] for n responses.
+"""
+
+from typing import Any, Dict, Sequence
+
+import numpy as np
+
+TALENT_DIMENSIONS = tuple(f"T{i}" for i in range(1, 13))
+DIMENSION_INDEX = {dimension: i for i, dimension in enumerate(TALENT_DIMENSIONS)}
+
+# V4Score column for each dimension, in T1-T12 order
+SCORE_COLUMNS = (
+    "t1_structured_execution",
+    "t2_quality_perfectionism",
+    "t3_exploration_innovation",
+    "t4_analytical_insight",
+    "t5_influence_advocacy",
+    "t6_collaboration_harmony",
+    "t7_customer_orientation",
+    "t8_learning_growth",
+    "t9_discipline_trust",
+    "t10_pressure_regulation",
+    "t11_conflict_integration",
+    "t12_responsibility_accountability",
+)
+
+MOST_LIKE_WEIGHT = 1.0
+LEAST_LIKE_WEIGHT = -0.5
+
+
+def count_score_matrix(session_index: Sequence[int],
+                       dimension_index: Sequence[int],
+                       weights: Sequence[float],
+                       n_sessions: int) -> np.ndarray:
+    """
+    Sum weighted choices per session and dimension.
+
+    Args:
+        session_index: Row of each chosen statement
+        dimension_index: DIMENSION_INDEX of each chosen statement
+        weights: MOST_LIKE_WEIGHT or LEAST_LIKE_WEIGHT per choice
+        n_sessions: Number of rows
+
+    Returns:
+        (n_sessions, 12) raw counts
+    """
+    raw = np.zeros((n_sessions, len(TALENT_DIMENSIONS)))
+    np.add.at(raw, (np.asarray(session_index, dtype=np.intp),
+                    np.asarray(dimension_index, dtype=np.intp)),
+              np.asarray(weights, dtype=float))
+    return raw
+
+
+def normalize_counts(raw: np.ndarray, n_responses: Sequence[int]) -> np.ndarray:
+    """
+    Rescale raw counts to 0-100 (unrounded); sessions without
+    responses score 50 on every dimension.
+    """
+    n = np.asarray(n_responses, dtype=float)[:, None]
+    max_score = n * MOST_LIKE_WEIGHT
+    min_score = n * LEAST_LIKE_WEIGHT
+    span = max_score - min_score
+    with np.errstate(divide="ignore", invalid="ignore"):
+        normalized = np.clip((raw - min_score) / span * 100, 0, 100)
+    return np.where(span > 0, normalized, 50.0)
+
+
+def talent_scores(normalized_row: np.ndarray) -> Dict[str, float]:
+    """One normalized row as {"t1_talent": ...} rounded to 0.1."""
+    return {f"t{i + 1}_talent": round(float(value), 1) for i, value in enumerate(normalized_row)}
+
+
+def score_record(t_scores: Dict[str, float],
+                 dimension_counts: Dict[str, float],
+                 n_responses: int,
+                 config: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    V4Score column values (without session_id) for one session.
+
+    Args:
+        t_scores: {"t1_talent": 0-100, ...}
+        dimension_counts: Raw counts of the dimensions that were chosen
+        n_responses: Number of answered blocks
+        config: Route scoring configuration (thresholds, versions)
+    """
+    scores = [t_scores.get(f"t{i}_talent", 50.0) for i in range(1, 13)]
+    return {
+        **dict(zip(SCORE_COLUMNS, scores)),
+        # IRT-style technical fields
+        "theta_estimates": dimension_counts,
+        "standard_errors": {f"t{i}": 0.3 + (0.2 * abs(score - 50.0) / 50.0)
+                            for i, score in enumerate(scores, 1)},
+        "percentiles": {f"t{i}": score for i, score in enumerate(scores, 1)},
+        "dimension_reliability": {f"t{i}": max(config["min_reliability"],
+                                               config["base_reliability"] - (n_responses / 100.0))
+                                  for i in range(1, 13)},
+        # Quality indicators from the number of responses
+        "overall_confidence": max(config["min_confidence"],
+                                  min(config["max_confidence"], 0.5 + (n_responses / 20.0))),
+        "response_consistency": max(0.7, min(0.98, config["base_response_consistency"] + (n_responses / 50.0))),
+        # Talent tiers
+        "dominant_talents": [f"t{i}" for i, score in enumerate(scores, 1)
+                             if score >= config["dominant_threshold"]],
+        "supporting_talents": [f"t{i}" for i, score in enumerate(scores, 1)
+                               if config["lesser_threshold"] <= score < config["dominant_threshold"]],
+        "lesser_talents": [f"t{i}" for i, score in enumerate(scores, 1)
+                           if score < config["lesser_threshold"]],
+        # Scoring metadata
+        "algorithm_version": config["algorithm_version"],
+        "computation_time_ms": n_responses * config["computation_ms_per_response"],
+        "calibration_version": config["calibration_version"],
+    }
@@ -0,0 +1,432 @@
+"""
+Disk Cache Tier for v4.0 IRT System
+
+Single-file SQLite key/value store replacing per-key pickle files:
+- One database file instead of one file per key
+- Writes queued to a background thread and committed in batches,
+  so saving to cache never blocks a response
+- Size cap with LRU eviction (access times recorded lazily, byte
+  total kept in memory so the cap check never scans the table; it is
+  re-read from the table before evicting and every resync_interval
+  seconds, since other workers write the same file)
+- Reads use per-thread WAL connections and never wait on the writer
+- blake2b checksum per value; corrupt rows are dropped as misses
+- Non-pickle encoding: JSON header plus raw ndarray buffers, with
+  dataclasses restored only for explicitly registered types
+"""
+
+import base64
+import dataclasses
+import hashlib
+import json
+import logging
+import queue
+import sqlite3
+import struct
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple, Type
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+
+_MAGIC = b"GDC1"
+_HEADER = struct.Struct("<4sI")
+
+# Dataclasses that may be reconstructed from the cache
+_DATACLASS_REGISTRY: Dict[str, Type] = {}
+
+
+def register_dataclass(cls: Type) -> Type:
+    """Allow a dataclass to round-trip through the disk cache (usable as decorator)."""
+    _DATACLASS_REGISTRY[f"{cls.__module__}.{cls.__qualname__}"] = cls
+    return cls
+
+
+class CacheSerializationError(ValueError):
+    """Value cannot be encoded for, or decoded from, the disk cache"""
+
+
+def encode_value(value: Any) -> bytes:
+    """
+    Encode a value as a JSON header followed by raw array buffers.
+
+    Supports JSON scalars, lists, tuples, str-keyed dicts, ndarrays,
+    NumPy scalars and registered dataclasses.
+    """
+    buffers: List[bytes] = []
+
+    def walk(obj):
+        if obj is None or isinstance(obj, (bool, int, float, str)):
+            return obj
+        if isinstance(obj, np.ndarray):
+            array = np.ascontiguousarray(obj)
+            if array.dtype.hasobject:
+                raise CacheSerializationError("object arrays are not cacheable")
+            buffers.append(array.tobytes())
+            return {"__nd__": len(buffers) - 1, "dtype": array.dtype.str, "shape": list(array.shape)}
+        if isinstance(obj, np.generic):
+            return obj.item()
+        if isinstance(obj, (list, tuple)):
+            items = [walk(item) for item in obj]
+            return {"__tuple__": items} if isinstance(obj, tuple) else items
+        if isinstance(obj, dict):
+            if not all(isinstance(k, str) for k in obj):
+                return {"__items__": [[walk(k), walk(v)] for k, v in obj.items()]}
+            if any(k.startswith("__") for k in obj):
+                return {"__dict__": {k: walk(v) for k, v in obj.items()}}
+            return {k: walk(v) for k, v in obj.items()}
+        if isinstance(obj, bytes):
+            return {"__bytes__": base64.b64encode(obj).decode("ascii")}
+        if dataclasses.is_dataclass(obj) and not isinstance(obj, type):
+            name = f"{type(obj).__module__}.{type(obj).__qualname__}"
+            if name not in _DATACLASS_REGISTRY:
+                raise CacheSerializationError(f"dataclass {name} is not registered")
+            fields = {f.name: walk(getattr(obj, f.name)) for f in dataclasses.fields(obj)}
+            return {"__dc__": name, "fields": fields}
+        raise CacheSerializationError(f"unsupported type {type(obj).__name__}")
+
+    header = json.dumps(walk(value), separators=(",", ":")).encode("utf-8")
+    return b"".join([_HEADER.pack(_MAGIC, len(header)), header, *buffers])
+
+
+def decode_value(payload: bytes) -> Any:
+    """Inverse of encode_value()."""
+    magic, header_len = _HEADER.unpack_from(payload)
+    if magic != _MAGIC:
+        raise CacheSerializationError("unknown cache payload format")
+    offset = _HEADER.size
+    tree = json.loads(payload[offset:offset + header_len])
+    offset += header_len
+
+    # Buffers follow the header in order of first appearance
+    data = memoryview(payload)
+
+    def take(dtype: np.dtype, shape) -> np.ndarray:
+        nonlocal offset
+        nbytes = dtype.itemsize * int(np.prod(shape, dtype=np.int64))
+        array = np.frombuffer(data[offset:offset + nbytes], dtype=dtype).reshape(shape).copy()
+        offset += nbytes
+        return array
+
+    def walk(obj):
+        if isinstance(obj, list):
+            return [walk(item) for item in obj]
+        if not isinstance(obj, dict):
+            return obj
+        if "__nd__" in obj:
+            return take(np.dtype(obj["dtype"]), tuple(obj["shape"]))
+        if "__tuple__" in obj:
+            return tuple(walk(item) for item in obj["__tuple__"])
+        if "__items__" in obj:
+            return {_hashable(walk(k)): walk(v) for k, v in obj["__items__"]}
+        if "__dict__" in obj:
+            return {k: walk(v) for k, v in obj["__dict__"].items()}
+        if "__bytes__" in obj:
+            return base64.b64decode(obj["__bytes__"])
+        if "__dc__" in obj:
+            cls = _DATACLASS_REGISTRY.get(obj["__dc__"])
+            if cls is None:
+                raise CacheSerializationError(f"dataclass {obj['__dc__']} is not registered")
+            return cls(**{k: walk(v) for k, v in obj["fields"].items()})
+        return {k: walk(v) for k, v in obj.items()}
+
+    return walk(tree)
+
+
+def _hashable(key: Any) -> Any:
+    return tuple(key) if isinstance(key, list) else key
+
+
+def _checksum(payload: bytes) -> bytes:
+    return hashlib.blake2b(payload, digest_size=16).digest()
+
+
+class DiskCache:
+    """
+    SQLite-backed disk cache tier.
+
+    get() reads synchronously (pending writes are visible immediately);
+    put()/delete()/clear() are queued and applied by a writer thread.
+    """
+
+    def __init__(self,
+                 db_path: Path,
+                 max_bytes: int = 512 * 1024 * 1024,
+                 flush_interval: float = 0.05,
+                 resync_interval: float = 30.0):
+        self.db_path = Path(db_path)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self.max_bytes = max_bytes
+        self.flush_interval = flush_interval
+        self.resync_interval = resync_interval
+
+        self._conn = sqlite3.connect(str(self.db_path), check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS cache (
+                key TEXT PRIMARY KEY,
+                value BLOB NOT NULL,
+                checksum BLOB NOT NULL,
+                size INTEGER NOT NULL,
+                expires_at REAL NOT NULL,
+                accessed_at REAL NOT NULL
+            )
+        """)
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_cache_accessed ON cache(accessed_at)")
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_cache_expires ON cache(expires_at)")
+        self._conn.commit()
+        self._db_lock = threading.Lock()
+        # Running totals, maintained by the writer. Other processes sharing
+        # the file change the table too, so they are only an estimate
+        # between resyncs.
+        self._entries, self._total_bytes = self._count_rows()
+        self._synced_at = time.monotonic()
+
+        self._readers = threading.local()
+        self._reader_conns: List[sqlite3.Connection] = []
+        self._readers_lock = threading.Lock()
+
+        # key -> (payload, checksum, expires_at) or None for pending delete
+        self._pending: Dict[str, Optional[Tuple[bytes, bytes, float]]] = {}
+        self._accessed: Dict[str, float] = {}
+        self._pending_lock = threading.Lock()
+        self._ops: "queue.Queue[Optional[tuple]]" = queue.Queue()
+
+        self.stats_counters = {
+            "hits": 0, "misses": 0, "writes": 0, "write_batches": 0,
+            "evictions": 0, "corrupt": 0, "unserializable": 0
+        }
+
+        self._writer = threading.Thread(target=self._writer_loop, name="disk-cache-writer", daemon=True)
+        self._writer.start()
+
+    # ---- reads -------------------------------------------------------
+
+    def _reader(self) -> sqlite3.Connection:
+        """This thread's read-only connection (opened on first use)"""
+        conn = getattr(self._readers, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(f"file:{self.db_path}?mode=ro", uri=True,
+                                   check_same_thread=False, isolation_level=None)
+            self._readers.conn = conn
+            with self._readers_lock:
+                self._reader_conns.append(conn)
+        return conn
+
+    def get(self, key: str) -> Optional[Tuple[Any, float]]:
+        """Return (value, expires_at wall time) or None."""
+        now = time.time()
+        with self._pending_lock:
+            if key in self._pending:
+                pending = self._pending[key]
+                if pending is None or pending[2] <= now:
+                    self.stats_counters["misses"] += 1
+                    return None
+                payload, checksum, expires_at = pending
+            else:
+                payload = None
+
+        if payload is None:
+            # WAL readers see the last committed batch without blocking on the writer
+            try:
+                row = self._reader().execute(
+                    "SELECT value, checksum, expires_at FROM cache WHERE key = ?", (key,)
+                ).fetchone()
+            except sqlite3.OperationalError as e:
+                logger.debug(f"Disk cache read failed for {key}: {e}")
+                row = None
+            if row is None or row[2] <= now:
+                self.stats_counters["misses"] += 1
+                return None
+            payload, checksum, expires_at = row
+
+        if not isinstance(payload, bytes) or _checksum(payload) != checksum:
+            logger.warning(f"Disk cache checksum mismatch, dropping {key}")
+            self.stats_counters["corrupt"] += 1
+            self.delete(key)
+            return None
+
+        try:
+            value = decode_value(payload)
+        except Exception as e:
+            logger.warning(f"Disk cache decode failed for {key}: {e}")
+            self.stats_counters["corrupt"] += 1
+            self.delete(key)
+            return None
+
+        with self._pending_lock:
+            self._accessed[key] = now
+        self.stats_counters["hits"] += 1
+        return value, expires_at
+
+    # ---- writes (queued) ---------------------------------------------
+
+    def put(self, key: str, value: Any, ttl: float) -> bool:
+        """Queue a value for writing; returns False if it cannot be encoded."""
+        try:
+            payload = encode_value(value)
+        except CacheSerializationError as e:
+            logger.debug(f"Not caching {key} on disk: {e}")
+            self.stats_counters["unserializable"] += 1
+            return False
+
+        with self._pending_lock:
+            self._pending[key] = (payload, _checksum(payload), time.time() + ttl)
+        self._ops.put(("put", key))
+        return True
+
+    def delete(self, key: str):
+        with self._pending_lock:
+            self._pending[key] = None
+        self._ops.put(("delete", key))
+
+    def clear(self, prefix: Optional[str] = None):
+        """Queue removal of all keys, or keys starting with prefix."""
+        with self._pending_lock:
+            for key in list(self._pending):
+                if prefix is None or key.startswith(prefix):
+                    self._pending[key] = None
+        self._ops.put(("clear", prefix))
+
+    def flush(self, timeout: float = 5.0):
+        """Block until queued writes are on disk."""
+        done = threading.Event()
+        self._ops.put(("flush", done))
+        done.wait(timeout)
+
+    def close(self):
+        self.flush()
+        self._ops.put(None)
+        self._writer.join(timeout=5.0)
+        with self._db_lock:
+            self._conn.close()
+        with self._readers_lock:
+            for conn in self._reader_conns:
+                conn.close()
+            self._reader_conns.clear()
+
+    def _writer_loop(self):
+        while True:
+            op = self._ops.get()
+            if op is None:
+                return
+            ops = [op]
+            # Coalesce everything queued within the flush interval
+            deadline = time.monotonic() + self.flush_interval
+            while True:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    nxt = self._ops.get(timeout=remaining)
+                except queue.Empty:
+                    break
+                if nxt is None:
+                    self._apply(ops)
+                    return
+                ops.append(nxt)
+                if nxt[0] == "flush":
+                    break
+            try:
+                self._apply(ops)
+            except Exception as e:
+                logger.warning(f"Disk cache write failed: {e}")
+            for kind, arg in ops:
+                if kind == "flush":
+                    arg.set()
+
+    def _apply(self, ops: List[tuple]):
+        with self._pending_lock:
+            writes = {}
+            for kind, arg in ops:
+                if kind in ("put", "delete") and arg in self._pending:
+                    writes[arg] = self._pending[arg]
+            accessed, self._accessed = self._accessed, {}
+
+        now = time.time()
+        with self._db_lock:
+            # Totals are staged locally and only adopted once the batch commits
+            entries, total = self._entries, self._total_bytes
+            with self._conn:
+                for kind, arg in ops:
+                    if kind == "clear":
+                        if arg is None:
+                            self._conn.execute("DELETE FROM cache")
+                            entries, total = 0, 0
+                        else:
+                            escaped = arg.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+                            count, size = self._delete(
+                                "DELETE FROM cache WHERE key LIKE ? ESCAPE '\\' RETURNING size",
+                                (escaped + "%",))
+                            entries, total = entries - count, total - size
+                for key, pending in writes.items():
+                    count, size = self._delete("DELETE FROM cache WHERE key = ? RETURNING size", (key,))
+                    entries, total = entries - count, total - size
+                    if pending is not None:
+                        payload, checksum, expires_at = pending
+                        self._conn.execute(
+                            "INSERT INTO cache VALUES (?, ?, ?, ?, ?, ?)",
+                            (key, payload, checksum, len(payload), expires_at, now)
+                        )
+                        entries, total = entries + 1, total + len(payload)
+                if accessed:
+                    self._conn.executemany("UPDATE cache SET accessed_at = ? WHERE key = ?",
+                                           [(t, k) for k, t in accessed.items()])
+                count, size = self._delete("DELETE FROM cache WHERE expires_at <= ? RETURNING size", (now,))
+                entries, total = entries - count, total - size
+                # Inside the write transaction the table cannot change under us
+                if total > self.max_bytes or time.monotonic() - self._synced_at >= self.resync_interval:
+                    entries, total = self._count_rows()
+                    self._synced_at = time.monotonic()
+                count, size = self._evict_over_cap(total)
+                entries, total = entries - count, total - size
+            self._entries, self._total_bytes = entries, total
+
+        # Drop pending entries that are now durable (unless overwritten meanwhile)
+        with self._pending_lock:
+            for key, pending in writes.items():
+                if self._pending.get(key, ...) is pending:
+                    del self._pending[key]
+
+        self.stats_counters["writes"] += len(writes)
+        self.stats_counters["write_batches"] += 1
+
+    def _count_rows(self) -> Tuple[int, int]:
+        """Actual (rows, bytes) in the table, including other workers' writes."""
+        return self._conn.execute("SELECT COUNT(*), COALESCE(SUM(size), 0) FROM cache").fetchone()
+
+    def _delete(self, sql: str, params: tuple) -> Tuple[int, int]:
+        """Run a DELETE ... RETURNING size; returns (rows, bytes) removed."""
+        sizes = [row[0] for row in self._conn.execute(sql, params)]
+        return len(sizes), sum(sizes)
+
+    def _evict_over_cap(self, total: int) -> Tuple[int, int]:
+        """Evict LRU rows when total exceeds the cap; returns (rows, bytes) removed."""
+        if total <= self.max_bytes:
+            return 0, 0
+        # Evict least recently used down to 90% of the cap
+        target = total - int(self.max_bytes * 0.9)
+        freed = 0
+        victims = []
+        for key, size in self._conn.execute("SELECT key, size FROM cache ORDER BY accessed_at"):
+            victims.append((key,))
+            freed += size
+            if freed >= target:
+                break
+        self._conn.executemany("DELETE FROM cache WHERE key = ?", victims)
+        self.stats_counters["evictions"] += len(victims)
+        return len(victims), freed
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            **self.stats_counters,
+            "entries": self._entries,
+            "bytes": self._total_bytes,
+            "max_bytes": self.max_bytes,
+            "pending_writes": len(self._pending),
+        }
@@ -0,0 +1,104 @@
+"""
+Structural Fingerprints for v4.0 Cache Keys
+
+Hashes scoring inputs without going through JSON:
+- Canonical compact binary encoding (type tag + length + payload)
+- ndarrays hashed from their raw bytes plus dtype and shape
+- Dataclasses, pydantic models and objects exposing
+  __cache_fingerprint__() are encoded by their fields
+- blake2b (128-bit) over the encoding
+
+The encoding is type-tagged: identical inputs always produce identical
+fingerprints, but values that compare equal across types (1, 1.0 and
+True; a list and a tuple) do not. NumPy scalars encode as the matching
+Python scalar. Dict key and set order do not matter, list order does.
+"""
+
+import dataclasses
+import hashlib
+import struct
+from typing import Any
+
+import numpy as np
+
+_FLOAT = struct.Struct("<d")
+
+
+def _encode(obj: Any, out: bytearray):
+    if obj is None:
+        out += b"N"
+    elif obj is True:
+        out += b"T"
+    elif obj is False:
+        out += b"F"
+    elif isinstance(obj, int):
+        out += b"i%d;" % obj
+    elif isinstance(obj, float):
+        out += b"f" + _FLOAT.pack(obj)
+    elif isinstance(obj, str):
+        data = obj.encode("utf-8")
+        out += b"s%d:" % len(data) + data
+    elif isinstance(obj, (bytes, bytearray, memoryview)):
+        data = bytes(obj)
+        out += b"b%d:" % len(data) + data
+    elif isinstance(obj, np.ndarray):
+        array = np.ascontiguousarray(obj)
+        if array.dtype.hasobject:
+            _encode(array.tolist(), out)
+            return
+        # tobytes() works for every fixed-size dtype (datetime64 and structured
+        # arrays cannot be exported through the buffer protocol); descr keeps
+        # field names and the datetime unit in the header
+        header = f"{array.dtype.descr}{array.shape}".encode("utf-8")
+        out += b"a%d:" % len(header) + header
+        out += array.tobytes()
+    elif isinstance(obj, np.generic):
+        _encode(obj.item(), out)
+    elif isinstance(obj, (list, tuple)):
+        out += (b"l%d:" if isinstance(obj, list) else b"t%d:") % len(obj)
+        for item in obj:
+            _encode(item, out)
+    elif isinstance(obj, dict):
+        out += b"d%d:" % len(obj)
+        for key_bytes, value in sorted((_encoded(k), v) for k, v in obj.items()):
+            out += key_bytes
+            _encode(value, out)
+    elif isinstance(obj, (set, frozenset)):
+        out += b"S%d:" % len(obj)
+        for item_bytes in sorted(_encoded(item) for item in obj):
+            out += item_bytes
+    elif hasattr(obj, "__cache_fingerprint__"):
+        _encode_object(obj, obj.__cache_fingerprint__(), out)
+    elif dataclasses.is_dataclass(obj) and not isinstance(obj, type):
+        _encode_object(obj, [getattr(obj, f.name) for f in dataclasses.fields(obj)], out)
+    elif hasattr(obj, "model_dump"):
+        _encode_object(obj, obj.model_dump(), out)
+    else:
+        raise TypeError(f"Cannot fingerprint {type(obj).__qualname__}")
+
+
+def _encoded(obj: Any) -> bytes:
+    out = bytearray()
+    _encode(obj, out)
+    return bytes(out)
+
+
+def _encode_object(obj: Any, state: Any, out: bytearray):
+    name = type(obj).__qualname__.encode("utf-8")
+    out += b"o%d:" % len(name) + name
+    _encode(state, out)
+
+
+def fingerprint(*parts: Any) -> str:
+    """
+    Fingerprint one or more values.
+
+    Raises:
+        TypeError: if a value has no canonical encoding
+        ValueError: if a value cannot be encoded (e.g. a failing
+            __cache_fingerprint__)
+    """
+    out = bytearray()
+    for part in parts:
+        _encode(part, out)
+    return hashlib.blake2b(out, digest_size=16).hexdigest()
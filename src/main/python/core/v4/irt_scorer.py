@@ -22,11 +22,14 @@ from models.v4.forced_choice import (
     QuartetBlock,
     IRTParameters
 )
+from .disk_cache import register_dataclass
+from .fingerprint import fingerprint
 
 
 logger = logging.getLogger(__name__)
 
 
+@register_dataclass
 @dataclass
 class ThetaEstimate:
     """Estimated latent trait scores with uncertainty"""
@@ -37,6 +40,7 @@ class ThetaEstimate:
     n_iterations: int  # Number of iterations used
 
 
+@register_dataclass
 @dataclass
 class NormativeScores:
     """Normative scores derived from theta estimates"""
@@ -67,6 +71,7 @@ class ThurstonianIRTScorer:
         self.n_dimensions = n_dimensions
         self.parameters: Optional[IRTParameters] = None
         self.norm_data: Optional[Dict] = None
+        self.parameters_version = 'default'
 
         if parameters_path:
             self.load_parameters(parameters_path)
@@ -91,6 +96,7 @@ class ThurstonianIRTScorer:
 
             # Extract normative data for scoring
             self.norm_data = params_dict['normative_data']
+            self.parameters_version = fingerprint(params_dict)
 
             logger.info(f"Loaded IRT parameters from {path}")
 
@@ -98,6 +104,10 @@ class ThurstonianIRTScorer:
             logger.error(f"Failed to load parameters: {e}")
             raise
 
+    def __cache_fingerprint__(self):
+        """Identify the parameter set for cache keys"""
+        return (self.n_dimensions, self.parameters_version)
+
     def estimate_theta(self,
                       response_data: ForcedChoiceBlockResponse,
                       method: str = 'MLE',
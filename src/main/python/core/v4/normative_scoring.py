@@ -12,8 +12,18 @@ import json
 from pathlib import Path
 import logging
 
+from .disk_cache import register_dataclass
+from .fingerprint import fingerprint
+
 logger = logging.getLogger(__name__)
 
+# 批次轉換用的分界 (與 _compute_stanine / _compute_sten / _get_interpretation 相同)
+STANINE_BOUNDS = np.array([4, 11, 23, 40, 60, 77, 89, 96])
+STEN_BOUNDS = np.array([2.3, 6.7, 15.9, 30.9, 50, 69.1, 84.1, 93.3, 97.7])
+INTERPRETATION_BOUNDS = np.array([5, 15, 30, 70, 85, 95])
+INTERPRETATIONS = ("極低（後5%）", "很低（後15%）", "低於平均（後30%）", "平均範圍",
+                   "高於平均（前30%）", "很高（前15%）", "極高（前5%）")
+
 
 @dataclass
 class NormativeData:
@@ -29,6 +39,7 @@ class NormativeData:
     max_value: float
 
 
+@register_dataclass
 @dataclass
 class NormScore:
     """常模分數"""
@@ -66,6 +77,7 @@ class NormativeScorer:
             self.load_norm_data(norm_data_path)
         else:
             self._initialize_default_norms()
+        self.version = fingerprint(self.norm_data)
 
     def _initialize_default_norms(self):
         """初始化預設常模（標準常態分佈）- T1-T12 框架"""
@@ -91,6 +103,10 @@ class NormativeScorer:
                 max_value=3.0
             )
 
+    def __cache_fingerprint__(self) -> str:
+        """常模版本 (供快取鍵使用)"""
+        return self.version
+
     def compute_norm_scores(self,
                            theta_scores: Dict[str, float]) -> Dict[str, NormScore]:
         """
@@ -114,6 +130,57 @@ class NormativeScorer:
 
         return norm_scores
 
+    def compute_norm_scores_batch(self,
+                                  dimensions: List[str],
+                                  theta: np.ndarray,
+                                  present: Optional[np.ndarray] = None) -> List[Dict[str, NormScore]]:
+        """
+        批次計算常模分數 (結果與逐筆 compute_norm_scores 相同)
+
+        Args:
+            dimensions: θ 矩陣各欄的維度
+            theta: (受測者數, 維度數) θ 分數
+            present: 同形狀布林矩陣，False 表示該受測者沒有此維度分數
+
+        Returns:
+            每位受測者的 {維度: NormScore}
+        """
+        theta = np.asarray(theta, dtype=float)
+        if present is None:
+            present = np.ones(theta.shape, dtype=bool)
+        columns = [j for j, dimension in enumerate(dimensions) if dimension in self.norm_data]
+        for dimension in dimensions:
+            if dimension not in self.norm_data:
+                logger.warning(f"維度 {dimension} 沒有常模資料")
+
+        means = np.array([self.norm_data[dimensions[j]].mean for j in columns])
+        sds = np.array([self.norm_data[dimensions[j]].sd for j in columns])
+        z = (theta[:, columns] - means) / sds
+        percentile = stats.norm.cdf(z) * 100
+        t_score = np.clip(50 + 10 * z, 20, 80)
+        stanine = np.searchsorted(STANINE_BOUNDS, percentile, side="right") + 1
+        sten = np.searchsorted(STEN_BOUNDS, percentile, side="right") + 1
+        interpretation = np.searchsorted(INTERPRETATION_BOUNDS, percentile, side="right")
+
+        results = []
+        for i in range(theta.shape[0]):
+            row = {}
+            for k, j in enumerate(columns):
+                if not present[i, j]:
+                    continue
+                row[dimensions[j]] = NormScore(
+                    dimension=dimensions[j],
+                    raw_theta=float(theta[i, j]),
+                    percentile=round(percentile[i, k], 1),
+                    t_score=round(t_score[i, k], 1),
+                    stanine=int(stanine[i, k]),
+                    sten=int(sten[i, k]),
+                    z_score=round(float(z[i, k]), 2),
+                    interpretation=INTERPRETATIONS[interpretation[i, k]]
+                )
+            results.append(row)
+        return results
+
     def _compute_single_norm(self,
                             dimension: str,
                             theta: float) -> NormScore:
@@ -326,6 +393,7 @@ class NormativeScorer:
                 max_value=norm_dict['max_value']
             )
 
+        self.version = fingerprint(self.norm_data)
         logger.info(f"已載入 {len(self.norm_data)} 個維度的常模資料")
 
     def get_strength_profile(self,
@@ -9,30 +9,242 @@ Implements caching and performance optimizations for:
 4. Block design generation
 """
 
-import hashlib
-import json
+import heapq
+import inspect
+import sys
+import threading
 import time
-from typing import Dict, List, Any, Optional, Tuple
-from functools import lru_cache
+from collections import OrderedDict
+from typing import Dict, Iterable, List, Any, Optional, Tuple
+from functools import lru_cache, wraps
 from pathlib import Path
 import numpy as np
-from dataclasses import dataclass, asdict
-import pickle
 import logging
 
+from utils.cache import (ARTIFACT_IRT_PARAMETERS, ARTIFACT_STATEMENT_BANK,
+                         CacheManager, get_cache_manager)
+from .disk_cache import DiskCache
+from .fingerprint import fingerprint
+
 logger = logging.getLogger(__name__)
 
 
-@dataclass
-class CacheEntry:
-    """Cache entry with expiration"""
-    data: Any
-    timestamp: float
-    ttl: float  # Time to live in seconds
+# Default per-prefix byte quotas: each prefix evicts only within its own
+# budget, so a burst of theta results cannot push out norm tables.
+DEFAULT_PREFIX_QUOTAS: Dict[str, int] = {
+    'norm': 32 * 1024 * 1024,
+    'theta': 128 * 1024 * 1024,
+    'blocks': 32 * 1024 * 1024,
+}
+
+# Share of the memory budget always left to keys outside the quota
+# prefixes; larger quotas are scaled down proportionally.
+MIN_SHARED_FRACTION = 0.25
+
+
+def estimate_size(data: Any, _depth: int = 0) -> int:
+    """
+    Approximate in-memory size of a cached value in bytes.
+
+    ndarrays report their buffer size; containers are walked a few
+    levels deep, which is accurate enough for budgeting.
+    """
+    if isinstance(data, np.ndarray):
+        return data.nbytes + 112
+    size = sys.getsizeof(data)
+    if _depth >= 3:
+        return size
+    if isinstance(data, dict):
+        size += sum(estimate_size(k, _depth + 1) + estimate_size(v, _depth + 1)
+                    for k, v in data.items())
+    elif isinstance(data, (list, tuple, set, frozenset)):
+        size += sum(estimate_size(item, _depth + 1) for item in data)
+    elif hasattr(data, '__dict__'):
+        size += estimate_size(vars(data), _depth + 1)
+    return size
+
+
+class _MemoryEntry:
+    __slots__ = ('data', 'size', 'expires_at')
+
+    def __init__(self, data: Any, size: int, expires_at: float):
+        self.data = data
+        self.size = size
+        self.expires_at = expires_at
+
+
+class _Partition:
+    """One LRU partition with its own byte budget."""
+
+    def __init__(self, max_bytes: int):
+        self.entries: 'OrderedDict[str, _MemoryEntry]' = OrderedDict()
+        self.max_bytes = max_bytes
+        self.bytes = 0
+        self.evictions = 0
+
+    def fill_ratio(self) -> float:
+        """Share of the byte quota in use (a zero quota with entries counts as infinitely full)."""
+        if self.max_bytes <= 0:
+            return float('inf') if self.entries else 0.0
+        return self.bytes / self.max_bytes
+
+
+class MemoryTier:
+    """
+    In-memory cache tier for the optimizer.
+
+    - O(1) LRU: OrderedDict per partition, refreshed on every hit
+    - TTL expiry heap: expired entries are purged in order of expiry
+    - Byte limits: eviction is driven by estimated size, not entry count
+    - Per-prefix quotas: keys matching a quota prefix live in their own
+      partition; everything else shares the remaining budget (at least
+      MIN_SHARED_FRACTION of it: quotas that do not fit are scaled down
+      proportionally, so partitions never exceed max_bytes). When the
+      global entry cap is hit, the partition most over its quota (by
+      fill ratio) gives up its LRU entry
+    """
 
-    def is_valid(self) -> bool:
-        """Check if cache entry is still valid"""
-        return time.time() - self.timestamp < self.ttl
+    def __init__(self,
+                 max_entries: int = 10000,
+                 max_bytes: int = 256 * 1024 * 1024,
+                 prefix_quotas: Optional[Dict[str, int]] = None):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+
+        quotas = DEFAULT_PREFIX_QUOTAS if prefix_quotas is None else prefix_quotas
+        quota_budget = int(max_bytes * (1 - MIN_SHARED_FRACTION))
+        if sum(quotas.values()) > quota_budget:
+            scale = quota_budget / sum(quotas.values())
+            quotas = {prefix: int(quota * scale) for prefix, quota in quotas.items()}
+        # Longest prefix wins when quota prefixes overlap
+        self._quota_prefixes = sorted(quotas, key=len, reverse=True)
+        self._partitions: Dict[str, _Partition] = {
+            prefix: _Partition(quota) for prefix, quota in quotas.items()
+        }
+        self._partitions[''] = _Partition(max(0, max_bytes - sum(quotas.values())))
+
+        self._expiry_heap: List[Tuple[float, str]] = []
+        self._lock = threading.RLock()
+        self.expirations = 0
+
+    def _partition_for(self, key: str) -> _Partition:
+        for prefix in self._quota_prefixes:
+            if key.startswith(prefix):
+                return self._partitions[prefix]
+        return self._partitions['']
+
+    def __len__(self) -> int:
+        return sum(len(p.entries) for p in self._partitions.values())
+
+    def __contains__(self, key: str) -> bool:
+        """True for a live entry; does not touch LRU order or remove expired entries."""
+        with self._lock:
+            entry = self._partition_for(key).entries.get(key)
+            return entry is not None and entry.expires_at > time.monotonic()
+
+    def get(self, key: str) -> Optional[Any]:
+        """Return a live entry and mark it most recently used."""
+        with self._lock:
+            partition = self._partition_for(key)
+            entry = partition.entries.get(key)
+            if entry is None:
+                return None
+            if entry.expires_at <= time.monotonic():
+                self._remove(partition, key)
+                self.expirations += 1
+                return None
+            partition.entries.move_to_end(key)
+            return entry.data
+
+    def put(self, key: str, data: Any, ttl: float):
+        """Insert or replace an entry, evicting LRU entries over budget."""
+        size = estimate_size(data)
+        expires_at = time.monotonic() + ttl
+
+        with self._lock:
+            self._purge_expired()
+            partition = self._partition_for(key)
+            if size > partition.max_bytes:
+                logger.debug(f"Value too large for memory cache: {key} ({size} bytes)")
+                self._remove(partition, key)
+                return
+
+            if key in partition.entries:
+                self._remove(partition, key)
+            partition.entries[key] = _MemoryEntry(data, size, expires_at)
+            partition.bytes += size
+            heapq.heappush(self._expiry_heap, (expires_at, key))
+
+            while partition.bytes > partition.max_bytes:
+                self._evict_lru(partition)
+            while len(self) > self.max_entries:
+                self._evict_lru(max((p for p in self._partitions.values() if p.entries),
+                                    key=_Partition.fill_ratio))
+
+    def delete(self, key: str):
+        with self._lock:
+            self._remove(self._partition_for(key), key)
+
+    def clear(self, prefix: Optional[str] = None):
+        """Drop all entries, or only keys starting with prefix."""
+        with self._lock:
+            for partition in self._partitions.values():
+                if prefix is None:
+                    partition.entries.clear()
+                    partition.bytes = 0
+                else:
+                    for key in [k for k in partition.entries if k.startswith(prefix)]:
+                        self._remove(partition, key)
+            if prefix is None:
+                self._expiry_heap.clear()
+
+    def _remove(self, partition: _Partition, key: str):
+        entry = partition.entries.pop(key, None)
+        if entry is not None:
+            partition.bytes -= entry.size
+
+    def _evict_lru(self, partition: _Partition):
+        key, entry = partition.entries.popitem(last=False)
+        partition.bytes -= entry.size
+        partition.evictions += 1
+        logger.debug(f"Evicted from memory cache: {key}")
+
+    def _purge_expired(self):
+        now = time.monotonic()
+        heap = self._expiry_heap
+        while heap and heap[0][0] <= now:
+            expires_at, key = heapq.heappop(heap)
+            partition = self._partition_for(key)
+            entry = partition.entries.get(key)
+            # Skip heap records superseded by a later put
+            if entry is not None and entry.expires_at == expires_at:
+                self._remove(partition, key)
+                self.expirations += 1
+        # Stale records from replaced/evicted keys accumulate; rebuild when
+        # the heap outgrows the live entries by a wide margin.
+        if len(heap) > 2 * len(self) + 1024:
+            self._expiry_heap = [(e.expires_at, k)
+                                 for p in self._partitions.values()
+                                 for k, e in p.entries.items()]
+            heapq.heapify(self._expiry_heap)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                'entries': len(self),
+                'bytes': sum(p.bytes for p in self._partitions.values()),
+                'max_bytes': self.max_bytes,
+                'expirations': self.expirations,
+                'partitions': {
+                    prefix or '*': {
+                        'entries': len(p.entries),
+                        'bytes': p.bytes,
+                        'max_bytes': p.max_bytes,
+                        'evictions': p.evictions
+                    }
+                    for prefix, p in self._partitions.items()
+                }
+            }
 
 
 class PerformanceOptimizer:
@@ -41,14 +253,18 @@ class PerformanceOptimizer:
 
     Implements multiple caching strategies:
     - Memory cache for frequently accessed data
-    - File cache for expensive computations
+    - Disk cache (single SQLite file, async writes) for expensive computations
     - LRU cache for function results
     """
 
     def __init__(self,
                  cache_dir: Optional[Path] = None,
-                 max_memory_cache: int = 100,
-                 default_ttl: float = 3600):
+                 max_memory_cache: int = 10000,
+                 default_ttl: float = 3600,
+                 max_memory_bytes: int = 256 * 1024 * 1024,
+                 prefix_quotas: Optional[Dict[str, int]] = None,
+                 max_disk_bytes: int = 512 * 1024 * 1024,
+                 cache_manager: Optional[CacheManager] = None):
         """
         Initialize performance optimizer.
 
@@ -56,45 +272,85 @@ class PerformanceOptimizer:
             cache_dir: Directory for file-based cache
             max_memory_cache: Maximum number of items in memory cache
             default_ttl: Default time-to-live for cache entries (seconds)
+            max_memory_bytes: Estimated byte budget for the memory cache
+            prefix_quotas: Per-prefix byte quotas (defaults to DEFAULT_PREFIX_QUOTAS)
+            max_disk_bytes: Size cap for the disk cache file
+            cache_manager: Manager whose artifact versions and tag index are
+                shared (defaults to the global one)
         """
         self.cache_dir = cache_dir or Path('cache/v4')
         self.cache_dir.mkdir(parents=True, exist_ok=True)
 
-        self.memory_cache: Dict[str, CacheEntry] = {}
+        self.memory_cache = MemoryTier(max_entries=max_memory_cache,
+                                       max_bytes=max_memory_bytes,
+                                       prefix_quotas=prefix_quotas)
+        self.disk_cache = DiskCache(self.cache_dir / 'cache.db', max_bytes=max_disk_bytes)
         self.max_memory_cache = max_memory_cache
         self.default_ttl = default_ttl
 
+        # Versions of the artifacts results depend on (IRT parameters, norms,
+        # statement bank) come from the cache manager's tag index, so one
+        # publish_version() covers both caches. A key embeds the versions of
+        # its own dependencies, so entries persisted on disk by an older
+        # process are never served; live dependents are dropped on publish.
+        self.cache_manager = cache_manager or get_cache_manager()
+        self.dependencies = self.cache_manager.dependencies
+        self.dependencies.subscribe(self._drop_dependents)
+
         # Performance metrics
         self.cache_hits = 0
         self.cache_misses = 0
+        self.memory_hits = 0
+        self.disk_hits = 0
         self.computation_times: List[float] = []
 
-    def get_cache_key(self, prefix: str, data: Any) -> str:
+    @property
+    def table_versions(self) -> Dict[str, str]:
+        return self.dependencies.versions
+
+    def get_cache_key(self, prefix: str, data: Any, depends_on: Iterable[str] = ()) -> str:
         """
         Generate cache key from prefix and data.
 
         Args:
             prefix: Cache key prefix (e.g., 'theta_estimation')
-            data: Data to hash
+            data: Data to hash (see core.v4.fingerprint for supported types)
+            depends_on: Artifacts whose current versions are part of the key
 
         Returns:
             Unique cache key
         """
-        # Convert data to JSON string for hashing
-        if isinstance(data, (dict, list)):
-            data_str = json.dumps(data, sort_keys=True)
-        elif isinstance(data, np.ndarray):
-            data_str = data.tobytes()
-        else:
-            data_str = str(data)
-
-        # Generate hash
-        hash_obj = hashlib.md5(data_str.encode())
-        return f"{prefix}_{hash_obj.hexdigest()}"
+        versions = self.dependencies.versions_of(sorted(depends_on))
+        return f"{prefix}_{fingerprint(versions, data)}"
+
+    async def publish_version(self, name: str, version: str) -> List[str]:
+        """
+        Publish the version of an artifact cached results depend on.
+
+        Delegates to the cache manager: entries saved with depends_on
+        including name are deleted from both caches; other entries are
+        untouched.
+
+        Args:
+            name: Artifact name (e.g., 'irt_parameters', 'norms')
+            version: Version or content fingerprint of the loaded artifact
+
+        Returns:
+            The invalidated keys (empty when the version is unchanged)
+        """
+        return await self.cache_manager.publish_version(name, version)
+
+    def _drop_dependents(self, keys: List[str]):
+        """Tag index listener: delete invalidated keys from the optimizer tiers"""
+        for key in keys:
+            if key in self.memory_cache:
+                self.memory_cache.delete(key)
+            self.disk_cache.delete(key)
+        logger.debug(f"Dropped {len(keys)} dependent entries from the v4 caches")
 
     def get_from_cache(self, key: str) -> Optional[Any]:
         """
-        Retrieve data from cache (memory first, then file).
+        Retrieve data from cache (memory first, then disk).
 
         Args:
             key: Cache key
@@ -103,72 +359,47 @@ class PerformanceOptimizer:
             Cached data or None if not found/expired
         """
         # Check memory cache first
-        if key in self.memory_cache:
-            entry = self.memory_cache[key]
-            if entry.is_valid():
-                self.cache_hits += 1
-                logger.debug(f"Memory cache hit: {key}")
-                return entry.data
-            else:
-                # Remove expired entry
-                del self.memory_cache[key]
-
-        # Check file cache
-        cache_file = self.cache_dir / f"{key}.pkl"
-        if cache_file.exists():
-            try:
-                with open(cache_file, 'rb') as f:
-                    entry = pickle.load(f)
-                if isinstance(entry, CacheEntry) and entry.is_valid():
-                    # Promote to memory cache
-                    self._add_to_memory_cache(key, entry)
-                    self.cache_hits += 1
-                    logger.debug(f"File cache hit: {key}")
-                    return entry.data
-                else:
-                    # Remove expired file
-                    cache_file.unlink()
-            except Exception as e:
-                logger.warning(f"Failed to load cache file {cache_file}: {e}")
+        data = self.memory_cache.get(key)
+        if data is not None:
+            self.cache_hits += 1
+            self.memory_hits += 1
+            logger.debug(f"Memory cache hit: {key}")
+            return data
+
+        # Check disk cache
+        found = self.disk_cache.get(key)
+        if found is not None:
+            data, expires_at = found
+            # Promote to memory cache for the remaining lifetime
+            remaining = expires_at - time.time()
+            if remaining > 0:
+                self.memory_cache.put(key, data, remaining)
+            self.cache_hits += 1
+            self.disk_hits += 1
+            logger.debug(f"Disk cache hit: {key}")
+            return data
 
         self.cache_misses += 1
         return None
 
-    def save_to_cache(self, key: str, data: Any, ttl: Optional[float] = None):
+    def save_to_cache(self, key: str, data: Any, ttl: Optional[float] = None,
+                      depends_on: Iterable[str] = ()):
         """
-        Save data to cache (both memory and file).
+        Save data to cache (memory now, disk in the background).
 
         Args:
             key: Cache key
             data: Data to cache
             ttl: Time-to-live in seconds
+            depends_on: Artifacts the data was computed from
         """
         ttl = ttl or self.default_ttl
-        entry = CacheEntry(data=data, timestamp=time.time(), ttl=ttl)
-
-        # Save to memory cache
-        self._add_to_memory_cache(key, entry)
-
-        # Save to file cache
-        cache_file = self.cache_dir / f"{key}.pkl"
-        try:
-            with open(cache_file, 'wb') as f:
-                pickle.dump(entry, f)
-            logger.debug(f"Saved to cache: {key}")
-        except Exception as e:
-            logger.warning(f"Failed to save cache file {cache_file}: {e}")
-
-    def _add_to_memory_cache(self, key: str, entry: CacheEntry):
-        """Add entry to memory cache with LRU eviction"""
-        # Evict oldest entries if cache is full
-        if len(self.memory_cache) >= self.max_memory_cache:
-            # Remove oldest entry
-            oldest_key = min(self.memory_cache.keys(),
-                           key=lambda k: self.memory_cache[k].timestamp)
-            del self.memory_cache[oldest_key]
-            logger.debug(f"Evicted from memory cache: {oldest_key}")
-
-        self.memory_cache[key] = entry
+
+        self.dependencies.track(key, depends_on)
+        self.memory_cache.put(key, data, ttl)
+        # Queued; values that cannot be encoded stay memory-only
+        self.disk_cache.put(key, data, ttl)
+        logger.debug(f"Saved to cache: {key}")
 
     def cache_theta_estimation(self,
                               responses: List[Dict],
@@ -184,8 +415,9 @@ class PerformanceOptimizer:
             theta: Estimated theta values
             ttl: Cache duration (2 hours default)
         """
-        key = self.get_cache_key('theta', {'responses': responses, 'blocks': blocks})
-        self.save_to_cache(key, theta, ttl)
+        key = self.get_cache_key('theta', {'responses': responses, 'blocks': blocks},
+                                 depends_on=(ARTIFACT_IRT_PARAMETERS,))
+        self.save_to_cache(key, theta, ttl, depends_on=(ARTIFACT_IRT_PARAMETERS,))
 
     def get_cached_theta(self,
                         responses: List[Dict],
@@ -200,7 +432,8 @@ class PerformanceOptimizer:
         Returns:
             Cached theta values or None
         """
-        key = self.get_cache_key('theta', {'responses': responses, 'blocks': blocks})
+        key = self.get_cache_key('theta', {'responses': responses, 'blocks': blocks},
+                                 depends_on=(ARTIFACT_IRT_PARAMETERS,))
         return self.get_from_cache(key)
 
     @lru_cache(maxsize=128)
@@ -234,7 +467,7 @@ class PerformanceOptimizer:
         key = self.get_cache_key('blocks', {
             'num_statements': len(statements),
             'num_blocks': num_blocks
-        })
+        }, depends_on=(ARTIFACT_STATEMENT_BANK,))
         return key
 
     def clear_cache(self, prefix: Optional[str] = None):
@@ -245,18 +478,15 @@ class PerformanceOptimizer:
             prefix: Clear only entries with this prefix
         """
         # Clear memory cache
+        self.memory_cache.clear(prefix or None)
+
+        # Clear disk cache
+        self.disk_cache.clear(prefix or None)
+
+        # Only prefixed clears drop tags: the index is shared with the cache
+        # manager, and tags of deleted keys are harmless until aged out.
         if prefix:
-            keys_to_remove = [k for k in self.memory_cache.keys()
-                            if k.startswith(prefix)]
-            for key in keys_to_remove:
-                del self.memory_cache[key]
-        else:
-            self.memory_cache.clear()
-
-        # Clear file cache
-        for cache_file in self.cache_dir.glob('*.pkl'):
-            if not prefix or cache_file.stem.startswith(prefix):
-                cache_file.unlink()
+            self.dependencies.forget(prefix)
 
         logger.info(f"Cache cleared: {prefix or 'all'}")
 
@@ -270,11 +500,20 @@ class PerformanceOptimizer:
         hit_rate = (self.cache_hits / (self.cache_hits + self.cache_misses) * 100
                    if (self.cache_hits + self.cache_misses) > 0 else 0)
 
+        memory_stats = self.memory_cache.stats()
+
         return {
             'cache_hits': self.cache_hits,
             'cache_misses': self.cache_misses,
             'hit_rate': hit_rate,
-            'memory_cache_size': len(self.memory_cache),
+            'memory_hits': self.memory_hits,
+            'disk_hits': self.disk_hits,
+            'memory_cache_size': memory_stats['entries'],
+            'memory_cache_bytes': memory_stats['bytes'],
+            'memory_cache': memory_stats,
+            'table_versions': dict(self.table_versions),
+            'dependencies': self.dependencies.stats(),
+            'disk_cache': self.disk_cache.stats(),
             'avg_computation_time': (np.mean(self.computation_times)
                                     if self.computation_times else 0),
             'total_computations': len(self.computation_times)
@@ -301,24 +540,49 @@ def get_optimizer() -> PerformanceOptimizer:
 
 
 # Decorator for automatic caching
-def cached_computation(prefix: str, ttl: float = 3600):
+def cached_computation(prefix: str, ttl: float = 3600, depends_on: Iterable[str] = ()):
     """
     Decorator for caching expensive computations.
 
+    For methods, the instance is keyed by its __cache_fingerprint__();
+    instances without one are not cached, since two instances of a class
+    may hold different state. Class methods are keyed by the class.
+
     Args:
         prefix: Cache key prefix
         ttl: Time-to-live in seconds
+        depends_on: Artifacts (e.g. 'norms') whose new versions invalidate results
     """
+    depends_on = tuple(depends_on)
+
     def decorator(func):
+        params = list(inspect.signature(func).parameters)
+        is_method = bool(params) and params[0] in ('self', 'cls')
+
+        @wraps(func)
         def wrapper(*args, **kwargs):
             optimizer = get_optimizer()
 
+            key_args = args
+            if is_method and args:
+                owner = args[0]
+                if isinstance(owner, type):
+                    owner_key = f"{owner.__module__}.{owner.__qualname__}"
+                elif hasattr(owner, '__cache_fingerprint__'):
+                    owner_key = owner.__cache_fingerprint__()
+                else:
+                    logger.debug(f"Not caching {func.__name__}: "
+                                 f"{type(owner).__qualname__} has no __cache_fingerprint__")
+                    return func(*args, **kwargs)
+                key_args = (owner_key,) + args[1:]
+
             # Generate cache key
-            cache_data = {
-                'args': args,
-                'kwargs': kwargs
-            }
-            key = optimizer.get_cache_key(f"{prefix}_{func.__name__}", cache_data)
+            try:
+                key = optimizer.get_cache_key(f"{prefix}_{func.__name__}", (key_args, kwargs),
+                                              depends_on)
+            except (TypeError, ValueError) as e:
+                logger.debug(f"Not caching {func.__name__}: {e}")
+                return func(*args, **kwargs)
 
             # Check cache
             result = optimizer.get_from_cache(key)
@@ -334,7 +598,7 @@ def cached_computation(prefix: str, ttl: float = 3600):
             optimizer.track_computation_time(duration)
 
             # Cache result
-            optimizer.save_to_cache(key, result, ttl)
+            optimizer.save_to_cache(key, result, ttl, depends_on)
 
             return result
         return wrapper
@@ -1,14 +1,107 @@
 """
 Strength DNA 雙軌色帶視覺化模組
 創建精美的 T1-T12 才幹強度排序視覺效果
+
+段落的漸層、發光、圖案與成長潛力只取決於維度與百分位數，
+以 (維度, 百分位區間) 為鍵查表；每次請求只即時計算排序、寬度與摘要。
+完整的 JSON 片段依常模分數快取。
 """
 
 import numpy as np
-from typing import Dict, List, Tuple
+from typing import Dict, List, Optional, Tuple
+from collections import OrderedDict
 from dataclasses import dataclass
 import json
+import threading
 import time
 
+# 百分位區間解析度：常模分數的百分位數取至小數一位，每 0.1 一個區間
+PERCENTILE_BUCKETS_PER_POINT = 10
+
+DEFAULT_DIMENSION_COLORS = {
+    'primary': '#6b7280',
+    'secondary': '#d1d5db',
+    'category': 'other'
+}
+
+PATTERN_TEMPLATES = {
+    'execution': {
+        'type': 'diagonal-lines',
+        'spacing': 8,
+        'angle': 45
+    },
+    'influencing': {
+        'type': 'dots',
+        'size': 3,
+        'spacing': 10
+    },
+    'relationship': {
+        'type': 'waves',
+        'amplitude': 4,
+        'frequency': 0.5
+    },
+    'thinking': {
+        'type': 'hexagons',
+        'size': 6,
+        'spacing': 12
+    }
+}
+
+# 段落中會以巢狀 dict 回傳的查表欄位 (回傳前逐一複製)
+_NESTED_ASSET_FIELDS = ('gradient_primary', 'gradient_secondary', 'glow_effect', 'pattern_overlay')
+
+
+def percentile_bucket(percentile: float) -> int:
+    """百分位數所屬的區間 (0-1000)"""
+    return int(round(percentile * PERCENTILE_BUCKETS_PER_POINT))
+
+
+class DNAFragmentCache:
+    """
+    視覺化 JSON 片段的 LRU 快取
+
+    片段在呼叫端之間共用 (只供序列化回應，不可修改)。
+    視覺化器透過 component registry 共用，因此需要加鎖。
+    """
+
+    def __init__(self, max_entries: int = 1024):
+        self.max_entries = max(1, max_entries)
+        self._entries: "OrderedDict[tuple, Dict]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: tuple) -> Optional[Dict]:
+        with self._lock:
+            fragment = self._entries.get(key)
+            if fragment is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return fragment
+
+    def put(self, key: tuple, fragment: Dict):
+        with self._lock:
+            self._entries[key] = fragment
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> Dict:
+        total = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "max_entries": self.max_entries,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / total if total else 0.0
+        }
+
 
 @dataclass
 class StrengthDNA:
@@ -79,9 +172,12 @@ class StrengthDNAVisualizer:
         }
     }
 
-    def __init__(self):
+    def __init__(self, fragment_cache_size: int = 1024):
         """初始化視覺化器"""
         self._setup_color_mappings()
+        self._setup_color_assets()
+        self._segment_assets: Dict[Tuple[str, int], Dict] = {}
+        self.fragment_cache = DNAFragmentCache(fragment_cache_size)
 
     def _setup_color_mappings(self):
         """設定維度到顏色的映射"""
@@ -99,6 +195,24 @@ class StrengthDNAVisualizer:
                     'category': category
                 }
 
+    def _setup_color_assets(self):
+        """預先混合各維度漸層所需的顏色 (與百分位數無關)"""
+        self._color_assets = {
+            dimension: self._build_color_assets(colors)
+            for dimension, colors in self.dimension_colors.items()
+        }
+        self._default_color_assets = self._build_color_assets(DEFAULT_DIMENSION_COLORS)
+
+    def _build_color_assets(self, colors: Dict) -> Dict:
+        primary, secondary = colors['primary'], colors['secondary']
+        return {
+            'primary': (primary, self._blend_colors(primary, secondary, 0.3), secondary),
+            'secondary': (secondary,
+                          self._blend_colors(secondary, '#ffffff', 0.4),
+                          self._blend_colors(secondary, '#ffffff', 0.7)),
+            'category': colors['category']
+        }
+
     def _lighten_color(self, hex_color: str, factor: float = 0.3) -> str:
         """將顏色變淺"""
         hex_color = hex_color.lstrip('#')
@@ -128,11 +242,7 @@ class StrengthDNAVisualizer:
         )
 
         for rank, (dimension, score) in enumerate(sorted_scores, 1):
-            color_info = self.dimension_colors.get(dimension, {
-                'primary': '#6b7280',
-                'secondary': '#d1d5db',
-                'category': 'other'
-            })
+            color_info = self.dimension_colors.get(dimension, DEFAULT_DIMENSION_COLORS)
 
             dna_item = StrengthDNA(
                 dimension=dimension,
@@ -159,40 +269,28 @@ class StrengthDNAVisualizer:
         Returns:
             視覺化配置字典
         """
-        # 計算色帶段落
+        # 計算色帶段落：視覺屬性查表，只有寬度依使用者即時計算
         dna_segments = []
         total_length = 100  # 總長度百分比
 
-        for i, item in enumerate(dna_items):
+        for item in dna_items:
             # 計算每個段落的長度（基於強度權重）
-            if len(dna_items) > 0:
-                base_width = total_length / len(dna_items)
-                # 根據百分位數調整寬度
-                strength_factor = (item.percentile / 100) * 0.5 + 0.75  # 0.75-1.25倍
-                segment_width = base_width * strength_factor
-            else:
-                segment_width = total_length
-
-            # 計算漸層效果
-            gradient_stops = self._create_gradient_stops(
-                item.color_primary,
-                item.color_secondary,
-                item.percentile
-            )
+            base_width = total_length / len(dna_items)
+            # 根據百分位數調整寬度
+            strength_factor = (item.percentile / 100) * 0.5 + 0.75  # 0.75-1.25倍
+            assets = self._get_segment_assets(item.dimension, item.percentile)
 
             segment = {
                 'dimension': item.dimension,
                 'name': item.name,
                 'rank': item.rank,
-                'width_percent': segment_width,
+                'width_percent': base_width * strength_factor,
                 'percentile': item.percentile,
                 'category': item.category,
-                'gradient_primary': gradient_stops['primary'],
-                'gradient_secondary': gradient_stops['secondary'],
-                'intensity': self._calculate_intensity(item.percentile),
-                'glow_effect': self._calculate_glow(item.percentile),
-                'pattern_overlay': self._get_pattern_overlay(item.category, item.percentile)
+                'intensity': assets['intensity']
             }
+            for field in _NESTED_ASSET_FIELDS:
+                segment[field] = dict(assets[field])
             dna_segments.append(segment)
 
         # 歸一化寬度
@@ -208,22 +306,50 @@ class StrengthDNAVisualizer:
             'strength_narrative': self._generate_strength_narrative(dna_items)
         }
 
-    def _create_gradient_stops(self, primary: str, secondary: str, percentile: float) -> Dict:
-        """創建漸層色階"""
+    def _get_segment_assets(self, dimension: str, percentile: float) -> Dict:
+        """
+        查詢 (維度, 百分位區間) 的視覺屬性，首次使用時建立
+
+        回傳的是共用的表格內容，呼叫端不可修改。
+        """
+        key = (dimension, percentile_bucket(percentile))
+        assets = self._segment_assets.get(key)
+        if assets is None:
+            assets = self._build_segment_assets(dimension, key[1] / PERCENTILE_BUCKETS_PER_POINT)
+            self._segment_assets[key] = assets
+        return assets
+
+    def _build_segment_assets(self, dimension: str, percentile: float) -> Dict:
+        """以區間的百分位數計算一筆視覺屬性"""
+        colors = self._color_assets.get(dimension, self._default_color_assets)
+        gradient_stops = self._create_gradient_stops(colors, percentile)
+        return {
+            'gradient_primary': gradient_stops['primary'],
+            'gradient_secondary': gradient_stops['secondary'],
+            'intensity': self._calculate_intensity(percentile),
+            'glow_effect': self._calculate_glow(percentile),
+            'pattern_overlay': self._get_pattern_overlay(colors['category'], percentile),
+            'growth_potential': self._calculate_growth_potential(percentile)
+        }
+
+    def _create_gradient_stops(self, colors: Dict, percentile: float) -> Dict:
+        """創建漸層色階 (顏色取自預先混合的 _color_assets)"""
         intensity = percentile / 100
+        primary_start, primary_middle, primary_end = colors['primary']
+        secondary_start, secondary_middle, secondary_end = colors['secondary']
 
         return {
             'primary': {
-                'start': primary,
-                'middle': self._blend_colors(primary, secondary, 0.3),
-                'end': secondary,
+                'start': primary_start,
+                'middle': primary_middle,
+                'end': primary_end,
                 'opacity_start': min(1.0, 0.6 + intensity * 0.4),
                 'opacity_end': min(1.0, 0.3 + intensity * 0.3)
             },
             'secondary': {
-                'start': secondary,
-                'middle': self._blend_colors(secondary, '#ffffff', 0.4),
-                'end': self._blend_colors(secondary, '#ffffff', 0.7),
+                'start': secondary_start,
+                'middle': secondary_middle,
+                'end': secondary_end,
                 'opacity_start': min(0.8, 0.4 + intensity * 0.4),
                 'opacity_end': min(0.6, 0.2 + intensity * 0.2)
             }
@@ -267,30 +393,7 @@ class StrengthDNAVisualizer:
 
     def _get_pattern_overlay(self, category: str, percentile: float) -> Dict:
         """獲取圖案覆蓋效果"""
-        patterns = {
-            'execution': {
-                'type': 'diagonal-lines',
-                'spacing': 8,
-                'angle': 45
-            },
-            'influencing': {
-                'type': 'dots',
-                'size': 3,
-                'spacing': 10
-            },
-            'relationship': {
-                'type': 'waves',
-                'amplitude': 4,
-                'frequency': 0.5
-            },
-            'thinking': {
-                'type': 'hexagons',
-                'size': 6,
-                'spacing': 12
-            }
-        }
-
-        pattern = patterns.get(category, {'type': 'none'})
+        pattern = dict(PATTERN_TEMPLATES.get(category, {'type': 'none'}))
         pattern['opacity'] = float(min(0.3, (percentile / 100) * 0.2))
         pattern['enabled'] = bool(percentile >= 60)
 
@@ -423,7 +526,7 @@ class StrengthDNAVisualizer:
                     'rank': item.rank,
                     'name': item.name,
                     'percentile': item.percentile,
-                    'growth_potential': self._calculate_growth_potential(item.percentile),
+                    'growth_potential': self._get_segment_assets(item.dimension, item.percentile)['growth_potential'],
                     'category': self.CATEGORY_THEMES[item.category]['name']
                 }
                 for item in bottom_3
@@ -497,6 +600,36 @@ class StrengthDNAVisualizer:
         return recommendations.get(balance_type, [])
 
 
+    def build_fragment(self, norm_scores: Dict) -> Dict:
+        """
+        生成 DNA 數據與視覺化 (可快取的 JSON 片段)
+
+        以各維度的常模分數為鍵；相同分數 (例如結果頁重複查詢同一 session)
+        直接取用快取的片段。片段為共用物件，呼叫端不可修改。
+
+        Args:
+            norm_scores: 常模分數字典 {dimension: NormScore}
+
+        Returns:
+            {'dna_data': [...], 'visualization': {...}}
+        """
+        key = tuple(
+            (dimension, score.raw_theta, score.percentile, score.interpretation)
+            for dimension, score in norm_scores.items()
+        )
+        fragment = self.fragment_cache.get(key)
+        if fragment is not None:
+            return fragment
+
+        dna_items = self.create_strength_dna(norm_scores)
+        fragment = {
+            'dna_data': [dict(item.__dict__) for item in dna_items],
+            'visualization': self.generate_dna_visualization(dna_items)
+        }
+        self.fragment_cache.put(key, fragment)
+        return fragment
+
+
 def create_fancy_dna_visualization(norm_scores: Dict) -> Dict:
     """
     創建精美的 Strength DNA 視覺化
@@ -507,20 +640,17 @@ def create_fancy_dna_visualization(norm_scores: Dict) -> Dict:
     Returns:
         完整的視覺化數據包
     """
-    visualizer = StrengthDNAVisualizer()
+    from core.component_registry import get_component_registry
+    visualizer = get_component_registry().get("strength_dna_visualizer")
 
-    # 創建 DNA 數據
-    dna_items = visualizer.create_strength_dna(norm_scores)
-
-    # 生成視覺化
-    visualization = visualizer.generate_dna_visualization(dna_items)
+    fragment = visualizer.build_fragment(norm_scores)
 
     return {
-        'dna_data': [item.__dict__ for item in dna_items],
-        'visualization': visualization,
+        'dna_data': fragment['dna_data'],
+        'visualization': fragment['visualization'],
         'metadata': {
-            'total_dimensions': len(dna_items),
+            'total_dimensions': len(fragment['dna_data']),
             'generation_timestamp': int(time.time()),
             'version': '1.0.0'
         }
-    }
\ No newline at end of file
+    }
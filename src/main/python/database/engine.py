@@ -15,19 +15,40 @@ Unified SQLAlchemy Database Engine
 import os
 import logging
 from typing import Optional, Dict, Any
-from contextlib import contextmanager
+from contextlib import contextmanager, asynccontextmanager
 from sqlalchemy import create_engine, event, text
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker, AsyncEngine, AsyncSession
 from sqlalchemy.orm import sessionmaker, Session
-from sqlalchemy.pool import StaticPool
+from sqlalchemy.pool import StaticPool, AsyncAdaptedQueuePool
 from pathlib import Path
 
+from database.sqlite_pool import SQLiteTuning, get_sqlite_tuning, apply_pragmas
+
 # 導入所有模型
-from models.database import Base, create_indexes
+from models.database import Base, create_indexes, create_reference_revision_triggers
 from models.v4_models import V4_TABLE_NAMES, create_v4_indexes, update_consent_relationships
 from core.config import get_settings
 
 logger = logging.getLogger(__name__)
 
+# 同步 driver → async driver 對應
+ASYNC_DRIVERS = {
+    "sqlite": "sqlite+aiosqlite",
+    "postgresql": "postgresql+asyncpg",
+    "mysql": "mysql+aiomysql",
+}
+
+
+def to_async_url(database_url: str) -> str:
+    """將同步資料庫 URL 轉為對應的 async driver URL"""
+    scheme, sep, rest = database_url.partition("://")
+    if not sep:
+        return database_url
+    base_scheme, _, driver = scheme.partition("+")
+    if driver and ASYNC_DRIVERS.get(base_scheme, "").endswith(f"+{driver}"):
+        return database_url
+    return f"{ASYNC_DRIVERS.get(base_scheme, scheme)}://{rest}"
+
 
 class DatabaseEngine:
     """
@@ -35,6 +56,9 @@ class DatabaseEngine:
 
     管理 SQLAlchemy engine, session 和 schema 初始化
     支援 SQLite (開發) 和 PostgreSQL (生產)
+
+    同時提供同步 engine (schema 初始化、腳本) 與 AsyncEngine
+    (API 路由)，兩者指向同一資料庫。
     """
 
     def __init__(self, database_url: Optional[str] = None):
@@ -46,6 +70,8 @@ class DatabaseEngine:
         """
         self.settings = get_settings()
         self.database_url = database_url or self.settings.database_url
+        self.sqlite_tuning: SQLiteTuning = get_sqlite_tuning(self.settings.sqlite_tuning_profile)
+        self._pool_events = {"connects": 0, "checkouts": 0, "checkins": 0}
 
         # 建立引擎
         self.engine = self._create_engine()
@@ -57,6 +83,10 @@ class DatabaseEngine:
             bind=self.engine
         )
 
+        # 建立 async engine 與 session factory (延遲到第一次使用)
+        self._async_engine: Optional[AsyncEngine] = None
+        self._async_session_factory: Optional[async_sessionmaker] = None
+
         # 初始化 schema
         self._initialize_schema()
 
@@ -68,43 +98,127 @@ class DatabaseEngine:
         if self.database_url.startswith("sqlite"):
             # SQLite 配置
             db_path = self.database_url.replace("sqlite:///", "")
-            Path(db_path).parent.mkdir(parents=True, exist_ok=True)
+            tuning = self.sqlite_tuning
+
+            if db_path in ("", ":memory:"):
+                # 記憶體資料庫只能共用單一連接
+                pool_args = {"poolclass": StaticPool}
+            else:
+                Path(db_path).parent.mkdir(parents=True, exist_ok=True)
+                # WAL 下讀取可並行：每個執行緒借用自己的連接
+                pool_args = {
+                    "pool_size": tuning.read_pool_size,
+                    "max_overflow": self.settings.database_max_overflow,
+                    "pool_timeout": 30
+                }
 
             engine = create_engine(
                 self.database_url,
-                # SQLite 最佳化設定
-                poolclass=StaticPool,
-                pool_pre_ping=True,
+                **pool_args,
+                # 本機檔案連接不會斷線，不需 pre-ping 的額外查詢
                 connect_args={
                     "check_same_thread": False,
-                    "timeout": 30
+                    "timeout": tuning.busy_timeout_ms / 1000.0,
+                    "cached_statements": tuning.cached_statements
                 },
                 echo=getattr(self.settings, 'debug', False)  # 開發時顯示 SQL
             )
 
-            # SQLite 特殊設定
+            # SQLite 特殊設定：每個新連接套用調校設定檔
             @event.listens_for(engine, "connect")
             def set_sqlite_pragma(dbapi_connection, connection_record):
-                cursor = dbapi_connection.cursor()
-                # 效能最佳化
-                cursor.execute("PRAGMA journal_mode=WAL")
-                cursor.execute("PRAGMA synchronous=NORMAL")
-                cursor.execute("PRAGMA cache_size=10000")
-                cursor.execute("PRAGMA foreign_keys=ON")
-                cursor.close()
+                apply_pragmas(dbapi_connection, tuning)
 
         else:
             # PostgreSQL 或其他資料庫
             engine = create_engine(
                 self.database_url,
-                pool_size=10,
-                max_overflow=20,
+                pool_size=self.settings.database_pool_size,
+                max_overflow=self.settings.database_max_overflow,
+                pool_pre_ping=True,
+                echo=getattr(self.settings, 'debug', False)
+            )
+
+        self._track_pool_events(engine)
+        return engine
+
+    def _track_pool_events(self, engine):
+        """記錄連接池事件，供 pool_status() 回報"""
+        def count(name):
+            def listener(*args):
+                self._pool_events[name] += 1
+            return listener
+
+        event.listen(engine, "connect", count("connects"))
+        event.listen(engine, "checkout", count("checkouts"))
+        event.listen(engine, "checkin", count("checkins"))
+
+    def pool_status(self) -> Dict[str, Any]:
+        """連接池指標"""
+        pool = self.engine.pool
+        status = {
+            "pool_class": type(pool).__name__,
+            **self._pool_events
+        }
+        for name in ("size", "checkedin", "checkedout", "overflow"):
+            method = getattr(pool, name, None)
+            if callable(method):
+                status[name] = method()
+        return status
+
+    def _create_async_engine(self) -> AsyncEngine:
+        """建立 SQLAlchemy AsyncEngine"""
+        async_url = to_async_url(self.database_url)
+
+        if self.database_url.startswith("sqlite"):
+            tuning = self.sqlite_tuning
+            # aiosqlite 預設 NullPool (每次重新連接)，改用連接池保留連接與 statement cache
+            engine = create_async_engine(
+                async_url,
+                poolclass=AsyncAdaptedQueuePool,
+                pool_size=tuning.read_pool_size,
+                max_overflow=self.settings.database_max_overflow,
+                connect_args={
+                    "timeout": tuning.busy_timeout_ms / 1000.0,
+                    "cached_statements": tuning.cached_statements
+                },
+                echo=getattr(self.settings, 'debug', False)
+            )
+
+            @event.listens_for(engine.sync_engine, "connect")
+            def set_sqlite_pragma(dbapi_connection, connection_record):
+                apply_pragmas(dbapi_connection, tuning)
+        else:
+            engine = create_async_engine(
+                async_url,
+                pool_size=self.settings.database_pool_size,
+                max_overflow=self.settings.database_max_overflow,
                 pool_pre_ping=True,
                 echo=getattr(self.settings, 'debug', False)
             )
 
         return engine
 
+    @property
+    def async_engine(self) -> AsyncEngine:
+        """取得 AsyncEngine (第一次存取時建立)"""
+        if self._async_engine is None:
+            self._async_engine = self._create_async_engine()
+        return self._async_engine
+
+    @property
+    def AsyncSessionLocal(self) -> async_sessionmaker:
+        """取得 async session factory"""
+        if self._async_session_factory is None:
+            self._async_session_factory = async_sessionmaker(
+                bind=self.async_engine,
+                class_=AsyncSession,
+                autoflush=False,
+                # commit 後仍可讀取屬性，避免在 async 中觸發隱式 lazy load
+                expire_on_commit=False
+            )
+        return self._async_session_factory
+
     def _initialize_schema(self):
         """初始化資料庫 schema"""
         try:
@@ -118,6 +232,7 @@ class DatabaseEngine:
             try:
                 create_indexes(self.engine)
                 create_v4_indexes(self.engine)
+                create_reference_revision_triggers(self.engine)
             except Exception as e:
                 logger.warning(f"Index creation failed (will retry): {e}")
                 # 索引失敗不影響基本功能
@@ -196,6 +311,32 @@ class DatabaseEngine:
         """取得 session factory (用於 FastAPI Depends)"""
         return self.SessionLocal
 
+    @asynccontextmanager
+    async def get_async_session(self):
+        """
+        獲取 async 資料庫 session 的 context manager
+
+        與 get_session() 相同語意：自動 commit/rollback 與清理，
+        查詢不會阻塞 event loop。
+        """
+        session = self.AsyncSessionLocal()
+        try:
+            yield session
+            await session.commit()
+        except Exception as e:
+            await session.rollback()
+            logger.error(f"Async database session error: {e}")
+            raise
+        finally:
+            await session.close()
+
+    async def dispose_async_engine(self):
+        """關閉 async engine 的連接池"""
+        if self._async_engine is not None:
+            await self._async_engine.dispose()
+            self._async_engine = None
+            self._async_session_factory = None
+
     def _mask_db_url(self) -> str:
         """遮罩資料庫 URL 中的敏感資訊"""
         if "://" not in self.database_url:
@@ -225,7 +366,8 @@ class DatabaseEngine:
                     "status": "healthy",
                     "database_url": self._mask_db_url(),
                     "table_count": table_count,
-                    "connection_test": "passed"
+                    "connection_test": "passed",
+                    "pool": self.pool_status()
                 }
         except Exception as e:
             return {
@@ -276,6 +418,27 @@ def get_session():
         yield session
 
 
+async def get_async_db_session():
+    """FastAPI dependency: 取得 async 資料庫 session"""
+    engine = get_database_engine()
+    async with engine.get_async_session() as session:
+        yield session
+
+
+@asynccontextmanager
+async def get_async_session():
+    """便利函式：取得 async 資料庫 session"""
+    engine = get_database_engine()
+    async with engine.get_async_session() as session:
+        yield session
+
+
+async def dispose_database_engine():
+    """關閉全域引擎的 async 連接池 (應用程式 shutdown 時呼叫)"""
+    if _db_engine is not None:
+        await _db_engine.dispose_async_engine()
+
+
 def init_database(force_recreate: bool = False):
     """
     初始化資料庫
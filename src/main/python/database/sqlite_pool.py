@@ -0,0 +1,241 @@
+"""
+SQLite Connection Pool and Tuning Profile
+SQLite 連接池與效能調校設定
+
+取代「每次呼叫都 sqlite3.connect」與單一 StaticPool 連接：
+- 讀取連接池：WAL 模式下多個讀取者可並行
+- 序列化寫入者：單一寫入連接，以鎖排隊而非 SQLITE_BUSY 重試
+- 每個連接套用相同 PRAGMA (mmap_size, temp_store, busy_timeout...)
+- sqlite3 statement cache 隨連接保留，重複查詢不再重新 prepare
+- 連接池指標供 health check 使用
+
+SQLAlchemy 引擎 (同步與 async) 透過 apply_pragmas() 共用同一調校設定。
+"""
+
+import logging
+import queue
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import Dict, Any, List, Optional
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class SQLiteTuning:
+    """每個 SQLite 連接套用的 PRAGMA 與連接參數"""
+    journal_mode: str = "WAL"
+    synchronous: str = "NORMAL"
+    cache_size_kb: int = 16384          # 每連接 page cache (KiB)
+    mmap_size_mb: int = 256             # 以 mmap 讀取資料庫檔案
+    temp_store: str = "MEMORY"          # 排序/暫存表放記憶體
+    busy_timeout_ms: int = 5000         # 鎖等待上限
+    foreign_keys: bool = True
+    cached_statements: int = 256        # sqlite3 prepared statement cache
+    read_pool_size: int = 4             # 讀取連接數
+
+    def pragmas(self) -> List[str]:
+        return [
+            f"PRAGMA journal_mode={self.journal_mode}",
+            f"PRAGMA synchronous={self.synchronous}",
+            f"PRAGMA cache_size=-{self.cache_size_kb}",
+            f"PRAGMA mmap_size={self.mmap_size_mb * 1024 * 1024}",
+            f"PRAGMA temp_store={self.temp_store}",
+            f"PRAGMA busy_timeout={self.busy_timeout_ms}",
+            f"PRAGMA foreign_keys={'ON' if self.foreign_keys else 'OFF'}",
+        ]
+
+
+# 調校設定檔
+SQLITE_PROFILES: Dict[str, SQLiteTuning] = {
+    "development": SQLiteTuning(mmap_size_mb=64, read_pool_size=2),
+    "production": SQLiteTuning(cache_size_kb=65536, mmap_size_mb=1024, read_pool_size=8),
+}
+
+
+def get_sqlite_tuning(profile: Optional[str] = None) -> SQLiteTuning:
+    """依名稱取得調校設定，未指定時依環境設定"""
+    if profile is None:
+        from core.config import get_settings
+        profile = get_settings().sqlite_tuning_profile
+    return SQLITE_PROFILES.get(profile, SQLiteTuning())
+
+
+def apply_pragmas(dbapi_connection, tuning: SQLiteTuning):
+    """在新連接上套用調校 PRAGMA (供 SQLAlchemy connect 事件使用)"""
+    cursor = dbapi_connection.cursor()
+    try:
+        for pragma in tuning.pragmas():
+            cursor.execute(pragma)
+    finally:
+        cursor.close()
+
+
+class SQLitePool:
+    """
+    SQLite 讀取連接池 + 序列化寫入者
+
+    reader() 借出唯讀連接 (query_only)，用完歸還；
+    writer() 取得唯一寫入連接，區塊結束時 commit，例外時 rollback。
+    """
+
+    def __init__(self, db_path: str, tuning: Optional[SQLiteTuning] = None,
+                 checkout_timeout: float = 30.0):
+        self.db_path = db_path
+        self.tuning = tuning or get_sqlite_tuning()
+        self.checkout_timeout = checkout_timeout
+
+        self._idle: "queue.LifoQueue[sqlite3.Connection]" = queue.LifoQueue()
+        self._open_readers = 0
+        self._readers_lock = threading.Lock()
+
+        self._writer: Optional[sqlite3.Connection] = None
+        self._writer_lock = threading.Lock()
+
+        self._stats_lock = threading.Lock()
+        self._stats = {
+            "reader_checkouts": 0,
+            "reader_waits": 0,
+            "reader_wait_ms": 0.0,
+            "readers_in_use": 0,
+            "peak_readers_in_use": 0,
+            "writes": 0,
+            "writer_waits": 0,
+            "writer_wait_ms": 0.0,
+        }
+
+    def _count(self, key: str, amount: float = 1):
+        with self._stats_lock:
+            self._stats[key] += amount
+
+    def _connect(self, read_only: bool) -> sqlite3.Connection:
+        conn = sqlite3.connect(
+            self.db_path,
+            timeout=self.tuning.busy_timeout_ms / 1000.0,
+            check_same_thread=False,
+            cached_statements=self.tuning.cached_statements,
+        )
+        apply_pragmas(conn, self.tuning)
+        if read_only:
+            conn.execute("PRAGMA query_only=ON")
+        return conn
+
+    def _checkout_reader(self) -> sqlite3.Connection:
+        try:
+            return self._idle.get_nowait()
+        except queue.Empty:
+            pass
+
+        with self._readers_lock:
+            if self._open_readers < self.tuning.read_pool_size:
+                self._open_readers += 1
+                try:
+                    return self._connect(read_only=True)
+                except Exception:
+                    self._open_readers -= 1
+                    raise
+
+        # 連接池已滿：等待歸還
+        started = time.perf_counter()
+        self._count("reader_waits")
+        try:
+            return self._idle.get(timeout=self.checkout_timeout)
+        except queue.Empty:
+            raise TimeoutError(f"No SQLite reader available after {self.checkout_timeout}s")
+        finally:
+            self._count("reader_wait_ms", (time.perf_counter() - started) * 1000)
+
+    @contextmanager
+    def reader(self):
+        """借出讀取連接"""
+        conn = self._checkout_reader()
+        with self._stats_lock:
+            self._stats["reader_checkouts"] += 1
+            self._stats["readers_in_use"] += 1
+            self._stats["peak_readers_in_use"] = max(self._stats["peak_readers_in_use"],
+                                                     self._stats["readers_in_use"])
+        try:
+            yield conn
+        finally:
+            if conn.in_transaction:
+                conn.rollback()
+            self._count("readers_in_use", -1)
+            self._idle.put(conn)
+
+    @contextmanager
+    def writer(self):
+        """取得序列化寫入連接 (一次只有一個寫入者)"""
+        started = time.perf_counter()
+        if not self._writer_lock.acquire(blocking=False):
+            self._count("writer_waits")
+            if not self._writer_lock.acquire(timeout=self.checkout_timeout):
+                raise TimeoutError(f"SQLite writer busy after {self.checkout_timeout}s")
+        self._count("writer_wait_ms", (time.perf_counter() - started) * 1000)
+
+        try:
+            if self._writer is None:
+                self._writer = self._connect(read_only=False)
+            conn = self._writer
+            try:
+                yield conn
+                conn.commit()
+                self._count("writes")
+            except Exception:
+                conn.rollback()
+                raise
+        finally:
+            self._writer_lock.release()
+
+    def stats(self) -> Dict[str, Any]:
+        """連接池指標"""
+        with self._stats_lock:
+            stats = dict(self._stats)
+        return {
+            **stats,
+            "readers_open": self._open_readers,
+            "readers_idle": self._idle.qsize(),
+            "read_pool_size": self.tuning.read_pool_size,
+            "writer_open": self._writer is not None,
+        }
+
+    def close(self):
+        """關閉所有連接"""
+        while True:
+            try:
+                self._idle.get_nowait().close()
+            except queue.Empty:
+                break
+        with self._readers_lock:
+            self._open_readers = 0
+        with self._writer_lock:
+            if self._writer is not None:
+                self._writer.close()
+                self._writer = None
+
+
+# 每個資料庫檔案共用一個連接池
+_pools: Dict[str, SQLitePool] = {}
+_pools_lock = threading.Lock()
+
+
+def get_sqlite_pool(db_path: str, tuning: Optional[SQLiteTuning] = None) -> SQLitePool:
+    """取得 (或建立) 指定資料庫的共用連接池"""
+    with _pools_lock:
+        pool = _pools.get(db_path)
+        if pool is None:
+            pool = SQLitePool(db_path, tuning)
+            _pools[db_path] = pool
+            logger.info(f"SQLite pool created for {db_path} "
+                        f"(readers={pool.tuning.read_pool_size}, mmap={pool.tuning.mmap_size_mb}MB)")
+        return pool
+
+
+def close_sqlite_pools():
+    """關閉所有共用連接池"""
+    with _pools_lock:
+        for pool in _pools.values():
+            pool.close()
+        _pools.clear()
@@ -443,15 +443,10 @@ class ReportGeneration(Base):
 # 索引定義
 def create_indexes(engine):
     """建立效能最佳化索引"""
-    from sqlalchemy import Index, text
+    from sqlalchemy import text
 
-    # 複合索引用於常見查詢
-    Index('idx_session_status_created', AssessmentSession.status, AssessmentSession.created_at)
-    Index('idx_response_session_question', AssessmentResponse.session_id, AssessmentResponse.question_number)
-    Index('idx_score_confidence_created', Score.confidence_level, Score.created_at)
-    Index('idx_report_status_created', ReportGeneration.generation_status, ReportGeneration.created_at)
-
-    # 執行建立索引
+    # 複合索引用於常見查詢 (以 IF NOT EXISTS 建立，不註冊到 metadata，
+    # 避免同一程序中第二個 engine 的 create_all 重複建立)
     with engine.connect() as conn:
         conn.execute(text("CREATE INDEX IF NOT EXISTS idx_session_status_created ON assessment_sessions(status, created_at)"))
         conn.execute(text("CREATE INDEX IF NOT EXISTS idx_response_session_question ON assessment_responses(session_id, question_number)"))
@@ -459,6 +454,45 @@ def create_indexes(engine):
         conn.execute(text("CREATE INDEX IF NOT EXISTS idx_report_status_created ON report_generations(generation_status, created_at)"))
 
 
+# 參考資料修訂計數：任何寫入 (含未更動 updated_at 的原地 UPDATE) 都會遞增，
+# ArchetypeReferenceRepository 以此判斷參考資料快照是否過期
+REFERENCE_REVISION_TABLES = ("career_archetypes", "job_roles")
+
+
+def reference_revision_ddl():
+    """修訂計數表與各參考表 INSERT/UPDATE/DELETE 觸發器的 DDL (SQLite，可重複執行)"""
+    statements = [
+        """CREATE TABLE IF NOT EXISTS reference_data_revisions (
+            table_name TEXT PRIMARY KEY,
+            revision INTEGER NOT NULL DEFAULT 0
+        )"""
+    ]
+    for table in REFERENCE_REVISION_TABLES:
+        statements.append(
+            f"INSERT OR IGNORE INTO reference_data_revisions (table_name) VALUES ('{table}')")
+        for event in ("INSERT", "UPDATE", "DELETE"):
+            statements.append(
+                f"""CREATE TRIGGER IF NOT EXISTS trg_{table}_revision_{event.lower()}
+                AFTER {event} ON {table}
+                BEGIN
+                    UPDATE reference_data_revisions SET revision = revision + 1
+                    WHERE table_name = '{table}';
+                END"""
+            )
+    return statements
+
+
+def create_reference_revision_triggers(engine):
+    """建立參考資料修訂計數觸發器 (僅 SQLite；其他資料庫依 COUNT/MAX 版本)"""
+    from sqlalchemy import text
+
+    if engine.dialect.name != "sqlite":
+        return
+    with engine.begin() as conn:
+        for statement in reference_revision_ddl():
+            conn.execute(text(statement))
+
+
 # 資料庫設定函式
 def get_table_names():
     """取得所有資料表名稱"""
@@ -10,7 +10,8 @@ V4 專用資料模型，支援：
 設計原則：Linus 好品味 + 心理測量學標準
 """
 
-from sqlalchemy import Column, Integer, String, Text, DateTime, Boolean, Float, ForeignKey, JSON, Index
+from sqlalchemy import (Column, Integer, String, Text, DateTime, Boolean, Float, ForeignKey, JSON, Index,
+                        LargeBinary)
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
@@ -308,6 +309,39 @@ class V4ArchetypeResult(Base):
         return self.archetype_confidence >= 0.75 and self.analysis_confidence >= 0.75
 
 
+class V4ResultsDocument(Base):
+    """V4 物化評測結果文件 (提交或首次讀取時計算一次)"""
+    __tablename__ = "v4_results_documents"
+
+    session_id = Column(String(36), ForeignKey("v4_sessions.session_id"), primary_key=True)
+
+    # 文件格式與依賴產物版本 (常模、IRT 參數、知識庫...) 的指紋，不符即重新計算
+    versions_key = Column(String(32), nullable=False)
+    etag = Column(String(40), nullable=False)          # 內容雜湊
+    body = Column(LargeBinary, nullable=False)         # gzip 壓縮 JSON
+
+    created_at = Column(DateTime, default=func.now(), nullable=False)
+
+    def __repr__(self):
+        return f"<V4ResultsDocument(session_id={self.session_id}, etag={self.etag})>"
+
+
+class V4SessionEnrichment(Base):
+    """V4 提交後背景分析 (原型、職缺、發展建議、報告) 的狀態與產出"""
+    __tablename__ = "v4_session_enrichments"
+
+    session_id = Column(String(36), ForeignKey("v4_sessions.session_id"), primary_key=True)
+
+    status = Column(String(20), nullable=False)        # queued, running, completed, failed
+    stages = Column(JSON, nullable=False)              # 各階段狀態、嘗試次數、錯誤、耗時
+    outputs = Column(JSON, nullable=False)             # 各階段產出
+
+    updated_at = Column(DateTime, default=func.now(), onupdate=func.now(), nullable=False)
+
+    def __repr__(self):
+        return f"<V4SessionEnrichment(session_id={self.session_id}, status={self.status})>"
+
+
 # 更新Consent模型以支援V4關聯
 def update_consent_relationships():
     """更新Consent模型的關聯"""
@@ -5,19 +5,22 @@ Career Archetype Service Layer
 - 現有的 archetype_mapper.py 邏輯
 - 資料庫持久化存儲
 - 職位匹配算法
-- 結果快取機制
+- 結果快取機制 (原型/職位參考資料常駐記憶體，依版本失效)
 
 遵循 Linus 原則：簡潔、實用、不過度設計
 """
 
-from typing import Dict, List, Optional, Any, Tuple
+from typing import Dict, List, Optional, Any, Tuple, Sequence
 from datetime import datetime
 import json
 import logging
 
+import numpy as np
+
 from utils.database import get_database_manager, DatabaseError
+from core.data_access.archetype_reference import ArchetypeReferenceRepository, ArchetypeReferenceSnapshot
 from core.analysis.archetype_mapper import ArchetypeMapper, TalentProfile
-from core.recommendation.career_matcher import CareerMatcher
+from core.recommendation.career_matcher import get_career_matcher
 from models.schemas import (
     CareerArchetype, CareerArchetypeBase, UserArchetypeResult, JobRecommendation,
     ArchetypeAnalysisRequest, ArchetypeAnalysisResponse,
@@ -32,8 +35,9 @@ class ArchetypeService:
 
     def __init__(self):
         self.db_manager = get_database_manager()
+        self.reference_repository = ArchetypeReferenceRepository()
         self.archetype_mapper = ArchetypeMapper()
-        self.career_matcher = CareerMatcher()
+        self.career_matcher = get_career_matcher()
 
     def analyze_user_archetype(self, session_id: str, talent_scores: Dict[str, float],
                              user_context: Optional[Dict[str, Any]] = None) -> UserArchetypeResult:
@@ -49,18 +53,13 @@ class ArchetypeService:
             UserArchetypeResult: 完整的原型分析結果
         """
         try:
-            # 1. 使用現有的 archetype_mapper 進行分類
-            talent_profile = self.archetype_mapper.classify_talents(talent_scores)
-            primary_archetype = self.archetype_mapper.map_to_archetype(talent_profile)
-
-            # 2. 計算所有4種原型的分數
-            archetype_scores = self._calculate_all_archetype_scores(talent_profile)
-
-            # 3. 獲取次要原型
-            secondary_archetype = self._get_secondary_archetype(archetype_scores, primary_archetype.archetype_id)
-
-            # 4. 計算信心分數
-            confidence_score = self._calculate_confidence_score(talent_profile, archetype_scores)
+            # 1-4. 才幹分類、主要原型、4種原型分數、次要原型與信心分數
+            analysis = self.analyze_archetypes_batch([talent_scores])[0]
+            talent_profile = analysis["talent_profile"]
+            primary_archetype = analysis["primary_archetype"]
+            archetype_scores = analysis["archetype_scores"]
+            secondary_archetype = analysis["secondary_archetype_id"]
+            confidence_score = analysis["confidence_score"]
 
             # 5. 從資料庫獲取完整原型資訊
             primary_archetype_data = self._get_archetype_from_db(primary_archetype.archetype_id)
@@ -115,11 +114,13 @@ class ArchetypeService:
             strength_profile = self._rebuild_strength_profile(archetype_result)
 
             # 3. 使用 career_matcher 進行職位匹配
-            career_matches = self.career_matcher.find_career_matches(strength_profile, user_context or {})
+            career_matches = self.career_matcher.find_career_matches(
+                strength_profile, user_context or {}, top_k=10  # 取前10個推薦
+            )
 
             # 4. 轉換為 JobRecommendation 格式並分類
             recommendations = []
-            for i, match in enumerate(career_matches[:10]):  # 取前10個推薦
+            for i, match in enumerate(career_matches):
                 recommendation_type = self._determine_recommendation_type(match.match_score, i)
 
                 formatted_job_role = self._format_job_role(match.job_role)
@@ -155,16 +156,15 @@ class ArchetypeService:
             CareerPrototypeInfo: 職業原型資訊
         """
         try:
-            # 從資料庫獲取原型結果
-            archetype_result = self._get_archetype_result(session_id)
+            # 原型結果與職位推薦以一次查詢取得
+            archetype_result, job_recommendations = self._get_session_results(session_id)
             if not archetype_result:
                 raise ValueError(f"No archetype result found for session {session_id}")
 
-            # 從資料庫獲取完整原型資訊
+            # 完整原型資訊來自快取的參考資料
             archetype_data = self._get_archetype_from_db(archetype_result['primary_archetype_id'])
 
-            # 獲取該原型的職位推薦
-            job_recommendations = self._get_job_recommendations(session_id)
+            # 該原型的職位推薦
             suggested_roles = [rec['job_role']['role_name'] for rec in job_recommendations[:3]]
 
             # 建構前端所需的原型資訊
@@ -193,92 +193,119 @@ class ArchetypeService:
                 mbti_correlation="可對應 INTJ/ISTJ 原型"
             )
 
-    def _calculate_all_archetype_scores(self, talent_profile: TalentProfile) -> Dict[str, float]:
-        """計算所有4種原型的分數"""
-        scores = {}
+    def analyze_archetypes_batch(self, talent_scores_list: Sequence[Dict[str, float]]) -> List[Dict[str, Any]]:
+        """
+        批次計算原型分析 (不含資料庫查詢與存儲)，供批次報告與群體分析使用
 
-        # 獲取主導才幹ID列表
-        dominant_talent_ids = [t[0] for t in talent_profile.dominant_talents]
+        Args:
+            talent_scores_list: 每位用戶的 T1-T12 才幹分數
 
-        for archetype in self.archetype_mapper.archetypes:
-            score = 0
-            # 計算核心才幹匹配分數
-            for talent in archetype.primary_talents:
-                if talent in dominant_talent_ids:
-                    score += 3
+        Returns:
+            每位用戶的 talent_profile、primary_archetype、archetype_scores、
+            secondary_archetype_id、confidence_score
+        """
+        mapper = self.archetype_mapper
+        profiles = [mapper.classify_talents(talent_scores) for talent_scores in talent_scores_list]
+        if not profiles:
+            return []
+
+        primaries = mapper.map_to_archetypes(profiles)
+        scores = mapper.score_archetypes([[t[0] for t in profile.dominant_talents] for profile in profiles])
+        archetype_index = {archetype.archetype_id: i for i, archetype in enumerate(mapper.archetypes)}
+        secondary_indices, confidences = self._rank_archetypes(
+            scores,
+            np.array([archetype_index[archetype.archetype_id] for archetype in primaries]),
+            np.array([len(profile.dominant_talents) for profile in profiles])
+        )
+
+        archetype_ids = [archetype.archetype_id for archetype in mapper.archetypes]
+        return [
+            {
+                "talent_profile": profile,
+                "primary_archetype": primary,
+                "archetype_scores": {archetype_id: int(score) for archetype_id, score in zip(archetype_ids, row)},
+                "secondary_archetype_id": archetype_ids[secondary] if secondary >= 0 else None,
+                "confidence_score": float(confidence)
+            }
+            for profile, primary, row, secondary, confidence
+            in zip(profiles, primaries, scores, secondary_indices, confidences)
+        ]
 
-            # 計算輔助才幹匹配分數
-            for talent in archetype.secondary_talents:
-                if talent in dominant_talent_ids:
-                    score += 1
+    def _rank_archetypes(self, scores: np.ndarray, primary_indices: np.ndarray,
+                         dominant_counts: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        由每列前兩高的原型分數求次要原型與信心分數
 
-            scores[archetype.archetype_id] = score
+        Args:
+            scores: (用戶數 x 原型數) 原型分數
+            primary_indices: 每位用戶主要原型的索引 (-1 表示不在分數中)
+            dominant_counts: 每位用戶的主導才幹數
 
-        return scores
+        Returns:
+            (次要原型索引 (-1 表示無), 信心分數)
+        """
+        order, top = self.archetype_mapper.top_two(scores)
 
-    def _get_secondary_archetype(self, archetype_scores: Dict[str, float], primary_id: str) -> Optional[str]:
-        """獲取次要原型"""
-        sorted_scores = sorted(archetype_scores.items(), key=lambda x: x[1], reverse=True)
+        # 次要原型：排除主要原型後分數最高者，且分數需大於 0
+        if order.shape[1] > 1:
+            use_second = order[:, 0] == primary_indices
+            secondary = np.where(use_second, order[:, 1], order[:, 0])
+            secondary_score = np.where(use_second, top[:, 1], top[:, 0])
+        else:
+            secondary = np.where(order[:, 0] == primary_indices, -1, order[:, 0])
+            secondary_score = np.where(secondary >= 0, top[:, 0], 0)
+        secondary = np.where(secondary_score > 0, secondary, -1)
 
-        # 找第二高分的原型
-        for archetype_id, score in sorted_scores:
-            if archetype_id != primary_id and score > 0:
-                return archetype_id
+        # 如果最高分明顯高於第二高分，信心度較高
+        if top.shape[1] > 1:
+            confidence = np.minimum(0.95, 0.7 + (top[:, 0] - top[:, 1]) * 0.05)
+        else:
+            confidence = np.full(len(scores), 0.8)
 
-        return None
+        # 主導才幹數量影響信心度
+        confidence = np.where(dominant_counts >= 3, confidence + 0.1, confidence)
+        return secondary, np.minimum(confidence, 1.0)
+
+    def _calculate_all_archetype_scores(self, talent_profile: TalentProfile) -> Dict[str, float]:
+        """計算所有4種原型的分數"""
+        scores = self.archetype_mapper.score_archetypes([[t[0] for t in talent_profile.dominant_talents]])[0]
+        return {archetype.archetype_id: int(score)
+                for archetype, score in zip(self.archetype_mapper.archetypes, scores)}
+
+    def _get_secondary_archetype(self, archetype_scores: Dict[str, float], primary_id: str) -> Optional[str]:
+        """獲取次要原型"""
+        archetype_ids = list(archetype_scores)
+        if not archetype_ids:
+            return None
+        primary_index = archetype_ids.index(primary_id) if primary_id in archetype_scores else -1
+        secondary, _ = self._rank_archetypes(np.array([list(archetype_scores.values())]),
+                                             np.array([primary_index]), np.array([0]))
+        return archetype_ids[secondary[0]] if secondary[0] >= 0 else None
 
     def _calculate_confidence_score(self, talent_profile: TalentProfile, archetype_scores: Dict[str, float]) -> float:
         """計算信心分數"""
-        max_score = max(archetype_scores.values())
-        scores_list = list(archetype_scores.values())
-        scores_list.sort(reverse=True)
+        _, confidence = self._rank_archetypes(np.array([list(archetype_scores.values())]),
+                                              np.array([-1]), np.array([len(talent_profile.dominant_talents)]))
+        return float(confidence[0])
 
-        # 如果最高分明顯高於第二高分，信心度較高
-        if len(scores_list) > 1:
-            gap = scores_list[0] - scores_list[1]
-            confidence = min(0.95, 0.7 + gap * 0.05)
-        else:
-            confidence = 0.8
+    def _reference_data(self) -> ArchetypeReferenceSnapshot:
+        """原型與職位參考資料快照 (快照有效時不連線資料庫)"""
+        return self.reference_repository.get_snapshot(self.db_manager.get_connection)
 
-        # 主導才幹數量影響信心度
-        if len(talent_profile.dominant_talents) >= 3:
-            confidence += 0.1
+    def preload_reference_data(self) -> ArchetypeReferenceSnapshot:
+        """啟動時預先載入參考資料快照 (快取預熱使用)"""
+        return self._reference_data()
 
-        return min(confidence, 1.0)
+    def invalidate_reference_data(self):
+        """參考資料表被修改後呼叫，下次存取時重新載入"""
+        self.reference_repository.invalidate()
 
     def _get_archetype_from_db(self, archetype_id: str) -> Any:
-        """從資料庫獲取原型資訊"""
-        with self.db_manager.get_connection() as conn:
-            cursor = conn.execute("""
-                SELECT archetype_id, archetype_name, archetype_name_en,
-                       keirsey_temperament, mbti_correlates, description,
-                       core_characteristics, work_environment_preferences,
-                       leadership_style, decision_making_style, communication_style,
-                       stress_indicators, development_areas
-                FROM career_archetypes
-                WHERE archetype_id = ?
-            """, (archetype_id,))
-
-            row = cursor.fetchone()
-            if not row:
-                raise ValueError(f"Archetype {archetype_id} not found in database")
-
-            # 解析JSON欄位
-            data = dict(row)
-            json_fields = ['mbti_correlates', 'core_characteristics', 'work_environment_preferences',
-                          'stress_indicators', 'development_areas']
-            for field in json_fields:
-                if data[field]:
-                    data[field] = json.loads(data[field])
-
-            # 返回符合 CareerArchetypeBase 的 Pydantic 模型
-            return CareerArchetypeBase(
-                archetype_id=data['archetype_id'],
-                archetype_name=data['archetype_name'],
-                archetype_name_en=data['archetype_name_en'],
-                keirsey_temperament=data['keirsey_temperament'],
-                description=data['description']
-            )
+        """獲取原型資訊 (來自快取的 career_archetypes)"""
+        archetype = self._reference_data().archetypes.get(archetype_id)
+        if archetype is None:
+            raise ValueError(f"Archetype {archetype_id} not found in database")
+        return archetype
 
     def _format_talents(self, talents: List[Tuple[str, float]]) -> List[Dict[str, Any]]:
         """格式化才幹資料"""
@@ -333,15 +360,65 @@ class ArchetypeService:
 
             row = cursor.fetchone()
             if row:
-                data = dict(row)
-                # 解析JSON欄位
-                json_fields = ['archetype_scores', 'dominant_talents', 'supporting_talents', 'lesser_talents']
-                for field in json_fields:
-                    if data[field]:
-                        data[field] = json.loads(data[field])
-                return data
+                return self._parse_archetype_result(dict(row))
             return None
 
+    def _parse_archetype_result(self, data: Dict[str, Any]) -> Dict[str, Any]:
+        """解析原型結果的JSON欄位"""
+        json_fields = ['archetype_scores', 'dominant_talents', 'supporting_talents', 'lesser_talents']
+        for field in json_fields:
+            if data[field]:
+                data[field] = json.loads(data[field])
+        return data
+
+    def _get_session_results(self, session_id: str) -> Tuple[Optional[Dict[str, Any]], List[Dict[str, Any]]]:
+        """
+        以一次 JOIN 查詢獲取 session 的原型結果與職位推薦
+
+        Returns:
+            (原型結果，無結果時為 None；依優先級排序的職位推薦)
+        """
+        with self.db_manager.get_connection() as conn:
+            cursor = conn.execute("""
+                SELECT uar.primary_archetype_id, uar.secondary_archetype_id,
+                       uar.archetype_scores, uar.dominant_talents, uar.supporting_talents,
+                       uar.lesser_talents, uar.confidence_score,
+                       jr.role_id, jr.recommendation_type, jr.match_score,
+                       jr.strength_alignment, jr.development_gaps, jr.recommendation_reasoning,
+                       jr.priority_rank, jr.confidence_level, jr.is_featured
+                FROM user_archetype_results uar
+                LEFT JOIN job_recommendations jr ON jr.session_id = uar.session_id
+                WHERE uar.session_id = ?
+                ORDER BY jr.priority_rank
+            """, (session_id,))
+            rows = [dict(row) for row in cursor.fetchall()]
+
+        if not rows:
+            return None, []
+
+        result_fields = ['primary_archetype_id', 'secondary_archetype_id', 'archetype_scores',
+                         'dominant_talents', 'supporting_talents', 'lesser_talents', 'confidence_score']
+        archetype_result = self._parse_archetype_result({field: rows[0][field] for field in result_fields})
+
+        recommendation_rows = [
+            {field: value for field, value in row.items() if field not in result_fields}
+            for row in rows if row['role_id'] is not None
+        ]
+        return archetype_result, self._attach_job_roles(recommendation_rows)
+
+    def _attach_job_roles(self, recommendations: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """以快取的 job_roles 補上職位資訊"""
+        job_roles = self._reference_data().job_roles
+        for data in recommendations:
+            role = job_roles.get(data['role_id'])
+            data['job_role'] = {
+                'role_id': data['role_id'],
+                'role_name': (role.role_name if role else None) or '職位名稱',
+                'description': (role.description if role else None) or '職位描述',
+                'industry_sector': (role.industry_sector if role else None) or 'Technology'
+            }
+        return recommendations
+
     def _rebuild_strength_profile(self, archetype_result: Dict[str, Any]):
         """從原型結果重建 StrengthProfile 物件"""
         # 這裡需要建立一個簡化的 StrengthProfile 物件
@@ -417,30 +494,19 @@ class ArchetypeService:
                 ))
 
     def _get_job_recommendations(self, session_id: str) -> List[Dict[str, Any]]:
-        """從資料庫獲取職位推薦"""
+        """從資料庫獲取職位推薦 (職位資訊來自快取的參考資料)"""
         with self.db_manager.get_connection() as conn:
             cursor = conn.execute("""
-                SELECT jr.*, jrole.role_name, jrole.description, jrole.industry_sector
-                FROM job_recommendations jr
-                LEFT JOIN job_roles jrole ON jr.role_id = jrole.role_id
-                WHERE jr.session_id = ?
-                ORDER BY jr.priority_rank
+                SELECT * FROM job_recommendations
+                WHERE session_id = ?
+                ORDER BY priority_rank
             """, (session_id,))
+            recommendations = [dict(row) for row in cursor.fetchall()]
 
-            recommendations = []
-            for row in cursor.fetchall():
-                data = dict(row)
-                data['job_role'] = {
-                    'role_id': data['role_id'],
-                    'role_name': data['role_name'] or '職位名稱',
-                    'description': data['description'] or '職位描述',
-                    'industry_sector': data['industry_sector'] or 'Technology'
-                }
-                recommendations.append(data)
-
-            return recommendations
+        return self._attach_job_roles(recommendations)
 
 
 def get_archetype_service() -> ArchetypeService:
-    """獲取職業原型服務實例"""
-    return ArchetypeService()
\ No newline at end of file
+    """獲取職業原型服務實例（每個進程共用一個，由元件註冊表建立）"""
+    from core.component_registry import get_component_registry
+    return get_component_registry().get("archetype_service")
\ No newline at end of file
@@ -35,6 +35,7 @@ from core.report.cache_manager import (
     get_report_cache_manager
 )
 from utils.cache import CacheStats, CacheManager, get_cache_manager
+from utils.cache_warming import get_cache_warmer
 from models.schemas import QuestionResponse
 from models.report_models import ReportType, ReportFormat, ReportQuality
 
@@ -62,8 +63,8 @@ class CacheHealthStatus:
 @dataclass
 class CacheWarmingPlan:
     """Plan for cache warming operations."""
-    target_patterns: List[Dict[str, Any]]
-    estimated_duration_seconds: int
+    target_patterns: List[Dict[str, Any]]  # {"key": cache key, "score": hotness}
+    estimated_duration_seconds: int  # also the warming time budget
     priority_level: str  # "high", "medium", "low"
     warm_on_startup: bool = True
     warm_on_schedule: bool = False
@@ -88,6 +89,7 @@ class CacheService:
         self.config = config or CacheConfiguration()
         self.cache_manager = get_cache_manager()
         self.report_cache_manager = get_report_cache_manager(config)
+        self.cache_warmer = get_cache_warmer()
 
         # Service state
         self._is_healthy = True
@@ -253,23 +255,20 @@ class CacheService:
             if warming_plan is None:
                 warming_plan = await self._create_default_warming_plan()
 
+            # Recompute the hottest missing entries under the plan's budget
+            warm_stats = await self.cache_warmer.warm_keys(
+                [pattern['key'] for pattern in warming_plan.target_patterns],
+                time_budget_seconds=warming_plan.estimated_duration_seconds
+            )
+
             warming_results = {
                 'plan_executed': warming_plan.priority_level,
-                'patterns_warmed': 0,
+                'patterns_warmed': warm_stats.get('warmed', 0),
+                'warming': warm_stats,
                 'time_taken_seconds': 0.0,
                 'errors': []
             }
 
-            # Execute warming for each pattern
-            for pattern in warming_plan.target_patterns:
-                try:
-                    await self._warm_pattern(pattern)
-                    warming_results['patterns_warmed'] += 1
-                except Exception as e:
-                    error_msg = f"Failed to warm pattern {pattern}: {str(e)}"
-                    warming_results['errors'].append(error_msg)
-                    logger.warning(error_msg)
-
             # Delegate to report cache manager for additional warming
             report_warming_stats = await self.report_cache_manager.warm_cache_for_common_patterns()
             warming_results['report_patterns'] = report_warming_stats
@@ -473,37 +472,24 @@ class CacheService:
             logger.error(f"Error getting comprehensive stats: {e}")
             return {'error': str(e)}
 
-    async def _create_default_warming_plan(self) -> CacheWarmingPlan:
-        """Create a default cache warming plan based on common patterns."""
-        # Define common Big Five score patterns for warming
-        common_patterns = [
-            # Balanced profiles
-            {"openness": 15, "conscientiousness": 15, "extraversion": 15, "agreeableness": 15, "neuroticism": 10},
-            # High openness, creativity-focused
-            {"openness": 20, "conscientiousness": 12, "extraversion": 14, "agreeableness": 16, "neuroticism": 8},
-            # High conscientiousness, detail-oriented
-            {"openness": 12, "conscientiousness": 20, "extraversion": 13, "agreeableness": 15, "neuroticism": 9},
-            # High extraversion, people-focused
-            {"openness": 14, "conscientiousness": 13, "extraversion": 20, "agreeableness": 18, "neuroticism": 7},
-            # Analytical profile
-            {"openness": 18, "conscientiousness": 17, "extraversion": 10, "agreeableness": 12, "neuroticism": 11}
-        ]
+    async def _create_default_warming_plan(self, top_k: int = 200) -> CacheWarmingPlan:
+        """Create a warming plan from the hottest keys in recorded traffic."""
+        hottest = self.cache_warmer.tracker.top(
+            top_k, classes=self.cache_warmer.registered_classes()
+        )
 
         return CacheWarmingPlan(
-            target_patterns=common_patterns,
-            estimated_duration_seconds=300,  # 5 minutes
-            priority_level="medium",
+            target_patterns=[{'key': key, 'score': score} for key, score in hottest],
+            estimated_duration_seconds=30,
+            priority_level="high" if hottest else "low",
             warm_on_startup=True,
             warm_on_schedule=True,
             schedule_interval_hours=24
         )
 
     async def _warm_pattern(self, pattern: Dict[str, Any]) -> bool:
-        """Warm cache for a specific score pattern."""
-        # This would integrate with the report generation system
-        # For now, we simulate the warming process
-        await asyncio.sleep(0.1)  # Simulate work
-        return True
+        """Warm a single planned cache key."""
+        return await self.cache_warmer.warm_key(pattern['key'])
 
     def _update_response_time(self, response_time_ms: float):
         """Update average response time tracking."""
@@ -0,0 +1,307 @@
+"""
+Assessment Enrichment Service
+
+提交評測後的背景分析流程 (兩階段提交的第二階段)：
+- 提交請求只負責儲存回應與計分，隨即回應
+- 職業原型分類、職缺匹配、發展建議、結果報告預先產生
+  排入背景 pipeline，依序執行，失敗時逐階段重試；CPU 密集的同步階段
+  在 thread 中執行，不阻塞 event loop
+- 提交時在同一個 unit of work 寫入 queued 記錄；重啟後 resume_pending()
+  重新排入未完成的 session，佇列已滿而未排入的 session 在查詢狀態時補排
+- 每個 session 的處理狀態保存在記憶體並寫入 v4_session_enrichments，
+  其他 worker 或重啟後仍可查詢
+
+遵循 Linus 原則：簡潔、實用、不過度設計
+"""
+
+from datetime import datetime, timedelta
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+import asyncio
+import logging
+
+from sqlalchemy import select
+
+from core.component_registry import get_component_registry
+from core.v4.count_scoring import SCORE_COLUMNS, TALENT_DIMENSIONS
+from database.engine import get_async_session
+from models.v4_models import V4Score, V4SessionEnrichment
+from utils.pipeline import (FINISHED_STATUSES, PipelineFull, PipelineRunner, Stage,
+                            STATUS_COMPLETED, STATUS_FAILED, STATUS_QUEUED, STATUS_SKIPPED)
+
+logger = logging.getLogger(__name__)
+
+# T1-T12 才幹維度對應知識庫的優勢主題
+TALENT_THEMES = {
+    'T1': 'structured_execution',
+    'T2': 'quality_perfectionism',
+    'T3': 'exploration_innovation',
+    'T4': 'analytical_insight',
+    'T5': 'influence_advocacy',
+    'T6': 'collaboration_harmony',
+    'T7': 'customer_orientation',
+    'T8': 'learning_growth',
+    'T9': 'discipline_trust',
+    'T10': 'stress_regulation',
+    'T11': 'conflict_integration',
+    'T12': 'responsibility_accountability'
+}
+
+# 職缺匹配至少使用的才幹數 (主導才幹不足時以分數最高者補足)
+MIN_MATCHING_TALENTS = 3
+JOB_RECOMMENDATION_COUNT = 10
+
+# 最後一個階段：以前面各階段產出物化結果文件
+REPORT_STAGE = "report"
+
+ReportRenderer = Callable[[str], Awaitable[Any]]
+
+
+def _classify_archetype(session_id: str, context: Dict[str, Any]) -> Dict[str, Any]:
+    """職業原型分類"""
+    mapper = get_component_registry().get("archetype_mapper")
+    profile = mapper.classify_talents(context["talent_scores"])
+    archetype = mapper.map_to_archetype(profile)
+    context["talent_profile"] = profile
+
+    return {
+        "primary_archetype": {
+            "archetype_id": archetype.archetype_id,
+            "archetype_name": archetype.archetype_name,
+            "keirsey_temperament": archetype.keirsey_temperament,
+            "description": archetype.description,
+            "career_suggestions": archetype.career_suggestions
+        },
+        "dominant_talents": [talent for talent, _ in profile.dominant_talents],
+        "supporting_talents": [talent for talent, _ in profile.supporting_talents],
+        "lesser_talents": [talent for talent, _ in profile.lesser_talents]
+    }
+
+
+def _match_jobs(session_id: str, context: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """依主導才幹匹配知識庫職缺"""
+    profile = context["talent_profile"]
+    ranked = profile.dominant_talents + profile.supporting_talents + profile.lesser_talents
+    count = max(len(profile.dominant_talents), MIN_MATCHING_TALENTS)
+    themes = [TALENT_THEMES[talent] for talent, _ in ranked[:count] if talent in TALENT_THEMES]
+
+    knowledge_base = get_component_registry().get("knowledge_base")
+    matches = knowledge_base.find_career_matches_by_strengths(themes, top_n=JOB_RECOMMENDATION_COUNT)
+    return [
+        {
+            "role_id": role.role_id,
+            "role_name": role.role_name,
+            "chinese_name": role.chinese_name,
+            "industry_sector": role.industry_sector.value,
+            "match_score": round(float(score), 4)
+        }
+        for role, score in matches
+    ]
+
+
+def _plan_development(session_id: str, context: Dict[str, Any]) -> Dict[str, Any]:
+    """才幹發展建議與協同效應分析"""
+    mapper = get_component_registry().get("archetype_mapper")
+    profile = context["talent_profile"]
+    return {
+        "suggestions": mapper.get_development_suggestions(profile),
+        "synergy": mapper.get_synergy_analysis([talent for talent, _ in profile.dominant_talents])
+    }
+
+
+def compute_enrichment(talent_scores: Dict[str, float]) -> Dict[str, Any]:
+    """
+    同步計算原型、職缺、發展建議三個階段的產出 (批次重新計分使用)
+
+    Returns:
+        {階段名稱: 產出}，格式與背景 pipeline 寫入的 outputs 相同
+    """
+    context = {"talent_scores": dict(talent_scores)}
+    return {
+        "archetype": _classify_archetype("", context),
+        "job_matching": _match_jobs("", context),
+        "development_plan": _plan_development("", context)
+    }
+
+
+def _sync_stage(func: Callable[[str, Dict[str, Any]], Any]):
+    async def run(session_id: str, context: Dict[str, Any]) -> Any:
+        return await asyncio.to_thread(func, session_id, context)
+    return run
+
+
+class EnrichmentService:
+    """
+    提交後背景分析服務
+
+    report_renderer 由結果路由設定 (物化結果文件並清除結果快取)，
+    未設定時報告階段不做任何事。
+    """
+
+    def __init__(self, max_concurrency: int = 4, max_attempts: int = 3,
+                 requeue_after_seconds: float = 60.0):
+        self.report_renderer: Optional[ReportRenderer] = None
+        self.requeue_after_seconds = requeue_after_seconds
+        self.pipeline = PipelineRunner(
+            [
+                Stage("archetype", _sync_stage(_classify_archetype), max_attempts=max_attempts),
+                Stage("job_matching", _sync_stage(_match_jobs),
+                      requires=("archetype",), max_attempts=max_attempts),
+                Stage("development_plan", _sync_stage(_plan_development),
+                      requires=("archetype",), max_attempts=max_attempts),
+                Stage(REPORT_STAGE, self._render_report, max_attempts=max_attempts)
+            ],
+            max_concurrency=max_concurrency,
+            on_update=self._persist
+        )
+
+    async def _render_report(self, session_id: str, context: Dict[str, Any]) -> None:
+        if self.report_renderer is not None:
+            await self.report_renderer(session_id)
+
+    async def _persist(self, session_id: str, status: Dict[str, Any]):
+        """寫入處理狀態與產出 (報告階段無產出)"""
+        async with get_async_session() as db_session:
+            await db_session.merge(V4SessionEnrichment(
+                session_id=session_id,
+                status=status["status"],
+                stages=status["stages"],
+                outputs={name: output for name, output in status["outputs"].items()
+                         if output is not None}
+            ))
+
+    def queued_record(self, session_id: str) -> V4SessionEnrichment:
+        """提交時與分數一併寫入的 queued 記錄 (以 merge 寫入，重新提交時覆蓋舊記錄)"""
+        return V4SessionEnrichment(
+            session_id=session_id,
+            status=STATUS_QUEUED,
+            stages={stage.name: {"status": STATUS_QUEUED, "attempts": 0,
+                                 "error": None, "duration_ms": None}
+                    for stage in self.pipeline.stages},
+            outputs={}
+        )
+
+    def enqueue(self, session_id: str, talent_scores: Dict[str, float]) -> bool:
+        """
+        排入背景分析
+
+        Args:
+            session_id: 評測會話識別碼
+            talent_scores: T1-T12 百分等級分數
+
+        Returns:
+            False 表示此 session 已在處理中
+
+        Raises:
+            PipelineFull: 佇列已滿；queued 記錄保留，之後由 resume_pending()
+                或狀態查詢補排
+        """
+        return self.pipeline.submit(session_id, {"talent_scores": dict(talent_scores)})
+
+    async def resume_pending(self) -> int:
+        """
+        重新排入資料庫中未完成的 session (啟動時呼叫)
+
+        Returns:
+            排入的 session 數；佇列滿時停止，其餘留待之後補排
+        """
+        async with get_async_session() as db_session:
+            result = await db_session.execute(
+                select(V4Score)
+                .join(V4SessionEnrichment, V4SessionEnrichment.session_id == V4Score.session_id)
+                .where(V4SessionEnrichment.status.notin_(FINISHED_STATUSES))
+            )
+            scores = result.scalars().all()
+
+        resumed = 0
+        for score in scores:
+            try:
+                if self.enqueue(score.session_id, _score_talents(score)):
+                    resumed += 1
+            except PipelineFull:
+                break
+        if scores:
+            logger.info(f"Resumed enrichment for {resumed}/{len(scores)} unfinished sessions")
+        return resumed
+
+    async def _requeue(self, record: V4SessionEnrichment):
+        """補排佇列已滿或程序重啟而遺漏的 queued session"""
+        if datetime.utcnow() - record.updated_at < timedelta(seconds=self.requeue_after_seconds):
+            # 可能仍在其他 worker 的佇列中
+            return
+        async with get_async_session() as db_session:
+            result = await db_session.execute(
+                select(V4Score).where(V4Score.session_id == record.session_id)
+            )
+            score = result.scalars().first()
+        if score is None:
+            return
+        try:
+            self.enqueue(record.session_id, _score_talents(score))
+        except PipelineFull:
+            pass
+
+    async def get_status(self, session_id: str) -> Optional[Dict[str, Any]]:
+        """處理狀態：本程序追蹤中的優先，否則讀取資料庫記錄 (遺漏的 queued 記錄順便補排)"""
+        status = self.pipeline.status(session_id)
+        if status is not None:
+            return {"status": status["status"], "stages": status["stages"]}
+
+        record = await load_enrichment(session_id)
+        if record is None:
+            return None
+        if record.status == STATUS_QUEUED:
+            await self._requeue(record)
+        return {"status": record.status, "stages": record.stages}
+
+    async def stop(self):
+        await self.pipeline.stop()
+
+
+def _score_talents(score: V4Score) -> Dict[str, float]:
+    """V4Score 欄位轉回 T1-T12 分數"""
+    return {dimension: getattr(score, column)
+            for dimension, column in zip(TALENT_DIMENSIONS, SCORE_COLUMNS)}
+
+
+async def load_enrichment(session_id: str, db_session=None) -> Optional[V4SessionEnrichment]:
+    """讀取 session 的背景分析記錄"""
+    if db_session is None:
+        async with get_async_session() as db_session:
+            return await load_enrichment(session_id, db_session)
+
+    result = await db_session.execute(
+        select(V4SessionEnrichment).where(V4SessionEnrichment.session_id == session_id)
+    )
+    return result.scalars().first()
+
+
+def analysis_status(record: Optional[V4SessionEnrichment]) -> str:
+    """
+    結果文件中的分析狀態
+
+    報告階段本身不計：結果文件在報告階段中產生，此時其餘階段已全部結束。
+    """
+    if record is None:
+        return "pending"
+    statuses = [stage["status"] for name, stage in record.stages.items() if name != REPORT_STAGE]
+    if all(status == STATUS_COMPLETED for status in statuses):
+        return STATUS_COMPLETED
+    if any(status in (STATUS_FAILED, STATUS_SKIPPED) for status in statuses):
+        return STATUS_FAILED
+    return record.status
+
+
+# 全域實例
+_enrichment_service: Optional[EnrichmentService] = None
+
+
+def get_enrichment_service() -> EnrichmentService:
+    """獲取背景分析服務"""
+    global _enrichment_service
+    if _enrichment_service is None:
+        from core.config import get_settings
+        settings = get_settings()
+        _enrichment_service = EnrichmentService(settings.enrichment_concurrency,
+                                                settings.enrichment_max_attempts,
+                                                settings.enrichment_requeue_after_seconds)
+    return _enrichment_service
@@ -7,8 +7,12 @@ backend implementations and provides a consistent interface.
 
 Key Features:
 - Abstract cache interface for multiple backends
-- Memory-based cache with LRU eviction
+- Memory-based cache with lock-striped shards and approximate LRU eviction
+- Single-flight coalescing of concurrent misses
 - TTL (Time To Live) support
+- Stale-while-revalidate and negative caching in CacheManager
+- Dependency tags: entries declare the artifact versions they depend on
+  and publishing a new version drops exactly those entries
 - Cache statistics and monitoring
 - Thread-safe operations
 - Fallback mechanisms
@@ -25,14 +29,18 @@ Version: 1.0
 """
 
 import hashlib
+import inspect
 import json
+import sys
 import time
 import threading
+import weakref
 from abc import ABC, abstractmethod
 from collections import OrderedDict
 from dataclasses import dataclass, field
 from datetime import datetime, timedelta
-from typing import Any, Dict, List, Optional, Tuple, Union, TypeVar, Generic
+from typing import (Any, Awaitable, Callable, Dict, FrozenSet, Iterable, List, Optional, Set,
+                    Tuple, Union, TypeVar, Generic)
 import asyncio
 from concurrent.futures import ThreadPoolExecutor
 import logging
@@ -140,174 +148,231 @@ class CacheInterface(ABC, Generic[K, V]):
         pass
 
 
+class SingleFlight:
+    """
+    Request coalescing for concurrent cache misses.
+
+    While a computation for a key is running, other callers for the same
+    key await its result instead of starting their own.
+    """
+
+    def __init__(self):
+        self._inflight: Dict[str, asyncio.Future] = {}
+        self.coalesced = 0
+
+    async def do(self, key: str, compute: Callable[[], Awaitable[V]]) -> V:
+        """Run compute() once per key at a time and share the result."""
+        future = self._inflight.get(key)
+        if future is not None and future.get_loop() is asyncio.get_running_loop():
+            self.coalesced += 1
+            return await asyncio.shield(future)
+
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[key] = future
+        try:
+            result = await compute()
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except BaseException as e:
+            future.set_exception(e)
+            # Mark retrieved so an unawaited failure is not logged
+            future.exception()
+            raise
+        else:
+            future.set_result(result)
+            return result
+        finally:
+            if self._inflight.get(key) is future:
+                del self._inflight[key]
+
+    def __len__(self) -> int:
+        return len(self._inflight)
+
+
+class _Slot:
+    """Lightweight entry stored by MemoryCache."""
+    __slots__ = ('value', 'expires_at', 'size_bytes', 'referenced')
+
+    def __init__(self, value: Any, expires_at: Optional[float], size_bytes: int):
+        self.value = value
+        self.expires_at = expires_at
+        self.size_bytes = size_bytes
+        self.referenced = False
+
+
+class _Shard:
+    __slots__ = ('entries', 'lock')
+
+    def __init__(self):
+        self.entries: OrderedDict = OrderedDict()
+        self.lock = threading.Lock()
+
+
 class MemoryCache(CacheInterface[str, Any]):
     """
     High-performance in-memory cache with LRU eviction and TTL support.
 
     This implementation provides:
-    - LRU (Least Recently Used) eviction policy
-    - TTL (Time To Live) expiration
-    - Thread-safe operations
-    - Comprehensive statistics
-    - Memory usage monitoring
+    - Lock-striped shards: writers lock one shard, readers take no lock
+    - Approximate LRU (CLOCK): reads flag an entry as referenced and
+      eviction gives flagged entries a second chance
+    - TTL (Time To Live) expiration on a monotonic clock
+    - Single-flight get_or_compute() for concurrent misses
+    - Comprehensive statistics (approximate under thread contention)
     """
 
-    def __init__(self, max_size: int = 1000, default_ttl: int = 3600):
+    def __init__(self, max_size: int = 1000, default_ttl: int = 3600, shards: int = 16):
         """
         Initialize memory cache.
 
         Args:
             max_size: Maximum number of entries
             default_ttl: Default TTL in seconds
+            shards: Maximum number of lock stripes (small caches use fewer,
+                keeping eviction order exact)
         """
         self.max_size = max_size
         self.default_ttl = default_ttl
 
-        # Storage with LRU ordering
-        self._cache: OrderedDict[str, CacheEntry] = OrderedDict()
-        self._lock = threading.RLock()
+        shard_count = max(1, min(shards, max_size // 64))
+        self._shards = [_Shard() for _ in range(shard_count)]
+        self._size = 0
+        self._size_lock = threading.Lock()
+        self._single_flight = SingleFlight()
 
         # Statistics
         self._stats = CacheStats(max_entries=max_size)
 
         # Cleanup task
         self._cleanup_interval = 60  # seconds
-        self._last_cleanup = time.time()
+        self._last_cleanup = time.monotonic()
+
+    def _shard(self, key: str) -> _Shard:
+        return self._shards[hash(key) % len(self._shards)]
 
     async def get(self, key: str) -> Optional[Any]:
         """Get a value from the cache."""
-        start_time = time.time()
-
-        async with asyncio.Lock():
-            with self._lock:
-                entry = self._cache.get(key)
+        start_time = time.perf_counter()
 
-                if entry is None:
-                    self._stats.misses += 1
-                    self._update_avg_time('get', start_time)
-                    return None
+        # Lock-free: a dict lookup is atomic and slots are replaced, not mutated
+        slot = self._shard(key).entries.get(key)
 
-                # Check expiration
-                if entry.is_expired():
-                    del self._cache[key]
-                    self._stats.misses += 1
-                    self._stats.evictions += 1
-                    self._update_avg_time('get', start_time)
-                    return None
+        if slot is None or (slot.expires_at is not None and slot.expires_at <= time.monotonic()):
+            if slot is not None:
+                self._remove(key, slot, evicted=True)
+            self._stats.misses += 1
+            self._update_avg_time('get', start_time)
+            return None
 
-                # Update access and move to end (most recent)
-                entry.access()
-                self._cache.move_to_end(key)
-
-                self._stats.hits += 1
-                self._update_avg_time('get', start_time)
-                return entry.value
+        slot.referenced = True
+        self._stats.hits += 1
+        self._update_avg_time('get', start_time)
+        return slot.value
 
     async def set(self, key: str, value: Any, ttl: Optional[int] = None) -> bool:
         """Set a value in the cache with optional TTL."""
-        start_time = time.time()
-
-        async with asyncio.Lock():
-            with self._lock:
-                # Calculate expiration
-                ttl_seconds = ttl if ttl is not None else self.default_ttl
-                expires_at = datetime.now() + timedelta(seconds=ttl_seconds) if ttl_seconds > 0 else None
-
-                # Estimate size (rough approximation)
-                size_bytes = self._estimate_size(value)
-
-                # Create entry
-                entry = CacheEntry(
-                    value=value,
-                    created_at=datetime.now(),
-                    expires_at=expires_at,
-                    size_bytes=size_bytes
-                )
-
-                # Check if key already exists
-                if key in self._cache:
-                    # Update existing
-                    old_entry = self._cache[key]
-                    self._stats.memory_usage_bytes -= old_entry.size_bytes
-                    self._cache[key] = entry
-                    self._cache.move_to_end(key)
-                else:
-                    # Add new entry
-                    self._cache[key] = entry
-                    self._stats.current_entries += 1
-
-                self._stats.memory_usage_bytes += size_bytes
-                self._stats.sets += 1
+        start_time = time.perf_counter()
+
+        ttl_seconds = ttl if ttl is not None else self.default_ttl
+        expires_at = time.monotonic() + ttl_seconds if ttl_seconds > 0 else None
+        slot = _Slot(value, expires_at, self._estimate_size(value))
+
+        shard = self._shard(key)
+        with shard.lock:
+            old = shard.entries.pop(key, None)
+            shard.entries[key] = slot
+        delta = slot.size_bytes - (old.size_bytes if old else 0)
+
+        with self._size_lock:
+            if old is None:
+                self._size += 1
+                self._stats.current_entries += 1
+            self._stats.memory_usage_bytes += delta
+            self._stats.sets += 1
+
+        # Evict if necessary
+        self._evict_if_needed(shard)
+
+        # Periodic cleanup
+        self._periodic_cleanup()
+
+        self._update_avg_time('set', start_time)
+        return True
+
+    async def get_or_compute(self,
+                             key: str,
+                             compute: Callable[[], Awaitable[Any]],
+                             ttl: Optional[int] = None) -> Any:
+        """
+        Get a value, computing and caching it on a miss.
 
-                # Evict if necessary
-                self._evict_if_needed()
+        Concurrent misses for the same key share one compute() call.
+        """
+        value = await self.get(key)
+        if value is not None:
+            return value
 
-                # Periodic cleanup
-                self._periodic_cleanup()
+        async def compute_and_store():
+            result = await compute()
+            if result is not None:
+                await self.set(key, result, ttl)
+            return result
 
-                self._update_avg_time('set', start_time)
-                return True
+        return await self._single_flight.do(key, compute_and_store)
 
     async def delete(self, key: str) -> bool:
         """Delete a value from the cache."""
-        async with asyncio.Lock():
-            with self._lock:
-                entry = self._cache.pop(key, None)
-
-                if entry is not None:
-                    self._stats.deletes += 1
-                    self._stats.current_entries -= 1
-                    self._stats.memory_usage_bytes -= entry.size_bytes
-                    return True
-
-                return False
+        slot = self._shard(key).entries.get(key)
+        if slot is not None and self._remove(key, slot):
+            self._stats.deletes += 1
+            return True
+        return False
 
     async def exists(self, key: str) -> bool:
         """Check if a key exists in the cache."""
-        async with asyncio.Lock():
-            with self._lock:
-                entry = self._cache.get(key)
+        slot = self._shard(key).entries.get(key)
 
-                if entry is None:
-                    return False
+        if slot is None:
+            return False
 
-                if entry.is_expired():
-                    del self._cache[key]
-                    self._stats.evictions += 1
-                    self._stats.current_entries -= 1
-                    self._stats.memory_usage_bytes -= entry.size_bytes
-                    return False
+        if slot.expires_at is not None and slot.expires_at <= time.monotonic():
+            self._remove(key, slot, evicted=True)
+            return False
 
-                return True
+        return True
 
     async def clear(self) -> bool:
         """Clear all entries from the cache."""
-        async with asyncio.Lock():
-            with self._lock:
-                self._cache.clear()
-                self._stats.current_entries = 0
-                self._stats.memory_usage_bytes = 0
-                return True
+        for shard in self._shards:
+            with shard.lock:
+                shard.entries.clear()
+        with self._size_lock:
+            self._size = 0
+            self._stats.current_entries = 0
+            self._stats.memory_usage_bytes = 0
+        return True
 
     async def keys(self, pattern: Optional[str] = None) -> List[str]:
         """Get all keys, optionally matching a pattern."""
-        async with asyncio.Lock():
-            with self._lock:
-                all_keys = list(self._cache.keys())
+        all_keys = []
+        for shard in self._shards:
+            with shard.lock:
+                all_keys.extend(shard.entries.keys())
 
-                if pattern is None:
-                    return all_keys
+        if pattern is None:
+            return all_keys
 
-                # Simple pattern matching (could be enhanced with regex)
-                if '*' in pattern:
-                    prefix = pattern.rstrip('*')
-                    return [key for key in all_keys if key.startswith(prefix)]
+        # Simple pattern matching (could be enhanced with regex)
+        if '*' in pattern:
+            prefix = pattern.rstrip('*')
+            return [key for key in all_keys if key.startswith(prefix)]
 
-                return [key for key in all_keys if pattern in key]
+        return [key for key in all_keys if pattern in key]
 
     def get_stats(self) -> CacheStats:
         """Get cache statistics."""
-        with self._lock:
+        with self._size_lock:
             return CacheStats(
                 hits=self._stats.hits,
                 misses=self._stats.misses,
@@ -321,61 +386,106 @@ class MemoryCache(CacheInterface[str, Any]):
                 avg_set_time_ms=self._stats.avg_set_time_ms
             )
 
-    def _evict_if_needed(self):
-        """Evict least recently used entries if cache is full."""
-        while len(self._cache) > self.max_size:
-            # Remove least recently used (first item)
-            key, entry = self._cache.popitem(last=False)
-            self._stats.evictions += 1
+    def get_single_flight_stats(self) -> Dict[str, int]:
+        """Coalescing statistics for get_or_compute()."""
+        return {
+            'coalesced_requests': self._single_flight.coalesced,
+            'inflight': len(self._single_flight)
+        }
+
+    def _remove(self, key: str, slot: _Slot, evicted: bool = False) -> bool:
+        """Remove key if it still maps to slot; returns True if removed."""
+        shard = self._shard(key)
+        with shard.lock:
+            if shard.entries.get(key) is not slot:
+                return False
+            del shard.entries[key]
+
+        with self._size_lock:
+            self._size -= 1
             self._stats.current_entries -= 1
-            self._stats.memory_usage_bytes -= entry.size_bytes
+            self._stats.memory_usage_bytes -= slot.size_bytes
+            if evicted:
+                self._stats.evictions += 1
+        return True
+
+    def _evict_if_needed(self, start: _Shard):
+        """Evict entries (CLOCK order) while the cache is over capacity."""
+        index = self._shards.index(start)
+        while self._size > self.max_size:
+            # Start with the shard just written to, move on if it is empty
+            for offset in range(len(self._shards)):
+                shard = self._shards[(index + offset) % len(self._shards)]
+                victim = self._pop_victim(shard)
+                if victim is not None:
+                    break
+            else:
+                return
+
+            with self._size_lock:
+                self._size -= 1
+                self._stats.evictions += 1
+                self._stats.current_entries -= 1
+                self._stats.memory_usage_bytes -= victim.size_bytes
+
+    @staticmethod
+    def _pop_victim(shard: _Shard) -> Optional[_Slot]:
+        with shard.lock:
+            entries = shard.entries
+            for _ in range(len(entries)):
+                key, slot = next(iter(entries.items()))
+                if slot.referenced:
+                    # Second chance: recently read entries move to the back
+                    slot.referenced = False
+                    entries.move_to_end(key)
+                    continue
+                del entries[key]
+                return slot
+            if entries:
+                return entries.popitem(last=False)[1]
+        return None
 
     def _periodic_cleanup(self):
         """Remove expired entries periodically."""
-        current_time = time.time()
+        now = time.monotonic()
 
-        if current_time - self._last_cleanup < self._cleanup_interval:
+        if now - self._last_cleanup < self._cleanup_interval:
             return
 
-        self._last_cleanup = current_time
-        now = datetime.now()
-
-        expired_keys = []
-        for key, entry in self._cache.items():
-            if entry.expires_at and now > entry.expires_at:
-                expired_keys.append(key)
+        self._last_cleanup = now
 
-        for key in expired_keys:
-            entry = self._cache.pop(key, None)
-            if entry:
-                self._stats.evictions += 1
-                self._stats.current_entries -= 1
-                self._stats.memory_usage_bytes -= entry.size_bytes
+        for shard in self._shards:
+            with shard.lock:
+                expired = [(key, slot) for key, slot in shard.entries.items()
+                           if slot.expires_at is not None and slot.expires_at <= now]
+            for key, slot in expired:
+                self._remove(key, slot, evicted=True)
 
-    def _estimate_size(self, value: Any) -> int:
-        """Estimate the memory size of a value in bytes."""
-        try:
-            # Use JSON serialization as approximation
-            return len(json.dumps(value, default=str).encode('utf-8'))
-        except (TypeError, ValueError):
-            # Fallback for non-serializable objects
-            return len(str(value).encode('utf-8'))
+    @staticmethod
+    def _estimate_size(value: Any) -> int:
+        """Estimate the memory size of a value in bytes (shallow, no serialization)."""
+        size = sys.getsizeof(value)
+        if isinstance(value, dict):
+            size += sum(sys.getsizeof(k) + sys.getsizeof(v) for k, v in value.items())
+        elif isinstance(value, (list, tuple, set, frozenset)):
+            size += sum(sys.getsizeof(item) for item in value)
+        return size
 
     def _update_avg_time(self, operation: str, start_time: float):
         """Update average operation time."""
-        elapsed_ms = (time.time() - start_time) * 1000
+        elapsed_ms = (time.perf_counter() - start_time) * 1000
 
         if operation == 'get':
             # Simple moving average
             total_ops = self._stats.hits + self._stats.misses
-            if total_ops == 1:
+            if total_ops <= 1:
                 self._stats.avg_get_time_ms = elapsed_ms
             else:
                 self._stats.avg_get_time_ms = (
                     (self._stats.avg_get_time_ms * (total_ops - 1) + elapsed_ms) / total_ops
                 )
         elif operation == 'set':
-            if self._stats.sets == 1:
+            if self._stats.sets <= 1:
                 self._stats.avg_set_time_ms = elapsed_ms
             else:
                 self._stats.avg_set_time_ms = (
@@ -479,22 +589,151 @@ class CacheKeyBuilder:
         return f"chart:{chart_type}:{data_hash}:{style}"
 
 
+_ENVELOPE = '__cache_envelope__'
+# Negative-cache marker stored in fallback (shared) tiers
+_MISSING = '__cache_missing__'
+
+# Versioned artifacts cached results can depend on
+ARTIFACT_IRT_PARAMETERS = 'irt_parameters'
+ARTIFACT_NORMS = 'norms'
+ARTIFACT_STATEMENT_BANK = 'statement_bank'
+ARTIFACT_KNOWLEDGE_BASE = 'knowledge_base'
+
+
+class DependencyIndex:
+    """
+    Tag index from artifacts to the cache keys computed from them.
+
+    Publishing a new artifact version returns (and forgets) exactly the
+    keys tagged with that artifact, in O(#dependents). Beyond max_keys the
+    oldest tags are dropped, so it should exceed the number of live entries.
+
+    The index and the published versions are per process: every worker
+    publishes the versions it loaded. Entries shared between workers carry
+    their tags and the versions they were computed with, so CacheManager
+    re-tags them when promoting and ignores them when this worker has
+    published a different version.
+
+    Other cache tiers sharing the index (the v4 PerformanceOptimizer)
+    subscribe() to drop their own copies of invalidated keys.
+    """
+
+    def __init__(self, max_keys: int = 200000):
+        self.max_keys = max_keys
+        self.versions: Dict[str, str] = {}
+        self._dependents: Dict[str, Set[str]] = {}
+        self._tags: Dict[str, FrozenSet[str]] = {}
+        self._listeners: List[Callable[[], Any]] = []
+        self._lock = threading.Lock()
+
+    def subscribe(self, callback: Callable[[List[str]], None]):
+        """Call callback(keys) after each publish that invalidates keys (bound methods held weakly)."""
+        if inspect.ismethod(callback):
+            ref = weakref.WeakMethod(callback)
+        else:
+            ref = lambda: callback
+        with self._lock:
+            self._listeners.append(ref)
+
+    def track(self, key: str, artifacts: Iterable[str]):
+        """Tag key with the artifacts it was computed from."""
+        tags = frozenset(artifacts)
+        with self._lock:
+            self._untrack(key)
+            if tags:
+                self._tags[key] = tags
+                for artifact in tags:
+                    self._dependents.setdefault(artifact, set()).add(key)
+                while len(self._tags) > self.max_keys:
+                    self._untrack(next(iter(self._tags)))
+
+    def untrack(self, key: str):
+        with self._lock:
+            self._untrack(key)
+
+    def forget(self, prefix: Optional[str] = None):
+        """Drop the tags of keys starting with prefix (all when None)."""
+        with self._lock:
+            for key in [k for k in self._tags if prefix is None or k.startswith(prefix)]:
+                self._untrack(key)
+
+    def _untrack(self, key: str):
+        for artifact in self._tags.pop(key, ()):
+            dependents = self._dependents.get(artifact)
+            if dependents is not None:
+                dependents.discard(key)
+
+    def versions_of(self, artifacts: Iterable[str]) -> Dict[str, Optional[str]]:
+        """Current versions of the given artifacts."""
+        return {artifact: self.versions.get(artifact) for artifact in artifacts}
+
+    def publish(self, artifact: str, version: str) -> List[str]:
+        """Record a version; returns the keys invalidated by the change."""
+        with self._lock:
+            if self.versions.get(artifact) == version:
+                return []
+            self.versions[artifact] = version
+            keys = self._dependents.pop(artifact, set())
+            for key in keys:
+                for other in self._tags.pop(key, ()):
+                    if other != artifact:
+                        self._dependents[other].discard(key)
+            self._listeners = [ref for ref in self._listeners if ref() is not None]
+            listeners = [ref() for ref in self._listeners]
+        keys = list(keys)
+        if keys:
+            for listener in listeners:
+                if listener is not None:
+                    listener(keys)
+        return keys
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                'versions': dict(self.versions),
+                'tagged_keys': len(self._tags),
+                'dependents': {artifact: len(keys) for artifact, keys in self._dependents.items()}
+            }
+
+
 class CacheManager:
     """
     High-level cache manager that orchestrates multiple cache instances.
 
     This manager provides:
     - Cache instance management
-    - Fallback mechanisms
-    - Cache warming strategies
+    - Fallback mechanisms (fallback hits are promoted to the primary)
+    - Stale-while-revalidate: entries past their soft TTL are served
+      while a single background task refreshes them
+    - Negative caching of known-missing keys; with fallback tiers the
+      markers live there, so delete() in any worker clears them
+    - Dependency-tagged invalidation on artifact version changes
     - Health monitoring
     """
 
-    def __init__(self):
+    def __init__(self, negative_cache_size: int = 10000):
         self._caches: Dict[str, CacheInterface] = {}
         self._primary_cache: Optional[str] = None
         self._fallback_caches: List[str] = []
 
+        # key -> monotonic expiry of the "known missing" marker
+        self._negative: OrderedDict[str, float] = OrderedDict()
+        self._negative_cache_size = negative_cache_size
+        self._refreshing: Dict[str, asyncio.Task] = {}
+        self._single_flight = SingleFlight()
+        # Optional AccessTracker (utils.cache_warming) fed by get_or_load()
+        self.access_tracker = None
+        self.dependencies = DependencyIndex()
+        self._swr_stats = {
+            'stale_served': 0,
+            'refreshes': 0,
+            'refresh_failures': 0,
+            'negative_hits': 0,
+            'promotions': 0,
+            'dependency_invalidations': 0,
+            'superseded_loads': 0
+        }
+
         # Initialize default memory cache
         self.register_cache("memory", MemoryCache(max_size=1000, default_ttl=3600))
         self.set_primary("memory")
@@ -520,8 +759,13 @@ class CacheManager:
         if name not in self._fallback_caches:
             self._fallback_caches.append(name)
 
-    async def get(self, key: str) -> Optional[Any]:
-        """Get value with fallback support."""
+    async def _lookup(self, key: str) -> Optional[Any]:
+        """
+        Raw lookup: primary first, then fallbacks (promoting hits).
+
+        Fallback entries computed from an artifact version other than the
+        one this worker has published are treated as misses.
+        """
         # Try primary cache first
         if self._primary_cache:
             try:
@@ -536,26 +780,104 @@ class CacheManager:
             try:
                 value = await self._caches[cache_name].get(key)
                 if value is not None:
-                    # Warm primary cache if available
-                    if self._primary_cache:
-                        try:
-                            await self._caches[self._primary_cache].set(key, value)
-                        except Exception:
-                            pass  # Don't fail get operation
+                    if _is_missing_marker(value):
+                        return value  # never promoted
+                    if not self._matches_versions(value):
+                        continue
+                    await self._promote(key, value)
                     return value
             except Exception as e:
                 logger.warning(f"Fallback cache {cache_name} get failed: {e}")
 
         return None
 
-    async def set(self, key: str, value: Any, ttl: Optional[int] = None) -> bool:
-        """Set value in all available caches."""
+    def _matches_versions(self, value: Any) -> bool:
+        """Whether an envelope was computed from this worker's artifact versions."""
+        if not (isinstance(value, dict) and value.get(_ENVELOPE)):
+            return True
+        for artifact, version in value.get('versions', {}).items():
+            current = self.dependencies.versions.get(artifact)
+            if current is not None and current != version:
+                return False
+        return True
+
+    async def _promote(self, key: str, value: Any):
+        """
+        Copy a fallback hit into the primary for its remaining lifetime,
+        re-tagging it so publish_version() in this worker evicts it.
+        """
+        if not self._primary_cache:
+            return
+        ttl = None
+        if isinstance(value, dict) and value.get(_ENVELOPE):
+            if value.get('expires_at') is not None:
+                remaining = value['expires_at'] - time.time()
+                if remaining <= 0:
+                    return
+                ttl = max(1, int(remaining))
+            self.dependencies.track(key, value.get('depends_on', ()))
+        try:
+            await self._caches[self._primary_cache].set(key, value, ttl)
+            self._swr_stats['promotions'] += 1
+        except Exception:
+            pass  # Don't fail get operation
+
+    async def get(self, key: str) -> Optional[Any]:
+        """Get value with fallback support (stale values included)."""
+        if self.is_known_missing(key):
+            return None
+        value = await self._lookup(key)
+        if _is_missing_marker(value):
+            return None
+        if isinstance(value, dict) and value.get(_ENVELOPE):
+            return value['value']
+        return value
+
+    async def set(self,
+                  key: str,
+                  value: Any,
+                  ttl: Optional[int] = None,
+                  stale_ttl: Optional[int] = None,
+                  depends_on: Iterable[str] = ()) -> bool:
+        """
+        Set value in all available caches.
+
+        Args:
+            key: Cache key
+            value: Value to cache
+            ttl: Freshness TTL in seconds (backend default when None)
+            stale_ttl: Extra seconds the value may be served stale while it
+                is refreshed by get_or_load(); None disables stale serving
+            depends_on: Artifacts (ARTIFACT_*) the value was computed from;
+                publish_version() on any of them deletes the entry. The tags
+                and current versions travel with the value to other tiers.
+        """
+        depends_on = tuple(depends_on)
+        self._negative.pop(key, None)
+        self.dependencies.track(key, depends_on)
+
+        stored = value
+        backend_ttl = ttl
+        serve_stale = stale_ttl is not None and ttl is not None
+        if serve_stale or depends_on:
+            now = time.time()
+            if serve_stale:
+                backend_ttl = ttl + stale_ttl
+            stored = {
+                _ENVELOPE: 1,
+                'value': value,
+                'fresh_until': now + ttl if ttl is not None else None,
+                'expires_at': now + backend_ttl if backend_ttl is not None else None,
+                'depends_on': sorted(depends_on),
+                'versions': self.dependencies.versions_of(depends_on)
+            }
+
         success = False
 
         # Set in primary cache
         if self._primary_cache:
             try:
-                await self._caches[self._primary_cache].set(key, value, ttl)
+                await self._caches[self._primary_cache].set(key, stored, backend_ttl)
                 success = True
             except Exception as e:
                 logger.warning(f"Primary cache set failed: {e}")
@@ -563,17 +885,197 @@ class CacheManager:
         # Set in fallback caches
         for cache_name in self._fallback_caches:
             try:
-                await self._caches[cache_name].set(key, value, ttl)
+                await self._caches[cache_name].set(key, stored, backend_ttl)
                 success = True
             except Exception as e:
                 logger.warning(f"Fallback cache {cache_name} set failed: {e}")
 
         return success
 
+    async def delete(self, key: str) -> bool:
+        """Delete a key from every registered cache."""
+        self._negative.pop(key, None)
+        self.dependencies.untrack(key)
+        deleted = False
+        for name, cache in self._caches.items():
+            try:
+                deleted = await cache.delete(key) or deleted
+            except Exception as e:
+                logger.warning(f"Cache {name} delete failed: {e}")
+        return deleted
+
+    async def get_or_load(self,
+                          key: str,
+                          loader: Callable[[], Awaitable[Optional[Any]]],
+                          ttl: int = 300,
+                          stale_ttl: int = 600,
+                          negative_ttl: Optional[int] = 30,
+                          depends_on: Iterable[str] = ()) -> Optional[Any]:
+        """
+        Get a value, loading it on a miss with stale-while-revalidate.
+
+        - Fresh entry: returned directly
+        - Stale entry (past ttl, within stale_ttl): returned immediately;
+          one background task per key reloads it
+        - Miss: concurrent callers share one loader() call
+        - loader() returning None marks the key missing for negative_ttl
+          seconds, so repeated lookups for unknown ids skip the loader;
+          the marker is kept in the fallback tiers when there are any,
+          so delete() in any worker clears it for all of them
+        - A load that overlaps publish_version() of one of its artifacts
+          is returned but not cached
+
+        Args:
+            key: Cache key
+            loader: Coroutine function producing the value (None if absent)
+            ttl: Freshness TTL in seconds
+            stale_ttl: Seconds a stale value may still be served
+            negative_ttl: Seconds to remember a missing key (None disables)
+            depends_on: Artifacts (ARTIFACT_*) the value is computed from
+        """
+        depends_on = tuple(depends_on)
+        if self.is_known_missing(key):
+            self._swr_stats['negative_hits'] += 1
+            return None
+
+        if self.access_tracker is not None:
+            self.access_tracker.record(key)
+
+        cached = await self._lookup(key)
+        if _is_missing_marker(cached):
+            self._swr_stats['negative_hits'] += 1
+            return None
+        if cached is not None:
+            if not (isinstance(cached, dict) and cached.get(_ENVELOPE)):
+                return cached
+            if cached['fresh_until'] is not None and cached['fresh_until'] <= time.time():
+                self._swr_stats['stale_served'] += 1
+                self._schedule_refresh(key, loader, ttl, stale_ttl, negative_ttl, depends_on)
+            return cached['value']
+
+        async def load():
+            versions = self.dependencies.versions_of(depends_on)
+            value = await loader()
+            await self._store_loaded(key, value, ttl, stale_ttl, negative_ttl, depends_on, versions)
+            return value
+
+        return await self._single_flight.do(key, load)
+
+    async def _store_loaded(self, key: str, value: Any, ttl: int,
+                            stale_ttl: int, negative_ttl: Optional[int],
+                            depends_on: Tuple[str, ...] = (),
+                            versions: Optional[Dict[str, Optional[str]]] = None):
+        if versions is not None and self.dependencies.versions_of(depends_on) != versions:
+            # An artifact was republished while loading: the value may be stale
+            self._swr_stats['superseded_loads'] += 1
+        elif value is None:
+            if negative_ttl:
+                await self._remember_missing(key, negative_ttl)
+        else:
+            await self.set(key, value, ttl, stale_ttl, depends_on)
+
+    def _schedule_refresh(self, key: str, loader, ttl: int,
+                          stale_ttl: int, negative_ttl: Optional[int],
+                          depends_on: Tuple[str, ...] = ()):
+        """Start one background reload per key."""
+        task = self._refreshing.get(key)
+        if task is not None and not task.done():
+            return
+
+        async def refresh():
+            try:
+                versions = self.dependencies.versions_of(depends_on)
+                value = await loader()
+                if value is None:
+                    await self.delete(key)
+                await self._store_loaded(key, value, ttl, stale_ttl, negative_ttl,
+                                         depends_on, versions)
+                self._swr_stats['refreshes'] += 1
+            except Exception as e:
+                # Keep serving the stale value until it expires
+                self._swr_stats['refresh_failures'] += 1
+                logger.warning(f"Background refresh failed for {key}: {e}")
+            finally:
+                self._refreshing.pop(key, None)
+
+        self._refreshing[key] = asyncio.get_running_loop().create_task(refresh())
+
+    async def publish_version(self, artifact: str, version: str) -> List[str]:
+        """
+        Record a new artifact version and delete the entries built on the old one.
+
+        Args:
+            artifact: Artifact name (ARTIFACT_*)
+            version: New version or content hash
+
+        Returns:
+            The invalidated keys (empty when the version is unchanged)
+        """
+        keys = self.dependencies.publish(artifact, version)
+        for key in keys:
+            for name, cache in self._caches.items():
+                try:
+                    await cache.delete(key)
+                except Exception as e:
+                    logger.warning(f"Cache {name} delete failed: {e}")
+        if keys:
+            self._swr_stats['dependency_invalidations'] += len(keys)
+            logger.info(f"Published {artifact}={version}: invalidated {len(keys)} entries")
+        return keys
+
+    async def _remember_missing(self, key: str, ttl: int):
+        """
+        Negative-cache a key: in the fallback tiers when registered, so
+        other workers share the marker and delete() anywhere clears it;
+        in this process otherwise.
+        """
+        if not self._fallback_caches:
+            self.mark_missing(key, ttl)
+            return
+        for cache_name in self._fallback_caches:
+            try:
+                await self._caches[cache_name].set(key, {_MISSING: 1}, ttl)
+            except Exception as e:
+                logger.warning(f"Fallback cache {cache_name} set failed: {e}")
+
+    def mark_missing(self, key: str, ttl: int = 30):
+        """Remember (in this process only) that key has no value for ttl seconds."""
+        self._negative[key] = time.monotonic() + ttl
+        self._negative.move_to_end(key)
+        while len(self._negative) > self._negative_cache_size:
+            self._negative.popitem(last=False)
+
+    def forget_missing(self, key: str):
+        """Drop a negative-cache marker (e.g. after the key was created)."""
+        self._negative.pop(key, None)
+
+    def is_known_missing(self, key: str) -> bool:
+        expires_at = self._negative.get(key)
+        if expires_at is None:
+            return False
+        if expires_at <= time.monotonic():
+            self._negative.pop(key, None)
+            return False
+        return True
+
     def get_all_stats(self) -> Dict[str, CacheStats]:
         """Get statistics from all registered caches."""
         return {name: cache.get_stats() for name, cache in self._caches.items()}
 
+    def get_manager_stats(self) -> Dict[str, Any]:
+        """Stale-while-revalidate, negative cache and promotion counters."""
+        return {
+            **self._swr_stats,
+            'negative_entries': len(self._negative),
+            'refreshes_in_flight': len(self._refreshing),
+            'coalesced_loads': self._single_flight.coalesced,
+            'artifact_versions': dict(self.dependencies.versions)
+        }
+
+
+def _is_missing_marker(value: Any) -> bool:
+    return isinstance(value, dict) and value.get(_MISSING) == 1
+
 
 # Global cache manager instance
 _cache_manager = CacheManager()
@@ -597,9 +1099,7 @@ async def cache_set(key: str, value: Any, ttl: Optional[int] = None) -> bool:
 
 async def cache_delete(key: str) -> bool:
     """Delete value from cache using global manager."""
-    if _cache_manager._primary_cache:
-        return await _cache_manager._caches[_cache_manager._primary_cache].delete(key)
-    return False
+    return await _cache_manager.delete(key)
 
 
 def build_report_cache_key(
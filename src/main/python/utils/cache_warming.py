@@ -0,0 +1,321 @@
+"""
+Cache Warming - Traffic-Driven Precomputation
+
+Records how often each cache key is requested and, on startup or after
+an invalidation, recomputes the hottest entries before users ask for
+them.
+
+Components:
+- AccessTracker: exponentially decayed access counts per key class
+  (the key prefix before the first ':'), persisted as a compact JSON
+  hotness summary
+- CacheWarmer: key-class loaders plus a budgeted warm() that refills the
+  top-K missing entries through a bounded worker pool; publish_version()
+  invalidates an artifact's dependents and re-warms the hottest of them.
+  Synchronous loaders run in worker threads, so a blocking query does
+  not stall the event loop.
+- Preloads: reference data held in process-local snapshots rather than
+  cache keys (statement bank / form ids, archetype reference tables) is
+  loaded once at the start of warm(). Norm groups and report templates
+  are built by the component registry preload and need no entry here.
+
+Usage:
+    warmer = get_cache_warmer()
+    warmer.register("v4_results", load_results_for_key)
+    warmer.register_preload("archetype_reference", service.preload_reference_data)
+    await warmer.warm(top_k=200, time_budget_seconds=10)
+"""
+
+import asyncio
+import inspect
+import json
+import os
+import threading
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Dict, Iterable, List, Optional, Tuple, Union
+import logging
+
+from utils.cache import CacheManager, get_cache_manager
+
+logger = logging.getLogger(__name__)
+
+
+def key_class(key: str) -> str:
+    """Key class of a cache key, e.g. 'v4_results' for 'v4_results:abc'."""
+    return key.split(':', 1)[0]
+
+
+Loader = Callable[..., Union[Any, Awaitable[Any]]]
+
+
+async def _call_loader(loader: Loader, *args) -> Any:
+    """Await coroutine loaders; run synchronous ones in a worker thread."""
+    if inspect.iscoroutinefunction(loader):
+        return await loader(*args)
+    result = await asyncio.to_thread(loader, *args)
+    if inspect.isawaitable(result):
+        result = await result
+    return result
+
+
+class AccessTracker:
+    """
+    Decayed access frequency per cache key.
+
+    Each record() adds 1 to the key's score; scores halve every
+    half_life_seconds, so the summary follows current traffic.
+    """
+
+    def __init__(self, half_life_seconds: float = 6 * 3600, max_keys_per_class: int = 2000):
+        self.half_life_seconds = half_life_seconds
+        self.max_keys_per_class = max_keys_per_class
+        # class -> key -> (score, as-of wall time)
+        self._scores: Dict[str, Dict[str, Tuple[float, float]]] = {}
+        self._lock = threading.Lock()
+
+    def _decayed(self, score: float, as_of: float, now: float) -> float:
+        return score * 0.5 ** ((now - as_of) / self.half_life_seconds)
+
+    def record(self, key: str):
+        """Record one access to key."""
+        now = time.time()
+        with self._lock:
+            keys = self._scores.setdefault(key_class(key), {})
+            score, as_of = keys.get(key, (0.0, now))
+            keys[key] = (self._decayed(score, as_of, now) + 1.0, now)
+            if len(keys) > self.max_keys_per_class * 1.25:
+                self._prune(keys, now)
+
+    def _prune(self, keys: Dict[str, Tuple[float, float]], now: float):
+        ranked = sorted(keys.items(), key=lambda kv: self._decayed(*kv[1], now), reverse=True)
+        keys.clear()
+        keys.update(ranked[:self.max_keys_per_class])
+
+    def top(self, k: int, classes: Optional[List[str]] = None) -> List[Tuple[str, float]]:
+        """The k hottest keys (optionally restricted to key classes)."""
+        now = time.time()
+        with self._lock:
+            candidates = [
+                (key, self._decayed(score, as_of, now))
+                for cls, keys in self._scores.items()
+                if classes is None or cls in classes
+                for key, (score, as_of) in keys.items()
+            ]
+        candidates.sort(key=lambda kv: kv[1], reverse=True)
+        return candidates[:k]
+
+    def rank(self, keys: Iterable[str]) -> List[str]:
+        """Order keys hottest first (untracked keys last)."""
+        now = time.time()
+        with self._lock:
+            def score(key: str) -> float:
+                entry = self._scores.get(key_class(key), {}).get(key)
+                return self._decayed(*entry, now) if entry else 0.0
+            return sorted(keys, key=score, reverse=True)
+
+    def summary(self) -> Dict[str, Dict[str, int]]:
+        """Per-class key counts."""
+        with self._lock:
+            return {cls: {'tracked_keys': len(keys)} for cls, keys in self._scores.items()}
+
+    def save(self, path: Path):
+        """Persist the hotness summary (atomic replace)."""
+        now = time.time()
+        with self._lock:
+            data = {
+                'saved_at': now,
+                'half_life_seconds': self.half_life_seconds,
+                'classes': {
+                    cls: {key: round(self._decayed(score, as_of, now), 4)
+                          for key, (score, as_of) in keys.items()}
+                    for cls, keys in self._scores.items()
+                }
+            }
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_suffix(path.suffix + '.tmp')
+        with open(tmp, 'w', encoding='utf-8') as f:
+            json.dump(data, f, separators=(',', ':'))
+        os.replace(tmp, path)
+
+    def load(self, path: Path) -> bool:
+        """Merge a saved summary; returns False if none exists."""
+        path = Path(path)
+        if not path.exists():
+            return False
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, ValueError) as e:
+            logger.warning(f"Ignoring unreadable cache hotness summary {path}: {e}")
+            return False
+
+        saved_at = data.get('saved_at', time.time())
+        with self._lock:
+            for cls, keys in data.get('classes', {}).items():
+                target = self._scores.setdefault(cls, {})
+                for key, score in keys.items():
+                    if key not in target:
+                        target[key] = (float(score), saved_at)
+        return True
+
+
+@dataclass
+class _WarmSpec:
+    loader: Loader
+    ttl: int
+    stale_ttl: int
+    depends_on: Tuple[str, ...]
+
+
+class CacheWarmer:
+    """
+    Recomputes the hottest missing cache entries under a budget.
+
+    Loaders are registered per key class and receive the full key; they
+    may be coroutine functions or plain (blocking) functions.
+    """
+
+    def __init__(self,
+                 manager: Optional[CacheManager] = None,
+                 tracker: Optional[AccessTracker] = None,
+                 max_workers: int = 4):
+        self.manager = manager or get_cache_manager()
+        self.tracker = tracker or AccessTracker()
+        self.max_workers = max_workers
+        self._specs: Dict[str, _WarmSpec] = {}
+        self._preloads: Dict[str, Loader] = {}
+        self._warming = False
+        self.last_run: Dict[str, Any] = {}
+
+    def register(self,
+                 cls: str,
+                 loader: Loader,
+                 ttl: int = 300,
+                 stale_ttl: int = 600,
+                 depends_on: Iterable[str] = ()):
+        """Register how to recompute entries of a key class."""
+        self._specs[cls] = _WarmSpec(loader, ttl, stale_ttl, tuple(depends_on))
+
+    def register_preload(self, name: str, loader: Loader):
+        """Register a zero-argument loader for data kept outside the cache manager."""
+        self._preloads[name] = loader
+
+    def registered_classes(self) -> List[str]:
+        return list(self._specs)
+
+    async def preload(self) -> Dict[str, bool]:
+        """Run every registered preload concurrently; failures are logged, not raised."""
+        async def run(name: str, loader: Loader) -> bool:
+            try:
+                await _call_loader(loader)
+                return True
+            except Exception as e:
+                logger.warning(f"Cache preload {name} failed: {e}")
+                return False
+
+        names = list(self._preloads)
+        results = await asyncio.gather(*(run(name, self._preloads[name]) for name in names))
+        return dict(zip(names, results))
+
+    async def warm_key(self, key: str) -> bool:
+        """Recompute one key if its class is registered; True if cached."""
+        spec = self._specs.get(key_class(key))
+        if spec is None:
+            return False
+        value = await _call_loader(spec.loader, key)
+        if value is None:
+            return False
+        return await self.manager.set(key, value, spec.ttl, spec.stale_ttl, spec.depends_on)
+
+    async def warm(self,
+                   top_k: int = 200,
+                   time_budget_seconds: float = 10.0,
+                   cpu_budget_seconds: float = 5.0) -> Dict[str, Any]:
+        """Run the preloads, then warm the top_k hottest tracked keys that are not cached."""
+        preloaded = await self.preload() if self._preloads else {}
+        candidates = self.tracker.top(top_k, classes=self.registered_classes())
+        stats = await self.warm_keys([key for key, _ in candidates],
+                                     time_budget_seconds, cpu_budget_seconds)
+        return {**stats, 'preloaded': preloaded}
+
+    async def publish_version(self,
+                              artifact: str,
+                              version: str,
+                              top_k: int = 200,
+                              time_budget_seconds: float = 10.0) -> Dict[str, Any]:
+        """
+        Publish an artifact version, then re-warm the hottest invalidated
+        entries so the change does not send every reader to the loaders.
+        """
+        invalidated = await self.manager.publish_version(artifact, version)
+        if not invalidated:
+            return {'invalidated': 0}
+        stats = await self.warm_keys(self.tracker.rank(invalidated)[:top_k], time_budget_seconds)
+        return {'invalidated': len(invalidated), **stats}
+
+    async def warm_keys(self,
+                        keys: List[str],
+                        time_budget_seconds: float = 10.0,
+                        cpu_budget_seconds: float = 5.0) -> Dict[str, Any]:
+        """
+        Warm the given keys (hottest first) that are not cached.
+
+        Stops scheduling new work once the wall-clock or process CPU
+        budget is spent; at most max_workers loaders run at once.
+        """
+        if self._warming:
+            return {'status': 'already_in_progress'}
+
+        self._warming = True
+        started, cpu_started = time.monotonic(), time.process_time()
+        stats = {'candidates': 0, 'warmed': 0, 'already_cached': 0, 'failed': 0,
+                 'skipped_budget': 0, 'time_taken_seconds': 0.0, 'cpu_seconds': 0.0}
+
+        def budget_left() -> bool:
+            return (time.monotonic() - started < time_budget_seconds and
+                    time.process_time() - cpu_started < cpu_budget_seconds)
+
+        try:
+            stats['candidates'] = len(keys)
+            semaphore = asyncio.Semaphore(self.max_workers)
+
+            async def warm_one(key: str):
+                async with semaphore:
+                    if not budget_left():
+                        stats['skipped_budget'] += 1
+                        return
+                    try:
+                        if await self.manager.get(key) is not None:
+                            stats['already_cached'] += 1
+                        elif await self.warm_key(key):
+                            stats['warmed'] += 1
+                    except Exception as e:
+                        stats['failed'] += 1
+                        logger.warning(f"Cache warming failed for {key}: {e}")
+
+            # Hottest first: the semaphore admits tasks in creation order
+            await asyncio.gather(*(warm_one(key) for key in keys))
+        finally:
+            self._warming = False
+            stats['time_taken_seconds'] = round(time.monotonic() - started, 3)
+            stats['cpu_seconds'] = round(time.process_time() - cpu_started, 3)
+            self.last_run = stats
+
+        logger.info(f"Cache warming completed: {stats}")
+        return stats
+
+
+# Global warmer instance
+_cache_warmer: Optional[CacheWarmer] = None
+
+
+def get_cache_warmer() -> CacheWarmer:
+    """Get the global cache warmer, tracking accesses on the global manager."""
+    global _cache_warmer
+    if _cache_warmer is None:
+        _cache_warmer = CacheWarmer()
+        _cache_warmer.manager.access_tracker = _cache_warmer.tracker
+    return _cache_warmer
@@ -0,0 +1,216 @@
+"""
+Pipeline - Queued Background Stages with Per-Job Status
+
+Runs a fixed sequence of async stages for each submitted job (e.g. a
+session id) outside the request that submitted it:
+
+- A bounded queue drained by max_concurrency worker tasks, so at most
+  that many jobs are in flight at once
+- Stages run in order per job; each stage gets the outputs of the
+  stages before it and is retried with exponential backoff
+- A stage whose required stages failed is skipped, the others still run
+- Per-job status (overall and per stage) is kept in memory and handed to
+  an optional on_update hook after every change, e.g. to persist it
+
+Usage:
+    pipeline = PipelineRunner([
+        Stage("classify", classify),
+        Stage("report", render_report, requires=("classify",)),
+    ])
+    pipeline.submit(session_id, {"scores": scores})
+    pipeline.status(session_id)
+"""
+
+import asyncio
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Dict, Iterable, List, Optional, Tuple
+import logging
+
+logger = logging.getLogger(__name__)
+
+STATUS_QUEUED = "queued"
+STATUS_RUNNING = "running"
+STATUS_COMPLETED = "completed"
+STATUS_FAILED = "failed"
+STATUS_SKIPPED = "skipped"
+
+FINISHED_STATUSES = (STATUS_COMPLETED, STATUS_FAILED)
+
+
+class PipelineFull(Exception):
+    """The queue is at max_queue; the job was not accepted."""
+
+
+@dataclass
+class Stage:
+    """
+    One pipeline step.
+
+    run receives (job_id, context) where context holds the submit
+    context plus an "outputs" dict of earlier stage results by name.
+    """
+    name: str
+    run: Callable[[str, Dict[str, Any]], Awaitable[Any]]
+    requires: Tuple[str, ...] = ()
+    max_attempts: int = 3
+    retry_delay_seconds: float = 0.5
+
+
+class PipelineRunner:
+    """Bounded-concurrency background runner for staged jobs."""
+
+    def __init__(self,
+                 stages: Iterable[Stage],
+                 max_concurrency: int = 4,
+                 max_queue: int = 1000,
+                 history_size: int = 10000,
+                 on_update: Optional[Callable[[str, Dict[str, Any]], Awaitable[None]]] = None):
+        self.stages: List[Stage] = list(stages)
+        self.max_concurrency = max_concurrency
+        self.max_queue = max_queue
+        self.history_size = history_size
+        self.on_update = on_update
+        self._statuses: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self._queue: Optional[asyncio.Queue] = None
+        self._workers: List[asyncio.Task] = []
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._stats = {'submitted': 0, 'rejected': 0, 'completed': 0, 'failed': 0, 'retries': 0}
+
+    def _ensure_workers(self):
+        loop = asyncio.get_running_loop()
+        if self._workers and self._loop is loop:
+            return
+        # First submit, or the previous event loop is gone: start fresh workers
+        self._loop = loop
+        self._queue = asyncio.Queue(maxsize=self.max_queue)
+        self._workers = [asyncio.create_task(self._worker()) for _ in range(self.max_concurrency)]
+
+    def submit(self, job_id: str, context: Optional[Dict[str, Any]] = None) -> bool:
+        """
+        Queue a job (must be called from the event loop).
+
+        Returns False if the job is already pending; raises PipelineFull
+        if the queue is full.
+        """
+        self._ensure_workers()
+        current = self._statuses.get(job_id)
+        if current is not None and current['status'] not in FINISHED_STATUSES:
+            return False
+
+        try:
+            self._queue.put_nowait((job_id, dict(context or {})))
+        except asyncio.QueueFull:
+            self._stats['rejected'] += 1
+            logger.warning(f"Pipeline queue full, not enriching {job_id}")
+            raise PipelineFull(job_id)
+
+        self._statuses.pop(job_id, None)
+        self._statuses[job_id] = {
+            'status': STATUS_QUEUED,
+            'submitted_at': time.time(),
+            'finished_at': None,
+            'stages': {stage.name: {'status': STATUS_QUEUED, 'attempts': 0,
+                                    'error': None, 'duration_ms': None}
+                       for stage in self.stages}
+        }
+        self._trim_history()
+        self._stats['submitted'] += 1
+        return True
+
+    def _trim_history(self):
+        while len(self._statuses) > self.history_size:
+            oldest = next(iter(self._statuses))
+            if self._statuses[oldest]['status'] not in FINISHED_STATUSES:
+                break
+            del self._statuses[oldest]
+
+    def status(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """Current status of a job known to this process."""
+        return self._statuses.get(job_id)
+
+    async def _worker(self):
+        while True:
+            job_id, context = await self._queue.get()
+            try:
+                await self._run_job(job_id, context)
+            except Exception as e:
+                logger.error(f"Pipeline job {job_id} crashed: {e}")
+            finally:
+                self._queue.task_done()
+
+    async def _run_job(self, job_id: str, context: Dict[str, Any]):
+        status = self._statuses[job_id]
+        status['status'] = STATUS_RUNNING
+        outputs = context.setdefault('outputs', {})
+        failed = set()
+
+        for stage in self.stages:
+            stage_status = status['stages'][stage.name]
+            if failed.intersection(stage.requires):
+                stage_status['status'] = STATUS_SKIPPED
+                failed.add(stage.name)
+                continue
+
+            stage_status['status'] = STATUS_RUNNING
+            started = time.perf_counter()
+            for attempt in range(1, stage.max_attempts + 1):
+                stage_status['attempts'] = attempt
+                try:
+                    outputs[stage.name] = await stage.run(job_id, context)
+                    stage_status['status'] = STATUS_COMPLETED
+                    stage_status['error'] = None
+                    break
+                except Exception as e:
+                    stage_status['error'] = str(e)
+                    if attempt == stage.max_attempts:
+                        stage_status['status'] = STATUS_FAILED
+                        failed.add(stage.name)
+                        logger.warning(f"Stage {stage.name} failed for {job_id}: {e}")
+                    else:
+                        self._stats['retries'] += 1
+                        await asyncio.sleep(stage.retry_delay_seconds * 2 ** (attempt - 1))
+            stage_status['duration_ms'] = round((time.perf_counter() - started) * 1000, 2)
+            await self._notify(job_id, status, outputs)
+
+        status['status'] = STATUS_FAILED if failed else STATUS_COMPLETED
+        status['finished_at'] = time.time()
+        self._stats['failed' if failed else 'completed'] += 1
+        await self._notify(job_id, status, outputs)
+
+    async def _notify(self, job_id: str, status: Dict[str, Any], outputs: Dict[str, Any]):
+        if self.on_update is None:
+            return
+        try:
+            await self.on_update(job_id, {**status, 'outputs': outputs})
+        except Exception as e:
+            logger.warning(f"Pipeline status update failed for {job_id}: {e}")
+
+    async def join(self):
+        """Wait until every queued job has finished."""
+        if self._queue is not None:
+            await self._queue.join()
+
+    async def stop(self, drain_timeout_seconds: float = 5.0):
+        """Let queued jobs finish (up to the timeout), then stop the workers."""
+        if not self._workers:
+            return
+        try:
+            await asyncio.wait_for(self.join(), drain_timeout_seconds)
+        except asyncio.TimeoutError:
+            logger.warning(f"Pipeline stopped with {self._queue.qsize()} jobs still queued")
+        for worker in self._workers:
+            worker.cancel()
+        await asyncio.gather(*self._workers, return_exceptions=True)
+        self._workers = []
+        self._queue = None
+
+    def stats(self) -> Dict[str, Any]:
+        """Runner counters and queue depth."""
+        return {
+            **self._stats,
+            'queued': self._queue.qsize() if self._queue is not None else 0,
+            'workers': len(self._workers),
+            'tracked_jobs': len(self._statuses)
+        }
@@ -0,0 +1,339 @@
+"""
+Shared Cache - Cross-Process Cache Tier
+
+Each uvicorn worker keeps its own MemoryCache, so hit rates drop as
+workers are added. SharedCache is a CacheInterface backend whose entries
+are visible to every worker on the host:
+
+- SQLiteSharedStore: one SQLite file (WAL, mmap) that all worker
+  processes open; reads use their own per-thread connections and never
+  wait on this process's writer lock
+- InProcessSharedStore: dict-backed stand-in with the same contract,
+  used in tests and single-process deployments
+
+Register it as a fallback behind the per-process memory cache:
+
+    manager.register_cache("shared", SharedCache(SQLiteSharedStore(path)))
+    manager.add_fallback("shared")
+
+Values are stored as JSON (bytes are base64-tagged); values that are not
+JSON-serializable are not shared and set() returns False. Tuples come
+back as lists.
+"""
+
+import asyncio
+import base64
+import json
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+import logging
+
+from utils.cache import CacheInterface, CacheStats
+
+logger = logging.getLogger(__name__)
+
+
+class InProcessSharedStore:
+    """Dict-backed store with the SQLiteSharedStore contract."""
+
+    def __init__(self, max_entries: int = 100000):
+        self.max_entries = max_entries
+        self._data: Dict[str, Tuple[bytes, Optional[float]]] = {}
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[Tuple[bytes, Optional[float]]]:
+        return self._data.get(key)
+
+    def set(self, key: str, payload: bytes, expires_at: Optional[float]):
+        with self._lock:
+            self._data.pop(key, None)
+            self._data[key] = (payload, expires_at)
+            # dicts keep insertion order: drop the oldest writes first
+            while len(self._data) > self.max_entries:
+                del self._data[next(iter(self._data))]
+
+    def delete(self, key: str) -> bool:
+        with self._lock:
+            return self._data.pop(key, None) is not None
+
+    def delete_many(self, keys: List[str]) -> int:
+        with self._lock:
+            return sum(self._data.pop(key, None) is not None for key in keys)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+    def keys(self) -> List[str]:
+        return list(self._data)
+
+    def purge_expired(self, now: float) -> int:
+        with self._lock:
+            expired = [k for k, (_, exp) in self._data.items() if exp is not None and exp <= now]
+            for key in expired:
+                del self._data[key]
+        return len(expired)
+
+    def count(self) -> int:
+        return len(self._data)
+
+
+class SQLiteSharedStore:
+    """
+    Host-wide key/value store in a single SQLite file.
+
+    Each process opens one write connection, serialized by a lock, plus a
+    read-only connection per reading thread. WAL mode lets those readers
+    proceed while a writer (in this or another worker) commits, so a
+    write waiting out busy_timeout never holds up get().
+    """
+
+    def __init__(self, path: str, max_entries: int = 100000, mmap_size_mb: int = 64,
+                 read_timeout_seconds: float = 0.1):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.max_entries = max_entries
+        self.mmap_size_mb = mmap_size_mb
+        self.read_timeout_seconds = read_timeout_seconds
+        self._lock = threading.Lock()
+        self._readers = threading.local()
+        self._reader_conns: List[sqlite3.Connection] = []
+        self._readers_lock = threading.Lock()
+
+        self._conn = sqlite3.connect(str(self.path), timeout=5.0, check_same_thread=False,
+                                     isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(f"PRAGMA mmap_size={mmap_size_mb * 1024 * 1024}")
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS shared_cache (
+                key TEXT PRIMARY KEY,
+                value BLOB NOT NULL,
+                expires_at REAL,
+                updated_at REAL NOT NULL
+            )
+        """)
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS idx_shared_cache_updated ON shared_cache(updated_at)"
+        )
+
+    def _reader(self) -> sqlite3.Connection:
+        """This thread's read-only connection (opened on first use)"""
+        conn = getattr(self._readers, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(f"file:{self.path}?mode=ro", uri=True,
+                                   timeout=self.read_timeout_seconds,
+                                   check_same_thread=False, isolation_level=None)
+            conn.execute(f"PRAGMA mmap_size={self.mmap_size_mb * 1024 * 1024}")
+            self._readers.conn = conn
+            with self._readers_lock:
+                self._reader_conns.append(conn)
+        return conn
+
+    def get(self, key: str) -> Optional[Tuple[bytes, Optional[float]]]:
+        try:
+            row = self._reader().execute(
+                "SELECT value, expires_at FROM shared_cache WHERE key = ?", (key,)
+            ).fetchone()
+        except sqlite3.OperationalError as e:
+            # Busy beyond the short read timeout: treat as a miss
+            logger.debug(f"Shared cache read skipped for {key}: {e}")
+            return None
+        return (bytes(row[0]), row[1]) if row else None
+
+    def set(self, key: str, payload: bytes, expires_at: Optional[float]):
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO shared_cache VALUES (?, ?, ?, ?)",
+                (key, payload, expires_at, time.time())
+            )
+
+    def delete(self, key: str) -> bool:
+        with self._lock:
+            cursor = self._conn.execute("DELETE FROM shared_cache WHERE key = ?", (key,))
+        return cursor.rowcount > 0
+
+    def delete_many(self, keys: List[str]) -> int:
+        """Delete keys in one transaction; returns how many existed."""
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                deleted = sum(
+                    self._conn.execute("DELETE FROM shared_cache WHERE key = ?", (key,)).rowcount
+                    for key in keys
+                )
+                self._conn.execute("COMMIT")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+        return deleted
+
+    def clear(self):
+        with self._lock:
+            self._conn.execute("DELETE FROM shared_cache")
+
+    def keys(self) -> List[str]:
+        with self._lock:
+            return [row[0] for row in self._conn.execute("SELECT key FROM shared_cache")]
+
+    def purge_expired(self, now: float) -> int:
+        with self._lock:
+            cursor = self._conn.execute(
+                "DELETE FROM shared_cache WHERE expires_at IS NOT NULL AND expires_at <= ?", (now,)
+            )
+            removed = cursor.rowcount
+            # Trim the oldest writes beyond the entry cap
+            overflow = self._conn.execute("SELECT COUNT(*) FROM shared_cache").fetchone()[0] - self.max_entries
+            if overflow > 0:
+                self._conn.execute(
+                    "DELETE FROM shared_cache WHERE key IN "
+                    "(SELECT key FROM shared_cache ORDER BY updated_at LIMIT ?)", (overflow,)
+                )
+                removed += overflow
+        return removed
+
+    def count(self) -> int:
+        return self._reader().execute("SELECT COUNT(*) FROM shared_cache").fetchone()[0]
+
+    def close(self):
+        with self._readers_lock:
+            for conn in self._reader_conns:
+                conn.close()
+            self._reader_conns.clear()
+        with self._lock:
+            self._conn.close()
+
+
+def _json_default(value: Any):
+    if isinstance(value, (bytes, bytearray)):
+        return {'__b64__': base64.b64encode(bytes(value)).decode('ascii')}
+    raise TypeError(f"{type(value).__name__} is not shareable")
+
+
+def _json_object_hook(obj: Dict[str, Any]):
+    if len(obj) == 1 and '__b64__' in obj:
+        return base64.b64decode(obj['__b64__'])
+    return obj
+
+
+class SharedCache(CacheInterface[str, Any]):
+    """CacheInterface over a cross-process store."""
+
+    def __init__(self, store=None, default_ttl: int = 3600, purge_every: int = 200):
+        """
+        Initialize shared cache.
+
+        Args:
+            store: SQLiteSharedStore or InProcessSharedStore (in-process by default)
+            default_ttl: Default TTL in seconds
+            purge_every: Purge expired entries every N writes
+        """
+        self.store = store if store is not None else InProcessSharedStore()
+        self.default_ttl = default_ttl
+        self.purge_every = purge_every
+        self._writes_since_purge = 0
+        self._stats = CacheStats()
+
+    async def get(self, key: str) -> Optional[Any]:
+        """Get a value from the cache."""
+        # Reads use their own connection and never take the writer lock;
+        # a busy database is a miss rather than a wait: run inline
+        found = self.store.get(key)
+        if found is None or (found[1] is not None and found[1] <= time.time()):
+            self._stats.misses += 1
+            return None
+
+        try:
+            value = json.loads(found[0], object_hook=_json_object_hook)
+        except ValueError as e:
+            logger.warning(f"Dropping unreadable shared cache entry {key}: {e}")
+            await self.delete(key)
+            self._stats.misses += 1
+            return None
+
+        self._stats.hits += 1
+        return value
+
+    async def set(self, key: str, value: Any, ttl: Optional[int] = None) -> bool:
+        """Set a value in the cache with optional TTL."""
+        try:
+            payload = json.dumps(value, default=_json_default, separators=(',', ':')).encode('utf-8')
+        except (TypeError, ValueError) as e:
+            logger.debug(f"Not sharing {key}: {e}")
+            return False
+
+        ttl_seconds = ttl if ttl is not None else self.default_ttl
+        expires_at = time.time() + ttl_seconds if ttl_seconds > 0 else None
+
+        # Writes may wait on another worker's commit: keep them off the event loop
+        await asyncio.to_thread(self.store.set, key, payload, expires_at)
+        self._stats.sets += 1
+
+        self._writes_since_purge += 1
+        if self._writes_since_purge >= self.purge_every:
+            self._writes_since_purge = 0
+            self._stats.evictions += await asyncio.to_thread(self.store.purge_expired, time.time())
+        return True
+
+    async def delete(self, key: str) -> bool:
+        """Delete a value from the cache."""
+        deleted = await asyncio.to_thread(self.store.delete, key)
+        if deleted:
+            self._stats.deletes += 1
+        return deleted
+
+    async def exists(self, key: str) -> bool:
+        """Check if a key exists in the cache."""
+        found = self.store.get(key)
+        return found is not None and (found[1] is None or found[1] > time.time())
+
+    async def clear(self) -> bool:
+        """Clear all entries from the cache."""
+        await asyncio.to_thread(self.store.clear)
+        return True
+
+    async def keys(self, pattern: Optional[str] = None) -> List[str]:
+        """Get all keys, optionally matching a pattern."""
+        all_keys = await asyncio.to_thread(self.store.keys)
+
+        if pattern is None:
+            return all_keys
+
+        if '*' in pattern:
+            prefix = pattern.rstrip('*')
+            return [key for key in all_keys if key.startswith(prefix)]
+
+        return [key for key in all_keys if pattern in key]
+
+    def get_stats(self) -> CacheStats:
+        """Get cache statistics."""
+        return CacheStats(
+            hits=self._stats.hits,
+            misses=self._stats.misses,
+            sets=self._stats.sets,
+            deletes=self._stats.deletes,
+            evictions=self._stats.evictions,
+            current_entries=self.store.count(),
+            max_entries=self.store.max_entries
+        )
+
+
+def register_shared_cache(path: Optional[str] = None, name: str = "shared") -> SharedCache:
+    """
+    Attach a shared cache to the global CacheManager as a fallback tier.
+
+    Args:
+        path: SQLite file shared by all workers; in-process store when None
+        name: Registration name
+    """
+    from utils.cache import get_cache_manager
+
+    store = SQLiteSharedStore(path) if path else InProcessSharedStore()
+    cache = SharedCache(store)
+    manager = get_cache_manager()
+    manager.register_cache(name, cache)
+    manager.add_fallback(name)
+    return cache
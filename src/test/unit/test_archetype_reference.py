@@ -0,0 +1,134 @@
+"""
+Test Archetype Reference Repository
+
+測試職業原型/職位參考資料快取：
+- 一次載入並解析 JSON 欄位為型別化模型
+- 快照有效時不連線資料庫
+- 版本 (筆數、最後更新時間、觸發器修訂計數) 變更或 invalidate() 後重新載入
+"""
+
+import json
+import sqlite3
+import sys
+from contextlib import contextmanager
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent.parent / "main" / "python"))
+
+from core.data_access.archetype_reference import ArchetypeReferenceRepository
+from models.database import reference_revision_ddl
+
+
+class _Database:
+    """記錄連線次數的 sqlite 記憶體資料庫"""
+
+    def __init__(self, revision_triggers=True):
+        self.conn = sqlite3.connect(":memory:")
+        self.conn.row_factory = sqlite3.Row
+        self.connections = 0
+        self.conn.executescript("""
+            CREATE TABLE career_archetypes (
+                archetype_id TEXT, archetype_name TEXT, archetype_name_en TEXT,
+                keirsey_temperament TEXT, mbti_correlates TEXT, description TEXT,
+                core_characteristics TEXT, work_environment_preferences TEXT,
+                leadership_style TEXT, decision_making_style TEXT, communication_style TEXT,
+                stress_indicators TEXT, development_areas TEXT, updated_at TEXT
+            );
+            CREATE TABLE job_roles (
+                role_id TEXT, role_name TEXT, role_name_en TEXT, industry_sector TEXT,
+                job_family TEXT, seniority_level TEXT, description TEXT,
+                key_responsibilities TEXT, required_skills TEXT, preferred_skills TEXT,
+                salary_range_min INTEGER, salary_range_max INTEGER, work_arrangement TEXT,
+                updated_at TEXT
+            );
+        """)
+        self.add_archetype("ARCHITECT", "系統建構者", "2025-01-01")
+        self.conn.execute(
+            "INSERT INTO job_roles VALUES (?, ?, NULL, ?, ?, ?, ?, ?, ?, NULL, 60, 150, 'hybrid', ?)",
+            ("R001", "資料科學家", "technology", "data", "mid", "分析資料",
+             json.dumps(["建模"]), json.dumps(["Python"]), "2025-01-01")
+        )
+        if revision_triggers:
+            for statement in reference_revision_ddl():
+                self.conn.execute(statement)
+
+    def add_archetype(self, archetype_id, name, updated_at):
+        self.conn.execute(
+            "INSERT INTO career_archetypes VALUES (?, ?, ?, ?, ?, ?, ?, ?, NULL, NULL, NULL, NULL, NULL, ?)",
+            (archetype_id, name, archetype_id.title(), "理性者 (Rational)", json.dumps(["INTJ", "INTP"]),
+             "描述", json.dumps(["邏輯"]), json.dumps({"autonomy": "high"}), updated_at)
+        )
+
+    @contextmanager
+    def connect(self):
+        self.connections += 1
+        yield self.conn
+
+
+class TestArchetypeReferenceRepository:
+    """測試參考資料快取"""
+
+    def test_loads_typed_models_once(self):
+        database = _Database()
+        repository = ArchetypeReferenceRepository()
+
+        snapshot = repository.get_snapshot(database.connect)
+        assert repository.get_snapshot(database.connect) is snapshot
+
+        archetype = snapshot.archetypes["ARCHITECT"]
+        assert archetype.mbti_correlates == ["INTJ", "INTP"]
+        assert archetype.work_environment_preferences == {"autonomy": "high"}
+        assert snapshot.job_roles["R001"].required_skills == ["Python"]
+        assert database.connections == 1
+        assert repository.stats()["hits"] == 1
+
+    def test_reloads_only_when_version_changes(self):
+        database = _Database()
+        repository = ArchetypeReferenceRepository(revalidate_seconds=0)
+
+        first = repository.get_snapshot(database.connect)
+        assert repository.get_snapshot(database.connect) is first
+        assert repository.stats()["loads"] == 1
+        assert repository.stats()["version_checks"] == 2
+
+        database.add_archetype("GUARDIAN", "組織守護者", "2025-02-01")
+        second = repository.get_snapshot(database.connect)
+        assert second is not first
+        assert set(second.archetypes) == {"ARCHITECT", "GUARDIAN"}
+
+    def test_invalidate_forces_reload(self):
+        database = _Database()
+        repository = ArchetypeReferenceRepository()
+
+        first = repository.get_snapshot(database.connect)
+        repository.invalidate()
+
+        assert repository.get_snapshot(database.connect) is not first
+        assert repository.stats()["loads"] == 2
+
+    def test_in_place_update_changes_version(self):
+        database = _Database()
+        repository = ArchetypeReferenceRepository(revalidate_seconds=0)
+
+        first = repository.get_snapshot(database.connect)
+        database.conn.execute("UPDATE career_archetypes SET archetype_name = '系統架構師'")
+
+        second = repository.get_snapshot(database.connect)
+        assert second is not first
+        assert second.archetypes["ARCHITECT"].archetype_name == "系統架構師"
+        assert repository.stats()["revision_tracking"]
+
+    def test_falls_back_to_counts_without_revision_table(self):
+        database = _Database(revision_triggers=False)
+        repository = ArchetypeReferenceRepository(revalidate_seconds=0)
+
+        first = repository.get_snapshot(database.connect)
+        assert repository.get_snapshot(database.connect) is first
+        assert not repository.stats()["revision_tracking"]
+
+        database.add_archetype("GUARDIAN", "組織守護者", "2025-02-01")
+        assert set(repository.get_snapshot(database.connect).archetypes) == {"ARCHITECT", "GUARDIAN"}
+        # 讀取路徑不建立 schema
+        assert database.conn.execute(
+            "SELECT COUNT(*) FROM sqlite_master WHERE name = 'reference_data_revisions'"
+        ).fetchone()[0] == 0
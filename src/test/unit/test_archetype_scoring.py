@@ -0,0 +1,111 @@
+"""
+Test Archetype Scoring
+
+測試原型分數矩陣計算與逐一原型迴圈的結果一致：
+- ArchetypeMapper 原型映射與批次計分
+- FileBasedAssessmentEngine 原型分類
+"""
+
+import random
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent.parent / "main" / "python"))
+
+from core.analysis.archetype_mapper import ArchetypeMapper, TALENT_IDS
+from core.assessment.file_based_engine import FileBasedAssessmentEngine, TalentScore
+
+RESOURCES_PATH = Path(__file__).parent.parent.parent / "main" / "resources" / "assessment"
+
+
+def _random_talent_scores(rng):
+    return {talent: rng.choice([rng.randint(0, 100), 80, 90, 20]) for talent in TALENT_IDS}
+
+
+def _reference_mapping(mapper, profile):
+    """逐一原型比對前4個主導才幹 (矩陣化之前的算法)"""
+    top_talents = [t[0] for t in profile.dominant_talents[:4]]
+    best_match, best_score = None, 0
+    for archetype in mapper.archetypes:
+        score = 3 * sum(t in top_talents for t in archetype.primary_talents)
+        score += sum(t in top_talents for t in archetype.secondary_talents)
+        if score > best_score:
+            best_score, best_match = score, archetype
+    return best_match or mapper.archetypes[0]
+
+
+def _reference_engine_score(engine, top_talents, domain_scores, balance_metrics, info):
+    """逐一原型計算分數 (矩陣化之前的算法)"""
+    score = 0.0
+    for i, talent in enumerate(top_talents):
+        weight = 0.4 if i == 0 else 0.3 if i == 1 else 0.2 if i == 2 else 0.1
+        if talent.talent_id in info.get("primary_talents", []):
+            score += weight * 1.0
+        elif talent.talent_id in info.get("secondary_talents", []):
+            score += weight * 0.7
+    for domain_score in domain_scores:
+        if domain_score.domain_id in info.get("domain_preference", ""):
+            score += domain_score.percentile / 100.0 * 0.3
+    modifiers = engine.mapping_rules["mapping_rules"]["balance_profile_modifiers"]
+    if balance_metrics.profile_type in modifiers:
+        score *= modifiers[balance_metrics.profile_type]["modifier"]
+    return min(1.0, max(0.0, score))
+
+
+class TestArchetypeMapperScoring:
+    """測試 ArchetypeMapper 矩陣計分"""
+
+    def test_batch_mapping_matches_loop(self):
+        mapper = ArchetypeMapper()
+        rng = random.Random(2)
+        profiles = [mapper.classify_talents(_random_talent_scores(rng)) for _ in range(500)]
+        profiles.append(mapper.classify_talents({talent: 50 for talent in TALENT_IDS}))
+
+        mapped = mapper.map_to_archetypes(profiles)
+
+        for profile, archetype in zip(profiles, mapped):
+            assert archetype is _reference_mapping(mapper, profile)
+            assert mapper.map_to_archetype(profile) is archetype
+
+    def test_scores_and_top_two(self):
+        mapper = ArchetypeMapper()
+
+        scores = mapper.score_archetypes([["T4", "T1", "T12"], ["T5", "T10", "T3"], []])
+        order, values = mapper.top_two(scores)
+
+        assert scores[0].tolist() == [7, 4, 0, 0]
+        assert scores[1].tolist() == [1, 0, 1, 7]
+        assert order.tolist() == [[0, 1], [3, 0], [0, 1]]
+        assert values.tolist() == [[7, 4], [7, 1], [0, 0]]
+
+
+class TestFileBasedArchetypeClassification:
+    """測試 FileBasedAssessmentEngine 原型分類"""
+
+    def test_batch_classification_matches_loop(self):
+        engine = FileBasedAssessmentEngine(str(RESOURCES_PATH))
+        definitions = engine.mapping_rules["archetype_definitions"]
+        rng = random.Random(4)
+
+        profiles = []
+        for _ in range(200):
+            talent_scores = [
+                TalentScore(talent_id, info.get("name", talent_id), 0.0,
+                            rng.choice([rng.randint(0, 100), 90]), info["domain"])
+                for talent_id, info in engine.talent_definitions.items()
+            ]
+            domain_scores = engine._calculate_domain_scores(talent_scores)
+            profiles.append((talent_scores, domain_scores, engine._calculate_balance_metrics(domain_scores)))
+
+        results = engine.classify_archetypes_batch(profiles)
+
+        for (talent_scores, domain_scores, balance_metrics), result in zip(profiles, results):
+            top_talents = sorted(talent_scores, key=lambda x: x.percentile, reverse=True)[:4]
+            expected = {archetype_id: _reference_engine_score(engine, top_talents, domain_scores,
+                                                              balance_metrics, info)
+                        for archetype_id, info in definitions.items()}
+            ranked = sorted(expected.items(), key=lambda x: x[1], reverse=True)
+
+            assert result.archetype_scores == expected
+            assert result.primary_archetype["archetype_id"] == ranked[0][0]
+            assert result.secondary_archetype["archetype_id"] == ranked[1][0]
@@ -0,0 +1,71 @@
+"""
+Unit Tests for CareerKnowledgeBase Indexes
+
+Tests that the load-time inverted indexes answer the same queries as a
+scan over every role, for single users and in bulk.
+"""
+
+import random
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent.parent / "main" / "python"))
+
+from core.knowledge.career_knowledge_base import CareerKnowledgeBase, StrengthCategory
+
+
+def _scan_matches(kb, user_strengths, top_n):
+    """Reference: score every role by scanning its weights."""
+    matches = []
+    for role in kb.get_all_career_roles().values():
+        match_score = total_weight = 0.0
+        for strength_id in user_strengths:
+            weight = role.get_strength_weight(strength_id)
+            if weight > 0:
+                match_score += weight
+            total_weight += weight
+        if total_weight > 0:
+            matches.append((role.role_id, match_score / total_weight))
+    matches.sort(key=lambda x: x[1], reverse=True)
+    return matches[:top_n]
+
+
+class TestCareerKnowledgeBaseIndexes:
+    """Test suite for indexed knowledge base queries."""
+
+    @pytest.fixture(scope="class")
+    def kb(self):
+        return CareerKnowledgeBase()
+
+    def test_strength_and_role_lookups(self, kb):
+        for theme_id, theme in kb.get_all_strength_themes().items():
+            expected = [role_id for role_id in theme.best_fit_roles + theme.compatible_roles
+                        if kb.get_career_role(role_id)]
+            assert [role.role_id for role in kb.get_roles_for_strength(theme_id)] == expected
+
+        for role_id, role in kb.get_all_career_roles().items():
+            expected = [sid for sid in role.get_all_required_strengths() if kb.get_strength_theme(sid)]
+            assert [theme.theme_id for theme in kb.get_strengths_for_role(role_id)] == expected
+
+        assert kb.get_roles_for_strength("unknown") == []
+        assert kb.get_strengths_for_role("unknown") == []
+
+    def test_domain_index_covers_roles_needing_the_domain(self, kb):
+        for category in StrengthCategory:
+            for role in kb.get_roles_for_domain(category):
+                assert any(theme.category == category for theme in kb.get_strengths_for_role(role.role_id))
+
+    def test_single_and_bulk_matches_equal_full_scan(self, kb):
+        theme_ids = list(kb.get_all_strength_themes()) + ["unknown"]
+        rng = random.Random(7)
+        users = [rng.sample(theme_ids, k=rng.randint(0, 6)) for _ in range(50)]
+
+        bulk = kb.find_career_matches_by_strengths_bulk(users, top_n=4)
+
+        for user_strengths, bulk_matches in zip(users, bulk):
+            expected = _scan_matches(kb, user_strengths, 4)
+            single = kb.find_career_matches_by_strengths(user_strengths, top_n=4)
+            assert [(role.role_id, pytest.approx(score)) for role, score in single] == expected
+            assert [(role.role_id, pytest.approx(score)) for role, score in bulk_matches] == expected
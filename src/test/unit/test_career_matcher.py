@@ -0,0 +1,67 @@
+"""
+Unit Tests for CareerMatcher
+
+Tests that the compiled (roles x strengths) matrix path ranks and scores
+roles exactly like the per-role reference calculation.
+"""
+
+import random
+import sys
+from pathlib import Path
+from types import SimpleNamespace
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent.parent / "main" / "python"))
+
+from core.recommendation.career_matcher import CareerMatcher
+
+
+def _profile(matcher, seed):
+    rng = random.Random(seed)
+    theme_ids = list(matcher.knowledge_base.get_all_strength_themes())
+    strengths = [SimpleNamespace(name=theme_id, score=rng.uniform(0, 100))
+                 for theme_id in rng.sample(theme_ids, k=min(12, len(theme_ids)))]
+    return SimpleNamespace(all_strengths=strengths, top_5_strengths=strengths[:5],
+                           profile_confidence=0.8)
+
+
+class TestCareerMatcher:
+    """Test suite for matrix-based career matching."""
+
+    @pytest.fixture
+    def matcher(self):
+        return CareerMatcher()
+
+    @pytest.mark.parametrize("seed, user_context", [
+        (1, {}),
+        (2, {"industry_preference": "tech", "experience_level": "senior"}),
+        (3, {"salary_expectation": 80}),
+    ])
+    def test_matrix_scores_match_per_role_reference(self, matcher, seed, user_context):
+        profile = _profile(matcher, seed)
+        reference = sorted(
+            (matcher._calculate_job_match_from_knowledge_base(role, profile, user_context)
+             for role in matcher.knowledge_base.get_all_career_roles().values()),
+            key=lambda match: match.match_score, reverse=True
+        )
+
+        matches = matcher.find_career_matches(profile, user_context)
+
+        assert [m.job_role.role_id for m in matches] == [m.job_role.role_id for m in reference]
+        for match, expected in zip(matches, reference):
+            assert match.match_score == pytest.approx(expected.match_score)
+            assert match.strength_alignment == pytest.approx(expected.strength_alignment)
+            assert match.confidence == pytest.approx(expected.confidence)
+            assert match.reasons == expected.reasons
+            assert match.development_needs == expected.development_needs
+
+    def test_top_k_returns_best_matches_in_order(self, matcher):
+        profile = _profile(matcher, 4)
+        everything = matcher.find_career_matches(profile)
+
+        top = matcher.find_career_matches(profile, top_k=3)
+
+        assert [m.job_role.role_id for m in top] == [m.job_role.role_id for m in everything[:3]]
+        assert matcher.find_career_matches(profile, top_k=0) == []
+        assert len(matcher.find_career_matches(profile, top_k=10_000)) == len(everything)
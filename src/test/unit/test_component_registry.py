@@ -0,0 +1,91 @@
+"""
+Unit Tests for ComponentRegistry
+
+Tests that shared components are built once, preloading reports init
+times and failures, and the default accessors hand out shared instances.
+"""
+
+import sys
+import threading
+import time
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent.parent / "main" / "python"))
+
+from core.component_registry import ComponentRegistry, get_component_registry
+
+
+class TestComponentRegistry:
+    """Test suite for the process-wide component registry."""
+
+    def test_get_returns_same_instance(self):
+        registry = ComponentRegistry()
+        registry.register("thing", object)
+
+        assert registry.get("thing") is registry.get("thing")
+
+    def test_unknown_component_raises(self):
+        with pytest.raises(KeyError):
+            ComponentRegistry().get("missing")
+
+    def test_preload_records_init_time(self):
+        registry = ComponentRegistry()
+        registry.register("slow", lambda: time.sleep(0.01) or "ready")
+
+        stats = registry.preload()
+
+        assert stats["slow"]["initialized"] is True
+        assert stats["slow"]["init_ms"] >= 10
+        assert registry.get("slow") == "ready"
+
+    def test_failed_component_is_reported_and_retried(self):
+        attempts = []
+
+        def flaky():
+            attempts.append(1)
+            if len(attempts) == 1:
+                raise RuntimeError("not yet")
+            return "ok"
+
+        registry = ComponentRegistry()
+        registry.register("flaky", flaky)
+        registry.register("fine", dict)
+
+        stats = registry.preload()
+        assert stats["flaky"] == {"initialized": False, "init_ms": None, "error": "not yet"}
+        assert stats["fine"]["initialized"] is True
+
+        assert registry.get("flaky") == "ok"
+        assert registry.stats()["flaky"]["error"] is None
+
+    def test_concurrent_get_constructs_once(self):
+        calls = []
+
+        def factory():
+            calls.append(1)
+            time.sleep(0.02)
+            return object()
+
+        registry = ComponentRegistry()
+        registry.register("shared", factory)
+
+        results = []
+        threads = [threading.Thread(target=lambda: results.append(registry.get("shared")))
+                   for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert len(calls) == 1
+        assert all(result is results[0] for result in results)
+
+    def test_default_accessors_share_instances(self):
+        from core.recommendation.career_matcher import get_career_matcher
+        from core.recommendation.rule_engine import get_rule_engine
+
+        assert get_career_matcher() is get_career_matcher()
+        assert get_rule_engine() is get_component_registry().get("rule_engine")
+        assert get_component_registry().get("normative_scorer").version
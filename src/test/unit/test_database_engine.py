@@ -0,0 +1,68 @@
+"""
+Unit Tests for the SQLAlchemy Database Engine
+
+Tests the sync and async session paths of DatabaseEngine against a
+temporary SQLite database.
+"""
+
+import asyncio
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent.parent / "main" / "python"))
+
+from sqlalchemy import select, func
+
+from database.engine import DatabaseEngine, to_async_url
+from models.v4_models import V4Statement
+
+
+class TestAsyncUrl:
+    """Test suite for async driver URL mapping."""
+
+    def test_sqlite_uses_aiosqlite(self):
+        assert to_async_url("sqlite:///./data/db.sqlite") == "sqlite+aiosqlite:///./data/db.sqlite"
+
+    def test_postgres_driver_is_replaced(self):
+        assert to_async_url("postgresql+psycopg2://u@h/db") == "postgresql+asyncpg://u@h/db"
+
+    def test_async_url_is_unchanged(self):
+        assert to_async_url("sqlite+aiosqlite:///x.db") == "sqlite+aiosqlite:///x.db"
+
+
+class TestDatabaseEngine:
+    """Test suite for DatabaseEngine sessions."""
+
+    @pytest.fixture
+    def engine(self, tmp_path):
+        return DatabaseEngine(f"sqlite:///{tmp_path / 'test.db'}")
+
+    def test_async_session_sees_seeded_statements(self, engine):
+        with engine.get_session() as session:
+            expected = session.query(V4Statement).count()
+
+        async def count_statements():
+            async with engine.get_async_session() as session:
+                result = await session.execute(select(func.count(V4Statement.id)))
+                count = result.scalar_one()
+            await engine.dispose_async_engine()
+            return count
+
+        assert expected > 0
+        assert asyncio.run(count_statements()) == expected
+
+    def test_async_session_rolls_back_on_error(self, engine):
+        async def failing_update():
+            async with engine.get_async_session() as session:
+                result = await session.execute(select(V4Statement).limit(1))
+                statement = result.scalars().first()
+                statement.text = "changed"
+                raise RuntimeError("boom")
+
+        with pytest.raises(RuntimeError):
+            asyncio.run(failing_update())
+
+        with engine.get_session() as session:
+            assert session.query(V4Statement).filter(V4Statement.text == "changed").count() == 0
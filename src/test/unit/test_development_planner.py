@@ -0,0 +1,95 @@
+"""
+Unit Tests for DevelopmentPlanner
+
+Tests that plans assembled from memoized fragments match freshly built
+plans, get their own dates and containers, and that the batch API and
+bounded fragment cache behave as expected.
+"""
+
+import sys
+from dataclasses import asdict
+from datetime import timedelta
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent.parent / "main" / "python"))
+
+from core.recommendation.career_matcher import CareerMatch
+from core.recommendation.development_planner import DevelopmentPlanner
+from core.recommendation.strength_mapper import StrengthMapper
+
+
+def _career_match(name="Product Manager", needs=("project management", "communication", "analysis")):
+    return CareerMatch(
+        job_role=None, role_name=name, chinese_name=f"{name} (中文)", industry_sector="technology",
+        match_score=80.0, strength_alignment={}, domain_fit={}, confidence=0.8,
+        matching_strengths=["Strategic", "Achiever"], development_needs=list(needs),
+        description="", required_strengths=[], reasons=[]
+    )
+
+
+def _undated(plan):
+    data = asdict(plan)
+    for key in ("plan_id", "created_date", "review_schedule"):
+        data.pop(key)
+    for goal in data["development_goals"]:
+        goal.pop("target_completion")
+    return data
+
+
+PROFILE_SCORES = {"openness": 80, "conscientiousness": 65, "extraversion": 40,
+                  "agreeableness": 70, "neuroticism": 30}
+
+
+class TestDevelopmentPlanner:
+    """Test suite for fragment-cached development planning."""
+
+    def test_cached_plan_matches_fresh_plan(self):
+        planner = DevelopmentPlanner()
+        profile = StrengthMapper().generate_strength_profile(PROFILE_SCORES)
+        matches = [_career_match()]
+
+        first = planner.create_development_plan(profile, matches, {})
+        second = planner.create_development_plan(profile, matches, {"experience_years": 3})
+        planner.fragment_cache.clear()
+        fresh = planner.create_development_plan(profile, matches, {})
+
+        assert _undated(first) == _undated(second) == _undated(fresh)
+        assert planner.get_cache_stats()["hits"] == 1
+        for goal, days in zip(second.development_goals, (180, 365, 270)):
+            assert goal.target_completion == second.created_date + timedelta(days=days)
+        assert second.review_schedule[0] == second.created_date + timedelta(days=30)
+
+        # Plans do not share mutable containers
+        second.priority_areas.append("extra")
+        second.resource_requirements["cost_breakdown"]["免費"] = 99
+        assert "extra" not in first.priority_areas
+        assert planner.create_development_plan(profile, matches, {}).resource_requirements == first.resource_requirements
+
+    def test_different_career_match_gets_own_fragments(self):
+        planner = DevelopmentPlanner()
+        profile = StrengthMapper().generate_strength_profile(PROFILE_SCORES)
+
+        plan_a = planner.create_development_plan(profile, [_career_match("Analyst")], {})
+        plan_b = planner.create_development_plan(profile, [_career_match("Designer")], {})
+        plan_none = planner.create_development_plan(profile, [], {})
+
+        assert plan_a.career_focus != plan_b.career_focus
+        assert plan_none.career_focus == "多元職涯發展"
+        assert len(plan_none.development_goals) == len(plan_a.development_goals) - 1
+        assert planner.get_cache_stats()["misses"] == 3
+
+    def test_batch_plans(self):
+        planner = DevelopmentPlanner(fragment_cache_size=2)
+        mapper = StrengthMapper()
+        requests = [
+            (mapper.generate_strength_profile({**PROFILE_SCORES, "openness": openness}), [_career_match()], {})
+            for openness in (20, 50, 80, 20)
+        ]
+
+        plans = planner.create_development_plans(requests)
+
+        assert len({plan.plan_id for plan in plans}) == 4
+        assert _undated(plans[0]) == _undated(plans[3])
+        for plan, (profile, matches, context) in zip(plans, requests):
+            assert _undated(plan) == _undated(DevelopmentPlanner().create_development_plan(profile, matches, context))
+        assert planner.get_cache_stats()["entries"] <= 2
@@ -0,0 +1,467 @@
+"""
+Unit Tests for the In-Memory Cache Backend
+
+Tests the lock-striped MemoryCache (eviction order, expiry, size
+accounting), single-flight coalescing of concurrent misses, and the
+CacheManager's stale-while-revalidate and negative caching, the
+shared cross-process tier (with its in-process stand-in),
+traffic-driven cache warming, and dependency-tagged invalidation.
+"""
+
+import asyncio
+import sqlite3
+import sys
+import threading
+import time
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent.parent / "main" / "python"))
+
+import utils.cache as cache_module
+from utils.cache import ARTIFACT_NORMS, CacheManager, DependencyIndex, MemoryCache, SingleFlight
+from utils.shared_cache import SharedCache, InProcessSharedStore, SQLiteSharedStore
+from utils.cache_warming import AccessTracker, CacheWarmer
+
+
+class TestShardedMemoryCache:
+    """Test suite for MemoryCache."""
+
+    @pytest.mark.asyncio
+    async def test_large_cache_keeps_all_entries_within_capacity(self):
+        cache = MemoryCache(max_size=1000)
+        for i in range(1000):
+            await cache.set(f"key_{i}", i)
+
+        assert all([await cache.get(f"key_{i}") == i for i in range(1000)])
+        assert cache.get_stats().evictions == 0
+
+    @pytest.mark.asyncio
+    async def test_recently_read_entries_survive_eviction(self):
+        cache = MemoryCache(max_size=3)
+        for key in ("a", "b", "c"):
+            await cache.set(key, key)
+        await cache.get("a")
+        await cache.set("d", "d")
+
+        assert await cache.get("a") == "a"
+        assert await cache.get("b") is None
+        assert cache.get_stats().current_entries == 3
+
+    @pytest.mark.asyncio
+    async def test_overwrite_updates_size_accounting(self):
+        cache = MemoryCache(max_size=10)
+        await cache.set("k", "x" * 10)
+        small = cache.get_stats().memory_usage_bytes
+        await cache.set("k", "x" * 1000)
+
+        stats = cache.get_stats()
+        assert stats.current_entries == 1
+        assert stats.memory_usage_bytes > small
+
+        await cache.delete("k")
+        assert cache.get_stats().memory_usage_bytes == 0
+
+    @pytest.mark.asyncio
+    async def test_expired_entry_is_a_miss(self):
+        cache = MemoryCache(max_size=10)
+        await cache.set("k", "v", ttl=1)
+        cache._shard("k").entries["k"].expires_at = 0
+
+        assert await cache.get("k") is None
+        assert cache.get_stats().current_entries == 0
+
+
+class TestSingleFlight:
+    """Test suite for request coalescing."""
+
+    @pytest.mark.asyncio
+    async def test_concurrent_misses_compute_once(self):
+        cache = MemoryCache(max_size=10)
+        calls = 0
+
+        async def generate_report():
+            nonlocal calls
+            calls += 1
+            await asyncio.sleep(0.01)
+            return {"report": "ok"}
+
+        results = await asyncio.gather(*[
+            cache.get_or_compute("report:abc", generate_report) for _ in range(20)
+        ])
+
+        assert calls == 1
+        assert all(result == {"report": "ok"} for result in results)
+        assert cache.get_single_flight_stats()["coalesced_requests"] == 19
+        assert await cache.get("report:abc") == {"report": "ok"}
+
+    @pytest.mark.asyncio
+    async def test_failure_propagates_to_waiters_and_is_not_cached(self):
+        flight = SingleFlight()
+
+        async def failing():
+            await asyncio.sleep(0.01)
+            raise RuntimeError("generation failed")
+
+        results = await asyncio.gather(*[flight.do("k", failing) for _ in range(3)],
+                                       return_exceptions=True)
+
+        assert all(isinstance(result, RuntimeError) for result in results)
+        assert len(flight) == 0
+
+
+class TestCacheManagerRevalidation:
+    """Test suite for stale-while-revalidate and negative caching."""
+
+    @pytest.fixture
+    def manager(self):
+        return CacheManager()
+
+    @pytest.mark.asyncio
+    async def test_stale_value_served_while_one_refresh_runs(self, manager, monkeypatch):
+        clock = [1000.0]
+        monkeypatch.setattr(cache_module.time, "time", lambda: clock[0])
+        versions = iter(["v1", "v2"])
+        calls = 0
+
+        async def loader():
+            nonlocal calls
+            calls += 1
+            await asyncio.sleep(0.01)
+            return next(versions)
+
+        assert await manager.get_or_load("k", loader, ttl=10, stale_ttl=100) == "v1"
+
+        clock[0] += 20
+        stale = await asyncio.gather(*[manager.get_or_load("k", loader, ttl=10, stale_ttl=100)
+                                       for _ in range(5)])
+        assert stale == ["v1"] * 5
+
+        await asyncio.sleep(0.05)
+        assert await manager.get_or_load("k", loader, ttl=10, stale_ttl=100) == "v2"
+        assert calls == 2
+        assert manager.get_manager_stats()["refreshes"] == 1
+
+    @pytest.mark.asyncio
+    async def test_missing_keys_are_negatively_cached(self, manager):
+        calls = 0
+
+        async def loader():
+            nonlocal calls
+            calls += 1
+            return None
+
+        for _ in range(5):
+            assert await manager.get_or_load("results:unknown", loader, negative_ttl=30) is None
+
+        assert calls == 1
+        assert manager.get_manager_stats()["negative_hits"] == 4
+
+        await manager.set("results:unknown", {"ok": True})
+        assert await manager.get_or_load("results:unknown", loader) == {"ok": True}
+
+    @pytest.mark.asyncio
+    async def test_fallback_hit_promoted_to_primary(self, manager):
+        manager.register_cache("fallback", MemoryCache())
+        manager.add_fallback("fallback")
+        await manager._caches["fallback"].set("k", "v")
+
+        assert await manager.get("k") == "v"
+        assert await manager._caches["memory"].get("k") == "v"
+        assert manager.get_manager_stats()["promotions"] == 1
+
+
+class TestSharedCache:
+    """Test suite for the cross-process cache tier."""
+
+    @pytest.fixture(params=["in_process", "sqlite"])
+    def store_factory(self, request, tmp_path):
+        if request.param == "in_process":
+            store = InProcessSharedStore()
+            return lambda: store
+        return lambda: SQLiteSharedStore(str(tmp_path / "shared.db"))
+
+    @pytest.mark.asyncio
+    async def test_workers_see_each_others_writes(self, store_factory):
+        worker_a, worker_b = SharedCache(store_factory()), SharedCache(store_factory())
+        await worker_a.set("v4_results:s1", {"scores": [1, 2], "pdf": b"%PDF"})
+
+        assert await worker_b.get("v4_results:s1") == {"scores": [1, 2], "pdf": b"%PDF"}
+
+    @pytest.mark.asyncio
+    async def test_delete_many_is_seen_by_other_workers(self, store_factory):
+        worker = SharedCache(store_factory())
+        for session_id in ("s1", "s2", "s3"):
+            await worker.set(f"v4_results:{session_id}", {"scores": [1]})
+
+        # e.g. scripts/rescore_sessions.py evicting re-scored sessions
+        assert store_factory().delete_many(["v4_results:s1", "v4_results:s2", "v4_results:x"]) == 2
+
+        assert await worker.get("v4_results:s1") is None
+        assert await worker.get("v4_results:s3") == {"scores": [1]}
+
+    def test_sqlite_reads_do_not_wait_on_writers(self, tmp_path):
+        store = SQLiteSharedStore(str(tmp_path / "shared.db"))
+        store.set("k", b'"v"', None)
+
+        # Another worker holds the write lock; this process's writer is waiting on it
+        other = sqlite3.connect(str(tmp_path / "shared.db"), isolation_level=None)
+        other.execute("BEGIN IMMEDIATE")
+        with store._lock:
+            started = time.perf_counter()
+            assert store.get("k") == (b'"v"', None)
+            assert time.perf_counter() - started < 1.0
+        other.execute("ROLLBACK")
+        store.close()
+
+    @pytest.mark.asyncio
+    async def test_expired_and_unserializable_values(self, store_factory):
+        cache = SharedCache(store_factory())
+        await cache.set("k", "v", ttl=1)
+        cache.store.set("k", b'"v"', time.time() - 1)
+
+        assert await cache.get("k") is None
+        assert await cache.set("obj", object()) is False
+
+    @pytest.mark.asyncio
+    async def test_manager_promotes_shared_hits_per_worker(self, store_factory):
+        worker_a, worker_b = CacheManager(), CacheManager()
+        for manager in (worker_a, worker_b):
+            manager.register_cache("shared", SharedCache(store_factory()))
+            manager.add_fallback("shared")
+
+        calls = 0
+
+        async def loader():
+            nonlocal calls
+            calls += 1
+            return {"ok": True}
+
+        assert await worker_a.get_or_load("k", loader) == {"ok": True}
+        assert await worker_b.get_or_load("k", loader) == {"ok": True}
+        assert calls == 1
+        assert await worker_b._caches["memory"].get("k") is not None
+
+    @pytest.mark.asyncio
+    async def test_missing_marker_is_shared_and_cleared_by_any_worker(self, store_factory):
+        worker_a, worker_b = CacheManager(), CacheManager()
+        for manager in (worker_a, worker_b):
+            manager.register_cache("shared", SharedCache(store_factory()))
+            manager.add_fallback("shared")
+
+        results = {}
+
+        async def loader():
+            return results.get("s1")
+
+        assert await worker_a.get_or_load("results:s1", loader, negative_ttl=30) is None
+        assert await worker_b.get_or_load("results:s1", loader, negative_ttl=30) is None
+        assert worker_b.get_manager_stats()["negative_hits"] == 1
+        assert await worker_b._caches["memory"].get("results:s1") is None
+
+        # Submit lands on worker A; worker B must not keep answering "missing"
+        results["s1"] = {"ok": True}
+        await worker_a.delete("results:s1")
+        assert await worker_b.get_or_load("results:s1", loader) == {"ok": True}
+
+    @pytest.mark.asyncio
+    async def test_promoted_entries_follow_dependency_versions(self, store_factory):
+        worker_a, worker_b = CacheManager(), CacheManager()
+        for manager in (worker_a, worker_b):
+            manager.register_cache("shared", SharedCache(store_factory()))
+            manager.add_fallback("shared")
+            await manager.publish_version(ARTIFACT_NORMS, "v1")
+
+        calls = 0
+
+        async def loader():
+            nonlocal calls
+            calls += 1
+            return {"calls": calls}
+
+        await worker_a.get_or_load("k", loader, depends_on=(ARTIFACT_NORMS,))
+        assert await worker_b.get_or_load("k", loader, depends_on=(ARTIFACT_NORMS,)) == {"calls": 1}
+
+        # The promoted copy is tagged in worker B, so its own publish evicts it
+        assert await worker_b.publish_version(ARTIFACT_NORMS, "v2") == ["k"]
+        assert await worker_b._caches["memory"].get("k") is None
+
+        # Worker A still on v1 shares a v1 result; worker B on v2 ignores it
+        await worker_a.set("k", {"calls": 0}, ttl=60, depends_on=(ARTIFACT_NORMS,))
+        assert await worker_b.get_or_load("k", loader, depends_on=(ARTIFACT_NORMS,)) == {"calls": 2}
+
+
+class TestCacheWarming:
+    """Test suite for AccessTracker and CacheWarmer."""
+
+    @pytest.fixture
+    def manager(self):
+        return CacheManager()
+
+    def test_tracker_ranks_decayed_hotness_and_round_trips(self, tmp_path, monkeypatch):
+        tracker = AccessTracker(half_life_seconds=60)
+        clock = [1000.0]
+        monkeypatch.setattr("utils.cache_warming.time.time", lambda: clock[0])
+        for _ in range(4):
+            tracker.record("v4_results:old")
+        clock[0] += 120  # two half-lives: 4 -> 1
+        tracker.record("v4_results:new")
+        tracker.record("v4_results:new")
+        tracker.record("other:x")
+
+        assert [key for key, _ in tracker.top(2, classes=["v4_results"])] == [
+            "v4_results:new", "v4_results:old"]
+        assert tracker.top(1, classes=["v4_results"])[0][1] == pytest.approx(2.0)
+
+        path = tmp_path / "hotness.json"
+        tracker.save(path)
+        restored = AccessTracker(half_life_seconds=60)
+        assert restored.load(path)
+        assert restored.top(3) == tracker.top(3)
+        assert not AccessTracker().load(tmp_path / "missing.json")
+
+    @pytest.mark.asyncio
+    async def test_warm_fills_top_k_missing_entries(self, manager):
+        tracker = AccessTracker()
+        for i in range(5):
+            for _ in range(i + 1):
+                tracker.record(f"v4_results:s{i}")
+        tracker.record("unregistered:x")
+        await manager.set("v4_results:s4", {"cached": True})
+
+        loaded = []
+
+        async def loader(key):
+            loaded.append(key)
+            return {"key": key}
+
+        warmer = CacheWarmer(manager, tracker, max_workers=2)
+        warmer.register("v4_results", loader)
+        stats = await warmer.warm(top_k=3)
+
+        assert stats["candidates"] == 3
+        assert stats["already_cached"] == 1
+        assert sorted(loaded) == ["v4_results:s2", "v4_results:s3"]
+        assert await manager.get("v4_results:s3") == {"key": "v4_results:s3"}
+        assert await manager.get("v4_results:s0") is None
+
+    @pytest.mark.asyncio
+    async def test_warm_stops_when_budget_spent(self, manager):
+        tracker = AccessTracker()
+        for i in range(4):
+            tracker.record(f"v4_results:s{i}")
+
+        async def slow_loader(key):
+            await asyncio.sleep(0.05)
+            return {"key": key}
+
+        warmer = CacheWarmer(manager, tracker, max_workers=1)
+        warmer.register("v4_results", slow_loader)
+        stats = await warmer.warm(top_k=4, time_budget_seconds=0.07)
+
+        assert stats["warmed"] + stats["skipped_budget"] == 4
+        assert 1 <= stats["warmed"] < 4
+
+    @pytest.mark.asyncio
+    async def test_sync_loaders_and_preloads_run_off_the_event_loop(self, manager):
+        tracker = AccessTracker()
+        tracker.record("v4_results:s0")
+        loop_thread = threading.get_ident()
+        threads = {}
+
+        def blocking_loader(key):
+            threads[key] = threading.get_ident()
+            return {"key": key}
+
+        def preload_reference():
+            threads["reference"] = threading.get_ident()
+
+        def failing_preload():
+            raise RuntimeError("database unavailable")
+
+        warmer = CacheWarmer(manager, tracker)
+        warmer.register("v4_results", blocking_loader)
+        warmer.register_preload("reference", preload_reference)
+        warmer.register_preload("broken", failing_preload)
+        stats = await warmer.warm(top_k=1)
+
+        assert stats["warmed"] == 1
+        assert stats["preloaded"] == {"reference": True, "broken": False}
+        assert loop_thread not in threads.values()
+        assert await manager.get("v4_results:s0") == {"key": "v4_results:s0"}
+
+
+class TestDependencyInvalidation:
+    """Test suite for artifact-version dependency tags."""
+
+    @pytest.fixture
+    def manager(self):
+        return CacheManager()
+
+    def test_index_publish_returns_exact_dependents(self):
+        index = DependencyIndex(max_keys=3)
+        index.track("a", ["norms"])
+        index.track("b", ["norms", "irt_parameters"])
+        index.track("c", ["irt_parameters"])
+
+        assert index.publish("norms", "v1") and index.publish("norms", "v1") == []
+        assert sorted(index.publish("irt_parameters", "v1")) == ["c"]
+
+        index.track("d", ["norms"])
+        index.track("e", ["norms"])
+        index.track("f", ["norms"])
+        index.track("g", ["norms"])  # beyond max_keys: oldest tag dropped
+        assert sorted(index.publish("norms", "v2")) == ["e", "f", "g"]
+
+    @pytest.mark.asyncio
+    async def test_publish_deletes_only_dependent_entries(self, manager):
+        await manager.set("results:1", {"n": 1}, depends_on=["norms"])
+        await manager.set("theta:1", {"t": 1}, depends_on=["irt_parameters"])
+        await manager.set("plain", 1)
+
+        assert await manager.publish_version("norms", "v2") == ["results:1"]
+        assert await manager.get("results:1") is None
+        assert await manager.get("theta:1") == {"t": 1}
+        assert await manager.get("plain") == 1
+        assert await manager.publish_version("norms", "v2") == []
+
+    @pytest.mark.asyncio
+    async def test_load_overlapping_publish_is_not_cached(self, manager):
+        started = asyncio.Event()
+        release = asyncio.Event()
+
+        async def slow_loader():
+            started.set()
+            await release.wait()
+            return {"computed_with": "v1"}
+
+        task = asyncio.create_task(
+            manager.get_or_load("results:1", slow_loader, depends_on=["norms"]))
+        await started.wait()
+        await manager.publish_version("norms", "v2")
+        release.set()
+
+        assert await task == {"computed_with": "v1"}
+        assert await manager.get("results:1") is None
+        assert manager.get_manager_stats()["superseded_loads"] == 1
+
+    @pytest.mark.asyncio
+    async def test_warmer_rewarms_hottest_dependents(self, manager):
+        tracker = AccessTracker()
+        for key, hits in (("v4_results:a", 3), ("v4_results:b", 1)):
+            for _ in range(hits):
+                tracker.record(key)
+
+        async def loader(key):
+            return {"key": key, "norms": manager.dependencies.versions.get("norms")}
+
+        warmer = CacheWarmer(manager, tracker)
+        warmer.register("v4_results", loader, depends_on=["norms"])
+        await warmer.warm(top_k=2)
+
+        stats = await warmer.publish_version("norms", "v2", top_k=1)
+
+        assert stats["invalidated"] == 2 and stats["warmed"] == 1
+        assert await manager.get("v4_results:a") == {"key": "v4_results:a", "norms": "v2"}
+        assert await manager.get("v4_results:b") is None
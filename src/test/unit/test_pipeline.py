@@ -0,0 +1,148 @@
+"""
+Unit Tests for PipelineRunner
+
+Tests ordered stage execution, per-stage retries, skipping of dependent
+stages, bounded concurrency, queue-full rejection and per-job status
+reporting.
+"""
+
+import asyncio
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent.parent / "main" / "python"))
+
+from utils.pipeline import PipelineFull, PipelineRunner, Stage
+
+
+class TestPipelineRunner:
+    """Test suite for the background stage runner."""
+
+    @pytest.mark.asyncio
+    async def test_stages_run_in_order_with_outputs(self):
+        async def first(job_id, context):
+            return context["value"] * 2
+
+        async def second(job_id, context):
+            return context["outputs"]["first"] + 1
+
+        updates = []
+
+        async def record(job_id, status):
+            updates.append(status)
+
+        runner = PipelineRunner([Stage("first", first), Stage("second", second)], on_update=record)
+
+        assert runner.submit("job", {"value": 5})
+        await runner.join()
+
+        status = runner.status("job")
+        assert status["status"] == "completed"
+        assert status["stages"]["second"]["status"] == "completed"
+        assert updates[-1]["outputs"] == {"first": 10, "second": 11}
+        await runner.stop()
+
+    @pytest.mark.asyncio
+    async def test_failed_stage_is_retried(self):
+        calls = []
+
+        async def flaky(job_id, context):
+            calls.append(job_id)
+            if len(calls) < 3:
+                raise RuntimeError("transient")
+            return "ok"
+
+        runner = PipelineRunner([Stage("flaky", flaky, max_attempts=3, retry_delay_seconds=0)])
+        runner.submit("job")
+        await runner.join()
+
+        stage = runner.status("job")["stages"]["flaky"]
+        assert stage["status"] == "completed"
+        assert stage["attempts"] == 3
+        assert runner.stats()["retries"] == 2
+        await runner.stop()
+
+    @pytest.mark.asyncio
+    async def test_dependent_stages_are_skipped_after_failure(self):
+        async def broken(job_id, context):
+            raise ValueError("bad input")
+
+        async def independent(job_id, context):
+            return "done"
+
+        runner = PipelineRunner([
+            Stage("broken", broken, max_attempts=2, retry_delay_seconds=0),
+            Stage("dependent", independent, requires=("broken",)),
+            Stage("independent", independent)
+        ])
+        runner.submit("job")
+        await runner.join()
+
+        status = runner.status("job")
+        assert status["status"] == "failed"
+        assert status["stages"]["broken"] == {"status": "failed", "attempts": 2,
+                                               "error": "bad input",
+                                               "duration_ms": status["stages"]["broken"]["duration_ms"]}
+        assert status["stages"]["dependent"]["status"] == "skipped"
+        assert status["stages"]["independent"]["status"] == "completed"
+        await runner.stop()
+
+    @pytest.mark.asyncio
+    async def test_concurrency_is_bounded(self):
+        running = 0
+        peak = 0
+
+        async def slow(job_id, context):
+            nonlocal running, peak
+            running += 1
+            peak = max(peak, running)
+            await asyncio.sleep(0.01)
+            running -= 1
+
+        runner = PipelineRunner([Stage("slow", slow)], max_concurrency=2)
+        for i in range(6):
+            runner.submit(f"job{i}")
+        await runner.join()
+
+        assert peak == 2
+        assert runner.stats()["completed"] == 6
+        await runner.stop()
+
+    @pytest.mark.asyncio
+    async def test_pending_job_is_not_resubmitted(self):
+        release = asyncio.Event()
+
+        async def wait(job_id, context):
+            await release.wait()
+
+        runner = PipelineRunner([Stage("wait", wait)], max_concurrency=1)
+        assert runner.submit("job")
+        assert not runner.submit("job")
+
+        release.set()
+        await runner.join()
+        assert runner.submit("job")
+        await runner.stop()
+
+    @pytest.mark.asyncio
+    async def test_full_queue_raises(self):
+        release = asyncio.Event()
+
+        async def wait(job_id, context):
+            await release.wait()
+
+        runner = PipelineRunner([Stage("wait", wait)], max_concurrency=1, max_queue=1)
+        assert runner.submit("running")
+        await asyncio.sleep(0)  # worker picks up the first job
+        assert runner.submit("queued")
+
+        with pytest.raises(PipelineFull):
+            runner.submit("rejected")
+        assert runner.status("rejected") is None
+        assert runner.stats()["rejected"] == 1
+
+        release.set()
+        await runner.join()
+        await runner.stop()
@@ -0,0 +1,96 @@
+"""
+Unit Tests for Materialized Results Documents
+
+Tests ResultsDocument encoding (deterministic gzip body, content ETag),
+version keys tied to published artifact versions, and conditional
+responses (304 on a matching If-None-Match, gzip passthrough).
+"""
+
+import asyncio
+import gzip
+import json
+import sys
+from pathlib import Path
+
+import pytest
+from starlette.requests import Request
+
+sys.path.insert(0, str(Path(__file__).parent.parent.parent / "main" / "python"))
+
+import utils.cache as cache_module
+from api.conditional import document_response, representation_etag
+from core.data_access.results_document_store import ResultsDocument, current_versions_key
+from core.v4.performance_optimizer import PerformanceOptimizer
+from utils.cache import CacheManager
+
+
+def _request(headers):
+    return Request({
+        "type": "http", "method": "GET", "path": "/", "query_string": b"",
+        "headers": [(k.lower().encode(), v.encode()) for k, v in headers.items()]
+    })
+
+
+class TestResultsDocument:
+    """Test suite for ResultsDocument and document_response."""
+
+    @pytest.fixture
+    def document(self):
+        return ResultsDocument.build("s1", "v", {"session_id": "s1", "scores": {"t1": 72.5}, "名稱": "測試"})
+
+    def test_encoding_is_deterministic_and_round_trips(self, document):
+        assert json.loads(document.json_bytes())["名稱"] == "測試"
+        assert gzip.decompress(document.body) == document.json_bytes()
+        assert ResultsDocument.from_cache(document.to_cache()) == document
+        rebuilt = ResultsDocument.build("s1", "v", json.loads(document.json_bytes()))
+        assert (rebuilt.etag, rebuilt.body) == (document.etag, document.body)
+        assert ResultsDocument.build("s1", "v", {"session_id": "s2"}).etag != document.etag
+
+    def test_versions_key_follows_published_versions(self, monkeypatch):
+        manager = CacheManager()
+        monkeypatch.setattr(cache_module, "_cache_manager", manager)
+
+        before = current_versions_key(["norms"])
+        manager.dependencies.publish("irt_parameters", "v2")
+        assert current_versions_key(["norms"]) == before
+
+        manager.dependencies.publish("norms", "v2")
+        assert current_versions_key(["norms"]) != before
+
+    def test_optimizer_norms_republish_changes_versions_key(self, monkeypatch, tmp_path):
+        manager = CacheManager()
+        monkeypatch.setattr(cache_module, "_cache_manager", manager)
+        optimizer = PerformanceOptimizer(cache_dir=tmp_path)
+
+        before = current_versions_key(["norms"])
+        asyncio.run(optimizer.publish_version("norms", "v2"))
+
+        assert current_versions_key(["norms"]) != before
+
+    @pytest.mark.parametrize("if_none_match", [None, "\"other\"", "{plain}", "*", "W/{etag}", "\"x\", {etag}"])
+    def test_conditional_response(self, document, if_none_match):
+        etag = representation_etag(document.etag, gzipped=True)
+        headers = {"Accept-Encoding": "gzip, deflate"}
+        if if_none_match:
+            headers["If-None-Match"] = if_none_match.format(etag=etag, plain=document.etag)
+
+        response = document_response(_request(headers), document)
+
+        assert response.headers["etag"] == etag != document.etag
+        if if_none_match in (None, "\"other\"", "{plain}"):
+            assert response.status_code == 200
+            assert response.headers["content-encoding"] == "gzip"
+            assert response.body == document.body
+        else:
+            assert response.status_code == 304
+            assert response.body == b""
+
+    def test_uncompressed_for_clients_without_gzip(self, document):
+        response = document_response(_request({}), document)
+
+        assert "content-encoding" not in response.headers
+        assert response.headers["etag"] == document.etag
+        assert response.body == document.json_bytes()
+
+        gzip_etag = representation_etag(document.etag, gzipped=True)
+        assert document_response(_request({"If-None-Match": gzip_etag}), document).status_code == 200
@@ -0,0 +1,134 @@
+"""
+Unit Tests for RuleEngine
+
+Tests that compiled, indexed rule evaluation returns the same rules as
+evaluating every condition of every rule against the full context.
+"""
+
+import random
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent.parent / "main" / "python"))
+
+from core.recommendation.rule_engine import (RecommendationRule, RuleAction, RuleCondition,
+                                             RuleEngine, RuleType)
+from core.recommendation.strength_mapper import BIG_FIVE_FACTORS, StrengthMapper
+
+
+def _get_nested_value(data, field_path):
+    value = data
+    for key in field_path.split('.'):
+        if isinstance(value, dict):
+            value = value.get(key)
+        elif isinstance(value, list) and key.isdigit():
+            idx = int(key)
+            value = value[idx] if 0 <= idx < len(value) else None
+        elif hasattr(value, key):
+            value = getattr(value, key)
+        else:
+            return None
+    return value
+
+
+def _reference_matches(engine, profile, user_context):
+    """Evaluate every rule against the full context (the uncompiled engine)."""
+    context = {
+        "top_5_strengths": profile.top_5_strengths,
+        "all_strengths": profile.all_strengths,
+        "domain_distribution": {d.value: p for d, p in profile.domain_distribution.items()},
+        "profile_confidence": profile.profile_confidence,
+        "analysis_summary": profile.analysis_summary,
+        "user_context": user_context,
+        "domain_max_percentage": max(profile.domain_distribution.values()),
+        "strength_contains": " ".join(s.theme.name.lower() for s in profile.all_strengths)
+    }
+    matching = []
+    for rule in engine.rules:
+        if not rule.enabled or not all(_get_nested_value(user_context, r) for r in rule.context_requirements):
+            continue
+        total, matched = 0, 0
+        for condition in rule.conditions:
+            total += condition.weight
+            try:
+                value = _get_nested_value(context, condition.field_path)
+                if value is not None and engine._operators[condition.operator](value, condition.value):
+                    matched += condition.weight
+            except Exception:
+                pass
+        if total > 0 and matched / total >= 0.6:
+            matching.append(rule)
+    return sorted(matching, key=lambda r: r.priority, reverse=True)
+
+
+def _random_rule(rng, rule_id, theme_names):
+    fields = [("domain_distribution.strategic_thinking", "greater_than", 20),
+              ("domain_distribution.influencing", "less_equal", 30),
+              ("domain_max_percentage", "greater_equal", 40),
+              ("user_context.big_five_scores.openness", "less_than", 50),
+              ("top_5_strengths.0.theme.name", "equals", None),
+              ("top_5_strengths.1.theme.name", "in_list", None),
+              ("strength_contains", "contains", None),
+              ("user_context.industry_preference", "starts_with", "tech")]
+    conditions = []
+    for _ in range(rng.randint(1, 3)):
+        field_path, operator, value = rng.choice(fields)
+        if value is None:
+            value = rng.sample(theme_names, 3) if operator == "in_list" else rng.choice(theme_names)
+        elif isinstance(value, int):
+            value = rng.choice([value - 10, value, value + 10])
+        conditions.append(RuleCondition(field_path, operator, value, rng.choice([0.3, 0.6, 1.0])))
+    return RecommendationRule(rule_id, rule_id, "", RuleType.COMBINATION, conditions,
+                              [RuleAction.PROVIDE_INSIGHT], rng.randint(1, 9), 0.8, "", [])
+
+
+class TestRuleEngine:
+    """Test suite for compiled rule evaluation."""
+
+    def test_matches_uncompiled_evaluation(self):
+        rng = random.Random(5)
+        mapper = StrengthMapper()
+        engine = RuleEngine()
+        theme_names = [theme.name for theme in mapper._strength_themes.values()]
+        for i in range(300):
+            engine.add_rule(_random_rule(rng, f"X{i:03d}", theme_names))
+
+        for _ in range(100):
+            big_five_scores = {factor: rng.uniform(0, 100) for factor in BIG_FIVE_FACTORS}
+            user_context = {"big_five_scores": big_five_scores,
+                            "industry_preference": rng.choice(["service", "technology", ""])}
+            profile = mapper.generate_strength_profile(big_five_scores)
+
+            actual = engine.evaluate_strength_profile(profile, user_context)
+            expected = _reference_matches(engine, profile, user_context)
+            assert [r.rule_id for r in actual] == [r.rule_id for r in expected]
+
+    def test_rule_changes_are_recompiled(self):
+        mapper = StrengthMapper()
+        engine = RuleEngine()
+        big_five_scores = {"openness": 50, "conscientiousness": 50, "extraversion": 50,
+                           "agreeableness": 50, "neuroticism": 90}
+        profile = mapper.generate_strength_profile(big_five_scores)
+        context = {"big_five_scores": big_five_scores}
+
+        assert "R005_high_stress_sensitivity" in [r.rule_id for r in engine.evaluate_strength_profile(profile, context)]
+
+        engine.disable_rule("R005_high_stress_sensitivity")
+        assert "R005_high_stress_sensitivity" not in [r.rule_id for r in engine.evaluate_strength_profile(profile, context)]
+
+        engine.enable_rule("R005_high_stress_sensitivity")
+        rule = next(r for r in engine.rules if r.rule_id == "R005_high_stress_sensitivity")
+        engine.remove_rule(rule.rule_id)
+        assert rule not in engine.evaluate_strength_profile(profile, context)
+
+        engine.add_rule(rule)
+        assert rule in engine.evaluate_strength_profile(profile, context)
+
+    def test_shared_condition_is_compiled_once(self):
+        engine = RuleEngine()
+        condition = RuleCondition("domain_max_percentage", "less_than", 35, 1.0)
+        engine.add_rule(RecommendationRule("X1", "x", "", RuleType.DOMAIN_BASED, [condition],
+                                           [RuleAction.PROVIDE_INSIGHT], 5, 0.7, "", []))
+
+        compiled = {rule.rule.rule_id: rule for rule in engine._compiled_rules}
+        assert compiled["X1"].conditions[0] is compiled["R004_balanced_profile"].conditions[0]
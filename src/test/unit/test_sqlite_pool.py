@@ -0,0 +1,92 @@
+"""
+Unit Tests for the SQLite Connection Pool
+
+Tests tuning PRAGMAs, reader reuse and the serialized writer against a
+temporary SQLite database.
+"""
+
+import sqlite3
+import sys
+import threading
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent.parent / "main" / "python"))
+
+from database.sqlite_pool import SQLitePool, SQLiteTuning
+from database.engine import DatabaseEngine
+
+
+class TestSQLitePool:
+    """Test suite for SQLitePool."""
+
+    @pytest.fixture
+    def pool(self, tmp_path):
+        pool = SQLitePool(str(tmp_path / "test.db"), SQLiteTuning(read_pool_size=2))
+        with pool.writer() as conn:
+            conn.execute("CREATE TABLE items (id INTEGER PRIMARY KEY, name TEXT)")
+        yield pool
+        pool.close()
+
+    def test_pragmas_applied_to_connections(self, pool):
+        with pool.reader() as conn:
+            assert conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+            assert conn.execute("PRAGMA temp_store").fetchone()[0] == 2
+            assert conn.execute("PRAGMA busy_timeout").fetchone()[0] == 5000
+
+    def test_readers_are_reused(self, pool):
+        for _ in range(5):
+            with pool.reader() as conn:
+                conn.execute("SELECT 1").fetchone()
+
+        stats = pool.stats()
+        assert stats["reader_checkouts"] == 5
+        assert stats["readers_open"] == 1
+
+    def test_readers_are_query_only(self, pool):
+        with pytest.raises(sqlite3.OperationalError):
+            with pool.reader() as conn:
+                conn.execute("INSERT INTO items (name) VALUES ('x')")
+
+    def test_writer_commits_and_rolls_back(self, pool):
+        with pool.writer() as conn:
+            conn.execute("INSERT INTO items (name) VALUES ('kept')")
+
+        with pytest.raises(RuntimeError):
+            with pool.writer() as conn:
+                conn.execute("INSERT INTO items (name) VALUES ('dropped')")
+                raise RuntimeError("boom")
+
+        with pool.reader() as conn:
+            names = [row[0] for row in conn.execute("SELECT name FROM items")]
+        assert names == ["kept"]
+
+    def test_concurrent_writers_are_serialized(self, pool):
+        def write(i):
+            with pool.writer() as conn:
+                conn.execute("INSERT INTO items (name) VALUES (?)", (f"w{i}",))
+
+        threads = [threading.Thread(target=write, args=(i,)) for i in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        with pool.reader() as conn:
+            assert conn.execute("SELECT COUNT(*) FROM items").fetchone()[0] == 8
+
+
+class TestEngineTuning:
+    """Test suite for the SQLAlchemy engine's SQLite tuning."""
+
+    def test_file_database_uses_queue_pool_with_tuning(self, tmp_path):
+        engine = DatabaseEngine(f"sqlite:///{tmp_path / 'test.db'}")
+
+        with engine.engine.connect() as conn:
+            mmap_size = conn.exec_driver_sql("PRAGMA mmap_size").scalar()
+
+        status = engine.pool_status()
+        assert status["pool_class"] == "QueuePool"
+        assert status["checkouts"] >= 1
+        assert mmap_size == engine.sqlite_tuning.mmap_size_mb * 1024 * 1024
@@ -0,0 +1,78 @@
+"""
+Unit Tests for the V4 Statement Repository
+
+Tests snapshot loading, reuse and invalidation against a temporary
+SQLite database, counting the SQL statements actually executed.
+"""
+
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent.parent / "main" / "python"))
+
+from sqlalchemy import event
+
+from database.engine import DatabaseEngine
+from models.v4_models import V4Statement
+import core.data_access.statement_repository as statement_repository
+from core.data_access.statement_repository import StatementRepository
+
+
+class TestStatementRepository:
+    """Test suite for statement snapshots."""
+
+    @pytest.fixture
+    def engine(self, tmp_path):
+        return DatabaseEngine(f"sqlite:///{tmp_path / 'test.db'}")
+
+    @pytest.fixture
+    def queries(self, engine):
+        executed = []
+
+        def record(conn, cursor, statement, parameters, context, executemany):
+            executed.append(statement)
+
+        event.listen(engine.engine, "before_cursor_execute", record)
+        yield executed
+        event.remove(engine.engine, "before_cursor_execute", record)
+
+    @pytest.fixture
+    def repository(self, monkeypatch):
+        repository = StatementRepository(revalidate_seconds=3600)
+        monkeypatch.setattr(statement_repository, "_statement_repository", repository)
+        return repository
+
+    def test_snapshot_loads_in_one_query(self, engine, queries, repository):
+        with engine.get_session() as session:
+            snapshot = repository.get_snapshot_sync(session)
+
+        assert len(queries) == 1
+        assert len(snapshot.statements) > 0
+        assert set(snapshot.by_dimension) == {stmt.dimension for stmt in snapshot.statements}
+
+    def test_snapshot_reused_without_queries(self, engine, queries, repository):
+        with engine.get_session() as session:
+            first = repository.get_snapshot_sync(session)
+            second = repository.get_snapshot_sync(session)
+
+        assert first is second
+        assert len(queries) == 1
+        assert repository.stats()["hits"] == 1
+
+    def test_orm_write_invalidates_snapshot(self, engine, repository):
+        with engine.get_session() as session:
+            first = repository.get_snapshot_sync(session)
+
+        with engine.get_session() as session:
+            statement = session.query(V4Statement).first()
+            statement_id = statement.statement_id
+            statement.factor_loading = 0.91
+            statement.is_calibrated = True
+
+        with engine.get_session() as session:
+            second = repository.get_snapshot_sync(session)
+
+        assert second.version != first.version
+        assert second.by_id[statement_id].factor_loading == 0.91
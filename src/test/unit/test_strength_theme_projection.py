@@ -0,0 +1,80 @@
+"""
+Unit Tests for StrengthMapper Theme Projection
+
+Tests that the compiled weight-matrix scoring matches the per-theme
+weighted-sum loop, including tie ordering and missing factors.
+"""
+
+import random
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent.parent / "main" / "python"))
+
+from core.recommendation.strength_mapper import BIG_FIVE_FACTORS, StrengthMapper
+
+
+def _reference_scores(mapper, big_five_scores):
+    """Per-theme loop used before the weight matrix was compiled."""
+    scores = []
+    for theme_name, theme in mapper._strength_themes.items():
+        raw_score = 0.0
+        contributing_factors = {}
+        for factor, weight in mapper._mapping_weights.get(theme_name, {}).items():
+            if factor in big_five_scores:
+                contribution = big_five_scores[factor] * weight
+                raw_score += contribution
+                contributing_factors[factor] = contribution
+        normalized_score = max(0, min(100, (raw_score + 20) * 1.25))
+        max_contribution = max(abs(v) for v in contributing_factors.values()) if contributing_factors else 0
+        confidence = "high" if max_contribution > 30 else "medium" if max_contribution > 15 else "low"
+        scores.append((theme.name, raw_score, normalized_score, confidence, contributing_factors))
+    return sorted(scores, key=lambda x: x[2], reverse=True)
+
+
+def _random_big_five(rng):
+    scores = {factor: rng.choice([0.0, 100.0, rng.uniform(0, 100)]) for factor in BIG_FIVE_FACTORS}
+    for factor in BIG_FIVE_FACTORS:
+        if rng.random() < 0.15:
+            del scores[factor]
+    return scores
+
+
+class TestStrengthThemeProjection:
+    """Test suite for vectorized Big Five -> theme scoring."""
+
+    def test_batch_matches_per_theme_loop(self):
+        mapper = StrengthMapper()
+        rng = random.Random(11)
+        batch = [_random_big_five(rng) for _ in range(200)] + [{}]
+
+        results = mapper.calculate_strength_scores_batch(batch)
+
+        for big_five_scores, ranked in zip(batch, results):
+            expected = _reference_scores(mapper, big_five_scores)
+            actual = [(s.theme.name, s.raw_score, s.percentile_score, s.confidence_level,
+                       s.contributing_factors) for s in ranked]
+            assert actual == expected
+
+    def test_breakdown_only_for_top_themes(self):
+        mapper = StrengthMapper()
+        big_five_scores = {"openness": 80, "conscientiousness": 60, "extraversion": 40,
+                           "agreeableness": 70, "neuroticism": 30}
+
+        ranked = mapper.calculate_strength_scores(big_five_scores, breakdown_top_n=5)
+
+        assert all(s.contributing_factors for s in ranked[:5])
+        assert all(s.contributing_factors is None for s in ranked[5:])
+        assert [s.theme.name for s in ranked] == [s.theme.name for s in mapper.calculate_strength_scores(big_five_scores)]
+
+    def test_profiles_match_single_profile(self):
+        mapper = StrengthMapper()
+        rng = random.Random(3)
+        batch = [_random_big_five(rng) for _ in range(20)]
+
+        profiles = mapper.generate_strength_profiles(batch)
+
+        for big_five_scores, profile in zip(batch, profiles):
+            single = mapper.generate_strength_profile(big_five_scores)
+            assert [s.theme.name for s in profile.top_5_strengths] == [s.theme.name for s in single.top_5_strengths]
+            assert profile.domain_distribution == single.domain_distribution
@@ -0,0 +1,95 @@
+"""
+Unit Tests for v4 Batch Scoring
+
+Tests that the vectorized count scoring and batch norm conversion used
+by the bulk re-scoring script match the per-session calculations.
+"""
+
+import random
+import sys
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).parent.parent.parent.parent / "main" / "python"))
+
+from core.v4.count_scoring import (DIMENSION_INDEX, TALENT_DIMENSIONS, count_score_matrix,
+                                   normalize_counts, score_record, talent_scores)
+from core.v4.normative_scoring import NormativeScorer
+
+NORMS_PATH = Path(__file__).parent.parent.parent.parent / "main" / "python" / "data" / "v4_normative_data.json"
+
+CONFIG = {
+    "min_reliability": 0.7, "base_reliability": 0.9, "min_confidence": 0.6,
+    "max_confidence": 0.95, "base_response_consistency": 0.8, "dominant_threshold": 75.0,
+    "lesser_threshold": 25.0, "algorithm_version": "test", "computation_ms_per_response": 2.5,
+    "calibration_version": "test"
+}
+
+
+def _reference_scores(dimension_counts, n_responses):
+    """Per-session formula of the submit route before vectorization."""
+    max_score, min_score = n_responses * 1.0, n_responses * -0.5
+    scores = {}
+    for i in range(1, 13):
+        raw = dimension_counts.get(f"T{i}", 0)
+        if max_score > min_score:
+            value = max(0, min(100, ((raw - min_score) / (max_score - min_score)) * 100))
+        else:
+            value = 50.0
+        scores[f"t{i}_talent"] = round(value, 1)
+    return scores
+
+
+class TestCountScoring:
+    """Test suite for vectorized count scoring."""
+
+    def test_chunk_matches_per_session_formula(self):
+        rng = random.Random(7)
+        sessions = []
+        session_index, dimension_index, weights = [], [], []
+        for row in range(300):
+            n_responses = rng.randint(0, 20)
+            counts = {}
+            for _ in range(n_responses):
+                for weight in (1.0, -0.5):
+                    dimension = rng.choice(TALENT_DIMENSIONS)
+                    counts[dimension] = counts.get(dimension, 0) + weight
+                    session_index.append(row)
+                    dimension_index.append(DIMENSION_INDEX[dimension])
+                    weights.append(weight)
+            sessions.append((counts, n_responses))
+
+        raw = count_score_matrix(session_index, dimension_index, weights, len(sessions))
+        normalized = normalize_counts(raw, [n for _, n in sessions])
+
+        for row, (counts, n_responses) in enumerate(sessions):
+            assert talent_scores(normalized[row]) == _reference_scores(counts, n_responses)
+
+    def test_score_record_tiers(self):
+        scores = {f"t{i}_talent": value for i, value in enumerate([80.0, 50.0, 10.0] * 4, 1)}
+        record = score_record(scores, {"T1": 3.0}, 10, CONFIG)
+
+        assert record["t1_structured_execution"] == 80.0
+        assert record["dominant_talents"] == ["t1", "t4", "t7", "t10"]
+        assert record["lesser_talents"] == ["t3", "t6", "t9", "t12"]
+        assert record["overall_confidence"] == 0.95
+        assert record["theta_estimates"] == {"T1": 3.0}
+
+
+class TestBatchNormScores:
+    """Test suite for NormativeScorer.compute_norm_scores_batch."""
+
+    def test_batch_matches_single_conversion(self):
+        scorer = NormativeScorer(NORMS_PATH)
+        dimensions = list(TALENT_DIMENSIONS)
+        theta = np.random.default_rng(0).normal(0, 1.5, (500, 12))
+        present = np.random.default_rng(1).random((500, 12)) > 0.2
+
+        batch = scorer.compute_norm_scores_batch(dimensions, theta, present)
+
+        for i in range(500):
+            single = scorer.compute_norm_scores(
+                {dimension: float(theta[i, j]) for j, dimension in enumerate(dimensions) if present[i, j]}
+            )
+            assert batch[i] == single
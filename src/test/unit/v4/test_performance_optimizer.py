@@ -0,0 +1,391 @@
+"""
+Unit Tests for the v4 Performance Optimizer
+
+Tests the memory tier (LRU recency, TTL expiry, byte budgets and
+per-prefix quotas), the SQLite disk tier, structural cache keys and
+the optimizer's cache statistics.
+"""
+
+import asyncio
+import sqlite3
+import sys
+import threading
+from dataclasses import dataclass
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent.parent.parent / "main" / "python"))
+
+from core.v4 import performance_optimizer
+from core.v4.performance_optimizer import MemoryTier, PerformanceOptimizer, cached_computation
+from core.v4.fingerprint import fingerprint
+from utils.cache import CacheManager
+from core.v4.disk_cache import (
+    DiskCache, CacheSerializationError, encode_value, decode_value, register_dataclass
+)
+
+
+class TestMemoryTier:
+    """Test suite for MemoryTier."""
+
+    def test_hit_refreshes_recency(self):
+        tier = MemoryTier(max_entries=2, prefix_quotas={})
+        tier.put("a", 1, ttl=60)
+        tier.put("b", 2, ttl=60)
+        tier.get("a")
+        tier.put("c", 3, ttl=60)
+
+        assert tier.get("a") == 1
+        assert tier.get("b") is None
+        assert tier.get("c") == 3
+
+    def test_expired_entries_are_purged(self, monkeypatch):
+        now = [1000.0]
+        monkeypatch.setattr(performance_optimizer.time, "monotonic", lambda: now[0])
+        tier = MemoryTier(prefix_quotas={})
+        tier.put("short", "x", ttl=1)
+        tier.put("long", "y", ttl=100)
+
+        now[0] += 10
+        tier.put("other", "z", ttl=100)
+
+        assert len(tier) == 2
+        assert tier.get("short") is None
+        assert tier.stats()["expirations"] == 1
+
+    def test_byte_budget_evicts_lru(self):
+        array = np.zeros(1000)  # ~8 KB
+        tier = MemoryTier(max_bytes=20000, prefix_quotas={})
+        for i in range(5):
+            tier.put(f"k{i}", array.copy(), ttl=60)
+
+        stats = tier.stats()
+        assert stats["bytes"] <= 20000
+        assert tier.get("k4") is not None
+        assert tier.get("k0") is None
+
+    def test_prefix_quota_isolates_partitions(self):
+        tier = MemoryTier(max_bytes=40000, prefix_quotas={"theta": 20000, "norm": 10000})
+        tier.put("norm_table", np.zeros(500), ttl=60)
+        for i in range(50):
+            tier.put(f"theta_{i}", np.zeros(1000), ttl=60)
+
+        assert tier.get("norm_table") is not None
+        assert tier.stats()["partitions"]["theta"]["evictions"] > 0
+        assert tier.stats()["partitions"]["norm"]["evictions"] == 0
+
+    def test_small_budget_scales_quotas(self):
+        tier = MemoryTier(max_bytes=16 * 1024 * 1024)
+        tier.put("report_x", {"score": 1}, ttl=60)
+
+        partitions = tier.stats()["partitions"]
+        assert tier.get("report_x") == {"score": 1}
+        assert sum(p["max_bytes"] for p in partitions.values()) <= 16 * 1024 * 1024
+        assert partitions["*"]["max_bytes"] >= 4 * 1024 * 1024
+        assert partitions["theta"]["max_bytes"] == 4 * partitions["norm"]["max_bytes"]
+
+    def test_entry_cap_evicts_from_fullest_partition(self):
+        tier = MemoryTier(max_entries=6, max_bytes=200000,
+                          prefix_quotas={"theta": 100000, "norm": 10000})
+        tier.put("norm_a", np.zeros(500), ttl=60)  # ~40% of the norm quota each
+        tier.put("norm_b", np.zeros(500), ttl=60)
+        for i in range(5):
+            tier.put(f"theta_{i}", i, ttl=60)
+
+        assert "norm_a" not in tier
+        assert "norm_b" in tier
+        assert all(f"theta_{i}" in tier for i in range(5))
+        assert tier.stats()["partitions"]["theta"]["evictions"] == 0
+
+    def test_contains_has_no_side_effects(self, monkeypatch):
+        now = [1000.0]
+        monkeypatch.setattr(performance_optimizer.time, "monotonic", lambda: now[0])
+        tier = MemoryTier(max_entries=2, prefix_quotas={})
+        tier.put("a", 1, ttl=60)
+        tier.put("b", 2, ttl=5)
+
+        assert "a" in tier  # does not refresh recency
+        now[0] += 10
+        assert "b" not in tier
+        assert len(tier) == 2 and tier.stats()["expirations"] == 0
+
+        now[0] -= 10
+        tier.put("c", 3, ttl=60)
+        assert tier.get("a") is None
+        assert tier.get("b") == 2
+
+
+class TestPerformanceOptimizer:
+    """Test suite for optimizer-level caching."""
+
+    @pytest.fixture
+    def optimizer(self, tmp_path):
+        return PerformanceOptimizer(cache_dir=tmp_path)
+
+    def test_stats_report_tier_hits(self, optimizer):
+        optimizer.save_to_cache("theta_x", np.ones(12))
+        optimizer.get_from_cache("theta_x")
+        optimizer.get_from_cache("theta_missing")
+
+        stats = optimizer.get_performance_stats()
+        assert stats["memory_hits"] == 1
+        assert stats["cache_misses"] == 1
+        assert stats["hit_rate"] == 50
+        assert stats["memory_cache"]["partitions"]["theta"]["entries"] == 1
+
+    def test_clear_cache_by_prefix(self, optimizer):
+        optimizer.save_to_cache("theta_x", 1)
+        optimizer.save_to_cache("norm_x", 2)
+        optimizer.clear_cache("theta")
+
+        assert optimizer.get_from_cache("theta_x") is None
+        assert optimizer.get_from_cache("norm_x") == 2
+
+    def test_disk_hit_promotes_to_memory(self, optimizer):
+        optimizer.save_to_cache("theta_x", np.ones(12))
+        optimizer.disk_cache.flush()
+        optimizer.memory_cache.clear()
+
+        assert np.array_equal(optimizer.get_from_cache("theta_x"), np.ones(12))
+        assert np.array_equal(optimizer.get_from_cache("theta_x"), np.ones(12))
+        stats = optimizer.get_performance_stats()
+        assert stats["disk_hits"] == 1
+        assert stats["memory_hits"] == 1
+        assert not list(optimizer.cache_dir.glob("*.pkl"))
+
+
+@register_dataclass
+@dataclass
+class _Estimate:
+    theta: np.ndarray
+    converged: bool
+
+
+class TestDiskCache:
+    """Test suite for the single-file disk cache tier."""
+
+    @pytest.fixture
+    def disk(self, tmp_path):
+        cache = DiskCache(tmp_path / "cache.db")
+        yield cache
+        cache.close()
+
+    def test_encoding_round_trips_arrays_and_dataclasses(self):
+        value = {"estimate": _Estimate(np.arange(6.0).reshape(2, 3), True),
+                 "pair": (1, "a"), 3: [np.float32(0.5)]}
+        decoded = decode_value(encode_value(value))
+
+        assert np.array_equal(decoded["estimate"].theta, value["estimate"].theta)
+        assert decoded["estimate"].converged is True
+        assert decoded["pair"] == (1, "a")
+        assert decoded[3] == [0.5]
+
+    def test_unregistered_types_are_rejected(self):
+        with pytest.raises(CacheSerializationError):
+            encode_value(object())
+
+    def test_put_is_visible_before_and_after_flush(self, disk, tmp_path):
+        disk.put("theta_a", np.ones(3), ttl=60)
+        assert np.array_equal(disk.get("theta_a")[0], np.ones(3))
+
+        disk.flush()
+        reopened = DiskCache(tmp_path / "cache.db")
+        assert np.array_equal(reopened.get("theta_a")[0], np.ones(3))
+        reopened.close()
+
+    def test_corrupt_row_is_a_miss(self, disk, tmp_path):
+        disk.put("k", [1, 2, 3], ttl=60)
+        disk.flush()
+        with sqlite3.connect(tmp_path / "cache.db") as conn:
+            conn.execute("UPDATE cache SET value = zeroblob(length(value))")
+
+        assert disk.get("k") is None
+        assert disk.stats()["corrupt"] == 1
+
+    def test_size_cap_evicts_least_recently_used(self, tmp_path):
+        disk = DiskCache(tmp_path / "cache.db", max_bytes=3000)
+        for i in range(5):
+            disk.put(f"k{i}", np.zeros(100), ttl=60)  # ~900 bytes each
+            disk.flush()
+        stats = disk.stats()
+        disk.close()
+
+        assert stats["bytes"] <= 3000
+        assert stats["evictions"] > 0
+
+    def test_clear_prefix(self, disk):
+        disk.put("theta_a", 1, ttl=60)
+        disk.put("norm_a", 2, ttl=60)
+        disk.clear("theta")
+        disk.flush()
+
+        assert disk.get("theta_a") is None
+        assert disk.get("norm_a")[0] == 2
+
+    def test_running_totals_match_table(self, disk, tmp_path):
+        for i in range(4):
+            disk.put(f"theta_{i}", np.zeros(10 * (i + 1)), ttl=60)
+        disk.put("theta_0", np.zeros(50), ttl=60)
+        disk.put("norm_a", [1], ttl=0)
+        disk.delete("theta_1")
+        disk.flush()
+        disk.clear("norm")
+        disk.flush()
+
+        with sqlite3.connect(tmp_path / "cache.db") as conn:
+            entries, size = conn.execute("SELECT COUNT(*), SUM(size) FROM cache").fetchone()
+        stats = disk.stats()
+        assert entries == 3
+        assert (stats["entries"], stats["bytes"]) == (entries, size)
+
+        reopened = DiskCache(tmp_path / "cache.db")
+        assert reopened.stats()["bytes"] == size
+        reopened.close()
+
+    def test_cap_holds_across_workers_sharing_the_file(self, tmp_path):
+        workers = [DiskCache(tmp_path / "cache.db", max_bytes=3000, resync_interval=0)
+                   for _ in range(2)]
+        for i in range(3):
+            for n, disk in enumerate(workers):
+                disk.put(f"w{n}_{i}", np.zeros(100), ttl=60)  # ~900 bytes each
+                disk.flush()
+        stats = workers[1].stats()
+        for disk in workers:
+            disk.close()
+
+        with sqlite3.connect(tmp_path / "cache.db") as conn:
+            entries, size = conn.execute("SELECT COUNT(*), SUM(size) FROM cache").fetchone()
+        assert size <= 3000
+        assert (stats["entries"], stats["bytes"]) == (entries, size)
+
+    def test_stale_totals_are_resynced_before_evicting(self, tmp_path):
+        writer = DiskCache(tmp_path / "cache.db", max_bytes=3000)
+        other = DiskCache(tmp_path / "cache.db", max_bytes=3000)
+        writer.put("a", np.zeros(100), ttl=60)
+        writer.put("b", np.zeros(100), ttl=60)
+        writer.flush()
+        other.clear()  # another worker empties the file
+        other.flush()
+        writer.put("c", np.zeros(100), ttl=60)
+        writer.put("d", np.zeros(100), ttl=60)
+        writer.flush()
+        stats = writer.stats()
+        writer.close()
+        other.close()
+
+        # The writer thinks ~3600 bytes are stored, but only c and d are
+        assert stats["evictions"] == 0
+        assert stats["entries"] == 2
+
+    def test_reads_do_not_wait_on_writer(self, disk):
+        disk.put("k", [1, 2, 3], ttl=60)
+        disk.flush()
+
+        result = []
+        with disk._db_lock:  # as held by the writer during a batch commit
+            reader = threading.Thread(target=lambda: result.append(disk.get("k")))
+            reader.start()
+            reader.join(timeout=2.0)
+            assert not reader.is_alive()
+        assert result[0][0] == [1, 2, 3]
+
+
+class TestCacheKeys:
+    """Test suite for structural cache keys."""
+
+    @pytest.fixture
+    def optimizer(self, tmp_path):
+        return PerformanceOptimizer(cache_dir=tmp_path, cache_manager=CacheManager())
+
+    def test_fingerprint_is_order_insensitive_for_dicts(self):
+        assert fingerprint({"a": 1, "b": [1, 2]}) == fingerprint({"b": [1, 2], "a": 1})
+        assert fingerprint([1, 2]) != fingerprint([2, 1])
+        assert fingerprint(1) != fingerprint(1.0) != fingerprint("1")
+        assert fingerprint(1) != fingerprint(True)
+        assert fingerprint([1, 2]) != fingerprint((1, 2))
+        assert fingerprint(np.int64(1)) == fingerprint(1)
+
+    def test_ndarray_keys(self, optimizer):
+        theta = np.linspace(-1, 1, 12)
+
+        assert optimizer.get_cache_key("theta", theta) == optimizer.get_cache_key("theta", theta.copy())
+        assert optimizer.get_cache_key("theta", theta) != optimizer.get_cache_key("theta", theta.astype(np.float32))
+
+    def test_fingerprint_handles_non_buffer_dtypes(self):
+        dates = np.array(["2024-01-01", "2024-01-02"], dtype="datetime64[D]")
+
+        assert fingerprint(dates) == fingerprint(dates.copy())
+        assert fingerprint(dates) != fingerprint(dates.astype("datetime64[s]"))
+        assert fingerprint(np.zeros(2, dtype=[("a", "<f8")])) != fingerprint(np.zeros(2, dtype=[("b", "<f8")]))
+
+    def test_table_version_changes_dependent_keys_only(self, optimizer):
+        norm_before = optimizer.get_cache_key("norm", {"T1": 0.5}, depends_on=("norms",))
+        theta_before = optimizer.get_cache_key("theta", {"T1": 0.5}, depends_on=("irt_parameters",))
+        asyncio.run(optimizer.publish_version("norms", "v2"))
+
+        assert optimizer.get_cache_key("norm", {"T1": 0.5}, depends_on=("norms",)) != norm_before
+        assert optimizer.get_cache_key("theta", {"T1": 0.5}, depends_on=("irt_parameters",)) == theta_before
+
+    def test_publishing_version_drops_only_dependents(self, optimizer):
+        asyncio.run(optimizer.publish_version("norms", "v1"))
+        optimizer.save_to_cache("norm_a", 1.0, depends_on=("norms",))
+        optimizer.save_to_cache("norm_b", 2.0, depends_on=("norms", "irt_parameters"))
+        optimizer.save_to_cache("theta_a", 3.0, depends_on=("irt_parameters",))
+        optimizer.disk_cache.flush()
+
+        assert asyncio.run(optimizer.publish_version("norms", "v1")) == []  # unchanged
+        assert optimizer.get_from_cache("norm_a") == 1.0
+
+        asyncio.run(optimizer.publish_version("norms", "v2"))
+        assert optimizer.get_from_cache("norm_a") is None
+        assert optimizer.get_from_cache("norm_b") is None
+        assert optimizer.get_from_cache("theta_a") == 3.0
+        assert optimizer.dependencies.stats()["dependents"] == {"irt_parameters": 1}
+
+    def test_versions_are_shared_with_cache_manager(self, optimizer):
+        manager = optimizer.cache_manager
+        optimizer.save_to_cache("norm_a", 1.0, depends_on=("norms",))
+        asyncio.run(manager.set("v4_results:s1", {"ok": True}, depends_on=["norms"]))
+
+        asyncio.run(manager.publish_version("norms", "v3"))
+
+        assert optimizer.table_versions["norms"] == "v3"
+        assert optimizer.get_from_cache("norm_a") is None
+        assert asyncio.run(manager.get("v4_results:s1")) is None
+
+    def test_method_instance_keyed_by_fingerprint(self, optimizer, monkeypatch):
+        monkeypatch.setattr(performance_optimizer, "_optimizer_instance", optimizer)
+        calls = []
+
+        class Scorer:
+            def __init__(self, version):
+                self.version = version
+
+            def __cache_fingerprint__(self):
+                return self.version
+
+            @cached_computation("norm_test")
+            def score(self, theta):
+                calls.append(theta)
+                return theta * 2
+
+        assert Scorer("v1").score(1.5) == 3.0
+        assert Scorer("v1").score(1.5) == 3.0
+        assert Scorer("v2").score(1.5) == 3.0
+        assert len(calls) == 2
+
+    def test_method_instance_without_fingerprint_is_not_cached(self, optimizer, monkeypatch):
+        monkeypatch.setattr(performance_optimizer, "_optimizer_instance", optimizer)
+
+        class Scorer:
+            def __init__(self, factor):
+                self.factor = factor
+
+            @cached_computation("norm_test")
+            def score(self, theta):
+                return theta * self.factor
+
+        assert Scorer(2).score(1.5) == 3.0
+        assert Scorer(3).score(1.5) == 4.5
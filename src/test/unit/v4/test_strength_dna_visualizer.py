@@ -0,0 +1,117 @@
+"""
+Unit Tests for the Strength DNA Visualizer
+
+Tests that segment assets looked up per (dimension, percentile bucket)
+match the per-request formulas, and that the DNA fragment is cached.
+"""
+
+import random
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent.parent.parent / "main" / "python"))
+
+from core.v4.normative_scoring import NormScore
+from core.v4.strength_dna_visualizer import (StrengthDNAVisualizer, create_fancy_dna_visualization,
+                                             percentile_bucket)
+
+
+def _blend(color1, color2, ratio):
+    rgb1 = [int(color1[i:i + 2], 16) for i in (1, 3, 5)]
+    rgb2 = [int(color2[i:i + 2], 16) for i in (1, 3, 5)]
+    return "#" + "".join(f"{int(c1 * (1 - ratio) + c2 * ratio):02x}" for c1, c2 in zip(rgb1, rgb2))
+
+
+def _reference_segment(primary, secondary, percentile):
+    """Per-segment formulas of generate_dna_visualization before the lookup table."""
+    intensity = percentile / 100
+    return {
+        'gradient_primary': {
+            'start': primary, 'middle': _blend(primary, secondary, 0.3), 'end': secondary,
+            'opacity_start': min(1.0, 0.6 + intensity * 0.4),
+            'opacity_end': min(1.0, 0.3 + intensity * 0.3)
+        },
+        'gradient_secondary': {
+            'start': secondary, 'middle': _blend(secondary, '#ffffff', 0.4),
+            'end': _blend(secondary, '#ffffff', 0.7),
+            'opacity_start': min(0.8, 0.4 + intensity * 0.4),
+            'opacity_end': min(0.6, 0.2 + intensity * 0.2)
+        },
+        'glow_effect': {
+            'enabled': percentile >= 70,
+            'radius': int(5 + intensity * 10),
+            'opacity': min(0.8, intensity * 0.6),
+            'color': '#fbbf24' if percentile >= 85 else '#60a5fa'
+        }
+    }
+
+
+def _norm_scores(rng):
+    return {
+        f"T{i}": NormScore(dimension=f"T{i}", raw_theta=rng.gauss(0, 1),
+                           percentile=round(rng.uniform(0, 100), 1), t_score=50.0,
+                           stanine=5, sten=5, z_score=0.0, interpretation="中等")
+        for i in range(1, 13)
+    }
+
+
+class TestSegmentAssets:
+    """Test suite for the (dimension, percentile bucket) asset table."""
+
+    def test_segments_match_per_request_formulas(self):
+        visualizer = StrengthDNAVisualizer()
+        rng = random.Random(11)
+
+        for _ in range(200):
+            dna_items = visualizer.create_strength_dna(_norm_scores(rng))
+            segments = visualizer.generate_dna_visualization(dna_items)['dna_segments']
+
+            for item, segment in zip(dna_items, segments):
+                expected = _reference_segment(item.color_primary, item.color_secondary, item.percentile)
+                for field, value in expected.items():
+                    assert segment[field] == value
+                assert segment['pattern_overlay']['enabled'] == (item.percentile >= 60)
+
+            assert abs(sum(segment['width_percent'] for segment in segments) - 100) < 1e-9
+
+    def test_segments_do_not_share_table_entries(self):
+        visualizer = StrengthDNAVisualizer()
+        dna_items = visualizer.create_strength_dna(_norm_scores(random.Random(1)))
+
+        first = visualizer.generate_dna_visualization(dna_items)['dna_segments'][0]
+        first['pattern_overlay']['opacity'] = 1.0
+        first['glow_effect']['enabled'] = None
+
+        again = visualizer.generate_dna_visualization(dna_items)['dna_segments'][0]
+        assert again['pattern_overlay']['opacity'] <= 0.3
+        assert again['glow_effect']['enabled'] in (True, False)
+
+    def test_percentile_bucket(self):
+        assert percentile_bucket(0.0) == 0
+        assert percentile_bucket(57.3) == 573
+        assert percentile_bucket(100.0) == 1000
+
+
+class TestFragmentCache:
+    """Test suite for DNA fragment caching."""
+
+    def test_repeated_scores_hit_cache(self):
+        visualizer = StrengthDNAVisualizer(fragment_cache_size=2)
+        rng = random.Random(5)
+        scores = _norm_scores(rng)
+
+        fragment = visualizer.build_fragment(scores)
+        assert visualizer.build_fragment(dict(scores)) is fragment
+        assert [item['rank'] for item in fragment['dna_data']] == list(range(1, 13))
+
+        visualizer.build_fragment(_norm_scores(rng))
+        visualizer.build_fragment(_norm_scores(rng))
+        assert visualizer.fragment_cache.stats()['entries'] == 2
+        assert visualizer.build_fragment(scores) is not fragment
+
+    def test_create_fancy_dna_visualization(self):
+        result = create_fancy_dna_visualization(_norm_scores(random.Random(9)))
+
+        assert result['metadata']['total_dimensions'] == 12
+        assert len(result['visualization']['dna_segments']) == 12
+        assert 'generation_timestamp' in result['metadata']